@@ -70,11 +70,20 @@ export interface Instruction {
   updated_at: string;
 }
 
+export interface InstructionEmbeddingStatus {
+  status: "pending" | "running" | "done" | "failed" | "superseded";
+  attempts: number;
+  last_error: string | null;
+  enqueued_at: string | null;
+  finished_at: string | null;
+}
+
 export interface InstructionVersion {
   version: number;
   body: string;
   change_note: string;
   created_at: string;
+  embedding?: InstructionEmbeddingStatus | null;
 }
 
 export interface InstructionDetail extends Instruction {
@@ -235,6 +244,7 @@ export interface ChatRoom {
   description: string;
   message_count: number;
   last_activity: string | null;
+  last_message_id: number | null;
   created_at: string;
 }
 
@@ -317,6 +327,7 @@ export interface ArtifactWithRevision extends Artifact {
 export interface ArtifactListResult {
   artifacts: Artifact[];
   count: number;
+  next_cursor?: string | null;
 }
 
 export interface ArtifactRevisionsResult {
@@ -426,6 +437,8 @@ export interface ToMarkdownRequest {
   collapse_depth?: number | null;
   with_image_descriptions?: boolean;
   bare?: boolean;
+  /** Page selection for local PDFs, e.g. "1-5,9". */
+  pages?: string | null;
 }
 
 export interface ToMarkdownResult {
@@ -498,6 +511,7 @@ export interface Task {
 export interface TaskListResult {
   tasks: Task[];
   count: number;
+  next_cursor?: string | null;
 }
 
 export interface TaskCreateInput {
@@ -534,6 +548,72 @@ export interface HealthReport {
     hidden_tools: number;
     stub_tools: number;
   };
+  npl_render_cache?: SubsystemHealth & {
+    size: number;
+    maxsize: number;
+    hits: number;
+    misses: number;
+    hit_ratio: number;
+  };
+  inference_cache?: SubsystemHealth & {
+    size: number;
+    maxsize: number;
+    bytes: number;
+    max_bytes: number;
+    hits: number;
+    misses: number;
+    evictions: number;
+    hit_ratio: number;
+    disk: string | null;
+    inflight: number;
+  };
+  markdown_cache?: SubsystemHealth & {
+    cache_dir: string;
+    max_bytes: number;
+    hits: number;
+    stale_hits: number;
+    revalidated: number;
+    misses: number;
+    evictions: number;
+    refreshing: number;
+    hit_ratio: number;
+  };
+  metrics_buffer?: SubsystemHealth & {
+    running?: boolean;
+    queued?: number;
+    enqueued?: number;
+    written?: number;
+    dropped?: number;
+    failed_flushes?: number;
+    policy?: string;
+  };
+  chat_hub?: SubsystemHealth & {
+    running?: boolean;
+    listening?: boolean;
+    rooms?: number;
+    subscribers?: number;
+    notifications?: number;
+    delivered?: number;
+    resyncs?: number;
+    reconnects?: number;
+  };
+  pipe_hub?: SubsystemHealth & {
+    running?: boolean;
+    listening?: boolean;
+    waiters?: number;
+    notifications?: number;
+    woken?: number;
+    reconnects?: number;
+  };
+  embedding_worker?: SubsystemHealth & {
+    running?: boolean;
+    batches?: number;
+    done?: number;
+    retried?: number;
+    failed?: number;
+    superseded?: number;
+    vectors?: number;
+  };
   frontend_build: SubsystemHealth & { dist_path: string };
 }
 
@@ -565,6 +645,7 @@ export interface ChatMessage {
 export interface ChatMessageListResult {
   items: ChatMessage[];
   count: number;
+  next_cursor?: string | null;
 }
 
 export interface ChatRoomListResult {
@@ -589,6 +670,7 @@ export interface PipeInputRequest {
   since?: string;
   full?: boolean;
   with_sections?: string[];
+  wait?: number;
 }
 
 export interface PipeDashboardEntry {
@@ -603,6 +685,7 @@ export interface PipeInputResult {
   agent_handle: string;
   groups: string[];
   entries: number;
+  latest: string | null;
   dashboard: Record<string, PipeDashboardEntry | PipeDashboardEntry[]>;
 }
 
@@ -663,6 +746,8 @@ export interface MetricListResult<T> {
 export interface ChatRoomMember {
   persona_slug: string;
   joined_at: string | null;
+  unread_count: number;
+  last_read_message_id: number | null;
 }
 
 export interface ChatEvent {
@@ -8,19 +8,19 @@ from __future__ import annotations
 
 import asyncio
 import datetime
-import glob
 import os
 import re
 import shortuuid
 import time
-import yaml
 from pathlib import Path
 from typing import Any, Optional
 
-from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import Response
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
+from npl_mcp.storage.pagination import InvalidCursor, Keyset
+
 router = APIRouter(prefix="/api", tags=["api"])
 
 
@@ -129,6 +129,73 @@ async def health_check() -> dict:
     except Exception as exc:
         report["catalog"] = {"status": "unavailable", "message": str(exc)}
 
+    # ── npl_render_cache ─────────────────────────────────────────────────
+    try:
+        from npl_mcp.npl.render_cache import get_render_cache
+        report["npl_render_cache"] = {"status": "ok", **get_render_cache().stats()}
+    except Exception as exc:
+        report["npl_render_cache"] = {"status": "unavailable", "message": str(exc)}
+
+    # ── inference_cache ──────────────────────────────────────────────────
+    try:
+        from npl_mcp.meta_tools.inference_cache import cache_stats
+        report["inference_cache"] = {"status": "ok", **cache_stats()}
+    except Exception as exc:
+        report["inference_cache"] = {"status": "unavailable", "message": str(exc)}
+
+    # ── markdown_cache ───────────────────────────────────────────────────
+    try:
+        from npl_mcp.markdown.cache import get_markdown_cache
+        report["markdown_cache"] = {"status": "ok", **get_markdown_cache().stats()}
+    except Exception as exc:
+        report["markdown_cache"] = {"status": "unavailable", "message": str(exc)}
+
+    # ── metrics_buffer ───────────────────────────────────────────────────
+    try:
+        from npl_mcp.storage.metrics_buffer import get_metrics_buffer
+        buffer = get_metrics_buffer()
+        if buffer is None:
+            # Metrics are written inline (no ASGI lifespan running)
+            report["metrics_buffer"] = {"status": "not_configured"}
+        else:
+            report["metrics_buffer"] = {"status": "ok", **buffer.stats()}
+    except Exception as exc:
+        report["metrics_buffer"] = {"status": "unavailable", "message": str(exc)}
+
+    # ── chat_hub ─────────────────────────────────────────────────────────
+    try:
+        from npl_mcp.chat.stream import get_chat_hub
+        hub = get_chat_hub()
+        if hub is None:
+            report["chat_hub"] = {"status": "not_configured"}
+        else:
+            report["chat_hub"] = {"status": "ok", **hub.stats()}
+    except Exception as exc:
+        report["chat_hub"] = {"status": "unavailable", "message": str(exc)}
+
+    # ── pipe_hub ─────────────────────────────────────────────────────────
+    try:
+        from npl_mcp.pipes.stream import get_pipe_hub
+        hub = get_pipe_hub()
+        if hub is None:
+            report["pipe_hub"] = {"status": "not_configured"}
+        else:
+            report["pipe_hub"] = {"status": "ok", **hub.stats()}
+    except Exception as exc:
+        report["pipe_hub"] = {"status": "unavailable", "message": str(exc)}
+
+    # ── embedding_worker ─────────────────────────────────────────────────
+    try:
+        from npl_mcp.instructions.embedding_jobs import get_embedding_worker
+        worker = get_embedding_worker()
+        if worker is None:
+            # Jobs stay queued until a server process runs the worker
+            report["embedding_worker"] = {"status": "not_configured"}
+        else:
+            report["embedding_worker"] = {"status": "ok", **worker.stats()}
+    except Exception as exc:
+        report["embedding_worker"] = {"status": "unavailable", "message": str(exc)}
+
     # ── frontend_build ───────────────────────────────────────────────────
     try:
         dist_path = Path(__file__).resolve().parents[1] / "web" / "static"
@@ -264,14 +331,35 @@ async def _get_db_pool():
         ) from exc
 
 
+_TOOL_SESSION_KEYSET = Keyset("tool_sessions", ("updated_at", "id"))
+
+
+def _paged(result: dict) -> dict:
+    """Return a module page result, mapping a rejected cursor to 400."""
+    if result.get("status") == "error":
+        raise HTTPException(status_code=400, detail=result.get("message", "Invalid request"))
+    return result
+
+
+def _set_next_cursor(response: Optional[Response], next_cursor: Optional[str]) -> None:
+    """Expose the next page of a bare-list endpoint via ``X-Next-Cursor``."""
+    if response is not None and next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+
 @router.get("/sessions")
 async def sessions_list(
     project: Optional[str] = Query(None),
     agent: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    response: Response = None,
 ) -> list[dict]:
-    """List tool sessions with optional filtering."""
+    """List tool sessions with optional filtering, most recently updated first.
+
+    The next page's cursor is returned in the ``X-Next-Cursor`` header.
+    """
     pool = await _get_db_pool()
     try:
         conditions = ["1=1"]
@@ -295,8 +383,14 @@ async def sessions_list(
             params.append(f"%{search}%")
             idx += 1
 
+        after, values = _TOOL_SESSION_KEYSET.after(cursor, idx, alias="s")
+        if after:
+            conditions.append(after)
+            params.extend(values)
+            idx += len(values)
+
         where = " AND ".join(conditions)
-        params.append(limit)
+        params.append(limit + 1)
 
         rows = await pool.fetch(
             f"""SELECT s.id, s.agent, s.brief, s.task, s.project_id,
@@ -305,10 +399,12 @@ async def sessions_list(
                  FROM npl_tool_sessions s
                  JOIN npl_projects p ON s.project_id = p.id
                  WHERE {where}
-                 ORDER BY s.updated_at DESC
+                 ORDER BY {_TOOL_SESSION_KEYSET.order_by("s")}
                  LIMIT ${idx}""",
             *params,
         )
+        rows, next_cursor = _TOOL_SESSION_KEYSET.page(rows, limit)
+        _set_next_cursor(response, next_cursor)
 
         return [
             {
@@ -326,6 +422,8 @@ async def sessions_list(
         ]
     except HTTPException:
         raise
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -503,8 +601,14 @@ async def instructions_list(
     mode: str = Query("text"),
     tags: Optional[str] = Query(None, description="Comma-separated tag list"),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    response: Response = None,
 ) -> list[dict]:
-    """List/search instruction documents (no session auth for read)."""
+    """List/search instruction documents (no session auth for read).
+
+    Listing and text search page via the ``X-Next-Cursor`` header; intent
+    results are ranked by similarity and come back as a single page.
+    """
     pool = await _get_db_pool()
     try:
         tag_list: Optional[list[str]] = None
@@ -519,9 +623,10 @@ async def instructions_list(
         if mode == "intent" and query:
             result = await _intent_search(pool, query, tag_list, limit)
         elif query:
-            result = await _text_search(pool, query, tag_list, limit)
+            result = await _text_search(pool, query, tag_list, limit, cursor)
         else:
-            result = await _list_all(pool, tag_list, limit)
+            result = await _list_all(pool, tag_list, limit, cursor)
+        _set_next_cursor(response, result.get("next_cursor"))
 
         raw = result.get("instructions", [])
         # Normalize to frontend Instruction type: session_id (not session), created_at present
@@ -540,6 +645,8 @@ async def instructions_list(
         return normalized
     except HTTPException:
         raise
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
@@ -577,6 +684,8 @@ async def instructions_get(uuid: str) -> dict:
                ORDER BY version ASC""",
             uid,
         )
+        from npl_mcp.instructions.embedding_jobs import embedding_status
+        embedding = await embedding_status(uid)
 
         return {
             "uuid": _uuid_str(instr["id"]),
@@ -593,6 +702,7 @@ async def instructions_get(uuid: str) -> dict:
                     "body": v["body"],
                     "change_note": v["change_note"],
                     "created_at": _dt(v["created_at"]),
+                    "embedding": embedding.get(v["version"]),
                 }
                 for v in versions
             ],
@@ -1269,14 +1379,19 @@ _CONVENTIONS_DIR = Path(__file__).resolve().parents[3] / "conventions"
 _NPL_YAML = _CONVENTIONS_DIR / "npl.yaml"
 
 
+def _convention_store(conventions_dir: Optional[Path] = None):
+    """Return the process-wide convention store (default ``_CONVENTIONS_DIR``)."""
+    from npl_mcp.npl.store import get_convention_store
+    return get_convention_store(conventions_dir or _CONVENTIONS_DIR)
+
+
 def _npl_section_order() -> list[str]:
     """Return section names in the order specified by npl.yaml, or []."""
     try:
         npl_path = _NPL_YAML
         if not npl_path.exists():
             return []
-        with open(npl_path, encoding="utf-8") as fh:
-            data = yaml.safe_load(fh)
+        data = _convention_store(npl_path.parent).load(npl_path.stem)
         if not isinstance(data, dict):
             return []
         npl_block = data.get("/npl") or data.get("npl") or data
@@ -1316,16 +1431,11 @@ async def npl_coverage() -> dict:
         # section_name -> {total, complete, missing}
         sections: dict[str, dict] = {}
 
-        pattern = str(_CONVENTIONS_DIR / "*.yaml")
-        for path_str in glob.glob(pattern):
-            fname = Path(path_str).name
-            if fname == "npl.yaml":
-                continue
-            with open(path_str, encoding="utf-8") as fh:
-                data = yaml.safe_load(fh)
+        for doc in _convention_store().documents():
+            data = doc.data
             if not isinstance(data, dict):
                 continue
-            section = data.get("name") or fname.replace(".yaml", "")
+            section = data.get("name") or doc.name
             components = data.get("components") or []
             if section not in sections:
                 sections[section] = {"total": 0, "complete": 0, "missing": []}
@@ -1386,16 +1496,11 @@ async def npl_elements() -> list[dict]:
     """
     try:
         results: list[dict] = []
-        pattern = str(_CONVENTIONS_DIR / "*.yaml")
-        for path_str in glob.glob(pattern):
-            fname = Path(path_str).name
-            if fname == "npl.yaml":
-                continue
-            with open(path_str, encoding="utf-8") as fh:
-                data = yaml.safe_load(fh)
+        for doc in _convention_store().documents():
+            data = doc.data
             if not isinstance(data, dict):
                 continue
-            section = data.get("name") or fname.replace(".yaml", "")
+            section = data.get("name") or doc.name
             components = data.get("components") or []
             for comp in components:
                 if not isinstance(comp, dict):
@@ -1792,16 +1897,18 @@ async def tasks_list_endpoint(
     status: Optional[str] = Query(None),
     assigned_to: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
 ) -> dict:
-    """List tasks with optional status/assignee filters."""
+    """List tasks with optional status/assignee filters, newest first."""
     try:
         from npl_mcp.tasks import task_list
-        result = await task_list(status=status, assigned_to=assigned_to, limit=limit)
+        result = await task_list(status=status, assigned_to=assigned_to, limit=limit, cursor=cursor)
         if result.get("status") == "error":
             raise HTTPException(status_code=400, detail=result.get("message", "Invalid request"))
         return {
             "tasks": [_task_dto(t) for t in result.get("tasks", [])],
             "count": result.get("count", 0),
+            "next_cursor": result.get("next_cursor"),
         }
     except HTTPException:
         raise
@@ -1905,15 +2012,17 @@ def _work_session_dto(session: dict) -> dict:
 async def work_sessions_list_endpoint(
     status: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
 ) -> dict:
     try:
         from npl_mcp.sessions import session_list
-        result = await session_list(status=status, limit=limit)
+        result = await session_list(status=status, limit=limit, cursor=cursor)
         if result.get("status") == "error":
             raise HTTPException(status_code=400, detail=result.get("message", "Invalid request"))
         return {
             "sessions": [_work_session_dto(s) for s in result.get("sessions", [])],
             "count": result.get("count", 0),
+            "next_cursor": result.get("next_cursor"),
         }
     except HTTPException:
         raise
@@ -2037,15 +2146,17 @@ def _artifact_full_dto(result: dict) -> dict:
 async def artifacts_list_endpoint(
     kind: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
 ) -> dict:
     try:
         from npl_mcp.artifacts import artifact_list
-        result = await artifact_list(kind=kind, limit=limit)
+        result = await artifact_list(kind=kind, limit=limit, cursor=cursor)
         if result.get("status") == "error":
             raise HTTPException(status_code=400, detail=result.get("message", "Invalid request"))
         return {
             "artifacts": [_artifact_head_dto(a) for a in result.get("artifacts", [])],
             "count": result.get("count", 0),
+            "next_cursor": result.get("next_cursor"),
         }
     except HTTPException:
         raise
@@ -2270,6 +2381,7 @@ class PipeInputBody(BaseModel):
     since: Optional[str] = None
     full: bool = False
     with_sections: Optional[list[str]] = None
+    wait: Optional[float] = None
 
 
 @router.post("/pipes/output")
@@ -2295,6 +2407,7 @@ async def pipes_input_endpoint(req: PipeInputBody) -> dict:
             since=req.since,
             full=req.full,
             with_sections=req.with_sections,
+            wait=req.wait,
         )
         if result.get("status") == "error":
             raise HTTPException(status_code=400, detail=result.get("message", "Invalid request"))
@@ -2305,6 +2418,37 @@ async def pipes_input_endpoint(req: PipeInputBody) -> dict:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
 
 
+@router.get("/pipes/input/stream")
+async def pipes_input_stream(
+    request: Request,
+    agent: str = Query(...),
+    since: Optional[str] = Query(default=None),
+    with_sections: Optional[list[str]] = Query(default=None),
+):
+    """Stream input pipe dashboards for *agent* as entries arrive (SSE).
+
+    The first event holds every entry not delivered through *since* (all
+    entries without it); later events hold only newer entries. Each SSE
+    ``id`` is the dashboard's ``latest`` cursor, so reconnecting with
+    ``Last-Event-ID`` resumes without repeats.
+    """
+    from sse_starlette.sse import EventSourceResponse
+    from npl_mcp.pipes.pipes import PipeCursor, agent_input_stream, resolve_member
+
+    raw_since = request.headers.get("last-event-id") or since
+    try:
+        cursor = PipeCursor.parse(raw_since) if raw_since else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid since timestamp: {raw_since}") from exc
+    try:
+        member = await resolve_member(agent)
+    except Exception as exc:
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
+    if member is None:
+        raise HTTPException(status_code=404, detail=f"Session not found: {agent}")
+    return EventSourceResponse(agent_input_stream(member, since=cursor, with_sections=with_sections))
+
+
 # ---------------------------------------------------------------------------
 # Agent Pipes (inter-agent messaging)
 # ---------------------------------------------------------------------------
@@ -2315,6 +2459,7 @@ class PipeInputBody(BaseModel):
     since: Optional[str] = None
     full: bool = False
     with_sections: Optional[list[str]] = None
+    wait: Optional[float] = None
 
 
 class PipeOutputBody(BaseModel):
@@ -2331,6 +2476,7 @@ async def pipes_input_endpoint(body: PipeInputBody) -> dict:
             since=body.since,
             full=body.full,
             with_sections=body.with_sections,
+            wait=body.wait,
         )
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -2560,6 +2706,7 @@ class ToMarkdownRequest(BaseModel):
     collapse_depth: Optional[int] = None
     with_image_descriptions: bool = False
     bare: bool = False
+    pages: Optional[str] = None
 
 
 @router.post("/browser/to-markdown")
@@ -2572,6 +2719,7 @@ async def browser_to_markdown(body: ToMarkdownRequest) -> dict:
         collapse_depth: Collapse headings below this depth (1-6).
         with_image_descriptions: Inject LLM image descriptions.
         bare: Extract only matched section (filtered_only mode).
+        pages: Page selection for local PDFs (e.g. "1-5,9").
 
     Returns:
         {markdown: str, source: str, char_count: int}
@@ -2586,6 +2734,7 @@ async def browser_to_markdown(body: ToMarkdownRequest) -> dict:
             collapsed_depth=body.collapse_depth,
             filtered_only=body.bare,
             with_image_descriptions=body.with_image_descriptions,
+            pages=body.pages,
         )
         content = result.get("content", "")
         if not isinstance(content, str):
@@ -2598,10 +2747,84 @@ async def browser_to_markdown(body: ToMarkdownRequest) -> dict:
         }
     except HTTPException:
         raise
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+class ToMarkdownBatchRequest(BaseModel):
+    sources: list[str]
+    heading_filter: Optional[str] = None
+    collapse_depth: Optional[int] = None
+    with_image_descriptions: bool = False
+    bare: bool = False
+    concurrency: int = 8
+    per_host: int = 2
+
+
+@router.post("/browser/to-markdown/batch")
+async def browser_to_markdown_batch(body: ToMarkdownBatchRequest) -> StreamingResponse:
+    """Convert many URLs/files to Markdown, streaming results as they finish.
+
+    Body:
+        sources: URLs or local file paths (1-500).
+        heading_filter, collapse_depth, with_image_descriptions, bare:
+            As for ``/browser/to-markdown``, applied to every source.
+        concurrency: Maximum conversions at once (default 8).
+        per_host: Maximum concurrent conversions per URL host (default 2).
+
+    Returns:
+        NDJSON stream: one ``{index, source, ok, markdown, char_count,
+        elapsed_ms}`` (or ``{index, source, ok: false, error}``) line per
+        source in completion order, then ``{done: true, total, succeeded,
+        failed, elapsed_ms}``.
+    """
+    import json as _json
+
+    from npl_mcp.browser.to_markdown import iter_to_markdown_batch, validate_batch
+
+    try:
+        validate_batch(body.sources, body.concurrency, body.per_host)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    async def _lines():
+        started = time.monotonic()
+        succeeded = failed = 0
+        async for entry in iter_to_markdown_batch(
+            body.sources,
+            filter=body.heading_filter,
+            collapsed_depth=body.collapse_depth,
+            filtered_only=body.bare,
+            with_image_descriptions=body.with_image_descriptions,
+            concurrency=body.concurrency,
+            per_host=body.per_host,
+        ):
+            line = {"index": entry["index"], "source": entry["source"], "ok": entry["ok"]}
+            if entry["ok"]:
+                succeeded += 1
+                content = entry.get("content", "")
+                if not isinstance(content, str):
+                    content = _json.dumps(content, ensure_ascii=False, indent=2)
+                line["markdown"] = content
+                line["char_count"] = entry.get("content_length", len(content))
+            else:
+                failed += 1
+                line["error"] = entry["error"]
+            line["elapsed_ms"] = entry["elapsed_ms"]
+            yield _json.dumps(line, ensure_ascii=False) + "\n"
+        yield _json.dumps({
+            "done": True,
+            "total": succeeded + failed,
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        }) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
 class SkillValidateRequest(BaseModel):
     content: str
     filename: Optional[str] = None
@@ -2710,13 +2933,15 @@ async def chat_messages_list(
     room_id: int,
     limit: int = Query(default=50, ge=1, le=200),
     before_id: Optional[int] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
 ) -> dict:
     try:
-        from npl_mcp.chat.chat import message_list
-        items = await message_list(room_id=room_id, limit=limit, before_id=before_id)
-        return {"items": items, "count": len(items)}
+        from npl_mcp.chat.chat import message_page
+        return await message_page(room_id=room_id, limit=limit, cursor=cursor, before_id=before_id)
     except HTTPException:
         raise
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
 
@@ -2784,18 +3009,42 @@ async def chat_room_member_add(room_id: int, body: ChatMemberAddBody) -> dict:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
 
 
+class ChatMarkReadBody(BaseModel):
+    message_id: Optional[int] = None
+
+
+@router.post("/chat/rooms/{room_id}/members/{persona_slug}/read")
+async def chat_room_member_mark_read(
+    room_id: int, persona_slug: str, body: Optional[ChatMarkReadBody] = None,
+) -> dict:
+    """Mark a member's messages read up to message_id (default: latest)."""
+    try:
+        from npl_mcp.chat.chat import room_mark_read
+        result = await room_mark_read(
+            room_id=room_id, persona_slug=persona_slug,
+            message_id=body.message_id if body else None,
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="Chat room member not found")
+    return result
+
+
 @router.get("/chat/rooms/{room_id}/events")
 async def chat_room_events_list(
     room_id: int,
     since: Optional[str] = Query(None),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
 ) -> dict:
-    """List chat events in a room."""
+    """List chat events in a room (newest first unless *since* is given)."""
     try:
         from npl_mcp.chat.chat import event_list
-        return await event_list(room_id=room_id, since=since, limit=limit)
+        result = await event_list(room_id=room_id, since=since, limit=limit, cursor=cursor)
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
+    return _paged(result)
 
 
 @router.post("/chat/rooms/{room_id}/events")
@@ -2870,6 +3119,40 @@ async def chat_notification_mark_read(notification_id: int) -> dict:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
 
 
+@router.get("/chat/rooms/{room_id}/stream")
+async def chat_room_stream(
+    request: Request,
+    room_id: int,
+    last_event_id: Optional[str] = Query(default=None),
+    persona: Optional[str] = Query(default=None),
+):
+    """Stream new messages, events, reactions and notifications (SSE).
+
+    Each SSE ``id`` is a resume cursor; reconnecting with it (the
+    ``Last-Event-ID`` header or ``last_event_id``) replays everything
+    not yet delivered, including rows that committed out of id order
+    within ``NPL_CHAT_STREAM_HOLD_BACK`` seconds, before going live. Notifications are included when *persona*
+    is given. Without a cursor only rows created from now on are sent.
+    """
+    from sse_starlette.sse import EventSourceResponse
+    from npl_mcp.chat.stream import StreamCursor, room_stream
+
+    raw_cursor = last_event_id or request.headers.get("last-event-id")
+    try:
+        cursor = StreamCursor.parse(raw_cursor) if raw_cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        from npl_mcp.chat.chat import room_get
+        if await room_get(room_id) is None:
+            raise HTTPException(status_code=404, detail="Chat room not found")
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
+    return EventSourceResponse(room_stream(room_id, cursor=cursor, persona=persona))
+
+
 # ---------------------------------------------------------------------------
 # Sessions enhanced endpoints
 # ---------------------------------------------------------------------------
@@ -2946,13 +3229,15 @@ class TaskArtifactBody(BaseModel):
 async def task_queues_list(
     status: Optional[str] = Query(None),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
 ) -> dict:
-    """List task queues."""
+    """List task queues, newest first."""
     try:
         from npl_mcp.tasks.tasks import task_queue_list
-        return await task_queue_list(status=status, limit=limit)
+        result = await task_queue_list(status=status, limit=limit, cursor=cursor)
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
+    return _paged(result)
 
 
 @router.post("/task-queues")
@@ -2993,13 +3278,15 @@ async def task_queue_feed_endpoint(
     queue_id: int,
     since: Optional[str] = Query(None),
     limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
 ) -> dict:
     """Get activity feed for a task queue."""
     try:
         from npl_mcp.tasks.tasks import queue_feed
-        return await queue_feed(queue_id=queue_id, since=since, limit=limit)
+        result = await queue_feed(queue_id=queue_id, since=since, limit=limit, cursor=cursor)
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
+    return _paged(result)
 
 
 @router.post("/task-queues/{queue_id}/tasks")
@@ -3070,13 +3357,15 @@ async def task_feed_endpoint(
     task_id: int,
     since: Optional[str] = Query(None),
     limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
 ) -> dict:
     """Get activity feed for a task."""
     try:
         from npl_mcp.tasks.tasks import task_feed
-        return await task_feed(task_id=task_id, since=since, limit=limit)
+        result = await task_feed(task_id=task_id, since=since, limit=limit, cursor=cursor)
     except Exception as exc:
         raise HTTPException(status_code=503, detail=f"Database unavailable: {exc}") from exc
+    return _paged(result)
 
 
 # ---------------------------------------------------------------------------
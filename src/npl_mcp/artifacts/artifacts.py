@@ -17,6 +17,7 @@ from __future__ import annotations
 from typing import Any, Optional
 
 from npl_mcp.storage import get_pool
+from npl_mcp.storage.pagination import InvalidCursor, Keyset
 
 
 VALID_KINDS = {
@@ -26,6 +27,7 @@ VALID_KINDS = {
 BINARY_KINDS = {"image", "video", "audio", "pdf", "binary"}
 _DEFAULT_KIND = "markdown"
 MAX_BINARY_BYTES = 15 * 1024 * 1024  # 15 MB
+_ARTIFACT_KEYSET = Keyset("artifacts", ("updated_at", "id"))
 
 
 def _artifact_row_to_dict(row) -> dict[str, Any]:
@@ -288,8 +290,12 @@ async def artifact_get(
 async def artifact_list(
     kind: Optional[str] = None,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> dict[str, Any]:
-    """List artifacts (head rows only — no revision bodies)."""
+    """List artifacts (head rows only — no revision bodies), most recently updated first.
+
+    Pass the returned ``next_cursor`` back as *cursor* for the next page.
+    """
     if kind is not None and kind not in VALID_KINDS:
         return {
             "status": "error",
@@ -307,8 +313,16 @@ async def artifact_list(
         clauses.append(f"kind = ${idx}")
         params.append(kind)
         idx += 1
+    try:
+        after, values = _ARTIFACT_KEYSET.after(cursor, idx)
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e)}
+    if after:
+        clauses.append(after)
+        params.extend(values)
+        idx += len(values)
     where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    params.append(lim)
+    params.append(lim + 1)
 
     pool = await get_pool()
     rows = await pool.fetch(
@@ -316,14 +330,16 @@ async def artifact_list(
                    created_at, updated_at
             FROM npl_artifacts
             {where}
-            ORDER BY updated_at DESC
+            ORDER BY {_ARTIFACT_KEYSET.order_by()}
             LIMIT ${idx}""",
         *params,
     )
+    rows, next_cursor = _ARTIFACT_KEYSET.page(rows, lim)
     return {
         "status": "ok",
         "artifacts": [_artifact_row_to_dict(r) for r in rows],
         "count": len(rows),
+        "next_cursor": next_cursor,
     }
 
 
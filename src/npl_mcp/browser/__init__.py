@@ -14,7 +14,7 @@ from .interact import (
     PageState,
     ElementInfo,
 )
-from .diff import compare_screenshots, DiffResult, DiffStatus
+from .diff import compare_screenshots, compare_screenshots_tiled, DiffResult, DiffStatus
 from .checkpoint import (
     capture_checkpoint,
     list_checkpoints,
@@ -7,7 +7,7 @@ with configurable viewport, theme, and wait conditions.
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 
 # Viewport presets matching PRD-008
 VIEWPORT_PRESETS = {
@@ -21,6 +21,9 @@ VIEWPORT_PRESETS = {
 MAX_WIDTH = 3840
 MAX_HEIGHT = 10000
 
+# Idle pooled contexts kept warm per (width, height, theme)
+DEFAULT_MAX_IDLE_CONTEXTS = 4
+
 
 @dataclass
 class CaptureResult:
@@ -68,27 +71,36 @@ def parse_viewport(viewport: str) -> Tuple[int, int, Optional[str]]:
 class BrowserManager:
     """Manages browser lifecycle for screenshot capture.
 
-    Supports session persistence for authenticated captures.
+    Supports session persistence for authenticated captures and a pool of
+    warm, anonymous contexts per (width, height, theme) for batch captures.
     """
 
-    def __init__(self):
+    def __init__(self, max_idle_contexts: int = DEFAULT_MAX_IDLE_CONTEXTS):
         self._browser = None
         self._playwright = None
         self._contexts: Dict[str, Any] = {}  # session_key -> browser context
+        # (width, height, theme) -> idle pooled contexts
+        self._pool: Dict[Tuple[int, int, str], List[Any]] = {}
+        self._launch_lock = asyncio.Lock()
+        self.max_idle_contexts = max_idle_contexts
 
     async def _ensure_browser(self):
         """Ensure browser is launched."""
-        if self._browser is None:
-            from playwright.async_api import async_playwright
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-gpu",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                ]
-            )
+        if self._browser is not None:
+            return
+        # Concurrent captures must not race to launch two browsers
+        async with self._launch_lock:
+            if self._browser is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    headless=True,
+                    args=[
+                        "--disable-gpu",
+                        "--disable-dev-shm-usage",
+                        "--no-sandbox",
+                    ]
+                )
 
     async def get_context(
         self,
@@ -99,6 +111,10 @@ class BrowserManager:
     ) -> Any:
         """Get or create a browser context.
 
+        A session context keeps the viewport and theme it was created with;
+        captures sharing it set their own on each page (see
+        ``capture_screenshot``), since concurrent shots use it at once.
+
         Args:
             width: Viewport width
             height: Viewport height
@@ -112,14 +128,17 @@ class BrowserManager:
 
         # Return existing context if session key matches
         if session_key and session_key in self._contexts:
-            ctx = self._contexts[session_key]
-            # Update viewport if changed
-            pages = ctx.pages
-            if pages:
-                await pages[0].set_viewport_size({"width": width, "height": height})
-            return ctx
-
-        # Create new context
+            return self._contexts[session_key]
+
+        context = await self._new_context(width, height, theme)
+
+        if session_key:
+            self._contexts[session_key] = context
+
+        return context
+
+    async def _new_context(self, width: int, height: int, theme: str) -> Any:
+        """Create a fresh context with animations disabled."""
         color_scheme = "dark" if theme.lower() == "dark" else "light"
         context = await self._browser.new_context(
             viewport={"width": width, "height": height},
@@ -141,11 +160,55 @@ class BrowserManager:
             `;
             document.head.appendChild(style);
         """)
+        return context
 
-        if session_key:
-            self._contexts[session_key] = context
+    async def acquire_context(self, width: int, height: int, theme: str = "light") -> Any:
+        """Take a warm context for (width, height, theme) from the pool.
 
-        return context
+        A new context is created when none is idle. Hand it back with
+        ``release_context`` once the capture is done.
+        """
+        await self._ensure_browser()
+        idle = self._pool.get((width, height, theme.lower()))
+        if idle:
+            return idle.pop()
+        return await self._new_context(width, height, theme)
+
+    async def release_context(
+        self,
+        context: Any,
+        width: int,
+        height: int,
+        theme: str = "light",
+    ):
+        """Return a context to the pool, closing it if the pool is full.
+
+        Cookies are cleared; a context still holding localStorage for any
+        origin is closed rather than pooled, so captures never see another
+        page's storage.
+        """
+        idle = self._pool.setdefault((width, height, theme.lower()), [])
+        if self._browser is None or len(idle) >= self.max_idle_contexts:
+            await context.close()
+            return
+        try:
+            # Captures from different pages must not share cookies or storage
+            await context.clear_cookies()
+            state = await context.storage_state()
+        except Exception:
+            await context.close()
+            return
+        if state.get("origins"):
+            await context.close()
+            return
+        idle.append(context)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Return idle pooled context counts keyed by ``WxH/theme``."""
+        return {
+            f"{w}x{h}/{theme}": len(idle)
+            for (w, h, theme), idle in self._pool.items()
+        }
 
     async def close_context(self, session_key: str):
         """Close a specific browser context."""
@@ -159,6 +222,11 @@ class BrowserManager:
             await ctx.close()
         self._contexts.clear()
 
+        for idle in self._pool.values():
+            for ctx in idle:
+                await ctx.close()
+        self._pool.clear()
+
         if self._browser:
             await self._browser.close()
             self._browser = None
@@ -189,6 +257,7 @@ async def capture_screenshot(
     wait_timeout: int = 5000,
     network_idle: bool = True,
     session_key: Optional[str] = None,
+    use_pool: bool = False,
 ) -> CaptureResult:
     """Capture screenshot of a web page.
 
@@ -201,6 +270,8 @@ async def capture_screenshot(
         wait_timeout: Milliseconds to wait for selector
         network_idle: Wait for network to be idle before capture
         session_key: Optional key for browser session persistence
+        use_pool: Borrow a warm pooled context instead of creating one
+            (ignored when session_key is set)
 
     Returns:
         CaptureResult with image bytes and metadata
@@ -214,12 +285,22 @@ async def capture_screenshot(
 
     # Get browser manager and context
     manager = await get_browser_manager()
-    context = await manager.get_context(width, height, theme, session_key)
+    pooled = use_pool and not session_key
+    if pooled:
+        context = await manager.acquire_context(width, height, theme)
+    else:
+        context = await manager.get_context(width, height, theme, session_key)
 
     # Create new page
     page = await context.new_page()
 
     try:
+        if session_key:
+            # Concurrent shots share the session context; each page carries
+            # its own viewport and color scheme
+            await page.set_viewport_size({"width": width, "height": height})
+            await page.emulate_media(color_scheme="dark" if theme.lower() == "dark" else "light")
+
         # Navigate to URL
         wait_until = "networkidle" if network_idle else "load"
         await page.goto(url, wait_until=wait_until, timeout=30000)
@@ -263,11 +344,20 @@ async def capture_screenshot(
         )
 
     finally:
+        if pooled:
+            # Leave no storage behind for the next borrower of this context
+            try:
+                await page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+            except Exception:
+                pass
+
         # Close page but keep context for session persistence
         await page.close()
 
-        # If no session key, close the context too
-        if not session_key:
+        # Pooled contexts go back to the pool; unkeyed ones are closed
+        if pooled:
+            await manager.release_context(context, width, height, theme)
+        elif not session_key:
             await context.close()
 
 
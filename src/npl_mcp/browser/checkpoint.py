@@ -5,17 +5,21 @@ with manifest tracking and git metadata integration.
 """
 
 import asyncio
+import hashlib
+import multiprocessing
 import os
 import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 
 import yaml
 
 from .capture import capture_screenshot, CaptureResult, VIEWPORT_PRESETS
-from .diff import compare_screenshots, DiffResult, DiffStatus
+from .diff import compare_screenshots_tiled, DiffResult, DiffStatus
 
 
 # Default screenshot directory
@@ -40,6 +44,8 @@ class ScreenshotInfo:
     width: int = 0
     height: int = 0
     captured_at: str = ""
+    capture_ms: Optional[float] = None  # Navigate + render + screenshot
+    write_ms: Optional[float] = None    # PNG write to disk
 
 
 @dataclass
@@ -58,6 +64,8 @@ class CheckpointManifest:
     git_commit: Optional[str] = None
     git_branch: Optional[str] = None
     total_screenshots: int = 0
+    concurrency: int = 1                # Parallel captures used
+    elapsed_ms: Optional[float] = None  # Wall time of the whole capture
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for YAML serialization."""
@@ -103,6 +111,8 @@ class CheckpointManifest:
             git_commit=data.get("git_commit"),
             git_branch=data.get("git_branch"),
             total_screenshots=data.get("total_screenshots", 0),
+            concurrency=data.get("concurrency", 1),
+            elapsed_ms=data.get("elapsed_ms"),
         )
 
 
@@ -252,9 +262,14 @@ async def capture_checkpoint(
     themes: Optional[List[str]] = None,
     base_dir: Optional[Path] = None,
     session_key: Optional[str] = None,
+    concurrency: int = 1,
 ) -> CheckpointManifest:
     """Capture a checkpoint with all page/viewport/theme combinations.
 
+    Up to *concurrency* shots are captured at once. Anonymous captures
+    borrow warm contexts from the browser manager's per-(viewport, theme)
+    pool; with a *session_key* every shot shares the session's context.
+
     Args:
         name: Human-readable checkpoint name
         urls: List of page configs [{name, url, description?, requires_auth?, wait_for?}]
@@ -264,9 +279,11 @@ async def capture_checkpoint(
         themes: List of themes (default: ["light", "dark"])
         base_dir: Base directory for screenshots (default: .npl/screenshots)
         session_key: Optional browser session key for auth persistence
+        concurrency: Maximum number of screenshots captured in parallel
 
     Returns:
-        CheckpointManifest with all captured screenshots
+        CheckpointManifest with all captured screenshots (each with
+        capture/write timings in milliseconds)
     """
     viewports = viewports or ["desktop", "mobile"]
     themes = themes or ["light", "dark"]
@@ -298,8 +315,9 @@ async def capture_checkpoint(
         pages.append(page)
 
     # Capture screenshots
+    screenshots_dir = get_screenshots_dir(base_dir)
     screenshots: Dict[str, Dict[str, Dict[str, ScreenshotInfo]]] = {}
-    total = 0
+    jobs: List[Tuple[PageConfig, str, str, str]] = []
 
     for page in pages:
         screenshots[page.name] = {}
@@ -312,48 +330,59 @@ async def capture_checkpoint(
 
         for viewport in viewports:
             screenshots[page.name][viewport] = {}
-
             for theme in themes:
-                # Create directory structure: checkpoint/viewport/theme/
-                output_dir = checkpoint_dir / viewport / theme
-                output_dir.mkdir(parents=True, exist_ok=True)
-
-                # Capture screenshot
-                try:
-                    result: CaptureResult = await capture_screenshot(
-                        url=full_url,
-                        viewport=viewport,
-                        theme=theme,
-                        full_page=True,
-                        wait_for=page.wait_for,
-                        session_key=session_key,
-                    )
-
-                    # Save to file
-                    filename = f"{page.name}.png"
-                    file_path = output_dir / filename
-                    with open(file_path, 'wb') as f:
-                        f.write(result.image_bytes)
-
-                    # Calculate relative path from screenshots dir
-                    screenshots_dir = get_screenshots_dir(base_dir)
-                    rel_path = str(file_path.relative_to(screenshots_dir))
-
-                    screenshots[page.name][viewport][theme] = ScreenshotInfo(
-                        path=rel_path,
-                        width=result.width,
-                        height=result.height,
-                        captured_at=result.captured_at,
-                    )
-                    total += 1
-
-                except Exception as e:
-                    # Record failure
-                    screenshots[page.name][viewport][theme] = ScreenshotInfo(
-                        path="",
-                        captured_at=datetime.now(timezone.utc).isoformat(),
-                    )
-                    print(f"Failed to capture {page.name}/{viewport}/{theme}: {e}")
+                jobs.append((page, full_url, viewport, theme))
+
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _capture_one(page: PageConfig, full_url: str, viewport: str, theme: str) -> bool:
+        async with semaphore:
+            # Create directory structure: checkpoint/viewport/theme/
+            output_dir = checkpoint_dir / viewport / theme
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            try:
+                started = time.perf_counter()
+                result: CaptureResult = await capture_screenshot(
+                    url=full_url,
+                    viewport=viewport,
+                    theme=theme,
+                    full_page=True,
+                    wait_for=page.wait_for,
+                    session_key=session_key,
+                    use_pool=True,
+                )
+                captured = time.perf_counter()
+
+                # Save to file off the event loop
+                file_path = output_dir / f"{page.name}.png"
+                await asyncio.to_thread(file_path.write_bytes, result.image_bytes)
+                written = time.perf_counter()
+
+                screenshots[page.name][viewport][theme] = ScreenshotInfo(
+                    path=str(file_path.relative_to(screenshots_dir)),
+                    width=result.width,
+                    height=result.height,
+                    captured_at=result.captured_at,
+                    capture_ms=round((captured - started) * 1000, 1),
+                    write_ms=round((written - captured) * 1000, 1),
+                )
+                return True
+
+            except Exception as e:
+                # Record failure
+                screenshots[page.name][viewport][theme] = ScreenshotInfo(
+                    path="",
+                    captured_at=datetime.now(timezone.utc).isoformat(),
+                )
+                print(f"Failed to capture {page.name}/{viewport}/{theme}: {e}")
+                return False
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(_capture_one(*job) for job in jobs))
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    total = sum(outcomes)
 
     # Create manifest
     manifest = CheckpointManifest(
@@ -369,6 +398,8 @@ async def capture_checkpoint(
         git_commit=git_commit,
         git_branch=git_branch,
         total_screenshots=total,
+        concurrency=concurrency,
+        elapsed_ms=elapsed_ms,
     )
 
     # Load existing manifest, add this checkpoint, and save
@@ -427,19 +458,106 @@ def get_diffs_dir(
     return screenshots_dir / "diffs" / f"{baseline_slug}_vs_{comparison_slug}"
 
 
+def _file_digest(data: bytes) -> str:
+    """Return the SHA-256 hex digest of a screenshot file's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _compare_pair(
+    baseline_path: Path,
+    comparison_path: Path,
+    diff_file_path: Path,
+    threshold: float,
+    executor: Optional[Executor],
+) -> Tuple[str, float, Optional[Path]]:
+    """Compare one screenshot pair; write the diff image only if pixels differ.
+
+    Returns:
+        Tuple of (status, diff_percentage, diff image path or None)
+    """
+    baseline_bytes = baseline_path.read_bytes()
+    comparison_bytes = comparison_path.read_bytes()
+
+    # Byte-identical files need no decoding at all
+    if _file_digest(baseline_bytes) == _file_digest(comparison_bytes):
+        return DiffStatus.IDENTICAL.value, 0.0, None
+
+    diff_result: DiffResult = compare_screenshots_tiled(
+        baseline_bytes=baseline_bytes,
+        comparison_bytes=comparison_bytes,
+        threshold=threshold,
+        executor=executor,
+    )
+
+    if not diff_result.diff_image:
+        return diff_result.status.value, diff_result.diff_percentage, None
+
+    diff_file_path.parent.mkdir(parents=True, exist_ok=True)
+    diff_file_path.write_bytes(diff_result.diff_image)
+    return diff_result.status.value, diff_result.diff_percentage, diff_file_path
+
+
+async def _compare_pending(
+    pending: List[Tuple[int, Path, Path, Path]],
+    threshold: float,
+    max_workers: Optional[int],
+) -> List[Any]:
+    """Compare queued screenshot pairs concurrently.
+
+    Pairs run in worker threads (bounded by *max_workers*); their changed
+    tiles are fanned out to a shared process pool. Falls back to in-thread
+    tile comparison if a process pool cannot be started.
+
+    Returns:
+        One ``(status, diff_percentage, diff_path)`` tuple or exception per pair
+    """
+    workers = max_workers or os.cpu_count() or 1
+    try:
+        executor: Optional[Executor] = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    except (OSError, NotImplementedError, ValueError):
+        executor = None
+
+    semaphore = asyncio.Semaphore(workers)
+
+    async def _run(baseline_path: Path, comparison_path: Path, diff_path: Path):
+        async with semaphore:
+            return await asyncio.to_thread(
+                _compare_pair, baseline_path, comparison_path, diff_path, threshold, executor
+            )
+
+    try:
+        return await asyncio.gather(
+            *(_run(b, c, d) for _, b, c, d in pending),
+            return_exceptions=True,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
 async def compare_checkpoints(
     baseline_slug: str,
     comparison_slug: str,
     threshold: float = 0.1,
     base_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
 ) -> ComparisonResult:
     """Compare two checkpoints and generate diff images.
 
+    Byte-identical screenshots are reported as identical without decoding.
+    Other pairs are compared concurrently with tiled diffs (see
+    :func:`compare_screenshots_tiled`), and a diff image is only written
+    when pixels actually differ.
+
     Args:
         baseline_slug: Slug of baseline checkpoint
         comparison_slug: Slug of comparison checkpoint
         threshold: Diff sensitivity 0.0-1.0 (lower = more sensitive)
         base_dir: Base directory for screenshots
+        max_workers: Parallel comparisons / tile workers (default: CPU count)
 
     Returns:
         ComparisonResult with diff details and summary
@@ -469,8 +587,10 @@ async def compare_checkpoints(
     for page_data in comparison.pages:
         all_pages.add(page_data["name"])
 
-    # Compare each combination
+    # Compare each combination; image pairs are queued in ``pending`` as
+    # (detail index, baseline path, comparison path, diff image path)
     details: List[PageComparisonDetail] = []
+    pending: List[Tuple[int, Path, Path, Path]] = []
     summary = {
         "identical": 0,
         "minor": 0,
@@ -543,61 +663,38 @@ async def compare_checkpoints(
                     summary["major"] += 1
                     continue
 
-                # Load images and compare
-                baseline_path = screenshots_dir / baseline_info.path
-                comparison_path = screenshots_dir / comparison_info.path
-
-                try:
-                    with open(baseline_path, 'rb') as f:
-                        baseline_bytes = f.read()
-                    with open(comparison_path, 'rb') as f:
-                        comparison_bytes = f.read()
-
-                    # Generate diff
-                    diff_result: DiffResult = compare_screenshots(
-                        baseline_bytes=baseline_bytes,
-                        comparison_bytes=comparison_bytes,
-                        threshold=threshold,
-                    )
-
-                    # Save diff image
-                    diff_output_dir = diffs_dir / viewport / theme
-                    diff_output_dir.mkdir(parents=True, exist_ok=True)
-                    diff_file_path = diff_output_dir / f"{page}.png"
-
-                    with open(diff_file_path, 'wb') as f:
-                        f.write(diff_result.diff_image)
-
-                    diff_rel_path = str(diff_file_path.relative_to(screenshots_dir))
-
-                    # Map DiffStatus to string
-                    status = diff_result.status.value
-
-                    details.append(PageComparisonDetail(
-                        page=page,
-                        viewport=viewport,
-                        theme=theme,
-                        status=status,
-                        diff_percentage=diff_result.diff_percentage,
-                        baseline_path=baseline_info.path,
-                        comparison_path=comparison_info.path,
-                        diff_path=diff_rel_path,
-                    ))
-                    summary[status] += 1
-
-                except Exception as e:
-                    # Error during comparison
-                    details.append(PageComparisonDetail(
-                        page=page,
-                        viewport=viewport,
-                        theme=theme,
-                        status="major",
-                        diff_percentage=100.0,
-                        baseline_path=baseline_info.path,
-                        comparison_path=comparison_info.path,
-                    ))
-                    summary["major"] += 1
-                    print(f"Error comparing {page}/{viewport}/{theme}: {e}")
+                # Both captured - compare images below, concurrently
+                pending.append((
+                    len(details),
+                    screenshots_dir / baseline_info.path,
+                    screenshots_dir / comparison_info.path,
+                    diffs_dir / viewport / theme / f"{page}.png",
+                ))
+                details.append(PageComparisonDetail(
+                    page=page,
+                    viewport=viewport,
+                    theme=theme,
+                    status="major",
+                    diff_percentage=100.0,
+                    baseline_path=baseline_info.path,
+                    comparison_path=comparison_info.path,
+                ))
+
+    if pending:
+        outcomes = await _compare_pending(pending, threshold, max_workers)
+        for (index, _, _, _), outcome in zip(pending, outcomes):
+            detail = details[index]
+            if isinstance(outcome, BaseException):
+                # Error during comparison - keep the "major" placeholder
+                summary["major"] += 1
+                print(f"Error comparing {detail.page}/{detail.viewport}/{detail.theme}: {outcome}")
+                continue
+            status, diff_percentage, diff_file_path = outcome
+            detail.status = status
+            detail.diff_percentage = diff_percentage
+            if diff_file_path is not None:
+                detail.diff_path = str(diff_file_path.relative_to(screenshots_dir))
+            summary[status] += 1
 
     # Create comparison result
     comparison_id = f"{baseline_slug}_vs_{comparison_slug}"
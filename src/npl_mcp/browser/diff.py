@@ -1,9 +1,12 @@
 """Visual diff generation using pixelmatch algorithm.
 
-Pure Python implementation of pixel-by-pixel image comparison
-for visual regression testing.
+Pixel-by-pixel image comparison for visual regression testing. A
+NumPy-vectorized engine (``pixelmatch_numpy``) is used when NumPy is
+installed; the pure Python ``pixelmatch`` is the reference implementation
+and the fallback.
 """
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from enum import Enum
 from typing import Tuple, Optional
@@ -11,6 +14,12 @@ from io import BytesIO
 
 from PIL import Image
 
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
 
 class DiffStatus(str, Enum):
     """Classification of visual diff severity."""
@@ -156,42 +165,38 @@ def is_antialiased(
     return (max_delta - min_delta) > 50
 
 
-def pixelmatch(
+def _pixelmatch_rows(
     img1_rgba: bytes,
     img2_rgba: bytes,
     width: int,
     height: int,
-    threshold: float = 0.1,
-    include_aa: bool = False,
-    diff_color: Tuple[int, int, int] = (255, 0, 0),
-    aa_color: Tuple[int, int, int] = (255, 165, 0),
+    y_start: int,
+    y_end: int,
+    threshold: float,
+    include_aa: bool,
+    diff_color: Tuple[int, int, int],
+    aa_color: Tuple[int, int, int],
 ) -> Tuple[int, bytearray]:
-    """Compare two images pixel by pixel.
+    """Pure Python pixelmatch over rows ``[y_start, y_end)`` of the images.
 
-    Args:
-        img1_rgba: First image RGBA pixel data
-        img2_rgba: Second image RGBA pixel data
-        width: Image width
-        height: Image height
-        threshold: Color sensitivity (0.0 = exact, 1.0 = very tolerant)
-        include_aa: Count anti-aliased pixels as differences
-        diff_color: RGB color for different pixels (default: red)
-        aa_color: RGB color for anti-aliased pixels (default: orange)
+    Neighbours outside that range (but inside the image) still take part in
+    anti-alias detection, so a strip with a one-row halo gives exact results.
 
     Returns:
-        Tuple of (diff_pixel_count, diff_image_rgba)
+        Tuple of (diff_pixel_count, diff_image_rgba for those rows)
     """
     # Scale threshold to color distance range
     max_delta = 35215  # Max YIQ distance for extreme colors
     threshold_sq = threshold * threshold * max_delta
 
     # Output image
-    output = bytearray(width * height * 4)
+    output = bytearray(width * (y_end - y_start) * 4)
     diff_count = 0
 
-    for y in range(height):
+    for y in range(y_start, y_end):
         for x in range(width):
             idx = (y * width + x) * 4
+            oidx = ((y - y_start) * width + x) * 4
 
             r1, g1, b1, a1 = img1_rgba[idx:idx + 4]
             r2, g2, b2, a2 = img2_rgba[idx:idx + 4]
@@ -206,27 +211,250 @@ def pixelmatch(
                     is_antialiased(img2_rgba, x, y, width, height, img1_rgba)
                 ):
                     # Mark as AA diff (orange)
-                    output[idx] = aa_color[0]
-                    output[idx + 1] = aa_color[1]
-                    output[idx + 2] = aa_color[2]
-                    output[idx + 3] = 255
+                    output[oidx] = aa_color[0]
+                    output[oidx + 1] = aa_color[1]
+                    output[oidx + 2] = aa_color[2]
+                    output[oidx + 3] = 255
                 else:
                     # Mark as real diff (red)
-                    output[idx] = diff_color[0]
-                    output[idx + 1] = diff_color[1]
-                    output[idx + 2] = diff_color[2]
-                    output[idx + 3] = 255
+                    output[oidx] = diff_color[0]
+                    output[oidx + 1] = diff_color[1]
+                    output[oidx + 2] = diff_color[2]
+                    output[oidx + 3] = 255
                     diff_count += 1
             else:
                 # No difference - show dimmed original
-                output[idx] = r1 // 3
-                output[idx + 1] = g1 // 3
-                output[idx + 2] = b1 // 3
-                output[idx + 3] = 255
+                output[oidx] = r1 // 3
+                output[oidx + 1] = g1 // 3
+                output[oidx + 2] = b1 // 3
+                output[oidx + 3] = 255
 
     return diff_count, output
 
 
+def pixelmatch(
+    img1_rgba: bytes,
+    img2_rgba: bytes,
+    width: int,
+    height: int,
+    threshold: float = 0.1,
+    include_aa: bool = False,
+    diff_color: Tuple[int, int, int] = (255, 0, 0),
+    aa_color: Tuple[int, int, int] = (255, 165, 0),
+) -> Tuple[int, bytearray]:
+    """Compare two images pixel by pixel.
+
+    Args:
+        img1_rgba: First image RGBA pixel data
+        img2_rgba: Second image RGBA pixel data
+        width: Image width
+        height: Image height
+        threshold: Color sensitivity (0.0 = exact, 1.0 = very tolerant)
+        include_aa: Count anti-aliased pixels as differences
+        diff_color: RGB color for different pixels (default: red)
+        aa_color: RGB color for anti-aliased pixels (default: orange)
+
+    Returns:
+        Tuple of (diff_pixel_count, diff_image_rgba)
+    """
+    return _pixelmatch_rows(
+        img1_rgba, img2_rgba, width, height, 0, height,
+        threshold, include_aa, diff_color, aa_color,
+    )
+
+
+# Rows per band for the vectorized engine; bounds temporary float64 arrays
+_NP_BAND_ROWS = 256
+
+# 3x3 neighbourhood offsets in the same order as is_antialiased()
+_NEIGHBOUR_OFFSETS = tuple(
+    (dy, dx) for dy in range(-1, 2) for dx in range(-1, 2) if (dx, dy) != (0, 0)
+)
+
+
+def _color_distance_yiq_np(rgb1: "np.ndarray", rgb2: "np.ndarray") -> "np.ndarray":
+    """Vectorized ``color_distance_yiq`` over ``(..., 3)`` uint8 arrays.
+
+    Uses the same float64 operations in the same order as the scalar
+    version so results are bit-identical.
+    """
+    r1 = rgb1[..., 0].astype(np.float64)
+    g1 = rgb1[..., 1].astype(np.float64)
+    b1 = rgb1[..., 2].astype(np.float64)
+    r2 = rgb2[..., 0].astype(np.float64)
+    g2 = rgb2[..., 1].astype(np.float64)
+    b2 = rgb2[..., 2].astype(np.float64)
+
+    y1 = r1 * 0.29889531 + g1 * 0.58662247 + b1 * 0.11448223
+    i1 = r1 * 0.59597799 - g1 * 0.27417610 - b1 * 0.32180189
+    q1 = r1 * 0.21147017 - g1 * 0.52261711 + b1 * 0.31114694
+
+    y2 = r2 * 0.29889531 + g2 * 0.58662247 + b2 * 0.11448223
+    i2 = r2 * 0.59597799 - g2 * 0.27417610 - b2 * 0.32180189
+    q2 = r2 * 0.21147017 - g2 * 0.52261711 + b2 * 0.31114694
+
+    dy = y1 - y2
+    di = i1 - i2
+    dq = q1 - q2
+
+    return 0.5053 * dy * dy + 0.299 * di * di + 0.1957 * dq * dq
+
+
+def _is_antialiased_np(
+    pixels: "np.ndarray",
+    other_pixels: "np.ndarray",
+    ys: "np.ndarray",
+    xs: "np.ndarray",
+) -> "np.ndarray":
+    """Vectorized ``is_antialiased`` for the pixels at ``(ys, xs)``.
+
+    Args:
+        pixels: ``H x W x 4`` uint8 image the centre pixels come from
+        other_pixels: ``H x W x 4`` uint8 comparison image
+        ys, xs: Coordinates of the pixels to test
+
+    Returns:
+        Boolean array, True where the pixel appears anti-aliased
+    """
+    height, width = pixels.shape[:2]
+    center = pixels[ys, xs, :3]
+    zeros = np.zeros(ys.shape, dtype=np.int64)
+    max_delta = np.zeros(ys.shape, dtype=np.float64)
+
+    for dy, dx in _NEIGHBOUR_OFFSETS:
+        ny = ys + dy
+        nx = xs + dx
+        valid = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        ny = np.clip(ny, 0, height - 1)
+        nx = np.clip(nx, 0, width - 1)
+
+        for img in (pixels, other_pixels):
+            delta = _color_distance_yiq_np(center, img[ny, nx, :3])
+            zeros += valid & (delta == 0)
+            max_delta = np.where(valid, np.maximum(max_delta, delta), max_delta)
+
+    # Deltas are never negative, so the scalar min_delta is always 0 and the
+    # "min == max == 0" case is covered by the range test.
+    return (zeros <= 2) & (max_delta > 50)
+
+
+def _pixelmatch_numpy_rows(
+    img1_rgba: bytes,
+    img2_rgba: bytes,
+    width: int,
+    height: int,
+    y_start: int,
+    y_end: int,
+    threshold: float,
+    include_aa: bool,
+    diff_color: Tuple[int, int, int],
+    aa_color: Tuple[int, int, int],
+) -> Tuple[int, bytearray]:
+    """NumPy counterpart of :func:`_pixelmatch_rows`."""
+    max_delta = 35215  # Max YIQ distance for extreme colors
+    threshold_sq = threshold * threshold * max_delta
+
+    img1 = np.frombuffer(img1_rgba, dtype=np.uint8).reshape(height, width, 4)
+    img2 = np.frombuffer(img2_rgba, dtype=np.uint8).reshape(height, width, 4)
+
+    # No difference - show dimmed original
+    output = np.empty((y_end - y_start, width, 4), dtype=np.uint8)
+    output[..., :3] = img1[y_start:y_end, :, :3] // 3
+    output[..., 3] = 255
+
+    diff_rgba = np.array([*diff_color, 255], dtype=np.uint8)
+    aa_rgba = np.array([*aa_color, 255], dtype=np.uint8)
+    diff_count = 0
+
+    for y0 in range(y_start, y_end, _NP_BAND_ROWS):
+        y1 = min(y0 + _NP_BAND_ROWS, y_end)
+        delta = _color_distance_yiq_np(img1[y0:y1, :, :3], img2[y0:y1, :, :3])
+        ys, xs = np.nonzero(delta > threshold_sq)
+        if ys.size == 0:
+            continue
+        ys = ys + y0
+
+        if include_aa:
+            is_aa = np.zeros(ys.shape, dtype=bool)
+        else:
+            is_aa = (
+                _is_antialiased_np(img1, img2, ys, xs)
+                | _is_antialiased_np(img2, img1, ys, xs)
+            )
+
+        oys = ys - y_start
+        output[oys[is_aa], xs[is_aa]] = aa_rgba
+        real = ~is_aa
+        output[oys[real], xs[real]] = diff_rgba
+        diff_count += int(np.count_nonzero(real))
+
+    return diff_count, bytearray(output.data)
+
+
+def pixelmatch_numpy(
+    img1_rgba: bytes,
+    img2_rgba: bytes,
+    width: int,
+    height: int,
+    threshold: float = 0.1,
+    include_aa: bool = False,
+    diff_color: Tuple[int, int, int] = (255, 0, 0),
+    aa_color: Tuple[int, int, int] = (255, 165, 0),
+) -> Tuple[int, bytearray]:
+    """NumPy implementation of :func:`pixelmatch` over whole ``H x W x 4`` arrays.
+
+    Produces the same diff count and diff image as the reference
+    implementation. Rows are processed in bands to bound memory, and
+    anti-alias detection only runs on pixels above the threshold.
+
+    Args:
+        Same as :func:`pixelmatch`.
+
+    Returns:
+        Tuple of (diff_pixel_count, diff_image_rgba)
+    """
+    return _pixelmatch_numpy_rows(
+        img1_rgba, img2_rgba, width, height, 0, height,
+        threshold, include_aa, diff_color, aa_color,
+    )
+
+
+def _load_rgba(baseline_bytes: bytes, comparison_bytes: bytes) -> Tuple[Image.Image, Image.Image]:
+    """Decode both PNGs to RGBA, raising ValueError on failure."""
+    try:
+        baseline_img = Image.open(BytesIO(baseline_bytes)).convert("RGBA")
+        comparison_img = Image.open(BytesIO(comparison_bytes)).convert("RGBA")
+    except Exception as e:
+        raise ValueError(f"Failed to load images: {e}")
+    return baseline_img, comparison_img
+
+
+def _dimension_mismatch_result(
+    baseline_dims: Tuple[int, int],
+    comparison_dims: Tuple[int, int],
+) -> DiffResult:
+    """Build the MAJOR result (solid purple diff image) for mismatched sizes."""
+    max_width = max(baseline_dims[0], comparison_dims[0])
+    max_height = max(baseline_dims[1], comparison_dims[1])
+
+    diff_img = Image.new("RGBA", (max_width, max_height), (128, 0, 128, 255))
+
+    # Save diff image
+    diff_buffer = BytesIO()
+    diff_img.save(diff_buffer, format="PNG")
+
+    return DiffResult(
+        diff_image=diff_buffer.getvalue(),
+        diff_percentage=100.0,
+        diff_pixels=max_width * max_height,
+        total_pixels=max_width * max_height,
+        dimensions_match=False,
+        status=DiffStatus.MAJOR,
+        baseline_dimensions=baseline_dims,
+        comparison_dimensions=comparison_dims,
+    )
+
+
 def compare_screenshots(
     baseline_bytes: bytes,
     comparison_bytes: bytes,
@@ -235,6 +463,9 @@ def compare_screenshots(
 ) -> DiffResult:
     """Compare two screenshot images.
 
+    Uses the vectorized :func:`pixelmatch_numpy` engine when NumPy is
+    installed, otherwise the pure Python :func:`pixelmatch`.
+
     Args:
         baseline_bytes: PNG bytes of baseline screenshot
         comparison_bytes: PNG bytes of comparison screenshot
@@ -247,38 +478,13 @@ def compare_screenshots(
     Raises:
         ValueError: If images cannot be loaded
     """
-    # Load images
-    try:
-        baseline_img = Image.open(BytesIO(baseline_bytes)).convert("RGBA")
-        comparison_img = Image.open(BytesIO(comparison_bytes)).convert("RGBA")
-    except Exception as e:
-        raise ValueError(f"Failed to load images: {e}")
-
+    baseline_img, comparison_img = _load_rgba(baseline_bytes, comparison_bytes)
     baseline_dims = (baseline_img.width, baseline_img.height)
     comparison_dims = (comparison_img.width, comparison_img.height)
 
     # Check dimension match
     if baseline_dims != comparison_dims:
-        # Create a diff image showing the mismatch
-        max_width = max(baseline_dims[0], comparison_dims[0])
-        max_height = max(baseline_dims[1], comparison_dims[1])
-
-        diff_img = Image.new("RGBA", (max_width, max_height), (128, 0, 128, 255))
-
-        # Save diff image
-        diff_buffer = BytesIO()
-        diff_img.save(diff_buffer, format="PNG")
-
-        return DiffResult(
-            diff_image=diff_buffer.getvalue(),
-            diff_percentage=100.0,
-            diff_pixels=max_width * max_height,
-            total_pixels=max_width * max_height,
-            dimensions_match=False,
-            status=DiffStatus.MAJOR,
-            baseline_dimensions=baseline_dims,
-            comparison_dimensions=comparison_dims,
-        )
+        return _dimension_mismatch_result(baseline_dims, comparison_dims)
 
     # Get pixel data
     width, height = baseline_dims
@@ -286,7 +492,8 @@ def compare_screenshots(
     comparison_rgba = comparison_img.tobytes()
 
     # Run pixelmatch
-    diff_count, diff_rgba = pixelmatch(
+    engine = pixelmatch_numpy if _HAS_NUMPY else pixelmatch
+    diff_count, diff_rgba = engine(
         baseline_rgba,
         comparison_rgba,
         width,
@@ -315,3 +522,162 @@ def compare_screenshots(
         baseline_dimensions=baseline_dims,
         comparison_dimensions=comparison_dims,
     )
+
+
+# ---------------------------------------------------------------------------
+# Tiled comparison
+# ---------------------------------------------------------------------------
+
+# Rows per tile; tiles are full-width horizontal strips
+DEFAULT_TILE_ROWS = 512
+
+# Lookup table for the "dimmed original" shown where pixels match
+_DIM_TABLE = bytes(v // 3 for v in range(256))
+
+
+def _dim_rgba(rgba: bytes) -> bytearray:
+    """Render unchanged RGBA rows as the dimmed original (RGB // 3, opaque)."""
+    out = bytearray(rgba.translate(_DIM_TABLE))
+    out[3::4] = b"\xff" * (len(out) // 4)
+    return out
+
+
+def _diff_tile(
+    strip1: bytes,
+    strip2: bytes,
+    width: int,
+    strip_height: int,
+    top: int,
+    rows: int,
+    threshold: float,
+    include_aa: bool,
+) -> Tuple[int, bytearray]:
+    """Compare one tile (process-pool worker).
+
+    *strip1*/*strip2* hold the tile rows plus up to one halo row above and
+    below, so anti-alias detection at tile edges matches the full image.
+    Only rows ``[top, top + rows)`` of the strip are compared and returned.
+    """
+    engine = _pixelmatch_numpy_rows if _HAS_NUMPY else _pixelmatch_rows
+    return engine(
+        strip1, strip2, width, strip_height, top, top + rows,
+        threshold, include_aa, (255, 0, 0), (255, 165, 0),
+    )
+
+
+def compare_screenshots_tiled(
+    baseline_bytes: bytes,
+    comparison_bytes: bytes,
+    threshold: float = 0.1,
+    include_aa: bool = False,
+    executor: Optional[Executor] = None,
+    tile_rows: int = DEFAULT_TILE_ROWS,
+) -> DiffResult:
+    """Compare two screenshots tile by tile, skipping unchanged tiles.
+
+    Gives the same counts, percentages and status as
+    :func:`compare_screenshots`, but:
+
+    - byte-identical inputs return IDENTICAL without decoding;
+    - tiles whose raw pixels are byte-identical are not compared;
+    - changed tiles run on *executor* (e.g. a ``ProcessPoolExecutor``)
+      when given, otherwise inline;
+    - the PNG diff image is only encoded when ``diff_pixels > 0``;
+      otherwise ``diff_image`` is ``b""``.
+
+    Args:
+        baseline_bytes: PNG bytes of baseline screenshot
+        comparison_bytes: PNG bytes of comparison screenshot
+        threshold: Color sensitivity (0.0 = exact, 1.0 = very tolerant)
+        include_aa: Count anti-aliased pixels as differences
+        executor: Optional executor used to compare tiles in parallel
+        tile_rows: Rows per tile
+
+    Returns:
+        DiffResult with statistics and, if anything differs, the diff image
+
+    Raises:
+        ValueError: If images cannot be loaded
+    """
+    if baseline_bytes == comparison_bytes:
+        try:
+            with Image.open(BytesIO(baseline_bytes)) as img:
+                dims = img.size
+        except Exception as e:
+            raise ValueError(f"Failed to load images: {e}")
+        total = dims[0] * dims[1]
+        return DiffResult(
+            diff_image=b"",
+            diff_percentage=0,
+            diff_pixels=0,
+            total_pixels=total,
+            dimensions_match=True,
+            status=DiffStatus.IDENTICAL,
+            baseline_dimensions=dims,
+            comparison_dimensions=dims,
+        )
+
+    baseline_img, comparison_img = _load_rgba(baseline_bytes, comparison_bytes)
+    baseline_dims = (baseline_img.width, baseline_img.height)
+    comparison_dims = (comparison_img.width, comparison_img.height)
+
+    if baseline_dims != comparison_dims:
+        return _dimension_mismatch_result(baseline_dims, comparison_dims)
+
+    width, height = baseline_dims
+    baseline_rgba = baseline_img.tobytes()
+    comparison_rgba = comparison_img.tobytes()
+    stride = width * 4
+
+    # Build tile jobs, skipping tiles whose pixels are byte-identical
+    tiles = []      # (y0, y1)
+    jobs = []       # _diff_tile args for changed tiles
+    changed = []    # tile indices with a job
+    for y0 in range(0, height, max(1, tile_rows)):
+        y1 = min(y0 + tile_rows, height)
+        tiles.append((y0, y1))
+        if baseline_rgba[y0 * stride:y1 * stride] == comparison_rgba[y0 * stride:y1 * stride]:
+            continue
+        s0 = max(0, y0 - 1)
+        s1 = min(height, y1 + 1)
+        jobs.append((
+            baseline_rgba[s0 * stride:s1 * stride],
+            comparison_rgba[s0 * stride:s1 * stride],
+            width, s1 - s0, y0 - s0, y1 - y0, threshold, include_aa,
+        ))
+        changed.append(len(tiles) - 1)
+
+    if executor is not None and len(jobs) > 1:
+        results = list(executor.map(_diff_tile, *zip(*jobs)))
+    else:
+        results = [_diff_tile(*job) for job in jobs]
+
+    diff_count = sum(count for count, _ in results)
+    total_pixels = width * height
+    diff_percentage = (diff_count / total_pixels) * 100 if total_pixels > 0 else 0
+    status = classify_diff(diff_percentage)
+
+    diff_image = b""
+    if diff_count > 0:
+        tile_output = dict(zip(changed, (out for _, out in results)))
+        diff_rgba = bytearray()
+        for i, (y0, y1) in enumerate(tiles):
+            if i in tile_output:
+                diff_rgba += tile_output[i]
+            else:
+                diff_rgba += _dim_rgba(baseline_rgba[y0 * stride:y1 * stride])
+        diff_img = Image.frombytes("RGBA", (width, height), bytes(diff_rgba))
+        diff_buffer = BytesIO()
+        diff_img.save(diff_buffer, format="PNG", compress_level=6)
+        diff_image = diff_buffer.getvalue()
+
+    return DiffResult(
+        diff_image=diff_image,
+        diff_percentage=round(diff_percentage, 4),
+        diff_pixels=diff_count,
+        total_pixels=total_pixels,
+        dimensions_match=True,
+        status=status,
+        baseline_dimensions=baseline_dims,
+        comparison_dimensions=comparison_dims,
+    )
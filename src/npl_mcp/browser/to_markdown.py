@@ -1,17 +1,34 @@
 """ToMarkdown tool – convert URL/file to markdown with filter, collapse, and image descriptions.
 
 Orchestrates MarkdownConverter, MarkdownViewer, and ImageDescriptionCache
-into a single tool callable from MCP.
+into a single tool callable from MCP. ``to_markdown_batch`` runs the same
+pipeline over many sources with global and per-host concurrency limits.
 """
 
+import asyncio
 import json
+import mmap
+import os
+import time
+from collections.abc import AsyncIterator
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any, Optional
+from urllib.parse import urlparse
 
-from npl_mcp.markdown.cache import MarkdownCache
+import httpx
+
+from npl_mcp.markdown.cache import get_markdown_cache
 from npl_mcp.markdown.converter import MarkdownConverter
 from npl_mcp.markdown.viewer import MarkdownViewer
 
+DEFAULT_IMAGE_MODEL = "openai/gpt-5-mini"
+
+# Documents on disk at least this large are viewed through mmap, not loaded
+MMAP_THRESHOLD = int(os.environ.get("NPL_VIEWER_MMAP_BYTES", str(4 * 1024 * 1024)))
+# How far into a mapped cache file to look for a Jina Reader header
+JINA_HEADER_SCAN_BYTES = 64 * 1024
+
 
 async def to_markdown(
     source: str,
@@ -20,8 +37,9 @@ async def to_markdown(
     filtered_only: bool = False,
     output: Optional[str] = None,
     with_image_descriptions: bool = False,
-    image_model: str = "openai/gpt-5-mini",
+    image_model: str = DEFAULT_IMAGE_MODEL,
     fallback_parser: bool = False,
+    pages: Optional[str] = None,
 ) -> dict[str, Any]:
     """Convert a URL, file, or raw markdown string to filtered/collapsed markdown.
 
@@ -37,35 +55,85 @@ async def to_markdown(
         image_model: Multi-modal model for image descriptions.
         fallback_parser: If True, fall back to html2text when Jina fails.
             Default False (Jina only).
+        pages: Page selection for local PDFs, 1-based (e.g. ``"1-5,9"``).
+            Pages are extracted in parallel and cached per page.
 
     Returns:
         Dict with ``source``, ``content`` (or ``output_file``), ``content_length``,
-        and metadata about conversion.
+        and metadata about conversion. ``memory_mapped`` is set when a large
+        file or conversion cache was filtered through mmap instead of loaded.
     """
+    return await _to_markdown(
+        source,
+        filter=filter,
+        collapsed_depth=collapsed_depth,
+        filtered_only=filtered_only,
+        output=output,
+        with_image_descriptions=with_image_descriptions,
+        image_model=image_model,
+        fallback_parser=fallback_parser,
+        pages=pages,
+    )
+
+
+async def _to_markdown(
+    source: str,
+    *,
+    filter: Optional[str] = None,
+    collapsed_depth: Optional[int] = None,
+    filtered_only: bool = False,
+    output: Optional[str] = None,
+    with_image_descriptions: bool = False,
+    image_model: str = DEFAULT_IMAGE_MODEL,
+    fallback_parser: bool = False,
+    pages: Optional[str] = None,
+    converter: Optional[MarkdownConverter] = None,
+) -> dict[str, Any]:
+    """Implementation of ``to_markdown``; *converter* lets batches share one."""
     result: dict[str, Any] = {"source": source}
+    viewer = MarkdownViewer()
+
+    # --- Large documents already on disk: view through mmap, never loaded ---
+    mapped = None
+    if not with_image_descriptions and pages is None and (filter or collapsed_depth is not None):
+        mapped = await _mapped_source(source, fallback_parser=fallback_parser, converter=converter)
 
-    # --- Step 1: Get markdown content ---
-    raw_markdown = await _resolve_source(source, fallback_parser=fallback_parser)
-    result["source_type"] = _classify_source(source, raw_markdown)
-
-    # --- Step 2: Image descriptions (before filtering) ---
-    if with_image_descriptions:
-        from npl_mcp.markdown.image_descriptions import inject_image_descriptions
-        # Pass source as base_url so relative image URIs get resolved
-        base_url = source if source.startswith(("http://", "https://")) else None
-        raw_markdown = await inject_image_descriptions(
-            raw_markdown, model=image_model, base_url=base_url
+    if mapped is not None:
+        path, start = mapped
+        result["source_type"] = _classify_source(source, "")
+        result["memory_mapped"] = True
+        processed = await asyncio.to_thread(
+            viewer.view_file,
+            path,
+            filter=filter,
+            bare=filtered_only,
+            depth=collapsed_depth,
+            start=start,
         )
-        result["image_descriptions"] = True
+    else:
+        # --- Step 1: Get markdown content ---
+        raw_markdown = await _resolve_source(
+            source, fallback_parser=fallback_parser, pages=pages, converter=converter,
+        )
+        result["source_type"] = _classify_source(source, raw_markdown)
 
-    # --- Step 3: Filter and/or collapse ---
-    viewer = MarkdownViewer()
-    processed = viewer.view(
-        raw_markdown,
-        filter=filter,
-        bare=filtered_only,
-        depth=collapsed_depth,
-    )
+        # --- Step 2: Image descriptions (before filtering) ---
+        if with_image_descriptions:
+            from npl_mcp.markdown.image_descriptions import inject_image_descriptions
+            # Pass source as base_url so relative image URIs get resolved
+            base_url = source if source.startswith(("http://", "https://")) else None
+            raw_markdown = await inject_image_descriptions(
+                raw_markdown, model=image_model, base_url=base_url
+            )
+            result["image_descriptions"] = True
+
+        # --- Step 3: Filter and/or collapse ---
+        processed = viewer.view(
+            raw_markdown,
+            filter=filter,
+            bare=filtered_only,
+            depth=collapsed_depth,
+        )
     result["content_length"] = len(processed)
 
     # --- Step 4: Output ---
@@ -84,15 +152,23 @@ async def to_markdown(
     return result
 
 
-async def _resolve_source(source: str, *, fallback_parser: bool = False) -> str:
+async def _resolve_source(
+    source: str,
+    *,
+    fallback_parser: bool = False,
+    pages: Optional[str] = None,
+    converter: Optional[MarkdownConverter] = None,
+) -> str:
     """Resolve source to raw markdown content.
 
     Handles URLs, local files (with conversion), and raw markdown strings.
     """
+    if pages is not None and not (Path(source).suffix.lower() == ".pdf" and Path(source).is_file()):
+        raise ValueError("pages= only applies to local PDF files")
+
     # URL → convert via MarkdownConverter (Jina/local)
     if source.startswith(("http://", "https://")):
-        cache = MarkdownCache()
-        converter = MarkdownConverter(cache)
+        converter = converter or MarkdownConverter(get_markdown_cache())
         full_response = await converter.convert(source, fallback_parser=fallback_parser)
         # Strip the YAML metadata header from converter response
         return _strip_metadata_header(full_response)
@@ -107,15 +183,55 @@ async def _resolve_source(source: str, *, fallback_parser: bool = False) -> str:
             return path.read_text(encoding="utf-8")
 
         # Other file types go through converter
-        cache = MarkdownCache()
-        converter = MarkdownConverter(cache)
-        full_response = await converter.convert(source)
+        converter = converter or MarkdownConverter(get_markdown_cache())
+        full_response = await converter.convert(source, pages=pages)
         return _strip_metadata_header(full_response)
 
     # Not a URL and not an existing file → treat as raw markdown string
     return source
 
 
+async def _mapped_source(
+    source: str,
+    *,
+    fallback_parser: bool = False,
+    converter: Optional[MarkdownConverter] = None,
+) -> Optional[tuple[Path, int]]:
+    """Return ``(file, start offset)`` when *source* is a large document on disk.
+
+    Local markdown files qualify directly; URLs and convertible files
+    qualify when their conversion cache is servable without converting.
+    Files under ``MMAP_THRESHOLD`` bytes return None and are loaded as usual.
+    """
+    if source.startswith(("http://", "https://")):
+        is_markdown = False
+    elif "\n" in source or not Path(source).is_file():
+        # Raw markdown string (or a missing file)
+        return None
+    else:
+        is_markdown = Path(source).suffix.lower() in (".md", ".markdown", ".txt")
+
+    if is_markdown:
+        path: Optional[Path] = Path(source)
+    else:
+        converter = converter or MarkdownConverter(get_markdown_cache())
+        cache_path = converter.cache.get_cache_path(source)
+        # Cheap size check first: small or missing caches take the normal path
+        if not cache_path.is_file() or cache_path.stat().st_size < MMAP_THRESHOLD:
+            return None
+        path = await converter.cached_path(source, fallback_parser=fallback_parser)
+    if path is None or path.stat().st_size < MMAP_THRESHOLD:
+        return None
+    if is_markdown:
+        return path, 0
+
+    def body_offset() -> int:
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _jina_body_offset(buffer, limit=JINA_HEADER_SCAN_BYTES)
+
+    return path, await asyncio.to_thread(body_offset)
+
+
 def _classify_source(source: str, resolved: str) -> str:
     """Classify the source type for metadata."""
     if source.startswith(("http://", "https://")):
@@ -170,18 +286,190 @@ def _strip_jina_header(content: str) -> str:
 
     This strips everything up to and including 'Markdown Content:'.
     """
-    jina_marker = "Markdown Content:"
-    idx = content.find(jina_marker)
-    if idx != -1:
-        # Verify this is at the start (only metadata lines before it)
-        prefix = content[:idx]
-        lines = prefix.strip().split("\n")
-        # Jina metadata lines are key: value pairs like "Title:", "URL Source:"
-        looks_like_jina = all(
-            ":" in line for line in lines if line.strip()
+    return content[_jina_body_offset(content):]
+
+
+def _jina_body_offset(content: Any, limit: Optional[int] = None) -> int:
+    """Return where the markdown starts after a Jina Reader header (0 if none).
+
+    Works on text and on byte buffers such as a mapped cache file; *limit*
+    bounds how far into a buffer the marker is searched for.
+    """
+    if isinstance(content, str):
+        marker, newline, colon = "Markdown Content:", "\n", ":"
+    else:
+        marker, newline, colon = b"Markdown Content:", b"\n", b":"
+    idx = content.find(marker, 0, len(content) if limit is None else limit)
+    if idx == -1:
+        return 0
+    # Verify this is at the start (only metadata lines before it)
+    lines = content[:idx].strip().split(newline)
+    # Jina metadata lines are key: value pairs like "Title:", "URL Source:"
+    if not all(colon in line for line in lines if line.strip()):
+        return 0
+    offset = idx + len(marker)
+    # Skip leading newlines after the marker
+    while content[offset:offset + 1] == newline:
+        offset += 1
+    return offset
+
+
+# ---------------------------------------------------------------------------
+# Batch conversion
+# ---------------------------------------------------------------------------
+
+# Defaults for ToMarkdown.Batch
+BATCH_CONCURRENCY = 8
+BATCH_PER_HOST = 2
+BATCH_MAX_SOURCES = 500
+
+
+def validate_batch(sources: list[str], concurrency: int, per_host: int) -> None:
+    """Reject batch arguments before any work starts.
+
+    Raises:
+        ValueError: If the batch is empty, too large, or a limit is below 1
+    """
+    if not sources:
+        raise ValueError("sources must not be empty")
+    if len(sources) > BATCH_MAX_SOURCES:
+        raise ValueError(f"At most {BATCH_MAX_SOURCES} sources per batch (got {len(sources)})")
+    if concurrency < 1 or per_host < 1:
+        raise ValueError("concurrency and per_host must be at least 1")
+
+
+def _batch_output_path(output_dir: str, index: int, source: str) -> Path:
+    """Return a stable, unique output file for one batch source."""
+    if source.startswith(("http://", "https://")):
+        stem = get_markdown_cache().get_cache_path(source).stem
+    elif "\n" not in source and len(source) < 256:
+        stem = Path(source).name or "source"
+    else:
+        stem = "raw"
+    return Path(output_dir) / f"{index:04d}-{stem}.md"
+
+
+async def iter_to_markdown_batch(
+    sources: list[str],
+    *,
+    filter: Optional[str] = None,
+    collapsed_depth: Optional[int] = None,
+    filtered_only: bool = False,
+    output_dir: Optional[str] = None,
+    with_image_descriptions: bool = False,
+    image_model: str = DEFAULT_IMAGE_MODEL,
+    fallback_parser: bool = False,
+    concurrency: int = BATCH_CONCURRENCY,
+    per_host: int = BATCH_PER_HOST,
+) -> AsyncIterator[dict[str, Any]]:
+    """Convert many sources concurrently, yielding results as they finish.
+
+    At most *concurrency* conversions run at once, and at most *per_host*
+    against any one URL host. Every conversion shares one pooled HTTP client
+    and the process-wide markdown cache, so repeated and duplicate sources
+    are served from the cache or coalesced.
+
+    Yields:
+        Per-source dicts in completion order: ``index`` (position in
+        *sources*), ``ok``, ``elapsed_ms`` and either the ``to_markdown``
+        result fields or ``error``.
+    """
+    validate_batch(sources, concurrency, per_host)
+    global_limit = asyncio.Semaphore(concurrency)
+    host_limits: dict[str, asyncio.Semaphore] = {}
+    limits = httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        converter = MarkdownConverter(get_markdown_cache(), client=client)
+
+        async def run(index: int, source: str) -> dict[str, Any]:
+            host = urlparse(source).netloc.lower() if source.startswith(("http://", "https://")) else ""
+            # Take the host slot first so waiting on a busy host never holds a global slot
+            host_limit = host_limits.setdefault(host, asyncio.Semaphore(per_host)) if host else nullcontext()
+            async with host_limit, global_limit:
+                started = time.monotonic()
+                try:
+                    result = await _to_markdown(
+                        source,
+                        filter=filter,
+                        collapsed_depth=collapsed_depth,
+                        filtered_only=filtered_only,
+                        output=str(_batch_output_path(output_dir, index, source)) if output_dir else None,
+                        with_image_descriptions=with_image_descriptions,
+                        image_model=image_model,
+                        fallback_parser=fallback_parser,
+                        converter=converter,
+                    )
+                    entry = {"index": index, "ok": True, **result}
+                except Exception as e:
+                    entry = {"index": index, "source": source, "ok": False, "error": str(e)}
+                entry["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+                return entry
+
+        tasks = [asyncio.create_task(run(i, source)) for i, source in enumerate(sources)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # A consumer that stops early (e.g. a dropped stream) cancels the rest
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def to_markdown_batch(
+    sources: list[str],
+    filter: Optional[str] = None,
+    collapsed_depth: Optional[int] = None,
+    filtered_only: bool = False,
+    output_dir: Optional[str] = None,
+    with_image_descriptions: bool = False,
+    image_model: str = DEFAULT_IMAGE_MODEL,
+    fallback_parser: bool = False,
+    concurrency: int = BATCH_CONCURRENCY,
+    per_host: int = BATCH_PER_HOST,
+) -> dict[str, Any]:
+    """Convert many URLs/files to markdown concurrently.
+
+    Args:
+        sources: URLs, file paths, or raw markdown strings (up to 500).
+        filter: Heading/CSS/XPath filter applied to every result.
+        collapsed_depth: Collapse headings below this depth (1-6).
+        filtered_only: If True, extract only matched sections.
+        output_dir: Directory to write one ``NNNN-name.md`` file per source.
+            Recommended for large batches; otherwise content is inline.
+        with_image_descriptions: Inject LLM-generated image descriptions.
+        image_model: Multi-modal model for image descriptions.
+        fallback_parser: If True, fall back to html2text when Jina fails.
+        concurrency: Maximum conversions running at once.
+        per_host: Maximum concurrent conversions per URL host.
+
+    Returns:
+        Dict with ``results`` (in input order; each has ``ok`` and either
+        the ToMarkdown fields or ``error``), ``total``, ``succeeded``,
+        ``failed`` and ``elapsed_ms``.
+    """
+    started = time.monotonic()
+    results = [
+        entry async for entry in iter_to_markdown_batch(
+            sources,
+            filter=filter,
+            collapsed_depth=collapsed_depth,
+            filtered_only=filtered_only,
+            output_dir=output_dir,
+            with_image_descriptions=with_image_descriptions,
+            image_model=image_model,
+            fallback_parser=fallback_parser,
+            concurrency=concurrency,
+            per_host=per_host,
         )
-        if looks_like_jina:
-            after = content[idx + len(jina_marker):]
-            # Strip leading newlines after the marker
-            return after.lstrip("\n")
-    return content
+    ]
+    results.sort(key=lambda entry: entry["index"])
+    succeeded = sum(1 for entry in results if entry["ok"])
+    return {
+        "results": results,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+    }
@@ -4,20 +4,20 @@ from __future__ import annotations
 from typing import Any
 
 from npl_mcp.storage import get_pool
+from npl_mcp.storage.pagination import InvalidCursor, Keyset
+
+_MESSAGE_KEYSET = Keyset("chat_messages", ("id",))
+_EVENT_KEYSET = Keyset("chat_events", ("id",))
 
 
 async def room_list(limit: int = 50) -> list[dict[str, Any]]:
     pool = await get_pool()
+    # Counters are maintained by triggers on npl_chat_messages (changeset 020)
     rows = await pool.fetch(
-        """
-        SELECT r.id, r.name, r.description,
-               COUNT(m.id) AS message_count,
-               MAX(m.created_at) AS last_activity,
-               r.created_at
-        FROM npl_chat_rooms r
-        LEFT JOIN npl_chat_messages m ON m.room_id = r.id
-        GROUP BY r.id
-        ORDER BY r.created_at DESC
+        f"""
+        SELECT {_ROOM_COLUMNS}
+        FROM npl_chat_rooms
+        ORDER BY created_at DESC
         LIMIT $1
         """,
         limit,
@@ -28,30 +28,21 @@ async def room_list(limit: int = 50) -> list[dict[str, Any]]:
 async def room_create(name: str, description: str = "") -> dict[str, Any]:
     pool = await get_pool()
     row = await pool.fetchrow(
-        """
+        f"""
         INSERT INTO npl_chat_rooms (name, description, created_at)
         VALUES ($1, $2, NOW())
-        RETURNING id, name, description, created_at
+        RETURNING {_ROOM_COLUMNS}
         """,
         name,
         description,
     )
-    return _room_dto_bare(row)
+    return _room_dto(row)
 
 
 async def room_get(room_id: int) -> dict[str, Any] | None:
     pool = await get_pool()
     row = await pool.fetchrow(
-        """
-        SELECT r.id, r.name, r.description,
-               COUNT(m.id) AS message_count,
-               MAX(m.created_at) AS last_activity,
-               r.created_at
-        FROM npl_chat_rooms r
-        LEFT JOIN npl_chat_messages m ON m.room_id = r.id
-        WHERE r.id = $1
-        GROUP BY r.id
-        """,
+        f"SELECT {_ROOM_COLUMNS} FROM npl_chat_rooms WHERE id = $1",
         room_id,
     )
     if row is None:
@@ -62,34 +53,51 @@ async def room_get(room_id: int) -> dict[str, Any] | None:
 async def message_list(
     room_id: int, limit: int = 50, before_id: int | None = None
 ) -> list[dict[str, Any]]:
-    pool = await get_pool()
+    page = await message_page(room_id, limit=limit, before_id=before_id)
+    return page["items"]
+
+
+async def message_page(
+    room_id: int,
+    limit: int = 50,
+    cursor: str | None = None,
+    before_id: int | None = None,
+) -> dict[str, Any]:
+    """Return one page of messages, oldest first within the page.
+
+    Pages walk backwards from the newest message along ``(room_id, id)``;
+    pass ``next_cursor`` back as *cursor* for older messages. *before_id*
+    is the legacy form of the same bound.
+
+    Raises:
+        InvalidCursor: If *cursor* was not issued for this list
+    """
+    clauses = ["room_id = $1"]
+    params: list[Any] = [room_id]
+    after, values = _MESSAGE_KEYSET.after(cursor, len(params) + 1)
+    if after:
+        clauses.append(after)
+        params.extend(values)
     if before_id is not None:
-        rows = await pool.fetch(
-            """
-            SELECT id, room_id, content, author, created_at
-            FROM npl_chat_messages
-            WHERE room_id = $1 AND id < $2
-            ORDER BY created_at DESC
-            LIMIT $3
-            """,
-            room_id,
-            before_id,
-            limit,
-        )
-    else:
-        rows = await pool.fetch(
-            """
-            SELECT id, room_id, content, author, created_at
-            FROM npl_chat_messages
-            WHERE room_id = $1
-            ORDER BY created_at DESC
-            LIMIT $2
-            """,
-            room_id,
-            limit,
-        )
+        params.append(before_id)
+        clauses.append(f"id < ${len(params)}")
+    params.append(limit + 1)
+
+    pool = await get_pool()
+    rows = await pool.fetch(
+        f"""
+        SELECT id, room_id, content, author, created_at
+        FROM npl_chat_messages
+        WHERE {' AND '.join(clauses)}
+        ORDER BY {_MESSAGE_KEYSET.order_by()}
+        LIMIT ${len(params)}
+        """,
+        *params,
+    )
+    rows, next_cursor = _MESSAGE_KEYSET.page(rows, limit)
     # Return in ascending order
-    return [_message_dto(r) for r in reversed(rows)]
+    items = [_message_dto(r) for r in reversed(rows)]
+    return {"items": items, "count": len(items), "next_cursor": next_cursor}
 
 
 async def message_create(
@@ -109,6 +117,11 @@ async def message_create(
     return _message_dto(row)
 
 
+_ROOM_COLUMNS = (
+    "id, name, description, message_count, last_activity, last_message_id, created_at"
+)
+
+
 def _room_dto(row) -> dict[str, Any]:
     last = row["last_activity"]
     return {
@@ -117,17 +130,7 @@ def _room_dto(row) -> dict[str, Any]:
         "description": row["description"] or "",
         "message_count": row["message_count"],
         "last_activity": last.isoformat() if last else None,
-        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
-    }
-
-
-def _room_dto_bare(row) -> dict[str, Any]:
-    return {
-        "id": row["id"],
-        "name": row["name"],
-        "description": row["description"] or "",
-        "message_count": 0,
-        "last_activity": None,
+        "last_message_id": row["last_message_id"],
         "created_at": row["created_at"].isoformat() if row["created_at"] else None,
     }
 
@@ -152,8 +155,8 @@ async def room_add_member(room_id: int, persona_slug: str) -> dict[str, Any]:
     pool = await get_pool()
     try:
         row = await pool.fetchrow(
-            """INSERT INTO npl_chat_room_members (room_id, persona_slug)
-            VALUES ($1, $2)
+            """INSERT INTO npl_chat_room_members (room_id, persona_slug, last_read_message_id)
+            VALUES ($1, $2, (SELECT last_message_id FROM npl_chat_rooms WHERE id = $1))
             ON CONFLICT (room_id, persona_slug) DO NOTHING
             RETURNING id, room_id, persona_slug, joined_at""",
             room_id,
@@ -178,7 +181,7 @@ async def room_list_members(room_id: int) -> dict[str, Any]:
     """List all members of a chat room."""
     pool = await get_pool()
     rows = await pool.fetch(
-        """SELECT id, room_id, persona_slug, joined_at
+        """SELECT id, room_id, persona_slug, joined_at, unread_count, last_read_message_id
         FROM npl_chat_room_members
         WHERE room_id = $1
         ORDER BY joined_at""",
@@ -191,6 +194,8 @@ async def room_list_members(room_id: int) -> dict[str, Any]:
             {
                 "persona_slug": r["persona_slug"],
                 "joined_at": r["joined_at"].isoformat() if r["joined_at"] else None,
+                "unread_count": r["unread_count"],
+                "last_read_message_id": r["last_read_message_id"],
             }
             for r in rows
         ],
@@ -198,6 +203,44 @@ async def room_list_members(room_id: int) -> dict[str, Any]:
     }
 
 
+async def room_mark_read(
+    room_id: int, persona_slug: str, message_id: int | None = None
+) -> dict[str, Any]:
+    """Mark a member's messages as read up to *message_id* (default: the latest).
+
+    Unread counters are then kept current by the message triggers; only a
+    partial read (an older *message_id*) counts the remaining messages.
+    """
+    pool = await get_pool()
+    row = await pool.fetchrow(
+        """UPDATE npl_chat_room_members mb
+        SET last_read_message_id = s.read_id,
+            unread_count = CASE WHEN s.read_id IS NULL OR s.read_id >= s.last_id THEN 0 ELSE (
+                SELECT COUNT(*) FROM npl_chat_messages m
+                WHERE m.room_id = mb.room_id AND m.id > s.read_id AND m.author <> mb.persona_slug
+            ) END
+        FROM (
+            SELECT r.last_message_id AS last_id,
+                   LEAST(COALESCE($3, r.last_message_id), r.last_message_id) AS read_id
+            FROM npl_chat_rooms r WHERE r.id = $1
+        ) s
+        WHERE mb.room_id = $1 AND mb.persona_slug = $2
+        RETURNING mb.persona_slug, mb.unread_count, mb.last_read_message_id""",
+        room_id,
+        persona_slug,
+        message_id,
+    )
+    if row is None:
+        return {"status": "not_found", "room_id": room_id, "persona_slug": persona_slug}
+    return {
+        "status": "ok",
+        "room_id": room_id,
+        "persona_slug": row["persona_slug"],
+        "unread_count": row["unread_count"],
+        "last_read_message_id": row["last_read_message_id"],
+    }
+
+
 async def event_create(
     room_id: int,
     event_type: str,
@@ -233,9 +276,16 @@ async def event_list(
     room_id: int,
     since: str | None = None,
     limit: int = 50,
+    cursor: str | None = None,
 ) -> dict[str, Any]:
-    """List chat events for a room."""
+    """List chat events for a room.
+
+    With *since*, events after that time are returned oldest first.
+    Otherwise pages run newest first; pass ``next_cursor`` back as
+    *cursor* for older events.
+    """
     pool = await get_pool()
+    next_cursor = None
     if since:
         rows = await pool.fetch(
             """SELECT id, room_id, event_type, persona, data, reply_to_id, created_at
@@ -248,15 +298,21 @@ async def event_list(
             limit,
         )
     else:
+        try:
+            after, values = _EVENT_KEYSET.after(cursor, 2)
+        except InvalidCursor as e:
+            return {"status": "error", "message": str(e)}
         rows = await pool.fetch(
-            """SELECT id, room_id, event_type, persona, data, reply_to_id, created_at
+            f"""SELECT id, room_id, event_type, persona, data, reply_to_id, created_at
             FROM npl_chat_events
-            WHERE room_id = $1
-            ORDER BY created_at DESC
-            LIMIT $2""",
+            WHERE room_id = $1{f" AND {after}" if after else ""}
+            ORDER BY {_EVENT_KEYSET.order_by()}
+            LIMIT ${2 + len(values)}""",
             room_id,
-            limit,
+            *values,
+            limit + 1,
         )
+        rows, next_cursor = _EVENT_KEYSET.page(rows, limit)
     return {
         "status": "ok",
         "events": [
@@ -271,6 +327,7 @@ async def event_list(
             for r in rows
         ],
         "count": len(rows),
+        "next_cursor": next_cursor,
     }
 
 
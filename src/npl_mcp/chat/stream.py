@@ -0,0 +1,518 @@
+"""Push-based chat streams fed by Postgres LISTEN/NOTIFY.
+
+Inserts into ``npl_chat_messages``, ``npl_chat_events`` and
+``npl_chat_notifications`` fire a trigger (changeset 019) that sends
+``{"kind", "room_id", "id"}`` on the ``npl_chat`` channel. One ``ChatHub``
+per process holds a single dedicated LISTEN connection -- opened when the
+first subscriber arrives -- and a dispatcher task that drains notifications,
+fetches the new rows with one query per kind (only for rooms someone is
+watching) and fans them out to per-subscriber queues.
+
+``room_stream`` turns a subscription into SSE events. Each event id is a
+cursor ``"<message>.<event>.<notification>"``; handing it back
+(``Last-Event-ID``) replays rows the stream has not delivered from the
+tables before switching to live delivery. Subscribers whose queue
+overflows, and all subscribers each time the LISTEN connection is
+(re-)established, are marked stale and resync from the tables the same way.
+
+Serial ids are assigned at insert but rows become visible at commit, so a
+room's id 10 can commit after id 11 was streamed. Cursors therefore do not
+treat everything below the newest id as delivered: each component is a
+floor followed by the ids delivered above it (``"9+11.4.0"``), and the
+floor only passes an id once that id was delivered ``HOLD_BACK`` seconds
+ago. A row is delivered exactly once provided its transaction commits
+within ``HOLD_BACK`` seconds of a higher id of the same table being
+delivered; later commits are skipped.
+
+Configuration via environment variables:
+    NPL_CHAT_STREAM_QUEUE      (default: 1000 items per subscriber)
+    NPL_CHAT_STREAM_HOLD_BACK  (default: 10 seconds)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from npl_mcp.chat.chat import _message_dto
+from npl_mcp.storage.listen import HubSlot, ListenHub
+from npl_mcp.storage.pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "npl_chat"
+
+DEFAULT_MAX_QUEUE = int(os.environ.get("NPL_CHAT_STREAM_QUEUE", "1000"))
+HOLD_BACK = float(os.environ.get("NPL_CHAT_STREAM_HOLD_BACK", "10"))
+# Delivered ids kept above the floor per table; bounds the cursor's length
+MAX_RECENT = 128
+BACKFILL_PAGE = 200
+
+# Stream item: (kind, id, payload); kinds are message, event, reaction, notification
+Item = Tuple[str, int, Dict[str, Any]]
+
+FIELDS = ("message", "event", "notification")
+
+
+class StreamCursor:
+    """Delivered ids per table; reactions share the event sequence.
+
+    Per table, every id at or below the floor counts as delivered, as do
+    the recently delivered ids above it. The floor advances past an id once
+    it was delivered ``HOLD_BACK`` seconds ago, so rows that commit out of
+    id order within that window are still streamed.
+    """
+
+    def __init__(
+        self,
+        message: int = 0,
+        event: int = 0,
+        notification: int = 0,
+        recent: Optional[Dict[str, Iterable[int]]] = None,
+    ):
+        self._floor: Dict[str, int] = {"message": message, "event": event, "notification": notification}
+        now = time.monotonic()
+        self._recent: Dict[str, Dict[int, float]] = {
+            field: {
+                item_id: now
+                for item_id in (recent or {}).get(field, ())
+                if item_id > self._floor[field]
+            }
+            for field in FIELDS
+        }
+        for field in FIELDS:
+            self._trim(field)
+
+    @classmethod
+    def parse(cls, value: str) -> "StreamCursor":
+        """Parse ``"<message>.<event>.<notification>"``.
+
+        Each component is a floor optionally followed by ``+<id>`` for ids
+        delivered above it.
+
+        Raises:
+            ValueError: If *value* is not three such non-negative components
+        """
+        parts = value.strip().split(".")
+        ids = [part.split("+") for part in parts]
+        if len(parts) != 3 or not all(i.isdigit() for group in ids for i in group):
+            raise ValueError(f"Invalid chat stream cursor: {value!r}")
+        floors = [int(group[0]) for group in ids]
+        recent = {field: [int(i) for i in group[1:]] for field, group in zip(FIELDS, ids)}
+        return cls(*floors, recent=recent)
+
+    def __str__(self) -> str:
+        return ".".join(
+            "+".join(str(i) for i in [self._floor[field], *sorted(self._recent[field])])
+            for field in FIELDS
+        )
+
+    def __repr__(self) -> str:
+        return f"StreamCursor({str(self)!r})"
+
+    @property
+    def message(self) -> int:
+        """Newest message id delivered."""
+        return self._newest("message")
+
+    @property
+    def event(self) -> int:
+        """Newest event (or reaction) id delivered."""
+        return self._newest("event")
+
+    @property
+    def notification(self) -> int:
+        """Newest notification id delivered."""
+        return self._newest("notification")
+
+    def floor(self, field: str) -> int:
+        """Return the id at or below which every *field* row counts as delivered."""
+        return self._floor[field]
+
+    def copy(self) -> "StreamCursor":
+        """Return an independent copy."""
+        clone = StreamCursor(**self._floor)
+        clone._recent = {field: dict(recent) for field, recent in self._recent.items()}
+        return clone
+
+    def advance(self, kind: str, item_id: int) -> bool:
+        """Record *item_id* as delivered; False if it already was."""
+        field = "event" if kind == "reaction" else kind
+        recent = self._recent[field]
+        if item_id <= self._floor[field] or item_id in recent:
+            return False
+        recent[item_id] = time.monotonic()
+        self._trim(field)
+        return True
+
+    def _newest(self, field: str) -> int:
+        return max(self._recent[field], default=self._floor[field])
+
+    def _trim(self, field: str) -> None:
+        """Raise the floor past ids delivered HOLD_BACK ago (or the oldest beyond MAX_RECENT)."""
+        recent = self._recent[field]
+        cutoff = time.monotonic() - HOLD_BACK
+        settled = [item_id for item_id, at in recent.items() if at <= cutoff]
+        if len(recent) > MAX_RECENT:
+            settled += sorted(recent)[: len(recent) - MAX_RECENT]
+        if not settled:
+            return
+        floor = self._floor[field] = max(self._floor[field], *settled)
+        for item_id in [i for i in recent if i <= floor]:
+            del recent[item_id]
+
+
+class Subscription:
+    """Bounded queue of live items for one stream of one room."""
+
+    def __init__(self, room_id: int, persona: Optional[str], max_queue: int):
+        self.room_id = room_id
+        self.persona = persona
+        self.max_queue = max_queue
+        self.stale = False
+        self._items: Deque[Item] = deque()
+        self._ready = asyncio.Event()
+
+    def deliver(self, item: Item) -> None:
+        """Queue *item*; a full queue is dropped and the subscriber resyncs."""
+        if len(self._items) >= self.max_queue:
+            self.mark_stale()
+            return
+        self._items.append(item)
+        self._ready.set()
+
+    def mark_stale(self) -> None:
+        """Discard queued items; the reader will backfill from its cursor."""
+        self._items.clear()
+        self.stale = True
+        self._ready.set()
+
+    def clear(self) -> None:
+        """Forget the stale flag before a backfill."""
+        self.stale = False
+
+    async def get(self) -> List[Item]:
+        """Wait for and return every queued item (empty when marked stale)."""
+        await self._ready.wait()
+        self._ready.clear()
+        items = list(self._items)
+        self._items.clear()
+        return items
+
+
+class ChatHub(ListenHub):
+    """One LISTEN connection fanned out to in-process room subscribers."""
+
+    channel = CHANNEL
+    task_name = "npl-chat-hub"
+
+    def __init__(self, max_queue: int = DEFAULT_MAX_QUEUE, reconnect_delay: float = 1.0):
+        super().__init__(reconnect_delay)
+        self.max_queue = max_queue
+
+        self._rooms: Dict[int, Set[Subscription]] = {}
+        self._inbox: Deque[Dict[str, Any]] = deque()
+
+        self.delivered = 0
+        self.resyncs = 0
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+
+    def subscribe(self, room_id: int, persona: Optional[str] = None) -> Subscription:
+        """Register a subscriber for *room_id* (and *persona*'s notifications)."""
+        sub = Subscription(room_id, persona, self.max_queue)
+        self._rooms.setdefault(room_id, set()).add(sub)
+        self._wake()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Remove *sub*; the LISTEN connection stays open for later streams."""
+        subs = self._rooms.get(sub.room_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._rooms[sub.room_id]
+
+    # ------------------------------------------------------------------
+    # Listener
+    # ------------------------------------------------------------------
+
+    def _has_subscribers(self) -> bool:
+        return bool(self._rooms)
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        note = self._decode(payload)
+        if note is not None and note.get("room_id") in self._rooms:
+            self._inbox.append(note)
+            self._wake()
+
+    def _on_connect(self, reconnect: bool) -> None:
+        # Rows committed before LISTEN took effect (while streams were
+        # positioning, or while disconnected) sent no usable notification;
+        # every subscriber backfills from its cursor
+        self._resync_all()
+
+    async def _drain(self) -> None:
+        if self._inbox:
+            batch = list(self._inbox)
+            self._inbox.clear()
+            try:
+                await self.dispatch(batch)
+            except Exception as e:
+                logger.warning("Chat fan-out failed (%d notifications): %s", len(batch), e)
+                self._resync_rooms({note.get("room_id") for note in batch})
+
+    def _resync_all(self) -> None:
+        self._resync_rooms(set(self._rooms))
+
+    def _resync_rooms(self, room_ids: Set[Any]) -> None:
+        for room_id in room_ids:
+            for sub in self._rooms.get(room_id, ()):
+                sub.mark_stale()
+                self.resyncs += 1
+
+    # ------------------------------------------------------------------
+    # Fan-out
+    # ------------------------------------------------------------------
+
+    async def dispatch(self, notes: List[Dict[str, Any]]) -> None:
+        """Fetch the rows behind *notes* (one query per kind) and deliver them."""
+        ids: Dict[str, List[int]] = {"message": [], "event": [], "notification": []}
+        for note in notes:
+            room_id = note.get("room_id")
+            if room_id not in self._rooms:
+                continue
+            kind = "event" if note.get("kind") == "reaction" else note.get("kind")
+            if kind == "notification" and not any(
+                sub.persona == note.get("persona") for sub in self._rooms[room_id]
+            ):
+                continue
+            if kind in ids:
+                ids[kind].append(note["id"])
+        if not any(ids.values()):
+            return
+
+        pool = await get_pool()
+        items: List[Item] = []
+        if ids["message"]:
+            rows = await pool.fetch(_MESSAGE_SQL + " WHERE id = ANY($1::int[]) ORDER BY id", ids["message"])
+            items.extend(_message_item(r) for r in rows)
+        if ids["event"]:
+            rows = await pool.fetch(_EVENT_SQL + " WHERE id = ANY($1::int[]) ORDER BY id", ids["event"])
+            items.extend(_event_item(r) for r in rows)
+        if ids["notification"]:
+            rows = await pool.fetch(
+                _NOTIFICATION_SQL + " WHERE n.id = ANY($1::int[]) ORDER BY n.id", ids["notification"],
+            )
+            items.extend(_notification_item(r) for r in rows)
+
+        for item in items:
+            payload = item[2]
+            for sub in list(self._rooms.get(payload["room_id"], ())):
+                if item[0] == "notification" and sub.persona != payload["persona"]:
+                    continue
+                sub.deliver(item)
+                self.delivered += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return subscriber and delivery counters for health reporting."""
+        return {
+            **super().stats(),
+            "rooms": len(self._rooms),
+            "subscribers": sum(len(subs) for subs in self._rooms.values()),
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Rows
+# ---------------------------------------------------------------------------
+
+_MESSAGE_SQL = "SELECT id, room_id, content, author, created_at FROM npl_chat_messages"
+_EVENT_SQL = (
+    "SELECT id, room_id, event_type, persona, data, reply_to_id, created_at FROM npl_chat_events"
+)
+_NOTIFICATION_SQL = """SELECT n.id, n.persona, n.notification_type, n.event_id,
+       n.created_at, n.read_at, e.room_id, e.event_type, e.data
+FROM npl_chat_notifications n
+JOIN npl_chat_events e ON e.id = n.event_id"""
+
+
+def _json(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _iso(value: Any) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _message_item(row) -> Item:
+    return ("message", row["id"], _message_dto(row))
+
+
+def _event_item(row) -> Item:
+    kind = "reaction" if row["event_type"] == "reaction" else "event"
+    return (kind, row["id"], {
+        "id": row["id"],
+        "room_id": row["room_id"],
+        "event_type": row["event_type"],
+        "persona": row["persona"],
+        "data": _json(row["data"]),
+        "reply_to_id": row["reply_to_id"],
+        "created_at": _iso(row["created_at"]),
+    })
+
+
+def _notification_item(row) -> Item:
+    return ("notification", row["id"], {
+        "id": row["id"],
+        "room_id": row["room_id"],
+        "persona": row["persona"],
+        "notification_type": row["notification_type"],
+        "event_id": row["event_id"],
+        "event_type": row["event_type"],
+        "data": _json(row["data"]),
+        "created_at": _iso(row["created_at"]),
+        "read_at": _iso(row["read_at"]),
+    })
+
+
+async def current_cursor(room_id: int, persona: Optional[str] = None) -> StreamCursor:
+    """Return a cursor positioned after the existing rows of *room_id*.
+
+    Rows created within the last ``HOLD_BACK`` seconds are listed above the
+    floor, so lower ids still in flight are streamed when they commit.
+    """
+    pool = await get_pool()
+    row = await pool.fetchrow(
+        """WITH m AS (SELECT id, created_at FROM npl_chat_messages WHERE room_id = $1),
+             e AS (SELECT id, created_at FROM npl_chat_events WHERE room_id = $1),
+             n AS (SELECT n.id, n.created_at FROM npl_chat_notifications n
+                   JOIN npl_chat_events ev ON ev.id = n.event_id
+                   WHERE ev.room_id = $1 AND n.persona = $2),
+             cutoff AS (SELECT now() - make_interval(secs => $3) AS at)
+        SELECT
+            (SELECT COALESCE(MAX(id), 0) FROM m, cutoff WHERE created_at < at) AS message,
+            (SELECT array_agg(id) FROM m, cutoff WHERE created_at >= at) AS message_recent,
+            (SELECT COALESCE(MAX(id), 0) FROM e, cutoff WHERE created_at < at) AS event,
+            (SELECT array_agg(id) FROM e, cutoff WHERE created_at >= at) AS event_recent,
+            (SELECT COALESCE(MAX(id), 0) FROM n, cutoff WHERE created_at < at) AS notification,
+            (SELECT array_agg(id) FROM n, cutoff WHERE created_at >= at) AS notification_recent""",
+        room_id,
+        persona,
+        HOLD_BACK,
+    )
+    return StreamCursor(
+        row["message"],
+        row["event"],
+        row["notification"],
+        recent={field: row[f"{field}_recent"] or () for field in FIELDS},
+    )
+
+
+async def backfill(
+    room_id: int,
+    cursor: StreamCursor,
+    persona: Optional[str] = None,
+    page: int = BACKFILL_PAGE,
+) -> AsyncIterator[Item]:
+    """Yield rows of *room_id* above *cursor*'s floors, in id order per kind.
+
+    Rows are read in pages of *page*; *cursor* is not modified, and rows it
+    already lists as delivered are yielded too (``advance`` skips them).
+    """
+    pool = await get_pool()
+    queries = [
+        ("message", _MESSAGE_SQL + " WHERE room_id = $1 AND id > $2 ORDER BY id LIMIT $3",
+         _message_item, ()),
+        ("event", _EVENT_SQL + " WHERE room_id = $1 AND id > $2 ORDER BY id LIMIT $3",
+         _event_item, ()),
+    ]
+    if persona is not None:
+        queries.append((
+            "notification",
+            _NOTIFICATION_SQL + " WHERE e.room_id = $1 AND n.id > $2 AND n.persona = $4"
+            " ORDER BY n.id LIMIT $3",
+            _notification_item,
+            (persona,),
+        ))
+    floors = {field: cursor.floor(field) for field in FIELDS}
+    for field, sql, to_item, extra in queries:
+        after = floors[field]
+        while True:
+            rows = await pool.fetch(sql, room_id, after, page, *extra)
+            for row in rows:
+                yield to_item(row)
+            if len(rows) < page:
+                break
+            after = rows[-1]["id"]
+
+
+async def room_stream(
+    room_id: int,
+    cursor: Optional[StreamCursor] = None,
+    persona: Optional[str] = None,
+    hub: Optional[ChatHub] = None,
+) -> AsyncIterator[Dict[str, str]]:
+    """Yield SSE events (``event``, ``id``, ``data``) for new rows in a room.
+
+    Args:
+        room_id: Room to follow
+        cursor: Resume after these ids; None starts with rows created from now on
+        persona: Also stream this persona's notifications for the room
+        hub: Hub to subscribe to (defaults to the process-wide one)
+    """
+    hub = hub or await start_chat_hub()
+    sub = hub.subscribe(room_id, persona)
+    try:
+        # Subscribe first so rows committed while positioning are queued
+        if cursor is None:
+            cursor = await current_cursor(room_id, persona)
+        else:
+            sub.stale = True
+        while True:
+            if sub.stale:
+                sub.clear()
+                async for kind, item_id, payload in backfill(room_id, cursor.copy(), persona):
+                    if cursor.advance(kind, item_id):
+                        yield _sse(kind, cursor, payload)
+                continue
+            for kind, item_id, payload in await sub.get():
+                if cursor.advance(kind, item_id):
+                    yield _sse(kind, cursor, payload)
+    finally:
+        hub.unsubscribe(sub)
+
+
+def _sse(kind: str, cursor: StreamCursor, payload: Dict[str, Any]) -> Dict[str, str]:
+    return {"event": kind, "id": str(cursor), "data": json.dumps(payload)}
+
+
+# ---------------------------------------------------------------------------
+# Process-wide hub
+# ---------------------------------------------------------------------------
+
+_slot: HubSlot[ChatHub] = HubSlot(ChatHub)
+
+
+def get_chat_hub() -> Optional[ChatHub]:
+    """Return the running hub, or None when no stream has started one."""
+    return _slot.get()
+
+
+async def start_chat_hub(**kwargs: Any) -> ChatHub:
+    """Create and start the process-wide hub (idempotent)."""
+    return await _slot.start(**kwargs)
+
+
+async def stop_chat_hub() -> None:
+    """Stop the process-wide hub and close its LISTEN connection."""
+    await _slot.stop()
@@ -4,6 +4,9 @@ from typing import Any
 from dataclasses import dataclass
 import re
 
+from npl_mcp.npl.render_cache import get_render_cache, spec_key
+from npl_mcp.npl.store import get_convention_store
+
 
 @dataclass
 class ExampleCoverage:
@@ -51,6 +54,7 @@ class ConventionFormatter:
             conventions_dir = project_root / "conventions"
 
         self.conventions_dir = Path(conventions_dir)
+        self._store = get_convention_store(self.conventions_dir)
 
     def _count_backticks(self, text: str) -> int:
         """
@@ -272,8 +276,7 @@ class ConventionFormatter:
         yaml_path = self.conventions_dir / f"{convention}.yaml"
 
         try:
-            with open(yaml_path) as f:
-                data = yaml.safe_load(f)
+            data = self._store.load(convention)
         except FileNotFoundError:
             return f"""
 FORMAT CONVENTION {convention}
@@ -503,13 +506,12 @@ class NPLDefinition:
             conventions_dir = project_root / "conventions"
         self.conventions_dir = Path(conventions_dir)
         self.formatter = ConventionFormatter(conventions_dir)
+        self._store = self.formatter._store
         self._load_npl_config()
 
     def _load_npl_config(self):
         """Load framework metadata from npl.yaml."""
-        npl_path = self.conventions_dir / "npl.yaml"
-        with open(npl_path) as f:
-            data = yaml.safe_load(f)
+        data = self._store.load("npl")
         self.npl = data.get("/npl", {})
         # version may parse as float (1.0) — format to preserve decimal
         raw_version = self.npl.get("version", "1.0")
@@ -535,10 +537,8 @@ class NPLDefinition:
         self._convention_components: dict[str, list[str]] = {}
 
         for conv_name in self.section_order:
-            yaml_path = self.conventions_dir / f"{conv_name}.yaml"
             try:
-                with open(yaml_path) as f:
-                    data = yaml.safe_load(f)
+                data = self._store.load(conv_name)
             except (FileNotFoundError, yaml.YAMLError):
                 continue
 
@@ -702,6 +702,39 @@ class NPLDefinition:
                         result.add(f"{convention}.{comp}")
         return result
 
+    def _render_key(
+        self,
+        components: list[str | ComponentSpec] | None,
+        rendered: list[str | ComponentSpec] | None,
+        component_priority: int,
+        example_priority: int,
+        extension: bool,
+        flags: dict[str, Any] | None
+    ) -> tuple | None:
+        """Build the render-cache key for a format() call, or None if unhashable.
+
+        Component specs keep their order (it decides where conventions outside
+        section_order are placed); rendered specs are a set, so they are sorted.
+        """
+        def _norm(spec: str | ComponentSpec) -> tuple:
+            if isinstance(spec, ComponentSpec):
+                return (spec.spec.strip(), spec.component_priority, spec.example_priority)
+            return (spec.strip(), None, None)
+
+        comps_key = tuple(_norm(s) for s in components) if components is not None else None
+        rendered_key = (
+            tuple(sorted({_norm(s)[0] for s in rendered})) if rendered else None
+        )
+        key = spec_key(
+            self._store, comps_key, rendered_key,
+            component_priority, example_priority, extension, flags
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def format(
         self,
         components: list[str | ComponentSpec] | None = None,
@@ -733,6 +766,15 @@ class NPLDefinition:
         Returns:
             A formatted string containing the complete NPL definition.
         """
+        cache = get_render_cache()
+        key = self._render_key(
+            components, rendered, component_priority, example_priority, extension, flags
+        )
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
         version = self.version
 
         if extension:
@@ -811,4 +853,6 @@ class NPLDefinition:
             result += section
 
         result += f"\n{close_marker}\n"
+        if key is not None:
+            cache.set(key, result)
         return result
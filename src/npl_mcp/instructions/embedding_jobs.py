@@ -0,0 +1,394 @@
+"""Durable background queue for instruction embeddings.
+
+Instruction writes call ``enqueue_embedding`` inside their own transaction,
+which records one ``npl_instruction_embedding_jobs`` row per (instruction,
+version) and marks older pending versions of the same instruction
+``superseded``. New jobs become claimable after ``NPL_EMBED_DEBOUNCE``
+seconds, so a burst of updates to one instruction embeds only the last
+version.
+
+One ``EmbeddingWorker`` per server process (started by the ASGI lifespan)
+claims up to ``batch_size`` due jobs with ``FOR UPDATE SKIP LOCKED`` --
+never two jobs of the same instruction at once -- then:
+
+1. extracts descriptive phrases per instruction (bounded concurrency),
+2. embeds the phrases of every instruction in the batch with one call,
+3. replaces their vectors with one bulk insert and marks the jobs done.
+
+Failed jobs are retried with exponential backoff up to ``max_attempts``
+and then marked ``failed``. Running jobs whose worker died are reclaimed
+after ``lease`` seconds. Without a running worker (CLI scripts, tests)
+jobs simply wait in the table for the next server.
+
+Configuration via environment variables:
+    NPL_EMBED_BATCH          (default: 16 instructions per batch)
+    NPL_EMBED_DEBOUNCE       (default: 1.0 seconds)
+    NPL_EMBED_POLL_INTERVAL  (default: 10.0 seconds)
+    NPL_EMBED_MAX_ATTEMPTS   (default: 5)
+    NPL_EMBED_CONCURRENCY    (default: 4 phrase extractions at once)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import uuid as _uuid_mod
+from typing import Any, Dict, List, Optional
+
+from npl_mcp.instructions.embeddings import extract_descriptive_phrases, store_embeddings
+from npl_mcp.meta_tools.llm_client import embed_texts
+from npl_mcp.storage import get_pool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH = int(os.environ.get("NPL_EMBED_BATCH", "16"))
+DEFAULT_DEBOUNCE = float(os.environ.get("NPL_EMBED_DEBOUNCE", "1.0"))
+DEFAULT_POLL_INTERVAL = float(os.environ.get("NPL_EMBED_POLL_INTERVAL", "10.0"))
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get("NPL_EMBED_MAX_ATTEMPTS", "5"))
+DEFAULT_CONCURRENCY = int(os.environ.get("NPL_EMBED_CONCURRENCY", "4"))
+DEFAULT_LEASE = 300.0
+RETRY_DELAY = 5.0
+MAX_RETRY_DELAY = 600.0
+
+
+async def enqueue_embedding(
+    conn: Any,
+    instruction_id: _uuid_mod.UUID,
+    version: int,
+    debounce: Optional[float] = None,
+) -> None:
+    """Queue embedding of *version* of an instruction.
+
+    Call inside the transaction that wrote the version. Older pending jobs
+    of the instruction are superseded; re-queuing an existing version
+    (e.g. after a rollback) resets its job to pending.
+    """
+    await conn.execute(
+        """WITH superseded AS (
+               UPDATE npl_instruction_embedding_jobs
+               SET status = 'superseded', finished_at = NOW()
+               WHERE instruction_id = $1 AND status = 'pending' AND version <> $2
+           )
+           INSERT INTO npl_instruction_embedding_jobs
+               (instruction_id, version, status, attempts, enqueued_at, available_at)
+           VALUES ($1, $2, 'pending', 0, NOW(), NOW() + make_interval(secs => $3))
+           ON CONFLICT (instruction_id, version) DO UPDATE
+           SET status = 'pending', attempts = 0, last_error = NULL,
+               enqueued_at = EXCLUDED.enqueued_at, available_at = EXCLUDED.available_at,
+               started_at = NULL, finished_at = NULL""",
+        instruction_id,
+        version,
+        DEFAULT_DEBOUNCE if debounce is None else debounce,
+    )
+
+
+def wake_embedding_worker() -> None:
+    """Tell the in-process worker (if any) that jobs were queued."""
+    if _worker is not None and _worker.running:
+        _worker.wake()
+
+
+async def embedding_status(instruction_id: _uuid_mod.UUID) -> Dict[int, Dict[str, Any]]:
+    """Return the embedding job of each version of an instruction, keyed by version."""
+    pool = await get_pool()
+    rows = await pool.fetch(
+        """SELECT version, status, attempts, last_error, enqueued_at, finished_at
+           FROM npl_instruction_embedding_jobs
+           WHERE instruction_id = $1""",
+        instruction_id,
+    )
+    return {r["version"]: _status_dto(r) for r in rows}
+
+
+def _status_dto(row) -> Dict[str, Any]:
+    return {
+        "status": row["status"],
+        "attempts": row["attempts"],
+        "last_error": row["last_error"],
+        "enqueued_at": row["enqueued_at"].isoformat() if row["enqueued_at"] else None,
+        "finished_at": row["finished_at"].isoformat() if row["finished_at"] else None,
+    }
+
+
+_CLAIM_SQL = """UPDATE npl_instruction_embedding_jobs j
+SET status = 'running', started_at = NOW(), attempts = j.attempts + 1
+WHERE j.id IN (
+    SELECT p.id FROM npl_instruction_embedding_jobs p
+    WHERE ((p.status = 'pending' AND p.available_at <= NOW())
+           OR (p.status = 'running' AND p.started_at < NOW() - make_interval(secs => $2)))
+      AND NOT EXISTS (
+          SELECT 1 FROM npl_instruction_embedding_jobs r
+          WHERE r.instruction_id = p.instruction_id AND r.id <> p.id
+            AND r.status = 'running' AND r.started_at >= NOW() - make_interval(secs => $2))
+    ORDER BY p.available_at
+    LIMIT $1
+    FOR UPDATE SKIP LOCKED)
+RETURNING j.id, j.instruction_id, j.version, j.attempts, j.enqueued_at"""
+
+_CONTENT_SQL = """SELECT t.job_id, i.title, i.description, i.tags, v.body
+FROM unnest($1::int[], $2::uuid[], $3::int[]) AS t(job_id, instruction_id, version)
+JOIN npl_instructions i ON i.id = t.instruction_id
+JOIN npl_instruction_versions v ON v.instruction_id = t.instruction_id AND v.version = t.version"""
+
+
+class EmbeddingWorker:
+    """Claims embedding jobs in batches and processes them in one background task."""
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        lease: float = DEFAULT_LEASE,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.concurrency = concurrency
+        self.lease = lease
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.done = 0
+        self.retried = 0
+        self.failed = 0
+        self.superseded = 0
+        self.vectors = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        """True while the worker task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the worker task on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name="npl-embedding-worker",
+        )
+
+    async def stop(self) -> None:
+        """Stop the worker; an interrupted batch is reclaimed after its lease."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    def wake(self) -> None:
+        """Check for due jobs now instead of at the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        backoff = 0.0
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                while await self.run_once():
+                    pass
+                delay = await self._next_due()
+                backoff = 0.0
+            except Exception as e:
+                backoff = min(max(backoff * 2, RETRY_DELAY), MAX_RETRY_DELAY)
+                logger.warning("Embedding worker failed (retry in %.1fs): %s", backoff, e)
+                delay = backoff
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                self._wakeup.set()
+
+    async def _next_due(self) -> float:
+        """Seconds until the next pending job is due (capped at the poll interval)."""
+        pool = await get_pool()
+        due = await pool.fetchval(
+            """SELECT EXTRACT(EPOCH FROM MIN(available_at) - NOW())
+               FROM npl_instruction_embedding_jobs WHERE status = 'pending'""",
+        )
+        if due is None:
+            return self.poll_interval
+        return min(max(float(due), 0.05), self.poll_interval)
+
+    # ------------------------------------------------------------------
+    # Batches
+    # ------------------------------------------------------------------
+
+    async def run_once(self) -> int:
+        """Claim and process one batch; return the number of jobs claimed."""
+        pool = await get_pool()
+        jobs = await pool.fetch(_CLAIM_SQL, self.batch_size, self.lease)
+        if not jobs:
+            return 0
+        self.batches += 1
+
+        # A reclaimed stale job may share a batch with a later request for
+        # the same instruction. The most recently enqueued job wins, not the
+        # highest version: a rollback re-queues an older version
+        newest: Dict[_uuid_mod.UUID, Any] = {}
+        for job in jobs:
+            current = newest.get(job["instruction_id"])
+            if current is None or (job["enqueued_at"], job["id"]) > (current["enqueued_at"], current["id"]):
+                newest[job["instruction_id"]] = job
+        keep = {job["id"] for job in newest.values()}
+        stale = [job["id"] for job in jobs if job["id"] not in keep]
+        if stale:
+            await pool.execute(
+                """UPDATE npl_instruction_embedding_jobs
+                   SET status = 'superseded', finished_at = NOW()
+                   WHERE id = ANY($1::int[]) AND status = 'running'""",
+                stale,
+            )
+            self.superseded += len(stale)
+
+        jobs = list(newest.values())
+        content = {
+            row["job_id"]: row
+            for row in await pool.fetch(
+                _CONTENT_SQL,
+                [job["id"] for job in jobs],
+                [job["instruction_id"] for job in jobs],
+                [job["version"] for job in jobs],
+            )
+        }
+        errors: Dict[int, str] = {}
+        phrases: Dict[int, List[str]] = {}
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def _extract(job) -> None:
+            row = content[job["id"]]
+            async with limit:
+                try:
+                    found = await extract_descriptive_phrases(
+                        row["title"], row["description"] or "", row["tags"] or [], row["body"],
+                    )
+                except Exception as e:
+                    errors[job["id"]] = f"Phrase extraction failed: {e}"
+                    return
+            if found:
+                phrases[job["id"]] = found
+            else:
+                errors[job["id"]] = "No phrases extracted"
+
+        for job in jobs:
+            if job["id"] not in content:
+                errors[job["id"]] = "Instruction version not found"
+        await asyncio.gather(*(_extract(job) for job in jobs if job["id"] in content))
+
+        ready = [job for job in jobs if job["id"] in phrases]
+        if ready:
+            labels = [label for job in ready for label in phrases[job["id"]]]
+            try:
+                vectors = await embed_texts(labels)
+            except Exception as e:
+                for job in ready:
+                    errors[job["id"]] = f"Embedding failed: {e}"
+                ready = []
+            else:
+                await self._store(pool, ready, phrases, iter(vectors))
+
+        if errors:
+            await self._retry(pool, [job for job in jobs if job["id"] in errors], errors)
+        return len(jobs) + len(stale)
+
+    async def _store(self, pool, jobs, phrases: Dict[int, List[str]], vectors) -> None:
+        rows = [
+            (job["instruction_id"], job["version"], label, next(vectors))
+            for job in jobs
+            for label in phrases[job["id"]]
+        ]
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await store_embeddings(conn, [job["instruction_id"] for job in jobs], rows)
+                # A job re-queued while running stays pending
+                await conn.execute(
+                    """UPDATE npl_instruction_embedding_jobs
+                       SET status = 'done', finished_at = NOW(), last_error = NULL
+                       WHERE id = ANY($1::int[]) AND status = 'running'""",
+                    [job["id"] for job in jobs],
+                )
+        self.done += len(jobs)
+        self.vectors += len(rows)
+
+    async def _retry(self, pool, jobs, errors: Dict[int, str]) -> None:
+        """Reschedule failed jobs with backoff, or fail them after max_attempts."""
+        for job in jobs:
+            logger.warning(
+                "Embedding job %s (instruction %s v%s, attempt %s): %s",
+                job["id"], job["instruction_id"], job["version"], job["attempts"], errors[job["id"]],
+            )
+            if job["attempts"] >= self.max_attempts:
+                self.failed += 1
+            else:
+                self.retried += 1
+        await pool.execute(
+            """UPDATE npl_instruction_embedding_jobs j
+               SET status = CASE WHEN j.attempts >= $3 THEN 'failed' ELSE 'pending' END,
+                   last_error = t.error,
+                   available_at = NOW() + make_interval(
+                       secs => LEAST($4 * power(2, j.attempts - 1), $5)),
+                   finished_at = CASE WHEN j.attempts >= $3 THEN NOW() END
+               FROM unnest($1::int[], $2::text[]) AS t(id, error)
+               WHERE j.id = t.id AND j.status = 'running'""",
+            [job["id"] for job in jobs],
+            [errors[job["id"]] for job in jobs],
+            self.max_attempts,
+            RETRY_DELAY,
+            MAX_RETRY_DELAY,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch and job counters for health reporting."""
+        return {
+            "running": self.running,
+            "batches": self.batches,
+            "done": self.done,
+            "retried": self.retried,
+            "failed": self.failed,
+            "superseded": self.superseded,
+            "vectors": self.vectors,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide worker
+# ---------------------------------------------------------------------------
+
+_worker: Optional[EmbeddingWorker] = None
+
+
+def get_embedding_worker() -> Optional[EmbeddingWorker]:
+    """Return the running worker, or None outside the server lifespan."""
+    if _worker is not None and _worker.running:
+        return _worker
+    return None
+
+
+async def start_embedding_worker(**kwargs: Any) -> EmbeddingWorker:
+    """Create and start the process-wide worker (idempotent)."""
+    global _worker
+    if _worker is None or not _worker.running:
+        _worker = EmbeddingWorker(**kwargs)
+        _worker.start()
+    return _worker
+
+
+async def stop_embedding_worker() -> None:
+    """Stop the process-wide worker."""
+    global _worker
+    if _worker is not None:
+        await _worker.stop()
+        _worker = None
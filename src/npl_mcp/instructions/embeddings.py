@@ -1,17 +1,19 @@
 """Instruction embedding pipeline -- extract descriptive phrases, embed, store.
 
-On create/update, an LLM extracts 3-5 descriptive phrases about the
-instruction, an embedding model converts them to vectors, and the
-(label, embedding) pairs are stored in ``npl_instruction_embeddings``
-for future cosine-similarity search.
-
-Failures are logged but never raised -- embedding is best-effort
-so that instruction writes are never blocked.
+An LLM extracts 3-5 descriptive phrases about an instruction, an
+embedding model converts them to vectors, and the (label, embedding)
+pairs are stored in ``npl_instruction_embeddings`` for cosine-similarity
+search. Instruction writes do not call this inline: they enqueue a job
+that the background worker in ``embedding_jobs`` runs in batches.
+
+``generate_and_store_embeddings`` runs the pipeline for one instruction
+directly; failures are logged but never raised.
 """
 
 import json
 import logging
 import uuid as _uuid_mod
+from typing import Any, Optional, Sequence
 
 from npl_mcp.meta_tools.llm_client import chat_completion, embed_texts
 from npl_mcp.storage import get_pool
@@ -83,6 +85,39 @@ async def extract_descriptive_phrases(
     return [str(p) for p in phrases[:5]]
 
 
+async def store_embeddings(
+    conn: Any,
+    instruction_ids: Sequence[_uuid_mod.UUID],
+    rows: Sequence[tuple[_uuid_mod.UUID, Optional[int], str, list[float]]],
+) -> None:
+    """Replace the embeddings of *instruction_ids* with *rows* in two statements.
+
+    Must run inside a transaction on *conn*.
+
+    Args:
+        conn: Connection with an open transaction.
+        instruction_ids: Instructions whose existing embeddings are deleted.
+        rows: ``(instruction_id, version, label, vector)`` tuples to insert.
+    """
+    await conn.execute(
+        "DELETE FROM npl_instruction_embeddings WHERE instruction_id = ANY($1::uuid[])",
+        list(instruction_ids),
+    )
+    if not rows:
+        return
+    await conn.execute(
+        """INSERT INTO npl_instruction_embeddings
+               (instruction_id, version, label, embedding, created_at)
+           SELECT t.instruction_id, t.version, t.label, t.embedding::vector, NOW()
+           FROM unnest($1::uuid[], $2::int[], $3::text[], $4::text[])
+                AS t(instruction_id, version, label, embedding)""",
+        [r[0] for r in rows],
+        [r[1] for r in rows],
+        [r[2] for r in rows],
+        [str(r[3]) for r in rows],
+    )
+
+
 async def generate_and_store_embeddings(
     instruction_id: _uuid_mod.UUID,
     title: str,
@@ -116,23 +151,12 @@ async def generate_and_store_embeddings(
         pool = await get_pool()
         async with pool.acquire() as conn:
             async with conn.transaction():
-                # Delete existing embeddings for this instruction
-                await conn.execute(
-                    "DELETE FROM npl_instruction_embeddings WHERE instruction_id = $1",
-                    instruction_id,
+                await store_embeddings(
+                    conn,
+                    [instruction_id],
+                    [(instruction_id, None, label, vector) for label, vector in zip(phrases, vectors)],
                 )
 
-                # Insert new embeddings
-                for label, vector in zip(phrases, vectors):
-                    await conn.execute(
-                        """INSERT INTO npl_instruction_embeddings
-                               (instruction_id, label, embedding, created_at)
-                           VALUES ($1, $2, $3::vector, NOW())""",
-                        instruction_id,
-                        label,
-                        str(vector),
-                    )
-
     except Exception:
         logger.exception(
             "Failed to generate embeddings for instruction %s", instruction_id
@@ -13,6 +13,10 @@ from typing import Any, Optional
 import shortuuid
 
 from npl_mcp.storage import get_pool
+from npl_mcp.storage.pagination import InvalidCursor, Keyset
+
+# Newest-first keyset for "all" and "text" listings (intent results are ranked)
+_INSTRUCTION_KEYSET = Keyset("instructions", ("updated_at", "id"))
 
 
 async def _validate_session(session: str) -> tuple[Optional[_uuid_mod.UUID], Optional[dict]]:
@@ -58,7 +62,8 @@ async def instructions_create(
     """Create a new instruction with its first version (v1).
 
     If *session* is provided it must be a valid tool-session UUID; the
-    instruction will be linked to that session.
+    instruction will be linked to that session. Search embeddings are
+    queued for the background worker rather than generated inline.
     """
     if not title:
         return {"status": "error", "message": "title must be a non-empty string."}
@@ -71,6 +76,8 @@ async def instructions_create(
         if err is not None:
             return err
 
+    from npl_mcp.instructions.embedding_jobs import enqueue_embedding, wake_embedding_worker
+
     pool = await get_pool()
 
     async with pool.acquire() as conn:
@@ -98,15 +105,10 @@ async def instructions_create(
                 body,
             )
 
-    # Generate embeddings (best-effort, non-blocking on failure)
-    from npl_mcp.instructions.embeddings import generate_and_store_embeddings
-    await generate_and_store_embeddings(
-        instruction_id=instruction_id,
-        title=title,
-        description=description,
-        tags=tags,
-        body=body,
-    )
+            # Embeddings are generated by the background worker
+            await enqueue_embedding(conn, instruction_id, 1)
+
+    wake_embedding_worker()
 
     result: dict[str, Any] = {"uuid": _encode(instruction_id), "version": 1, "status": "ok"}
     if session is not None:
@@ -205,6 +207,8 @@ async def instructions_update(
     if uid is None:
         return {"uuid": uuid, "status": "error", "message": "Invalid UUID format."}
 
+    from npl_mcp.instructions.embedding_jobs import enqueue_embedding, wake_embedding_worker
+
     pool = await get_pool()
 
     async with pool.acquire() as conn:
@@ -253,15 +257,10 @@ async def instructions_update(
                 uid,
             )
 
-    # Re-generate embeddings with updated content (best-effort)
-    from npl_mcp.instructions.embeddings import generate_and_store_embeddings
-    await generate_and_store_embeddings(
-        instruction_id=uid,
-        title=instr["title"],
-        description=new_description,
-        tags=new_tags,
-        body=new_body,
-    )
+            # Supersedes any not-yet-embedded earlier version
+            await enqueue_embedding(conn, uid, new_version)
+
+    wake_embedding_worker()
 
     return {"uuid": uuid, "version": new_version, "status": "ok"}
 
@@ -290,11 +289,19 @@ async def instructions_active_version(
             "message": f"Version {version} not found.",
         }
 
-    await pool.execute(
-        "UPDATE npl_instructions SET active_version = $1, updated_at = NOW() WHERE id = $2",
-        version,
-        uid,
-    )
+    from npl_mcp.instructions.embedding_jobs import enqueue_embedding, wake_embedding_worker
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "UPDATE npl_instructions SET active_version = $1, updated_at = NOW() WHERE id = $2",
+                version,
+                uid,
+            )
+            # Search embeddings follow the active version
+            await enqueue_embedding(conn, uid, version)
+
+    wake_embedding_worker()
 
     return {"uuid": _encode(uid), "active_version": version, "status": "ok"}
 
@@ -302,7 +309,11 @@ async def instructions_active_version(
 async def instructions_versions(
     uuid: str,
 ) -> dict[str, Any]:
-    """List all versions with change notes."""
+    """List all versions with change notes and embedding job status.
+
+    ``embedding_status`` is ``pending``, ``running``, ``done``, ``failed``,
+    ``superseded`` or ``None`` (never queued).
+    """
     uid = _decode(uuid)
     if uid is None:
         return {"uuid": uuid, "status": "error", "message": "Invalid UUID format."}
@@ -317,10 +328,12 @@ async def instructions_versions(
         return {"uuid": uuid, "status": "not_found"}
 
     rows = await pool.fetch(
-        """SELECT version, change_note, created_at
-           FROM npl_instruction_versions
-           WHERE instruction_id = $1
-           ORDER BY version ASC""",
+        """SELECT v.version, v.change_note, v.created_at, j.status AS embedding_status
+           FROM npl_instruction_versions v
+           LEFT JOIN npl_instruction_embedding_jobs j
+                  ON j.instruction_id = v.instruction_id AND j.version = v.version
+           WHERE v.instruction_id = $1
+           ORDER BY v.version ASC""",
         uid,
     )
 
@@ -330,6 +343,7 @@ async def instructions_versions(
             "change_note": r["change_note"],
             "created_at": r["created_at"].isoformat() if r["created_at"] else None,
             "is_active": r["version"] == instr["active_version"],
+            "embedding_status": r["embedding_status"],
         }
         for r in rows
     ]
@@ -364,81 +378,86 @@ def _row_to_dict(row: dict, include_score: bool = False) -> dict[str, Any]:
     return result
 
 
-async def _list_all(pool, tags: list[str] | None, limit: int) -> dict[str, Any]:
-    """Return all instructions, optionally filtered by tags."""
+def _keyset_where(
+    clauses: list[str], params: list[Any], cursor: Optional[str], alias: str = ""
+) -> str:
+    """Append the cursor condition and return the WHERE clause.
+
+    Raises:
+        InvalidCursor: If *cursor* was not issued for instruction listings
+    """
+    after, values = _INSTRUCTION_KEYSET.after(cursor, len(params) + 1, alias)
+    if after:
+        clauses.append(after)
+        params.extend(values)
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+async def _list_all(
+    pool, tags: list[str] | None, limit: int, cursor: Optional[str] = None
+) -> dict[str, Any]:
+    """Return all instructions, optionally filtered by tags, most recently updated first."""
+    clauses: list[str] = []
+    params: list[Any] = []
     if tags:
-        rows = await pool.fetch(
-            """SELECT id, title, description, tags, active_version,
-                      session_id, created_at, updated_at
-               FROM npl_instructions
-               WHERE tags @> $1
-               ORDER BY updated_at DESC
-               LIMIT $2""",
-            tags,
-            limit,
-        )
-    else:
-        rows = await pool.fetch(
-            """SELECT id, title, description, tags, active_version,
-                      session_id, created_at, updated_at
-               FROM npl_instructions
-               ORDER BY updated_at DESC
-               LIMIT $1""",
-            limit,
-        )
+        params.append(tags)
+        clauses.append("tags @> $1")
+    where = _keyset_where(clauses, params, cursor)
+    params.append(limit + 1)
+
+    rows = await pool.fetch(
+        f"""SELECT id, title, description, tags, active_version,
+                  session_id, created_at, updated_at
+           FROM npl_instructions
+           {where}
+           ORDER BY {_INSTRUCTION_KEYSET.order_by()}
+           LIMIT ${len(params)}""",
+        *params,
+    )
+    rows, next_cursor = _INSTRUCTION_KEYSET.page(rows, limit)
 
     return {
         "mode": "all",
         "total": len(rows),
         "instructions": [_row_to_dict(r) for r in rows],
+        "next_cursor": next_cursor,
         "status": "ok",
     }
 
 
 async def _text_search(
-    pool, query: str, tags: list[str] | None, limit: int
+    pool, query: str, tags: list[str] | None, limit: int, cursor: Optional[str] = None
 ) -> dict[str, Any]:
     """ILIKE search across title, description, tags, and embedding labels."""
-    pattern = f"%{query}%"
-
-    if tags:
-        rows = await pool.fetch(
-            """SELECT DISTINCT i.id, i.title, i.description, i.tags,
-                      i.active_version, i.session_id, i.created_at, i.updated_at
-               FROM npl_instructions i
-               LEFT JOIN npl_instruction_embeddings e ON e.instruction_id = i.id
-               WHERE (i.title ILIKE $1
+    params: list[Any] = [f"%{query}%"]
+    clauses = ["""(i.title ILIKE $1
                       OR i.description ILIKE $1
                       OR EXISTS (SELECT 1 FROM unnest(i.tags) t WHERE t ILIKE $1)
-                      OR e.label ILIKE $1)
-                 AND i.tags @> $2
-               ORDER BY i.updated_at DESC
-               LIMIT $3""",
-            pattern,
-            tags,
-            limit,
-        )
-    else:
-        rows = await pool.fetch(
-            """SELECT DISTINCT i.id, i.title, i.description, i.tags,
-                      i.active_version, i.session_id, i.created_at, i.updated_at
-               FROM npl_instructions i
-               LEFT JOIN npl_instruction_embeddings e ON e.instruction_id = i.id
-               WHERE i.title ILIKE $1
-                     OR i.description ILIKE $1
-                     OR EXISTS (SELECT 1 FROM unnest(i.tags) t WHERE t ILIKE $1)
-                     OR e.label ILIKE $1
-               ORDER BY i.updated_at DESC
-               LIMIT $2""",
-            pattern,
-            limit,
-        )
+                      OR e.label ILIKE $1)"""]
+    if tags:
+        params.append(tags)
+        clauses.append("i.tags @> $2")
+    where = _keyset_where(clauses, params, cursor, alias="i")
+    params.append(limit + 1)
+
+    rows = await pool.fetch(
+        f"""SELECT DISTINCT i.id, i.title, i.description, i.tags,
+                  i.active_version, i.session_id, i.created_at, i.updated_at
+           FROM npl_instructions i
+           LEFT JOIN npl_instruction_embeddings e ON e.instruction_id = i.id
+           {where}
+           ORDER BY {_INSTRUCTION_KEYSET.order_by("i")}
+           LIMIT ${len(params)}""",
+        *params,
+    )
+    rows, next_cursor = _INSTRUCTION_KEYSET.page(rows, limit)
 
     return {
         "mode": "text",
         "query": query,
         "total": len(rows),
         "instructions": [_row_to_dict(r) for r in rows],
+        "next_cursor": next_cursor,
         "status": "ok",
     }
 
@@ -508,6 +527,7 @@ async def instructions_list(
     mode: str = "text",
     tags: Optional[list[str]] = None,
     limit: int = 20,
+    cursor: Optional[str] = None,
 ) -> dict[str, Any]:
     """List and search instructions.
 
@@ -522,6 +542,8 @@ async def instructions_list(
         mode: Search mode -- ``"text"``, ``"intent"``, or ``"all"``.
         tags: Optional tag filter (AND logic).
         limit: Maximum results (default 20, max 100).
+        cursor: ``next_cursor`` of the previous page (text/all modes;
+            intent results are ranked and not paginated).
 
     Returns:
         Dict with matching instructions and metadata.
@@ -535,9 +557,12 @@ async def instructions_list(
 
     pool = await get_pool()
 
-    if mode == "intent" and query:
-        return await _intent_search(pool, query, tags, limit)
-    elif mode == "text" and query:
-        return await _text_search(pool, query, tags, limit)
-    else:
-        return await _list_all(pool, tags, limit)
+    try:
+        if mode == "intent" and query:
+            return await _intent_search(pool, query, tags, limit)
+        elif mode == "text" and query:
+            return await _text_search(pool, query, tags, limit, cursor)
+        else:
+            return await _list_all(pool, tags, limit, cursor)
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e)}
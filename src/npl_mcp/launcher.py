@@ -1137,6 +1137,7 @@ def create_app() -> "FastMCP":
         since: Optional[str] = None,
         full: bool = False,
         with_sections: Optional[list[str]] = None,
+        wait: Optional[float] = None,
     ) -> dict:
         """Pull messages addressed to this agent from the pipe.
 
@@ -1145,9 +1146,13 @@ def create_app() -> "FastMCP":
 
         Args:
             agent: Session UUID (short or full) of the requesting agent.
-            since: ISO-8601 UTC timestamp — only entries updated after this.
+            since: ``latest`` from a previous call (or an ISO-8601 UTC
+                timestamp) — only entries not delivered through it.
             full: If True, ignore ``since`` and return all entries.
             with_sections: Optional list of message_name values to include.
+            wait: Seconds (max 300) to wait for new entries when none match
+                yet, instead of polling. Pass the returned ``latest`` as the
+                next ``since``.
         """
         from npl_mcp.pipes import agent_input_pipe
         return await agent_input_pipe(
@@ -1155,6 +1160,7 @@ def create_app() -> "FastMCP":
             since=since,
             full=full,
             with_sections=with_sections,
+            wait=wait,
         )
 
     @mcp_discoverable(
@@ -2015,6 +2021,7 @@ def create_app() -> "FastMCP":
         base_url: Optional[str] = None,
         viewports: Optional[list[str]] = None,
         themes: Optional[list[str]] = None,
+        concurrency: int = 4,
     ) -> dict:
         """Capture a checkpoint with screenshots across viewports and themes.
 
@@ -2024,6 +2031,7 @@ def create_app() -> "FastMCP":
             base_url: Base URL for relative paths.
             viewports: List of viewport names (default: desktop, mobile).
             themes: List of theme names (default: light, dark).
+            concurrency: Maximum screenshots captured in parallel (default: 4).
         """
         from npl_mcp.browser.checkpoint import capture_checkpoint
         url_configs = [{"name": u.split("/")[-1] or "root", "url": u} for u in urls]
@@ -2031,6 +2039,7 @@ def create_app() -> "FastMCP":
             name=name, urls=url_configs,
             base_url=base_url or "",
             viewports=viewports, themes=themes,
+            concurrency=concurrency,
         )
         return {
             "status": "ok",
@@ -2038,6 +2047,7 @@ def create_app() -> "FastMCP":
             "name": result.name,
             "total_screenshots": result.total_screenshots,
             "timestamp": result.timestamp,
+            "elapsed_ms": result.elapsed_ms,
         }
 
     @mcp_discoverable(
@@ -2098,6 +2108,54 @@ def create_app() -> "FastMCP":
     return mcp
 
 
+def _with_background_services(lifespan):
+    """Wrap an ASGI lifespan with the server's long-lived background services.
+
+    - Metrics buffer: tool-call metrics are queued during requests and
+      flushed in batches; the queue is drained on shutdown.
+    - LiteLLM client: one pooled keepalive client for every LLM call,
+      closed on shutdown.
+    - PDF extraction pool: worker processes are spawned on first use and
+      stopped on shutdown.
+    - Chat hub: one shared LISTEN connection (opened by the first chat
+      stream) fans NOTIFYs out to SSE subscribers; closed on shutdown.
+    - Pipe hub: one shared LISTEN connection (opened by the first
+      waiting input pipe) wakes long-polls and pipe streams; closed on
+      shutdown.
+    - Embedding worker: claims queued instruction embedding jobs in
+      batches; an interrupted batch is reclaimed after its lease.
+    """
+    from contextlib import asynccontextmanager
+
+    @asynccontextmanager
+    async def _lifespan(app):
+        from npl_mcp.meta_tools.llm_client import close_llm_client, start_llm_client
+        from npl_mcp.chat.stream import start_chat_hub, stop_chat_hub
+        from npl_mcp.pipes.stream import start_pipe_hub, stop_pipe_hub
+        from npl_mcp.instructions.embedding_jobs import (
+            start_embedding_worker, stop_embedding_worker,
+        )
+        from npl_mcp.storage.metrics_buffer import start_metrics_buffer, stop_metrics_buffer
+        await start_metrics_buffer()
+        await start_llm_client()
+        await start_chat_hub()
+        await start_pipe_hub()
+        await start_embedding_worker()
+        try:
+            async with lifespan(app) as state:
+                yield state
+        finally:
+            await stop_chat_hub()
+            await stop_embedding_worker()
+            await stop_pipe_hub()
+            await stop_metrics_buffer()
+            await close_llm_client()
+            from npl_mcp.markdown.pdf import shutdown_pool
+            shutdown_pool()
+
+    return _lifespan
+
+
 def create_asgi_app() -> FastAPI:
     """Build the full ASGI app (MCP + frontend).
 
@@ -2107,7 +2165,11 @@ def create_asgi_app() -> FastAPI:
     mcp_sse_app = mcp.http_app(path="/", transport="sse")
     mcp_streamable_app = mcp.http_app(path="/", transport="streamable-http")
 
-    api = FastAPI(title="NPL MCP Server", lifespan=mcp_streamable_app.lifespan, redirect_slashes=False)
+    api = FastAPI(
+        title="NPL MCP Server",
+        lifespan=_with_background_services(mcp_streamable_app.lifespan),
+        redirect_slashes=False,
+    )
     api.add_middleware(MountPathNormalizerMiddleware)
     api.mount("/sse", mcp_sse_app)
     api.mount("/mcp", mcp_streamable_app)
@@ -2,21 +2,130 @@
 
 - Local files: cache next to source (my-file.pdf.md)
 - URLs: cache in .tmp/cache/markdown/ (domain.path.hash.md)
+
+A SQLite index (``index.sqlite`` in the cache dir) records, per source, the
+hash and size of the cached markdown plus what is needed to validate it:
+
+* Local files -- the source's mtime and size at conversion time. A cache is
+  only served while both still match, so edited sources are reconverted.
+* URLs -- the origin's ETag / Last-Modified. A URL cache is fresh for
+  ``max_age`` seconds (measured from the cache file's mtime), then served
+  stale for up to ``stale_while_revalidate`` seconds while the caller
+  refreshes it in the background. Past that it is revalidated with a
+  conditional request; a 304 makes it fresh again without reconverting.
+
+URL cache files are evicted least-recently-used once their total size
+exceeds ``max_bytes``. Sidecar files next to local sources are never
+evicted -- they sit in the user's tree.
+
+The index also holds extracted PDF page text keyed by page fingerprint
+(see ``markdown/pdf.py``), under its own ``max_bytes`` budget. Each cache
+keeps one index connection, used only from its own worker thread.
+
+Configuration via environment variables:
+    NPL_MARKDOWN_CACHE_MAX_BYTES  (default: 268435456 -- 256 MiB)
+    NPL_MARKDOWN_CACHE_SWR        (default: 86400 seconds)
 """
 
+import asyncio
 import hashlib
+import logging
+import os
+import sqlite3
 import time
+import uuid
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from urllib.parse import urlparse
 
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 3600
+DEFAULT_MAX_BYTES = int(os.environ.get("NPL_MARKDOWN_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+DEFAULT_STALE_WHILE_REVALIDATE = int(os.environ.get("NPL_MARKDOWN_CACHE_SWR", "86400"))
+
+# Timeout for conditional revalidation requests
+REVALIDATE_TIMEOUT = 10.0
+# Seconds an index writer waits for another process's lock
+_BUSY_TIMEOUT = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    source TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    cache_path TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    source_mtime_ns INTEGER,
+    source_size INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries (kind, last_access);
+CREATE TABLE IF NOT EXISTS pdf_pages (
+    fingerprint TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pdf_pages_lru ON pdf_pages (last_access);
+"""
+
+
+def _is_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+@dataclass
+class CacheLookup:
+    """Result of ``MarkdownCache.lookup``.
+
+    ``state`` is one of ``fresh``, ``stale`` (servable, refresh in the
+    background), ``expired`` (URL only: revalidate or refetch) or ``miss``.
+    """
+
+    state: str
+    content: Optional[str] = None
+    validators: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def servable(self) -> bool:
+        return self.state in ("fresh", "stale")
+
 
 class MarkdownCache:
     """Hybrid caching: local files next to source, URLs in .tmp/cache/markdown/"""
 
-    def __init__(self, cache_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        stale_while_revalidate: int = DEFAULT_STALE_WHILE_REVALIDATE,
+    ):
         self.cache_dir = cache_dir or Path(".tmp/cache/markdown")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.stale_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.cache_dir / "index.sqlite"
 
     def get_cache_path(self, source: str) -> Path:
         """Get cache path based on source type.
@@ -27,7 +136,7 @@ class MarkdownCache:
         Returns:
             Path where cached markdown should be stored
         """
-        if source.startswith(("http://", "https://")):
+        if _is_url(source):
             # URL: cache in .tmp/cache/markdown/
             # Example: https://example.com/page.html → .tmp/cache/markdown/example.com.page.abc123.md
             return self._url_cache_path(source)
@@ -64,37 +173,384 @@ class MarkdownCache:
 
         return self.cache_dir / f"{domain}.{path_part}.{url_hash}.md"
 
-    async def get_cached(self, source: str, max_age: int = 3600) -> Optional[str]:
-        """Retrieve cached content if valid.
+    def _index_key(self, source: str) -> str:
+        return source if _is_url(source) else str(Path(source).resolve())
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run *fn* on the index thread.
+
+        The index is one long-lived connection owned by a single-thread
+        executor, so every ``_*_sync`` method runs there: queries never
+        block the event loop, need no lock, and a cache hit costs one hop
+        rather than a new connection.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="npl-markdown-index")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    def _index(self) -> sqlite3.Connection:
+        """Return the index connection; the schema runs once (again only if the file was deleted)."""
+        if self._db is not None:
+            if self.index_path.exists():
+                return self._db
+            self._db.close()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.index_path, timeout=_BUSY_TIMEOUT)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+        self._db = db
+        return db
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def lookup(
+        self,
+        source: str,
+        max_age: int = DEFAULT_MAX_AGE,
+        stale_while_revalidate: Optional[int] = None,
+        load: bool = True,
+    ) -> CacheLookup:
+        """Classify the cached entry for *source* without touching the network.
 
         Args:
             source: Source identifier (URL or file path)
-            max_age: Maximum age in seconds for URL caches (default: 1 hour)
-                     Local file caches never expire
+            max_age: Seconds a URL cache is fresh
+            stale_while_revalidate: Extra seconds a URL cache may be served
+                stale (default: the cache's setting; 0 disables)
+            load: Read the cached content; False leaves ``content`` unset
+                for callers that map the cache file instead
 
         Returns:
-            Cached content string if valid, None otherwise
+            CacheLookup with the state, content (when present and loaded)
+            and the stored origin validators
         """
-        cache_path = self.get_cache_path(source)
+        if stale_while_revalidate is None:
+            stale_while_revalidate = self.stale_while_revalidate
+        result = await self._run(self._lookup_sync, source, max_age, stale_while_revalidate, load)
+        if result.state == "fresh":
+            self.hits += 1
+        elif result.state == "stale":
+            self.stale_hits += 1
+        elif result.state == "miss":
+            self.misses += 1
+        return result
 
+    def _lookup_sync(
+        self, source: str, max_age: int, stale_while_revalidate: int, load: bool,
+    ) -> CacheLookup:
+        read = (lambda path: path.read_text()) if load else (lambda path: None)
+        cache_path = self.get_cache_path(source)
         if not cache_path.exists():
-            return None
+            return CacheLookup("miss")
+        db = self._index()
+        key = self._index_key(source)
+        row = db.execute("SELECT * FROM entries WHERE source = ?", (key,)).fetchone()
 
-        # Check age for URL caches only
-        if source.startswith(("http://", "https://")):
+        validators: dict[str, str] = {}
+        if not _is_url(source):
+            if not self._local_valid(source, cache_path, row):
+                # Source changed since conversion
+                return CacheLookup("miss")
+            state = "fresh"
+        else:
+            if row is not None:
+                validators = {
+                    k: row[k] for k in ("etag", "last_modified") if row[k]
+                }
             age = time.time() - cache_path.stat().st_mtime
-            if age > max_age:
-                return None
+            if age <= max_age:
+                state = "fresh"
+            elif age <= max_age + stale_while_revalidate:
+                state = "stale"
+            else:
+                return CacheLookup("expired", read(cache_path), validators)
+        if row is not None:
+            with db:
+                db.execute("UPDATE entries SET last_access = ? WHERE source = ?", (time.time(), key))
+        return CacheLookup(state, read(cache_path), validators)
+
+    def _local_valid(self, source: str, cache_path: Path, row: Optional[sqlite3.Row]) -> bool:
+        """Whether a local-file cache still matches its source."""
+        try:
+            st = Path(source).stat()
+        except OSError:
+            # Source is gone; the cache is all that is left
+            return True
+        if row is None:
+            # Legacy sidecar written before the index existed
+            return cache_path.stat().st_mtime >= st.st_mtime
+        return row["source_mtime_ns"] == st.st_mtime_ns and row["source_size"] == st.st_size
 
-        return cache_path.read_text()
+    async def revalidate(
+        self,
+        source: str,
+        validators: dict[str, str],
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> bool:
+        """Send a conditional request for a URL cache.
+
+        Returns True (and marks the cache fresh) when the origin answers 304.
+        Any other status, a network error, or missing validators return
+        False -- the caller must refetch. *client* reuses a pooled client;
+        once it is closed (a background refresh that outlived its batch) a
+        one-off client is used instead.
+        """
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        if not headers:
+            self.misses += 1
+            return False
+        try:
+            if client is not None and not client.is_closed:
+                not_modified = await self._conditional_get(client, source, headers)
+            else:
+                async with httpx.AsyncClient(timeout=REVALIDATE_TIMEOUT, follow_redirects=True) as own:
+                    not_modified = await self._conditional_get(own, source, headers)
+        except httpx.HTTPError as e:
+            logger.info("Revalidation of %s failed: %s", source, e)
+            not_modified = False
+        if not not_modified:
+            self.misses += 1
+            return False
 
-    async def save_cache(self, source: str, content: str) -> None:
+        await self._run(self._mark_fresh_sync, source)
+        self.revalidated += 1
+        return True
+
+    def _mark_fresh_sync(self, source: str) -> None:
+        now = time.time()
+        os.utime(self.get_cache_path(source), (now, now))
+        db = self._index()
+        with db:
+            db.execute(
+                "UPDATE entries SET stored_at = ?, last_access = ? WHERE source = ?",
+                (now, now, self._index_key(source)),
+            )
+
+    @staticmethod
+    async def _conditional_get(client: httpx.AsyncClient, url: str, headers: dict[str, str]) -> bool:
+        """Whether a conditional GET of *url* answers 304 (the body is not read)."""
+        async with client.stream(
+            "GET", url, headers=headers, timeout=REVALIDATE_TIMEOUT, follow_redirects=True,
+        ) as response:
+            return response.status_code == 304
+
+    async def get_cached(self, source: str, max_age: int = DEFAULT_MAX_AGE) -> Optional[str]:
+        """Retrieve cached content if valid.
+
+        Args:
+            source: Source identifier (URL or file path)
+            max_age: Maximum age in seconds for URL caches (default: 1 hour).
+                     Expired URL caches are revalidated when the origin's
+                     validators are known. Local file caches are valid while
+                     the source file is unchanged.
+
+        Returns:
+            Cached content string if valid, None otherwise
+        """
+        result = await self.lookup(source, max_age=max_age, stale_while_revalidate=0)
+        if result.state == "fresh":
+            return result.content
+        if result.state == "expired" and await self.revalidate(source, result.validators):
+            return result.content
+        return None
+
+    # ------------------------------------------------------------------
+    # Store
+    # ------------------------------------------------------------------
+
+    async def save_cache(
+        self,
+        source: str,
+        content: str,
+        validators: Optional[dict[str, str]] = None,
+    ) -> None:
         """Save content to cache.
 
         Args:
             source: Source identifier (URL or file path)
             content: Markdown content to cache
+            validators: Origin ``etag`` / ``last_modified`` for URLs
         """
+        await self._run(self._save_sync, source, content, validators or {})
+
+    def _save_sync(self, source: str, content: str, validators: dict[str, str]) -> None:
         cache_path = self.get_cache_path(source)
         cache_path.parent.mkdir(parents=True, exist_ok=True)
-        cache_path.write_text(content)
+        encoded = content.encode("utf-8")
+        content_hash = hashlib.sha256(encoded).hexdigest()
+
+        db = self._index()
+        key = self._index_key(source)
+        row = db.execute("SELECT content_hash FROM entries WHERE source = ?", (key,)).fetchone()
+        if row is not None and row["content_hash"] == content_hash and cache_path.exists():
+            # Identical content: only refresh the timestamp
+            now = time.time()
+            os.utime(cache_path, (now, now))
+        else:
+            # Write-then-rename so readers never see a partial file
+            tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+            try:
+                tmp.write_text(content)
+                os.replace(tmp, cache_path)
+            finally:
+                tmp.unlink(missing_ok=True)
+
+        source_mtime_ns = source_size = None
+        if not _is_url(source):
+            try:
+                st = Path(source).stat()
+                source_mtime_ns, source_size = st.st_mtime_ns, st.st_size
+            except OSError:
+                pass
+        now = time.time()
+        with db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries (source, kind, cache_path, content_hash, bytes,"
+                " source_mtime_ns, source_size, etag, last_modified, stored_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, "url" if _is_url(source) else "file", str(cache_path), content_hash,
+                    len(encoded), source_mtime_ns, source_size,
+                    validators.get("etag"), validators.get("last_modified"), now, now,
+                ),
+            )
+            if _is_url(source):
+                self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Delete least recently used URL caches until under ``max_bytes``."""
+        (total,) = db.execute("SELECT COALESCE(SUM(bytes), 0) FROM entries WHERE kind = 'url'").fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = db.execute(
+            "SELECT source, cache_path, bytes FROM entries WHERE kind = 'url' ORDER BY last_access"
+        ).fetchall()
+        # Never evict the entry just written (it is the most recent)
+        for row in rows[:-1]:
+            if total <= self.max_bytes:
+                break
+            Path(row["cache_path"]).unlink(missing_ok=True)
+            db.execute("DELETE FROM entries WHERE source = ?", (row["source"],))
+            total -= row["bytes"]
+            self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # PDF pages
+    # ------------------------------------------------------------------
+
+    async def get_pdf_pages(self, fingerprints: list[str]) -> dict[str, str]:
+        """Return extracted text for the known page *fingerprints*."""
+        if not fingerprints:
+            return {}
+        return await self._run(self._get_pdf_pages_sync, fingerprints)
+
+    def _get_pdf_pages_sync(self, fingerprints: list[str]) -> dict[str, str]:
+        found: dict[str, str] = {}
+        db = self._index()
+        with db:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(fingerprints), 500):
+                batch = fingerprints[start:start + 500]
+                marks = ",".join("?" * len(batch))
+                found.update(
+                    (row["fingerprint"], row["text"])
+                    for row in db.execute(
+                        f"SELECT fingerprint, text FROM pdf_pages WHERE fingerprint IN ({marks})", batch
+                    )
+                )
+                db.execute(
+                    f"UPDATE pdf_pages SET last_access = ? WHERE fingerprint IN ({marks})",
+                    [time.time(), *batch],
+                )
+        return found
+
+    async def save_pdf_pages(self, pages: dict[str, str]) -> None:
+        """Store extracted page text by fingerprint, evicting LRU over ``max_bytes``."""
+        if not pages:
+            return
+        await self._run(self._save_pdf_pages_sync, pages)
+
+    def _save_pdf_pages_sync(self, pages: dict[str, str]) -> None:
+        now = time.time()
+        db = self._index()
+        with db:
+            db.executemany(
+                "INSERT OR REPLACE INTO pdf_pages (fingerprint, text, bytes, last_access)"
+                " VALUES (?, ?, ?, ?)",
+                [(fp, text, len(text.encode("utf-8")), now) for fp, text in pages.items()],
+            )
+            (total,) = db.execute("SELECT COALESCE(SUM(bytes), 0) FROM pdf_pages").fetchone()
+            if total <= self.max_bytes:
+                return
+            rows = db.execute(
+                "SELECT fingerprint, bytes FROM pdf_pages WHERE last_access < ? ORDER BY last_access",
+                (now,),
+            ).fetchall()
+            for row in rows:
+                if total <= self.max_bytes:
+                    break
+                db.execute("DELETE FROM pdf_pages WHERE fingerprint = ?", (row["fingerprint"],))
+                total -= row["bytes"]
+                self.evictions += 1
+
+    # ------------------------------------------------------------------
+    # Background refresh and stats
+    # ------------------------------------------------------------------
+
+    def schedule_refresh(self, source: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """Run *refresh* in the background unless one is already running.
+
+        Returns True when a new refresh task was started.
+        """
+        if source in self._refreshing:
+            return False
+
+        async def _run() -> None:
+            try:
+                await refresh()
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", source, e)
+            finally:
+                self._refreshing.pop(source, None)
+
+        self._refreshing[source] = asyncio.create_task(_run())
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for health reporting."""
+        served = self.hits + self.stale_hits + self.revalidated
+        total = served + self.misses
+        return {
+            "cache_dir": str(self.cache_dir),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refreshing": len(self._refreshing),
+            "hit_ratio": round(served / total, 4) if total else 0.0,
+        }
+
+
+_shared: Optional[MarkdownCache] = None
+
+
+def get_markdown_cache() -> MarkdownCache:
+    """Return the process-wide cache used by the ToMarkdown tool."""
+    global _shared
+    if _shared is None:
+        _shared = MarkdownCache()
+    return _shared
@@ -1,15 +1,18 @@
 """Markdown converter - convert URLs, files, and images to markdown."""
 
+import asyncio
 import base64
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
 import httpx
 import html2text
-import pdfplumber
 
-from .cache import MarkdownCache
+from . import pdf as pdf_pages
+from .cache import DEFAULT_MAX_AGE, CacheLookup, MarkdownCache
 
 
 def _parse_sse_stream(lines: list[str]) -> str:
@@ -36,11 +39,36 @@ def _parse_sse_stream(lines: list[str]) -> str:
     return "\n".join(last_data)
 
 
+# Conversions in progress: (cache path, fallback_parser, save, pages) -> future
+_inflight: dict[tuple[str, bool, bool, Optional[str]], asyncio.Future] = {}
+
+
 class MarkdownConverter:
     """Convert various sources to markdown."""
 
-    def __init__(self, cache: MarkdownCache):
+    def __init__(self, cache: MarkdownCache, client: Optional[httpx.AsyncClient] = None):
+        """Initialize the converter.
+
+        Args:
+            cache: Conversion cache
+            client: Shared HTTP client for URL fetches (e.g. a batch run's
+                pooled client). Without one, each fetch opens its own.
+        """
         self.cache = cache
+        self.client = client
+
+    @asynccontextmanager
+    async def _http(self, timeout: float, follow_redirects: bool = False) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the shared client, or a one-off client when none was given.
+
+        A closed shared client (a background refresh that outlived its
+        batch) also falls back to a one-off client.
+        """
+        if self.client is not None and not self.client.is_closed:
+            yield self.client
+            return
+        async with httpx.AsyncClient(timeout=timeout, follow_redirects=follow_redirects) as client:
+            yield client
 
     async def convert(
         self,
@@ -49,6 +77,8 @@ class MarkdownConverter:
         timeout: int = 30,
         no_cache: bool = False,
         fallback_parser: bool = False,
+        max_age: int = DEFAULT_MAX_AGE,
+        pages: Optional[str] = None,
     ) -> str:
         """Convert source to markdown with caching.
 
@@ -59,37 +89,188 @@ class MarkdownConverter:
             no_cache: Skip both reading from and writing to cache
             fallback_parser: If True, fall back to direct html2text when Jina fails.
                 If False (default), use Jina only.
+            max_age: Seconds a cached URL conversion is fresh. Stale caches
+                are served while a background refresh runs; expired ones
+                are revalidated with a conditional request first.
+            pages: 1-based page selection for local PDFs (e.g. ``"1-5,9"``).
+                Partial conversions bypass the whole-document cache but
+                still use the per-page cache.
 
         Returns:
             Formatted markdown with YAML metadata header
         """
+        known = False
+        if pages is not None and (
+            source.startswith(("http://", "https://")) or not source.lower().endswith(".pdf")
+        ):
+            raise ValueError("pages= only applies to local PDF files")
+
+        # Check cache first (unless no_cache, force_refresh or a page selection)
+        if not force_refresh and not no_cache and pages is None:
+            hit = await self.cache.lookup(source, max_age=max_age)
+            known = hit.state != "miss"
+            if hit.content and await self._servable(source, hit, timeout, fallback_parser):
+                return self._format_response(source, hit.content, cached=True)
+
+        content = await self._convert_shared(
+            source, timeout, fallback_parser, refresh=known, save=not no_cache, pages=pages,
+        )
+        return self._format_response(source, content, cached=False)
 
-        # Check cache first (unless no_cache or force_refresh)
-        if not force_refresh and not no_cache:
-            cached = await self.cache.get_cached(source)
-            if cached:
-                return self._format_response(source, cached, cached=True)
+    async def cached_path(
+        self,
+        source: str,
+        timeout: int = 30,
+        fallback_parser: bool = False,
+        max_age: int = DEFAULT_MAX_AGE,
+    ) -> Optional[Path]:
+        """Return the cache file for *source* if it can be served as is.
+
+        Applies the same freshness rules as ``convert`` (stale entries
+        schedule a background refresh, expired ones are revalidated) but
+        never reads the file, so callers can map large documents instead
+        of loading them. Returns None when ``convert`` would have to run.
+        """
+        hit = await self.cache.lookup(source, max_age=max_age, load=False)
+        if hit.state == "miss":
+            return None
+        cache_path = self.cache.get_cache_path(source)
+        if cache_path.stat().st_size and await self._servable(source, hit, timeout, fallback_parser):
+            return cache_path
+        return None
+
+    async def _servable(
+        self, source: str, hit: CacheLookup, timeout: int, fallback_parser: bool,
+    ) -> bool:
+        """Refresh or revalidate a non-empty cache hit as needed; return whether to serve it."""
+        if hit.state == "stale":
+            self.cache.schedule_refresh(
+                source, lambda: self._refresh(source, timeout, fallback_parser, hit.validators)
+            )
+        elif hit.state == "expired":
+            if await self.cache.revalidate(source, hit.validators, client=self.client):
+                hit.state = "fresh"
+        return hit.servable
 
-        # Determine source type and convert
-        if source.startswith(("http://", "https://")):
-            content = await self._convert_url(source, timeout, fallback_parser=fallback_parser)
-        elif source.endswith((".png", ".jpg", ".jpeg", ".gif", ".svg")):
-            content = await self._convert_image(source)
-        elif source.endswith(".pdf"):
-            content = await self._convert_pdf(source, timeout)
-        elif source.endswith((".docx", ".doc")):
-            content = await self._convert_docx(source)
-        elif source.endswith((".html", ".htm")):
-            content = await self._convert_html(source)
-        else:
-            # Assume it's already markdown or text
-            content = Path(source).read_text()
-
-        # Save to cache (unless no_cache)
-        if not no_cache:
-            await self.cache.save_cache(source, content)
+    async def _convert_shared(
+        self,
+        source: str,
+        timeout: int,
+        fallback_parser: bool,
+        *,
+        refresh: bool,
+        save: bool,
+        pages: Optional[str] = None,
+    ) -> str:
+        """Convert *source* once for every concurrent caller and cache it.
 
-        return self._format_response(source, content, cached=False)
+        Callers converting the same source (same cache file and options)
+        while a conversion is running await that conversion instead of
+        starting their own, so the source is fetched/parsed once and the
+        cache file is written once. Exceptions propagate to every waiter.
+
+        Args:
+            refresh: The source was cached before -- probe URL validators,
+                and never replace the old cache with empty content.
+            save: Write the result to the cache (page selections only use
+                the per-page cache)
+            pages: PDF page selection
+        """
+        key = (str(self.cache.get_cache_path(source)), fallback_parser, save, pages)
+        pending = _inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The leading caller was cancelled; convert on our own below
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            content, validators = await self._convert_source(
+                source, timeout, fallback_parser, probe_validators=refresh,
+                pages=pages, use_cache=save,
+            )
+            if save and pages is None and (content or not refresh):
+                await self.cache.save_cache(source, content, validators=validators)
+            future.set_result(content)
+            return content
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a future nobody awaited does not log a warning
+            future.exception()
+            raise
+        finally:
+            if _inflight.get(key) is future:
+                del _inflight[key]
+
+    async def _convert_source(
+        self,
+        source: str,
+        timeout: int,
+        fallback_parser: bool,
+        *,
+        probe_validators: bool = False,
+        pages: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> tuple[str, dict[str, str]]:
+        """Dispatch on source type and return ``(content, origin validators)``.
+
+        Validators are only probed (a HEAD request alongside the conversion)
+        for URLs that were cached before, so first conversions cost nothing
+        extra and later refreshes can be conditional.
+        """
+        if source.startswith(("http://", "https://")):
+            if not probe_validators:
+                return await self._convert_url(source, timeout, fallback_parser=fallback_parser), {}
+            content, validators = await asyncio.gather(
+                self._convert_url(source, timeout, fallback_parser=fallback_parser),
+                self._fetch_validators(source, timeout),
+            )
+            return content, validators
+        if source.endswith((".png", ".jpg", ".jpeg", ".gif", ".svg")):
+            return await self._convert_image(source), {}
+        if source.endswith(".pdf"):
+            return await self._convert_pdf(source, timeout, pages=pages, use_cache=use_cache), {}
+        if source.endswith((".docx", ".doc")):
+            return await self._convert_docx(source), {}
+        if source.endswith((".html", ".htm")):
+            return await self._convert_html(source), {}
+        # Assume it's already markdown or text
+        return Path(source).read_text(), {}
+
+    async def _refresh(
+        self,
+        source: str,
+        timeout: int,
+        fallback_parser: bool,
+        validators: dict[str, str],
+    ) -> None:
+        """Background refresh of a stale URL cache."""
+        if validators and await self.cache.revalidate(source, validators, client=self.client):
+            return
+        await self._convert_shared(source, timeout, fallback_parser, refresh=True, save=True)
+
+    async def _fetch_validators(self, url: str, timeout: int) -> dict[str, str]:
+        """Return the origin's ETag / Last-Modified for *url* (empty on failure)."""
+        try:
+            async with self._http(min(timeout, 10), follow_redirects=True) as client:
+                response = await client.head(url, timeout=min(timeout, 10), follow_redirects=True)
+        except httpx.HTTPError:
+            return {}
+        if response.status_code >= 400:
+            return {}
+        validators = {}
+        if response.headers.get("etag"):
+            validators["etag"] = response.headers["etag"]
+        if response.headers.get("last-modified"):
+            validators["last_modified"] = response.headers["last-modified"]
+        return validators
 
     async def _convert_url(self, url: str, timeout: int, *, fallback_parser: bool = False) -> str:
         """Convert URL to markdown via Jina Reader.
@@ -137,8 +318,8 @@ class MarkdownConverter:
         if jina_api_key:
             headers["Authorization"] = f"Bearer {jina_api_key}"
 
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            async with client.stream("GET", jina_url, headers=headers) as response:
+        async with self._http(timeout) as client:
+            async with client.stream("GET", jina_url, headers=headers, timeout=timeout) as response:
                 response.raise_for_status()
                 return _parse_sse_stream(
                     [line async for line in response.aiter_lines()]
@@ -146,10 +327,8 @@ class MarkdownConverter:
 
     async def _convert_url_direct(self, url: str, timeout: int) -> str:
         """Fetch URL and convert HTML to markdown with html2text."""
-        async with httpx.AsyncClient(
-            timeout=timeout, follow_redirects=True
-        ) as client:
-            response = await client.get(url)
+        async with self._http(timeout, follow_redirects=True) as client:
+            response = await client.get(url, timeout=timeout, follow_redirects=True)
             response.raise_for_status()
 
         h = html2text.HTML2Text()
@@ -223,20 +402,29 @@ class MarkdownConverter:
         markdown = h.handle(html_content)
         return markdown.strip()
 
-    async def _convert_pdf(self, file_path: str, timeout: int = 60) -> str:
+    async def _convert_pdf(
+        self,
+        file_path: str,
+        timeout: int = 60,
+        pages: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
         """Convert PDF to markdown using Jina API or local converter.
 
         Args:
             file_path: Path to PDF file
             timeout: Request timeout in seconds for Jina API
+            pages: Optional 1-based page selection (local conversion only)
+            use_cache: Read and write the per-page cache
 
         Returns:
             Markdown content from PDF
         """
         jina_api_key = os.environ.get("JINA_API_KEY", "")
 
-        # Use Jina API when available (better structure preservation)
-        if jina_api_key:
+        # Use Jina API when available (better structure preservation).
+        # Jina converts whole documents, so page selections stay local.
+        if jina_api_key and pages is None:
             try:
                 return await self._convert_pdf_via_jina(file_path, jina_api_key, timeout)
             except Exception as e:
@@ -246,7 +434,12 @@ class MarkdownConverter:
 
         # Fallback to local pdfplumber conversion
         try:
-            return await self._convert_pdf_local(file_path)
+            return await self._convert_pdf_local(file_path, pages=pages, use_cache=use_cache)
+        except ValueError as e:
+            if pages is not None:
+                # Report a bad page selection as such
+                raise
+            raise RuntimeError(f"Failed to convert PDF {file_path}: {e}")
         except Exception as e:
             raise RuntimeError(f"Failed to convert PDF {file_path}: {e}")
 
@@ -293,32 +486,54 @@ class MarkdownConverter:
             else:
                 raise RuntimeError(f"Jina API error: {data}")
 
-    async def _convert_pdf_local(self, file_path: str) -> str:
+    async def _convert_pdf_local(
+        self,
+        file_path: str,
+        pages: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
         """Convert PDF to markdown using local pdfplumber library.
 
         Args:
             file_path: Path to PDF file
+            pages: Optional 1-based page selection (e.g. ``"1-5,9"``)
+            use_cache: Read and write the per-page cache
 
         Returns:
             Markdown content from PDF
         """
-        text_content = []
-        with pdfplumber.open(file_path) as pdf:
-            # Extract text from each page
-            for page_num, page in enumerate(pdf.pages, 1):
-                text = page.extract_text()
-                if text:
-                    # Add page marker for structure
-                    text_content.append(f"## Page {page_num}\n")
-                    text_content.append(text)
-                    text_content.append("")
-
-        result = "\n".join(text_content)
+        result = "\n".join([chunk async for chunk in self.stream_pdf(file_path, pages, use_cache=use_cache)])
         # If no text was extracted, raise an error
         if not result.strip():
             raise ValueError("No text content could be extracted from PDF")
         return result
 
+    async def stream_pdf(
+        self,
+        file_path: str,
+        pages: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """Yield the markdown of each PDF page, in order, as pages are extracted.
+
+        Extraction runs off the event loop in page-range chunks (see
+        ``markdown/pdf.py``); pages seen before come from the per-page cache.
+        Pages without text are skipped.
+
+        Args:
+            file_path: Path to PDF file
+            pages: Optional 1-based page selection (e.g. ``"1-5,9"``)
+            use_cache: Read and write the per-page cache
+        """
+        async for number, text in pdf_pages.stream_pages(
+            file_path,
+            pages,
+            load=self.cache.get_pdf_pages if use_cache else None,
+            save=self.cache.save_pdf_pages if use_cache else None,
+        ):
+            if text:
+                yield pdf_pages.format_page(number, text)
+
     async def _convert_docx(self, file_path: str) -> str:
         """Convert DOCX to markdown.
 
@@ -58,8 +58,7 @@ def apply_filter(content: str, selector: str) -> str:
         Filtered markdown content
 
     Raises:
-        NotImplementedError: For CSS/XPath filters (Phase 2)
-        ValueError: For invalid selectors
+        ValueError: For invalid CSS/XPath selectors
     """
     filter_type = detect_filter_type(selector)
 
@@ -79,3 +78,29 @@ def apply_filter(content: str, selector: str) -> str:
         from .xpath import XPathFilter
 
         return XPathFilter().filter(content, selector)
+
+
+def select_lines(content: str, selector: str) -> list[int]:
+    """Return the source line of each block a CSS/XPath selector matches.
+
+    Used to locate matches in the heading outline for context rendering.
+
+    Args:
+        content: Markdown content
+        selector: ``css:`` or ``xpath:`` selector
+
+    Returns:
+        0-based line numbers in document order
+
+    Raises:
+        ValueError: For heading selectors or invalid CSS/XPath selectors
+    """
+    from .tree import compile_css, compile_xpath, get_tree
+
+    filter_type = detect_filter_type(selector)
+    if filter_type == FilterType.HEADING:
+        raise ValueError(f"Not a CSS or XPath selector: {selector!r}")
+    expression = selector.split(":", 1)[1]
+    compiled = compile_css(expression) if filter_type == FilterType.CSS else compile_xpath(expression)
+    tree = get_tree(content)
+    return tree.source_lines(tree.select(compiled))
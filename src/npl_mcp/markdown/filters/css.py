@@ -1,12 +1,21 @@
-"""CSS selector filter for markdown (stub for Phase 2)."""
+"""CSS selector filter for markdown.
+
+The document is compiled to a memoized lxml tree (see ``tree``); matched
+elements are returned as the markdown they were rendered from.
+"""
+
+from .tree import compile_css, get_tree
 
 
 class CSSFilter:
-    """CSS selector filter (stub for Phase 2)."""
+    """CSS selector filter."""
 
     def filter(self, content: str, selector: str) -> str:
         """Apply CSS selector to markdown (converted to HTML first).
 
+        Headings carry ``id`` attributes from their kebab-case names, so
+        ``#api-reference`` selects the "API Reference" heading.
+
         Args:
             content: Markdown content
             selector: CSS selector
@@ -15,9 +24,10 @@ class CSSFilter:
             Filtered markdown
 
         Raises:
-            NotImplementedError: Coming in Phase 2
+            ValueError: If the selector is invalid
         """
-        raise NotImplementedError(
-            "CSS filtering coming in Phase 2. "
-            "Will convert markdown → HTML → apply CSS selector → convert back to markdown"
-        )
+        tree = get_tree(content)
+        pieces = tree.to_markdown(content, tree.select(compile_css(selector)))
+        if not pieces:
+            return f"# Error: No elements match: {selector}"
+        return "\n\n".join(pieces)
@@ -6,10 +6,20 @@ Supported syntax:
 - "heading-a > *" - All content under heading-a
 - "h2" - All level 2 headings
 - "heading-a:subsection" - Named subsection under heading-a
+
+Selectors are resolved against the memoized outline index from
+``npl_mcp.markdown.outline``; results are sliced from the original text.
 """
 
 import re
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+from ..outline import Buffer, Outline, get_outline, normalize_heading_name
+
+_LEVEL_SELECTOR_RE = re.compile(r"^h[1-6]$")
+
+# A navigation step: one heading index, or a list of sibling indices
+_Selection = Union[int, Sequence[int]]
 
 
 class HeadingFilter:
@@ -30,279 +40,129 @@ class HeadingFilter:
         Returns:
             Normalized heading name in kebab-case
         """
-        # Convert to lowercase
-        normalized = text.lower()
-        # Replace spaces and underscores with hyphens
-        normalized = re.sub(r'[\s_]+', '-', normalized)
-        # Remove non-alphanumeric characters except hyphens
-        normalized = re.sub(r'[^a-z0-9\-]', '', normalized)
-        # Remove consecutive hyphens
-        normalized = re.sub(r'-+', '-', normalized)
-        # Strip leading/trailing hyphens
-        normalized = normalized.strip('-')
-        return normalized
-
-    def filter_with_context(self, content: str, selector: str) -> Dict[str, Any]:
-        """Apply filter while preserving document context by marking matches.
+        return normalize_heading_name(text)
 
-        Instead of extracting the matched section, this returns the full
-        document structure with matched sections marked for context-aware rendering.
+    def _resolve(self, outline: Outline, selector: str) -> Tuple[List[int], Optional[str]]:
+        """Resolve a heading path to outline indices.
 
         Args:
-            content: Markdown content to filter
+            outline: Outline of the document
             selector: Heading selector (path, level, or name)
 
         Returns:
-            Dict with:
-                - 'sections': Full document structure with marking flags
-                - 'has_matches': Whether any sections matched
-                - 'matched_ids': Set of IDs of matched sections
+            Tuple of (matched heading indices, first path step not found)
         """
-        # Parse selector into path parts
         parts = [p.strip() for p in selector.split(">")]
 
-        # Parse markdown into sections
-        sections = self._parse_sections(content)
-
-        # Navigate path to find matched section(s)
-        current = sections
+        current: _Selection = outline.roots
         for part in parts:
             if part == "*":
-                # Match all at current level
-                if isinstance(current, dict):
-                    current = current.get("children", [])
-                break
-            else:
-                # Find matching section
-                if isinstance(current, list):
-                    current = self._find_section(current, part)
-                else:
-                    # Already narrowed to single section, search its children
-                    current = self._find_section(current.get("children", []), part)
-
-                if not current:
-                    return {
-                        'sections': sections,
-                        'has_matches': False,
-                        'matched_ids': set()
-                    }
-
-        # Ensure current is a list for consistent handling
-        if isinstance(current, dict):
-            current = [current]
-
-        # Mark matched sections and their ancestors
-        matched_ids = set()
-        for matched_section in current:
-            self._mark_matched(matched_section, matched_ids)
-            self._mark_ancestors(sections, matched_section)
-
-        return {
-            'sections': sections,
-            'has_matches': len(matched_ids) > 0,
-            'matched_ids': matched_ids
-        }
+                # All content at current level; for a single section, its children
+                if isinstance(current, int):
+                    return list(outline.headings[current].children), None
+                return list(current), None
+            # Already narrowed to a single section: search its children
+            siblings = outline.headings[current].children if isinstance(current, int) else current
+            found = self._find_section(outline, siblings, part)
+            if found is None:
+                return [], part
+            current = found
+
+        return ([current] if isinstance(current, int) else list(current)), None
+
+    def filter_with_context(
+        self, content: Buffer, selector: str, outline: Optional[Outline] = None,
+    ) -> Dict[str, Any]:
+        """Apply filter while preserving document context by marking matches.
 
-    def filter(self, content: str, selector: str) -> str:
-        """Apply heading selector to markdown content.
+        Instead of extracting the matched section, this returns the document
+        outline with the matched headings and their ancestors for
+        context-aware rendering.
 
         Args:
             content: Markdown content to filter
             selector: Heading selector (path, level, or name)
+            outline: Prebuilt outline of *content* (e.g. of a mapped file)
 
         Returns:
-            Filtered markdown content
-        """
-        # Parse selector into path parts
-        parts = [p.strip() for p in selector.split(">")]
-
-        # Parse markdown into sections
-        sections = self._parse_sections(content)
-
-        # Navigate path
-        current = sections
-        for part in parts:
-            if part == "*":
-                # Return all content at current level
-                # If current is a single section, return its children
-                if isinstance(current, dict):
-                    children = current.get("children", [])
-                    return self._sections_to_markdown(children)
-                # If current is a list, return all sections in that list
-                return self._sections_to_markdown(current)
-            else:
-                # Find matching section
-                if isinstance(current, list):
-                    current = self._find_section(current, part)
-                else:
-                    # Already narrowed to single section, search its children
-                    current = self._find_section(current.get("children", []), part)
-
-                if not current:
-                    return f"# Error: Section not found: {part}"
-
-        if isinstance(current, list):
-            return self._sections_to_markdown(current)
-        else:
-            return self._sections_to_markdown([current])
-
-    def _mark_matched(self, section: Dict[str, Any], matched_ids: set) -> None:
-        """Mark only the directly matched section (not children).
-
-        Children are tracked implicitly via tree traversal.
-
-        Args:
-            section: Section dictionary to mark
-            matched_ids: Set to accumulate matched section IDs
+            Dict with:
+                - 'outline': Outline index of the full document
+                - 'has_matches': Whether any sections matched
+                - 'matched_ids': Set of outline indices of matched sections
+                - 'ancestor_ids': Set of outline indices of their ancestors
         """
-        section['matched'] = True
-        matched_ids.add(id(section))
-
-    def _mark_ancestors(self, sections: List[Dict[str, Any]], matched_section: Dict[str, Any]) -> bool:
-        """Mark all ancestors of matched section for context rendering.
+        if outline is None:
+            outline = get_outline(content)
+        matched, _ = self._resolve(outline, selector)
 
-        Recursively searches the section tree to find the matched section,
-        and marks all its ancestors with 'matched_ancestor' flag.
+        ancestors: Set[int] = set()
+        for index in matched:
+            ancestors.update(outline.ancestors(index))
 
-        Args:
-            sections: List of sections to search
-            matched_section: The matched section to find ancestors for
+        return {
+            'outline': outline,
+            'has_matches': len(matched) > 0,
+            'matched_ids': set(matched),
+            'ancestor_ids': ancestors,
+        }
 
-        Returns:
-            True if the matched section was found and ancestors were marked
-        """
-        def find_and_mark_ancestors(section_list, target, ancestors_chain):
-            for section in section_list:
-                # Check if this is the target section
-                if id(section) == id(target):
-                    # Mark all ancestors
-                    for ancestor in ancestors_chain:
-                        ancestor['matched_ancestor'] = True
-                    return True
-
-                # Recurse into children
-                if find_and_mark_ancestors(
-                    section.get('children', []),
-                    target,
-                    ancestors_chain + [section]
-                ):
-                    return True
-
-            return False
-
-        return find_and_mark_ancestors(sections, matched_section, [])
-
-    def _parse_sections(self, content: str) -> List[Dict[str, Any]]:
-        """Parse markdown into hierarchical sections.
+    def filter(self, content: Buffer, selector: str, outline: Optional[Outline] = None) -> str:
+        """Apply heading selector to markdown content.
 
         Args:
-            content: Markdown content
+            content: Markdown content to filter (or the buffer *outline* indexes)
+            selector: Heading selector (path, level, or name)
+            outline: Prebuilt outline of *content* (e.g. of a mapped file)
 
         Returns:
-            List of section dictionaries with hierarchy
+            Filtered markdown content
         """
-        sections = []
-        current_stack: List[Dict[str, Any]] = []
-        lines = content.split("\n")
-
-        for i, line in enumerate(lines):
-            # Match heading lines (# Heading, ## Heading, etc.)
-            match = re.match(r"^(#{1,6})\s+(.+?)(?:\s*#*)?$", line)
-            if match:
-                level = len(match.group(1))
-                text = match.group(2).strip()
-
-                section = {
-                    "level": level,
-                    "text": text,
-                    "start": i,
-                    "end": len(lines),
-                    "content": [],
-                    "children": [],
-                }
-
-                # Pop stack until we find parent level or reach root
-                while current_stack and current_stack[-1]["level"] >= level:
-                    current_stack.pop()
-
-                # Add to parent or root
-                if not current_stack:
-                    sections.append(section)
-                else:
-                    current_stack[-1]["children"].append(section)
-
-                current_stack.append(section)
-            elif current_stack:
-                # Add content to current section
-                current_stack[-1]["content"].append(line)
-
-        return sections
-
-    def _find_section(self, sections: List[Dict[str, Any]], selector: str) -> Optional[Dict[str, Any]]:
+        if outline is None:
+            outline = get_outline(content)
+        matched, missing = self._resolve(outline, selector)
+        if missing is not None:
+            return f"# Error: Section not found: {missing}"
+        return outline.sections_markdown(content, matched)
+
+    def _find_section(self, outline: Outline, siblings: Sequence[int], selector: str) -> Optional[int]:
         """Find section matching selector.
 
         Searches recursively through the entire section tree if needed.
 
         Args:
-            sections: List of sections to search
+            outline: Outline of the document
+            siblings: Outline indices to search
             selector: Heading selector (name, level, or normalized name)
 
         Returns:
-            Matching section or None
+            Matching outline index or None
         """
+        headings = outline.headings
+
         # Handle level selectors (h1, h2, etc.)
-        if re.match(r"^h[1-6]$", selector):
+        if _LEVEL_SELECTOR_RE.match(selector):
             level = int(selector[1])
-            for section in sections:
-                if section["level"] == level:
-                    return section
+            for index in siblings:
+                if headings[index].level == level:
+                    return index
             return None
 
         # Normalize selector for matching
-        normalized_selector = self._normalize_heading_name(selector)
+        normalized_selector = normalize_heading_name(selector)
+        lowered = selector.lower()
 
         # First pass: search at current level only
-        for section in sections:
-            section_text = section["text"]
-            # Match by raw text (case-insensitive)
-            if section_text.lower() == selector.lower():
-                return section
-            # Match by normalized name
-            if self._normalize_heading_name(section_text) == normalized_selector:
-                return section
+        for index in siblings:
+            heading = headings[index]
+            # Match by raw text (case-insensitive) or by normalized name
+            if heading.text.lower() == lowered or heading.name == normalized_selector:
+                return index
 
         # Second pass: search recursively if not found at current level
         # This allows finding nested headings even when not specifying full path
-        for section in sections:
-            result = self._find_section(section.get("children", []), selector)
-            if result:
+        for index in siblings:
+            result = self._find_section(outline, headings[index].children, selector)
+            if result is not None:
                 return result
 
         return None
-
-    def _sections_to_markdown(self, sections: List[Dict[str, Any]]) -> str:
-        """Convert sections back to markdown.
-
-        Args:
-            sections: List of section dictionaries
-
-        Returns:
-            Markdown content
-        """
-        lines = []
-
-        for section in sections:
-            # Add heading
-            heading_prefix = "#" * section["level"]
-            lines.append(f"{heading_prefix} {section['text']}")
-
-            # Add content
-            lines.extend(section["content"])
-
-            # Add children recursively
-            if section["children"]:
-                child_markdown = self._sections_to_markdown(section["children"])
-                if child_markdown:
-                    lines.append(child_markdown)
-
-        return "\n".join(lines)
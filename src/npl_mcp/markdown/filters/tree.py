@@ -0,0 +1,220 @@
+"""Markdown compiled to an lxml tree for CSS and XPath filters.
+
+The markdown is rendered to HTML with markdown-it, and every block element
+carries the source lines it came from (``data-line-start`` /
+``data-line-end``). Headings get ``id`` attributes from their normalized
+names, so ``css:#api-reference`` works like a heading filter. Matched
+elements are serialized back to markdown by slicing those original lines.
+Inline elements, which have no source map, go through html2text.
+
+Trees are memoized by content hash, and compiled selectors are cached by
+their text. Repeat queries against the same document therefore only pay
+for the XPath evaluation.
+
+Configuration via environment variables:
+    NPL_FILTER_TREE_CACHE_SIZE  (default: 16 documents)
+"""
+
+import functools
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import html2text
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from markdown_it import MarkdownIt
+
+from ..outline import normalize_heading_name
+
+TREE_CACHE_SIZE = int(os.environ.get("NPL_FILTER_TREE_CACHE_SIZE", "16"))
+
+# Same line breaks markdown-it normalizes before assigning source maps
+_LINE_BREAK_RE = re.compile(r"\r\n?|\n")
+
+_markdown = MarkdownIt("commonmark").enable("table")
+
+
+@dataclass(frozen=True)
+class DocumentTree:
+    """An lxml tree of a markdown document plus its line offsets."""
+
+    root: lxml_html.HtmlElement
+    line_starts: tuple[int, ...]  # offset of each line
+    line_ends: tuple[int, ...]  # offset of each line's break (or end of text)
+
+    def select(self, compiled: etree.XPath) -> list[Any]:
+        """Evaluate a compiled selector; scalars are returned as a one-item list.
+
+        Raises:
+            ValueError: If evaluation fails (e.g. an unknown XPath function)
+        """
+        try:
+            result = compiled(self.root)
+        except etree.XPathError as e:
+            raise ValueError(f"Selector evaluation failed: {e}") from None
+        if isinstance(result, list):
+            return result
+        return [result]
+
+    def lines(self, content: str, start: int, end: int) -> str:
+        """Return source lines ``[start, end)`` of *content*."""
+        end = min(end, len(self.line_starts))
+        if start >= end:
+            return ""
+        return content[self.line_starts[start]:self.line_ends[end - 1]]
+
+    def line_range(self, element: Any) -> Optional[tuple[int, int]]:
+        """Return the source lines an element spans, or None for inline content."""
+        if not isinstance(element, etree._Element):
+            return None
+        if element.get("data-line-start") is not None:
+            return int(element.get("data-line-start")), int(element.get("data-line-end"))
+        # Wrappers without a map (pre, th, body, ...) span their mapped descendants
+        spans = [
+            (int(node.get("data-line-start")), int(node.get("data-line-end")))
+            for node in element.iterdescendants()
+            if node.get("data-line-start") is not None
+        ]
+        if not spans:
+            return None
+        return min(s for s, _ in spans), max(e for _, e in spans)
+
+    def source_lines(self, results: Iterable[Any]) -> list[int]:
+        """Return the first source line of the block holding each result.
+
+        Inline elements and text/attribute results resolve to their nearest
+        mapped ancestor; scalars (counts, booleans) have no line.
+        """
+        lines = []
+        for result in results:
+            node = result
+            while node is not None:
+                span = self.line_range(node)
+                if span is not None:
+                    lines.append(span[0])
+                    break
+                getparent = getattr(node, "getparent", None)
+                node = getparent() if getparent is not None else None
+        return lines
+
+    def to_markdown(self, content: str, results: Iterable[Any]) -> list[str]:
+        """Serialize selector results back to markdown, in document order.
+
+        Blocks nested in an already emitted block are skipped.
+        """
+        pieces: list[str] = []
+        covered_until = -1
+        for result in results:
+            span = self.line_range(result)
+            if span is not None:
+                start, end = span
+                if end <= covered_until:
+                    continue
+                start = max(start, covered_until)
+                covered_until = end
+                pieces.append(self.lines(content, start, end).rstrip())
+            elif isinstance(result, etree._Element):
+                pieces.append(_html_to_markdown(
+                    lxml_html.tostring(result, encoding="unicode", with_tail=False)
+                ))
+            elif isinstance(result, bool):
+                pieces.append("true" if result else "false")
+            elif isinstance(result, float) and result.is_integer():
+                pieces.append(str(int(result)))
+            else:
+                pieces.append(str(result))
+        return [piece for piece in pieces if piece]
+
+
+def _html_to_markdown(fragment: str) -> str:
+    """Convert an inline HTML fragment to markdown."""
+    converter = html2text.HTML2Text()
+    converter.body_width = 0
+    return converter.handle(fragment).strip()
+
+
+def build_tree(content: str) -> DocumentTree:
+    """Compile *content* to an lxml tree annotated with source lines."""
+    tokens = _markdown.parse(content)
+    used_ids: dict[str, int] = {}
+    for i, token in enumerate(tokens):
+        if not token.block or token.nesting < 0 or token.map is None:
+            continue
+        token.attrSet("data-line-start", str(token.map[0]))
+        token.attrSet("data-line-end", str(token.map[1]))
+        if token.type == "heading_open":
+            anchor = normalize_heading_name(tokens[i + 1].content) or "section"
+            count = used_ids.get(anchor, 0)
+            used_ids[anchor] = count + 1
+            token.attrSet("id", anchor if count == 0 else f"{anchor}-{count}")
+
+    body = _markdown.renderer.render(tokens, _markdown.options, {})
+    root = lxml_html.document_fromstring(f"<html><body>{body}</body></html>")
+
+    starts = [0]
+    ends = []
+    for match in _LINE_BREAK_RE.finditer(content):
+        ends.append(match.start())
+        starts.append(match.end())
+    ends.append(len(content))
+    return DocumentTree(root=root, line_starts=tuple(starts), line_ends=tuple(ends))
+
+
+_trees: "OrderedDict[bytes, DocumentTree]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_tree(content: str) -> DocumentTree:
+    """Return the tree of *content*, reusing one built for identical text."""
+    key = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _lock:
+        tree = _trees.get(key)
+        if tree is not None:
+            _trees.move_to_end(key)
+            return tree
+    tree = build_tree(content)
+    with _lock:
+        _trees[key] = tree
+        while len(_trees) > TREE_CACHE_SIZE:
+            _trees.popitem(last=False)
+    return tree
+
+
+def tree_cache_clear() -> None:
+    """Drop memoized trees and compiled selectors (for testing)."""
+    with _lock:
+        _trees.clear()
+    compile_css.cache_clear()
+    compile_xpath.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def compile_css(selector: str) -> etree.XPath:
+    """Compile a CSS selector.
+
+    Raises:
+        ValueError: If the selector is invalid
+    """
+    try:
+        return CSSSelector(selector, translator="html")
+    except Exception as e:
+        raise ValueError(f"Invalid CSS selector {selector!r}: {e}") from None
+
+
+@functools.lru_cache(maxsize=256)
+def compile_xpath(expression: str) -> etree.XPath:
+    """Compile an XPath expression.
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    try:
+        return etree.XPath(expression)
+    except etree.XPathSyntaxError as e:
+        raise ValueError(f"Invalid XPath expression {expression!r}: {e}") from None
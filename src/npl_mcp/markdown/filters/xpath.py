@@ -1,8 +1,15 @@
-"""XPath filter for markdown (stub for Phase 2)."""
+"""XPath filter for markdown.
+
+The document is compiled to a memoized lxml tree (see ``tree``); matched
+elements are returned as the markdown they were rendered from, and string,
+number or boolean results as their text.
+"""
+
+from .tree import compile_xpath, get_tree
 
 
 class XPathFilter:
-    """XPath filter (stub for Phase 2)."""
+    """XPath filter."""
 
     def filter(self, content: str, selector: str) -> str:
         """Apply XPath to markdown (converted to HTML first).
@@ -15,9 +22,10 @@ class XPathFilter:
             Filtered markdown
 
         Raises:
-            NotImplementedError: Coming in Phase 2
+            ValueError: If the expression is invalid
         """
-        raise NotImplementedError(
-            "XPath filtering coming in Phase 2. "
-            "Will convert markdown → HTML → apply XPath → convert back to markdown"
-        )
+        tree = get_tree(content)
+        pieces = tree.to_markdown(content, tree.select(compile_xpath(selector)))
+        if not pieces:
+            return f"# Error: No elements match: {selector}"
+        return "\n\n".join(pieces)
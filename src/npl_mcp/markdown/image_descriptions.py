@@ -1,11 +1,19 @@
-"""Image description injection with YAML caching.
+"""Image description injection with SQLite caching.
 
 Parses markdown for image references, describes them via multi-modal LLM,
-and caches descriptions in a YAML file keyed by image URI + model.
+and caches descriptions in a SQLite table keyed by image URI + model.
+
+The store is safe to share between processes (WAL journal, busy timeout).
+A document's new descriptions are written together by ``set_many`` in one
+transaction of per-row upserts, so concurrent conversions only replace the
+rows they describe and never clobber each other's. Descriptions from the
+older YAML cache file are imported on first use.
 """
 
 import asyncio
 import re
+import sqlite3
+from contextlib import closing
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -16,46 +24,128 @@ import yaml
 from npl_mcp.meta_tools.llm_client import describe_image
 
 # Default cache location (project convention: .tmp/ for persistent temp files)
-DEFAULT_CACHE_FILE = Path(".tmp/cache/image_descriptions.yaml")
+DEFAULT_CACHE_FILE = Path(".tmp/cache/image_descriptions.sqlite")
+
+# Seconds a writer waits for another process's lock
+_BUSY_TIMEOUT = 10.0
 
 # Regex for markdown image references: ![alt](uri)
 _IMAGE_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS descriptions (
+    image_uri TEXT NOT NULL,
+    model TEXT NOT NULL,
+    description TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (image_uri, model)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS yaml_imports (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+"""
 
-class ImageDescriptionCache:
-    """YAML-based cache for LLM-generated image descriptions."""
 
-    def __init__(self, cache_file: Path = DEFAULT_CACHE_FILE):
-        self.cache_file = cache_file
-        self._cache: dict = self._load()
+class ImageDescriptionCache:
+    """SQLite-backed cache for LLM-generated image descriptions.
 
-    def _load(self) -> dict:
-        if self.cache_file.exists():
-            return yaml.safe_load(self.cache_file.read_text()) or {}
-        return {}
+    ``cache_file`` is the database path. A legacy ``.yaml`` path is also
+    accepted: the database then lives next to it with a ``.sqlite`` suffix.
+    Either way the sibling YAML file, if present, is imported once (and
+    again if it changes); existing rows win over imported ones.
+    """
 
-    def _save(self) -> None:
+    def __init__(self, cache_file: Path = DEFAULT_CACHE_FILE):
+        cache_file = Path(cache_file)
+        if cache_file.suffix.lower() in (".yaml", ".yml"):
+            self.yaml_file = cache_file
+            self.cache_file = cache_file.with_suffix(".sqlite")
+        else:
+            self.cache_file = cache_file
+            self.yaml_file = cache_file.with_suffix(".yaml")
         self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        self.cache_file.write_text(yaml.dump(self._cache, sort_keys=False))
-
-    @staticmethod
-    def _key(image_uri: str, model: str) -> str:
-        return f"{image_uri}::{model}"
+        with closing(self._connect()) as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+        if self.yaml_file.exists():
+            self.import_yaml(self.yaml_file)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.cache_file, timeout=_BUSY_TIMEOUT)
+
+    def import_yaml(self, yaml_file: Path, force: bool = False) -> int:
+        """Import descriptions from a YAML cache written by earlier versions.
+
+        Skips files already imported at their current mtime unless *force*.
+
+        Returns:
+            Number of new rows stored
+        """
+        yaml_file = Path(yaml_file)
+        mtime_ns = yaml_file.stat().st_mtime_ns
+        key = str(yaml_file.resolve())
+        with closing(self._connect()) as db, db:
+            row = db.execute("SELECT mtime_ns FROM yaml_imports WHERE path = ?", (key,)).fetchone()
+            if row is not None and row[0] == mtime_ns and not force:
+                return 0
+            data = yaml.safe_load(yaml_file.read_text()) or {}
+            rows = []
+            for compound, entry in data.items():
+                image_uri, sep, model = str(compound).rpartition("::")
+                if not sep or not isinstance(entry, dict) or not entry.get("description"):
+                    continue
+                rows.append((
+                    image_uri, model, entry["description"],
+                    str(entry.get("created_at") or datetime.now(tz=timezone.utc).isoformat()),
+                ))
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO descriptions (image_uri, model, description, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            imported = db.total_changes - before
+            db.execute(
+                "INSERT OR REPLACE INTO yaml_imports (path, mtime_ns) VALUES (?, ?)", (key, mtime_ns),
+            )
+        return imported
 
     def get(self, image_uri: str, model: str) -> Optional[str]:
         """Return cached description or None."""
-        entry = self._cache.get(self._key(image_uri, model))
-        if isinstance(entry, dict):
-            return entry.get("description")
-        return None
+        return self.get_many([image_uri], model).get(image_uri)
+
+    def get_many(self, image_uris: list[str], model: str) -> dict[str, str]:
+        """Return ``{image_uri: description}`` for the cached URIs."""
+        found: dict[str, str] = {}
+        uris = list(dict.fromkeys(image_uris))
+        with closing(self._connect()) as db:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(uris), 500):
+                batch = uris[start:start + 500]
+                marks = ",".join("?" * len(batch))
+                found.update(db.execute(
+                    f"SELECT image_uri, description FROM descriptions"
+                    f" WHERE model = ? AND image_uri IN ({marks})",
+                    [model, *batch],
+                ).fetchall())
+        return found
 
     def set(self, image_uri: str, model: str, description: str) -> None:
-        """Cache a description and persist to YAML."""
-        self._cache[self._key(image_uri, model)] = {
-            "description": description,
-            "created_at": datetime.now(tz=timezone.utc).isoformat(),
-        }
-        self._save()
+        """Cache one description."""
+        self.set_many({image_uri: description}, model)
+
+    def set_many(self, descriptions: dict[str, str], model: str) -> None:
+        """Cache several descriptions in one transaction."""
+        if not descriptions:
+            return
+        now = datetime.now(tz=timezone.utc).isoformat()
+        with closing(self._connect()) as db, db:
+            db.executemany(
+                "INSERT OR REPLACE INTO descriptions (image_uri, model, description, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                [(uri, model, desc, now) for uri, desc in descriptions.items()],
+            )
 
 
 def _resolve_image_uri(uri: str, base_url: Optional[str] = None) -> str:
@@ -86,13 +176,14 @@ async def inject_image_descriptions(
     Args:
         markdown: Input markdown text with ``![alt](uri)`` references.
         model: Multi-modal LLM model name for descriptions.
-        cache_file: Override cache file path (default .tmp/cache/image_descriptions.yaml).
+        cache_file: Override cache file path (default .tmp/cache/image_descriptions.sqlite).
         base_url: Base URL for resolving relative image URIs (e.g. source page URL).
 
     Returns:
         Markdown with descriptions injected after each image reference.
     """
-    cache = ImageDescriptionCache(cache_file or DEFAULT_CACHE_FILE)
+    # SQLite may wait on another process's lock; keep it off the event loop
+    cache = await asyncio.to_thread(ImageDescriptionCache, cache_file or DEFAULT_CACHE_FILE)
 
     # Collect all image matches with resolved URIs
     matches: list[tuple[re.Match, str]] = []
@@ -104,16 +195,12 @@ async def inject_image_descriptions(
     if not matches:
         return markdown
 
-    # Separate cached vs uncached
-    descriptions: dict[str, Optional[str]] = {}
+    # Separate cached vs uncached (one query for the whole document)
     errors: dict[str, str] = {}
-    uncached: list[str] = []
-    for _, image_uri in matches:
-        if image_uri not in descriptions:
-            cached_desc = cache.get(image_uri, model)
-            descriptions[image_uri] = cached_desc
-            if cached_desc is None:
-                uncached.append(image_uri)
+    descriptions: dict[str, Optional[str]] = dict(
+        await asyncio.to_thread(cache.get_many, [uri for _, uri in matches], model)
+    )
+    uncached = [uri for uri in dict.fromkeys(uri for _, uri in matches) if uri not in descriptions]
 
     # Fetch uncached descriptions in parallel
     if uncached:
@@ -125,12 +212,15 @@ async def inject_image_descriptions(
                 return uri, None, f"{type(exc).__name__}: {exc}"
 
         results = await asyncio.gather(*[_describe(uri) for uri in uncached])
+        fresh: dict[str, str] = {}
         for uri, desc, err in results:
             descriptions[uri] = desc
             if desc is not None:
-                cache.set(uri, model, desc)
+                fresh[uri] = desc
             elif err is not None:
                 errors[uri] = err
+        # One write for every new description on the page
+        await asyncio.to_thread(cache.set_many, fresh, model)
 
     # Rebuild markdown with descriptions injected
     parts: list[str] = []
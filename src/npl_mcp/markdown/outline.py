@@ -0,0 +1,261 @@
+"""One-pass heading outline for markdown documents.
+
+``build_outline`` scans a document once with a compiled multiline pattern
+and records every ATX heading with its level, text, normalized name, line
+number, parent link and the offsets of its heading line, own body and
+whole section. Filters and the viewer then slice the original buffer by
+those offsets instead of splitting it into per-section line lists.
+
+Offsets are positions in the indexed buffer: characters for ``str``,
+bytes for ``bytes``/``mmap`` buffers. ``get_outline`` memoizes outlines of
+``str`` documents by content hash, so repeated views of the same cached
+document skip the scan entirely; ``get_file_outline`` does the same for
+memory-mapped files, keyed by the mapped descriptor's stat.
+
+Configuration via environment variables:
+    NPL_OUTLINE_CACHE_SIZE  (default: 64 documents)
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Union
+
+# Same heading grammar as the original per-line parser; [^\S\n] keeps
+# whitespace matches from crossing line boundaries in MULTILINE mode.
+HEADING_RE = re.compile(r"^(#{1,6})[^\S\n]+(.+?)(?:[^\S\n]*#*)?$", re.MULTILINE)
+
+# UTF-8 encodings of the characters str patterns treat as \s (minus \n), so
+# byte buffers recognize exactly the same headings as decoded text
+_WS_BYTES = (
+    rb"(?:[\t\x0b\x0c\r \x1c-\x1f]|\xc2[\x85\xa0]|\xe1\x9a\x80"
+    rb"|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)"
+)
+_HEADING_RE_BYTES = re.compile(
+    rb"^(#{1,6})" + _WS_BYTES + rb"+(.+?)(?:" + _WS_BYTES + rb"*#*)?$", re.MULTILINE,
+)
+
+_SEPARATORS_RE = re.compile(r"[\s_]+")
+_INVALID_RE = re.compile(r"[^a-z0-9\-]")
+_HYPHENS_RE = re.compile(r"-+")
+
+OUTLINE_CACHE_SIZE = int(os.environ.get("NPL_OUTLINE_CACHE_SIZE", "64"))
+
+Buffer = Union[str, bytes, mmap.mmap]
+
+
+def normalize_heading_name(text: str) -> str:
+    """Normalize heading text to kebab-case for matching.
+
+    Examples:
+        "Mereological nihilism" -> "mereological-nihilism"
+        "API Reference" -> "api-reference"
+        "HTTP/2" -> "http2"
+    """
+    normalized = _SEPARATORS_RE.sub("-", text.lower())
+    normalized = _INVALID_RE.sub("", normalized)
+    normalized = _HYPHENS_RE.sub("-", normalized)
+    return normalized.strip("-")
+
+
+@dataclass(frozen=True, slots=True)
+class Heading:
+    """One heading and the extent of its section."""
+
+    index: int
+    level: int
+    text: str
+    name: str
+    line: int  # 0-based line number of the heading
+    start: int  # offset of the heading line
+    head_end: int  # offset of the newline ending the heading line
+    body_end: int  # end of the heading's own body (before the next heading's newline)
+    end: int  # end of the section including all subsections
+    parent: int  # index of the enclosing heading, -1 at top level
+    stop: int  # index one past the last descendant
+    children: tuple[int, ...]
+
+    @property
+    def has_body(self) -> bool:
+        """Whether any lines sit between this heading and the next one."""
+        return self.head_end < self.body_end
+
+    @property
+    def markdown_heading(self) -> str:
+        """The heading line rewritten without closing hashes or extra spaces."""
+        return f"{'#' * self.level} {self.text}"
+
+
+@dataclass(frozen=True, slots=True)
+class Outline:
+    """Heading index of one document."""
+
+    headings: tuple[Heading, ...]
+    roots: tuple[int, ...]
+    size: int  # length of the indexed buffer
+    origin: int = 0  # offset where the document starts within the buffer
+
+    @property
+    def preamble_end(self) -> int:
+        """End offset of the text before the first heading (below ``origin`` when there is none)."""
+        if not self.headings:
+            return self.size
+        return self.headings[0].start - 1
+
+    def section_at(self, line: int) -> int:
+        """Return the innermost heading whose section contains *line* (-1 before the first)."""
+        return bisect.bisect_right(self.headings, line, key=lambda heading: heading.line) - 1
+
+    def text(self, buffer: Buffer, start: int, end: int) -> str:
+        """Return ``buffer[start:end]`` as text."""
+        return _text(buffer, start, end)
+
+    def ancestors(self, index: int) -> list[int]:
+        """Return parent links from *index* up to its top-level heading."""
+        chain = []
+        parent = self.headings[index].parent
+        while parent >= 0:
+            chain.append(parent)
+            parent = self.headings[parent].parent
+        return chain
+
+    def body(self, buffer: Buffer, index: int) -> str:
+        """Return the lines directly under heading *index* (before any subheading)."""
+        heading = self.headings[index]
+        return _text(buffer, heading.head_end + 1, heading.body_end)
+
+    def sections_markdown(self, buffer: Buffer, indices: Iterable[int]) -> str:
+        """Render whole sections, with heading lines normalized.
+
+        Equivalent to joining each section's heading, body and subsections
+        with newlines, but built from slices of *buffer*.
+        """
+        pieces = []
+        for index in indices:
+            for heading in self.headings[index:self.headings[index].stop]:
+                if heading.has_body:
+                    pieces.append(f"{heading.markdown_heading}\n{self.body(buffer, heading.index)}")
+                else:
+                    pieces.append(heading.markdown_heading)
+        return "\n".join(pieces)
+
+
+def _text(buffer: Buffer, start: int, end: int) -> str:
+    """Slice *buffer* and return text."""
+    chunk = buffer[start:end]
+    if isinstance(chunk, str):
+        return chunk
+    return chunk.decode("utf-8", "replace")
+
+
+def build_outline(buffer: Buffer, origin: int = 0) -> Outline:
+    """Index every heading of *buffer* in one pass.
+
+    Args:
+        buffer: Document text, bytes or a read-only mmap of a UTF-8 file
+        origin: Offset where the document starts (e.g. after a metadata
+            header); it should follow a newline
+    """
+    if isinstance(buffer, str):
+        pattern, newline = HEADING_RE, "\n"
+    else:
+        pattern, newline = _HEADING_RE_BYTES, b"\n"
+    size = len(buffer)
+
+    rows: list[list] = []
+    children: list[list[int]] = []
+    roots: list[int] = []
+    stack: list[int] = []
+    line = 0
+    last = origin
+    for match in pattern.finditer(buffer, origin):
+        start = match.start()
+        if isinstance(buffer, mmap.mmap):
+            line += buffer[last:start].count(newline)
+        else:
+            line += buffer.count(newline, last, start)
+        last = start
+        level = len(match.group(1))
+        text = match.group(2)
+        if not isinstance(text, str):
+            text = text.decode("utf-8", "replace")
+        text = text.strip()
+
+        index = len(rows)
+        if rows:
+            # The previous heading's body ends where this line begins
+            rows[-1][6] = start - 1
+        while stack and rows[stack[-1]][1] >= level:
+            closed = stack.pop()
+            rows[closed][7] = start - 1
+            rows[closed][9] = index
+        parent = stack[-1] if stack else -1
+        (children[parent] if parent >= 0 else roots).append(index)
+        # index, level, text, line, start, head_end, body_end, end, parent, stop
+        rows.append([index, level, text, line, start, match.end(), size, size, parent, 0])
+        children.append([])
+        stack.append(index)
+
+    for open_index in stack:
+        rows[open_index][9] = len(rows)
+
+    headings = tuple(
+        Heading(
+            index=index, level=level, text=text, name=normalize_heading_name(text),
+            line=line_no, start=start, head_end=head_end, body_end=body_end, end=end,
+            parent=parent, stop=stop, children=tuple(children[index]),
+        )
+        for index, level, text, line_no, start, head_end, body_end, end, parent, stop in rows
+    )
+    return Outline(headings=headings, roots=tuple(roots), size=size, origin=origin)
+
+
+_outlines: "OrderedDict[Hashable, Outline]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _memoized(key: Hashable, build: Callable[[], Outline]) -> Outline:
+    """Return the outline stored under *key*, building it on a miss."""
+    with _lock:
+        outline = _outlines.get(key)
+        if outline is not None:
+            _outlines.move_to_end(key)
+            return outline
+    outline = build()
+    with _lock:
+        _outlines[key] = outline
+        while len(_outlines) > OUTLINE_CACHE_SIZE:
+            _outlines.popitem(last=False)
+    return outline
+
+
+def get_outline(content: str) -> Outline:
+    """Return the outline of *content*, reusing one built for identical text."""
+    key = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return _memoized(key, lambda: build_outline(content))
+
+
+def get_file_outline(st: os.stat_result, buffer: Buffer, origin: int = 0) -> Outline:
+    """Return the outline of a mapped file, keyed by its inode, mtime and size.
+
+    Hashing would read every page of the file, so files are identified by
+    *st* instead -- ``os.fstat`` of the mapped descriptor, so an
+    ``os.replace`` of the path between mapping and keying cannot pair the
+    new file's key with the old file's outline. Rewriting the file
+    invalidates the entry.
+    """
+    key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, origin)
+    return _memoized(key, lambda: build_outline(buffer, origin))
+
+
+def outline_cache_clear() -> None:
+    """Drop memoized outlines (for testing)."""
+    with _lock:
+        _outlines.clear()
@@ -0,0 +1,225 @@
+"""Page-wise local PDF extraction.
+
+Text extraction with pdfplumber is CPU-bound and holds the GIL, so large
+PDFs are split into page-range chunks that run in a process pool; small
+ones run in a worker thread. Either way the event loop stays free.
+
+Pages are identified by a fingerprint of their media box, raw content
+streams and resolved ``/Resources`` (fonts, XObjects and their streams,
+recursively) -- content like ``/Fm0 Do`` means nothing without the
+objects it names. ``stream_pages`` asks a page store for already-extracted
+fingerprints first, so re-viewing a large spec only extracts pages that
+changed or were never seen.
+
+Configuration via environment variables:
+    NPL_PDF_WORKERS      (default: min(4, CPU count) processes)
+    NPL_PDF_CHUNK_PAGES  (default: 16 pages per task)
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+
+import pdfplumber
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import PSLiteral
+
+PDF_WORKERS = int(os.environ.get("NPL_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_CHUNK_PAGES = int(os.environ.get("NPL_PDF_CHUNK_PAGES", "16"))
+
+# (fingerprints) -> {fingerprint: text} for pages extracted earlier
+PageLoader = Callable[[list[str]], Awaitable[dict[str, str]]]
+# ({fingerprint: text}) -> None, persists newly extracted pages
+PageSaver = Callable[[dict[str, str]], Awaitable[None]]
+
+
+def parse_page_range(spec: Optional[str], total: int) -> list[int]:
+    """Parse a 1-based page selection like ``"1-5,8,10-"`` into page numbers.
+
+    Open-ended ranges run to the last page; pages past ``total`` are dropped.
+
+    Raises:
+        ValueError: If the spec is malformed or selects no pages
+    """
+    if spec is None or not spec.strip():
+        return list(range(1, total + 1))
+    selected: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        try:
+            if "-" in part:
+                lo, _, hi = part.partition("-")
+                start = int(lo) if lo.strip() else 1
+                end = int(hi) if hi.strip() else total
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range {spec!r}") from None
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range {spec!r}")
+        selected.update(range(start, min(end, total) + 1))
+    if not selected:
+        raise ValueError(f"Page range {spec!r} is outside the document's {total} pages")
+    return sorted(selected)
+
+
+def _object_digest(obj, memo: dict[int, bytes], active: set[int]) -> bytes:
+    """Digest a PDF object and everything it references.
+
+    Indirect objects are digested once per file (*memo*); a reference back
+    into an object being digested (*active*) contributes only its marker.
+    """
+    if isinstance(obj, PDFObjRef):
+        if obj.objid in memo:
+            return memo[obj.objid]
+        if obj.objid in active:
+            return b"cycle"
+        active.add(obj.objid)
+        try:
+            digest = _object_digest(resolve1(obj), memo, active)
+        finally:
+            active.discard(obj.objid)
+        memo[obj.objid] = digest
+        return digest
+
+    h = hashlib.sha256()
+    if isinstance(obj, PDFStream):
+        h.update(b"stream")
+        h.update(_object_digest(obj.attrs, memo, active))
+        h.update(obj.get_rawdata() or b"")
+    elif isinstance(obj, dict):
+        h.update(b"dict")
+        for key in sorted(obj, key=str):
+            # /Parent leads back up the page tree, not to page content
+            if str(key) == "Parent":
+                continue
+            h.update(str(key).encode())
+            h.update(_object_digest(obj[key], memo, active))
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"list")
+        for item in obj:
+            h.update(_object_digest(item, memo, active))
+    elif isinstance(obj, PSLiteral):
+        h.update(b"name" + str(obj.name).encode())
+    else:
+        h.update(repr(obj).encode())
+    return h.digest()
+
+
+def page_fingerprints(file_path: str) -> list[str]:
+    """Return a fingerprint per page from its content streams and resources.
+
+    Only parses the page tree and the objects pages reference -- no text
+    layout -- so it is cheap relative to extraction. Objects shared across
+    pages (fonts, forms) are digested once per file.
+    """
+    fingerprints = []
+    memo: dict[int, bytes] = {}
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            digest = hashlib.sha256(repr(page.page_obj.mediabox).encode())
+            contents = page.page_obj.contents or []
+            if not isinstance(contents, list):
+                contents = [contents]
+            for stream in contents:
+                digest.update(resolve1(stream).get_rawdata() or b"")
+            digest.update(_object_digest(page.page_obj.resources or {}, memo, set()))
+            fingerprints.append(digest.hexdigest()[:32])
+    return fingerprints
+
+
+def extract_pages(file_path: str, page_numbers: list[int]) -> list[tuple[int, str]]:
+    """Extract text for 1-based *page_numbers* (runs in a worker)."""
+    results = []
+    with pdfplumber.open(file_path) as pdf:
+        for number in page_numbers:
+            results.append((number, pdf.pages[number - 1].extract_text() or ""))
+    return results
+
+
+def format_page(number: int, text: str) -> str:
+    """Render one page as it appears in the converted document."""
+    return f"## Page {number}\n\n{text}\n"
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared extraction pool (spawned lazily).
+
+    Uses the spawn start method: forking a process that runs aiosqlite and
+    httpx threads is unsafe.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the extraction pool (for shutdown and tests)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def stream_pages(
+    file_path: str,
+    pages: Optional[str] = None,
+    *,
+    load: Optional[PageLoader] = None,
+    save: Optional[PageSaver] = None,
+    chunk_pages: int = PDF_CHUNK_PAGES,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[tuple[int, str]]:
+    """Yield ``(page number, text)`` in page order as extraction completes.
+
+    Args:
+        file_path: Path to the PDF
+        pages: Optional 1-based selection (see ``parse_page_range``)
+        load: Returns cached text for page fingerprints
+        save: Persists text for newly extracted fingerprints
+        chunk_pages: Pages per extraction task
+        executor: Override the pool (defaults to processes when more than
+            one chunk is needed, otherwise a thread)
+    """
+    fingerprints = await asyncio.to_thread(page_fingerprints, file_path)
+    numbers = parse_page_range(pages, len(fingerprints))
+    cached = await load([fingerprints[n - 1] for n in numbers]) if load else {}
+    missing = [n for n in numbers if fingerprints[n - 1] not in cached]
+
+    chunks = [missing[i:i + chunk_pages] for i in range(0, len(missing), chunk_pages)]
+    loop = asyncio.get_running_loop()
+    if executor is None and len(chunks) > 1 and PDF_WORKERS > 1:
+        executor = _get_pool()
+    tasks = [
+        loop.run_in_executor(executor, extract_pages, file_path, chunk) for chunk in chunks
+    ]
+    pending = dict(zip((chunk[0] for chunk in chunks), tasks))
+
+    extracted: dict[int, str] = {}
+    try:
+        for number in numbers:
+            fingerprint = fingerprints[number - 1]
+            if fingerprint in cached:
+                yield number, cached[fingerprint]
+                continue
+            if number not in extracted:
+                # Pages are consumed in order, so this is the first page of
+                # the next chunk; later chunks keep running meanwhile
+                chunk = await pending.pop(number)
+                extracted.update(chunk)
+                if save:
+                    await save({fingerprints[n - 1]: text for n, text in chunk})
+            yield number, extracted.pop(number)
+    finally:
+        for task in pending.values():
+            task.cancel()
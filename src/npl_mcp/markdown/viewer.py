@@ -1,8 +1,32 @@
-"""Markdown viewer with filtering and collapsing support."""
+"""Markdown viewer with filtering and collapsing support.
 
+Collapsing and context rendering walk the memoized heading outline
+(``npl_mcp.markdown.outline``) and slice the document by its offsets.
+``view_file`` applies the same rendering to a memory-mapped file, so large
+cached documents never have to be loaded whole.
+"""
+
+import mmap
+import os
 import re
+from pathlib import Path
 from typing import Optional
 
+from .outline import Buffer, Outline, get_file_outline, get_outline
+
+# Collapsed headings keep their raw text (including any closing hashes)
+_COLLAPSED_HEADING_RE = re.compile(r"(#{1,6})\s+(.+)")
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", "replace")
+
+
+def _is_tree_selector(selector: str) -> bool:
+    """Whether *selector* is a CSS/XPath selector rather than a heading path."""
+    from .filters import FilterType, detect_filter_type
+    return detect_filter_type(selector) is not FilterType.HEADING
+
 
 class MarkdownViewer:
     """Filter and view markdown with optional collapsible sections."""
@@ -19,7 +43,9 @@ class MarkdownViewer:
 
         Args:
             content: Markdown content
-            filter: Optional heading filter selector
+            filter: Optional heading, ``css:`` or ``xpath:`` selector. In
+                context mode, CSS/XPath matches expand the sections that
+                contain them.
             bare: If True, extract ONLY filtered content (no context)
                   If False (default), show full document with filtered section highlighted
             depth: Collapse level for entire document (1-6)
@@ -45,31 +71,125 @@ class MarkdownViewer:
             viewer.view(content, bare=False, depth=2)
         """
         # No filter specified
-        if not filter:
-            if depth is not None:
-                return self._collapse_sections(content, depth)
+        if not filter and depth is None:
             return content
 
-        # Bare mode: extract only (backward compatibility)
+        # CSS/XPath selectors run against the document's lxml tree
+        if filter and _is_tree_selector(filter):
+            return self._view_selector(content, filter, bare, depth, filter_inner_depth)
+
+        return self._view(content, get_outline(content), filter, bare, depth, filter_inner_depth)
+
+    def view_file(
+        self,
+        path: Path,
+        filter: Optional[str] = None,
+        bare: bool = False,
+        depth: Optional[int] = None,
+        filter_inner_depth: Optional[int] = None,
+        start: int = 0,
+    ) -> str:
+        """Like ``view``, but read a markdown file through a read-only mmap.
+
+        The heading outline is built over the mapping (memoized by the
+        mapped descriptor's stat) and only the sections that end up in the
+        result are decoded, so memory use follows the size of the output,
+        not of the document.
+
+        Args:
+            path: UTF-8 markdown file (e.g. a conversion cache file)
+            filter: Optional heading filter selector
+            bare: If True, extract ONLY filtered content (no context)
+            depth: Collapse level for entire document (1-6)
+            filter_inner_depth: Collapse level WITHIN filtered sections only (1-6)
+            start: Byte offset where the document begins, just after a
+                newline (skips a metadata header)
+
+        Returns:
+            The same result ``view`` gives for the file's text from *start*
+        """
+        with Path(path).open("rb") as f:
+            # Stat the open descriptor: the path may be replaced meanwhile
+            st = os.fstat(f.fileno())
+            if st.st_size == 0:
+                # Empty files cannot be mapped
+                return self.view("", filter, bare, depth, filter_inner_depth)
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if not filter and depth is None:
+                    return _decode(buffer[start:])
+
+                if filter and _is_tree_selector(filter):
+                    # The lxml tree needs the whole text
+                    return self._view_selector(
+                        _decode(buffer[start:]), filter, bare, depth, filter_inner_depth
+                    )
+
+                outline = get_file_outline(st, buffer, start)
+                return self._view(buffer, outline, filter, bare, depth, filter_inner_depth)
+
+    def _view_selector(
+        self,
+        content: str,
+        filter: str,
+        bare: bool,
+        depth: Optional[int],
+        filter_inner_depth: Optional[int],
+    ) -> str:
+        """Render a CSS/XPath filter; context mode expands the sections holding matches."""
+        from .filters import apply_filter, select_lines
+
         if bare:
-            from .filters import apply_filter
             return apply_filter(content, filter)
 
-        # Context mode: show full document with filtered section highlighted
+        outline = get_outline(content)
+        matched = {outline.section_at(line) for line in select_lines(content, filter)}
+        matched.discard(-1)
+        if not matched:
+            return f"# Error: Section not found: {filter}"
+
+        ancestors: set = set()
+        for index in matched:
+            ancestors.update(outline.ancestors(index))
+        return self._render_with_context(
+            content, outline, matched, ancestors, depth, filter_inner_depth
+        )
+
+    def _view(
+        self,
+        content: Buffer,
+        outline: Outline,
+        filter: Optional[str],
+        bare: bool,
+        depth: Optional[int],
+        filter_inner_depth: Optional[int],
+    ) -> str:
+        """Render a heading filter and/or collapse from *outline* over *content*."""
+        if not filter:
+            return self._collapse_sections(content, depth, outline)
+
         from .filters.heading import HeadingFilter
-        marked = HeadingFilter().filter_with_context(content, filter)
+
+        # Bare mode: extract only (backward compatibility)
+        if bare:
+            return HeadingFilter().filter(content, filter, outline=outline)
+
+        # Context mode: show full document with filtered section highlighted
+        marked = HeadingFilter().filter_with_context(content, filter, outline=outline)
 
         if not marked['has_matches']:
             return f"# Error: Section not found: {filter}"
 
         return self._render_with_context(
-            marked['sections'],
+            content,
+            marked['outline'],
             marked['matched_ids'],
+            marked['ancestor_ids'],
             depth,
             filter_inner_depth
         )
 
-    def _collapse_sections(self, content: str, depth: int) -> str:
+    def _collapse_sections(self, content: Buffer, depth: int, outline: Optional[Outline] = None) -> str:
         """Collapse sections below specified depth.
 
         When depth=2, shows:
@@ -81,55 +201,48 @@ class MarkdownViewer:
         Content under collapsed headings is hidden.
 
         Args:
-            content: Markdown content
+            content: Markdown content (or the buffer *outline* indexes)
             depth: Show headings up to this level expanded, collapse below
+            outline: Prebuilt outline of *content*
 
         Returns:
             Markdown with collapsed indicators (📦 emoji) for levels > depth
         """
-        lines = []
+        if outline is None:
+            outline = get_outline(content)
+        pieces = []
+        if outline.preamble_end >= outline.origin:
+            pieces.append(outline.text(content, outline.origin, outline.preamble_end))
+
         in_collapsed_section = False
         collapsed_section_depth = 0
-
-        for line in content.split("\n"):
-            # Check if heading
-            match = re.match(r"^(#{1,6})\s+(.+)$", line)
-            if match:
-                level = len(match.group(1))
-                heading_text = match.group(2)
-
-                # If we're returning to a level <= depth, exit collapsed section
-                if level <= depth:
-                    in_collapsed_section = False
-                    # This heading is at or above depth - show it fully expanded
-                    lines.append(line)
-                else:
-                    # Level > depth: show heading but mark as collapsed
-                    if not in_collapsed_section:
-                        # First level below threshold - show heading with emoji marker
-                        heading_prefix = "#" * level
-                        lines.append(f"{heading_prefix} {heading_text} 📦")
-                        in_collapsed_section = True
-                        collapsed_section_depth = level
-                    elif level < collapsed_section_depth:
-                        # Return to a shallower collapsed level - show but mark as collapsed
-                        heading_prefix = "#" * level
-                        lines.append(f"{heading_prefix} {heading_text} 📦")
-                        collapsed_section_depth = level
-                    # else: deeper nested under collapse - skip entirely
-            else:
-                # Content line
-                if not in_collapsed_section:
-                    # Show content for expanded sections
-                    lines.append(line)
-                # Skip content for collapsed sections
-
-        return "\n".join(lines)
+        for heading in outline.headings:
+            # If we're returning to a level <= depth, exit collapsed section
+            if heading.level <= depth:
+                in_collapsed_section = False
+                # Heading at or above depth: original heading line plus its body
+                pieces.append(outline.text(content, heading.start, heading.body_end))
+                continue
+
+            # Level > depth: show heading but mark as collapsed. Only the first
+            # level below the threshold (or a shallower one later) is shown;
+            # deeper headings nested under a collapse are skipped entirely.
+            if not in_collapsed_section or heading.level < collapsed_section_depth:
+                heading_text = _COLLAPSED_HEADING_RE.match(
+                    outline.text(content, heading.start, heading.head_end)
+                ).group(2)
+                pieces.append(f"{'#' * heading.level} {heading_text} 📦")
+                in_collapsed_section = True
+                collapsed_section_depth = heading.level
+
+        return "\n".join(pieces)
 
     def _render_with_context(
         self,
-        sections: list,
+        content: Buffer,
+        outline: Outline,
         matched_ids: set,
+        ancestor_ids: set,
         depth: Optional[int] = None,
         filter_inner_depth: Optional[int] = None,
     ) -> str:
@@ -141,8 +254,10 @@ class MarkdownViewer:
         - Other sections: shown as collapsed with emoji marker
 
         Args:
-            sections: Full document structure (list of section dicts)
-            matched_ids: Set of IDs of matched sections
+            content: Markdown content the outline was built from
+            outline: Heading outline of the full document
+            matched_ids: Outline indices of matched sections
+            ancestor_ids: Outline indices of the matched sections' ancestors
             depth: Global collapse depth (applies to non-matched siblings)
             filter_inner_depth: Collapse depth WITHIN matched sections only
 
@@ -152,16 +267,15 @@ class MarkdownViewer:
         lines = []
         COLLAPSED_EMOJI = "📦"  # Emoji to indicate collapsed section
 
-        def render_section(section: dict, is_inside_matched: bool = False) -> None:
-            level = section['level']
-            text = section['text']
-            is_matched = id(section) in matched_ids
-            is_matched_ancestor = section.get('matched_ancestor', False)
+        def render_section(index: int, is_inside_matched: bool = False) -> None:
+            heading = outline.headings[index]
+            level = heading.level
+            is_matched = index in matched_ids
 
             # Determine if this section should be collapsed
             should_collapse = False
 
-            if is_matched_ancestor:
+            if index in ancestor_ids:
                 # ANCESTORS ALWAYS SHOWN EXPANDED - never collapse
                 should_collapse = False
             elif is_matched:
@@ -184,22 +298,22 @@ class MarkdownViewer:
                     should_collapse = True
 
             # Render heading
-            heading = f"{'#' * level} {text}"
             if should_collapse:
                 # Show collapsed marker with emoji
-                lines.append(f"{heading} {COLLAPSED_EMOJI}")
+                lines.append(f"{heading.markdown_heading} {COLLAPSED_EMOJI}")
                 return  # Skip content and children
             else:
                 # Not collapsed - show fully expanded
-                lines.append(heading)
-                # Render content
-                lines.extend(section.get('content', []))
+                lines.append(heading.markdown_heading)
+                # Render content (sliced from the document, not per-line lists)
+                if heading.has_body:
+                    lines.append(outline.body(content, index))
                 # Render children (pass flag if we're matched or already inside matched)
-                for child in section.get('children', []):
+                for child in heading.children:
                     render_section(child, is_inside_matched=is_matched or is_inside_matched)
 
         # Render all top-level sections
-        for section in sections:
-            render_section(section)
+        for index in outline.roots:
+            render_section(index)
 
         return "\n".join(lines)
@@ -20,6 +20,8 @@ from collections.abc import Callable
 from dataclasses import dataclass, field
 from typing import Any, Optional, TypedDict, TYPE_CHECKING
 
+from .search_index import SearchIndex
+
 if TYPE_CHECKING:
     from fastmcp import FastMCP
 
@@ -436,6 +438,7 @@ def _schema_to_params(schema: dict) -> list[ToolParam]:
 
 _mcp_ref: Optional[FastMCP] = None
 _catalog_cache: Optional[list[ToolEntry]] = None
+_catalog_index: Optional[SearchIndex] = None
 _catalog_version: int = 0
 
 
@@ -452,8 +455,10 @@ async def build_catalog() -> list[ToolEntry]:
     1. MCP-registered tools (from ``mcp.list_tools()``)
     2. Discoverable-only tools (hidden from MCP)
     3. Stub catalog entries (tools without implementations)
+
+    The text-search index is rebuilt alongside the cached catalog.
     """
-    global _catalog_cache
+    global _catalog_cache, _catalog_index
     if _catalog_cache is not None:
         return _catalog_cache
 
@@ -520,14 +525,25 @@ async def build_catalog() -> list[ToolEntry]:
     except ImportError:
         pass  # No stub catalog available
 
+    _catalog_index = SearchIndex(catalog)
     _catalog_cache = catalog
     return catalog
 
 
+async def get_search_index() -> SearchIndex:
+    """Return the text-search index for the current catalog."""
+    catalog = await build_catalog()
+    if _catalog_index is None or _catalog_index.size != len(catalog):
+        # Catalog cache was set without going through build_catalog
+        return SearchIndex(catalog)
+    return _catalog_index
+
+
 def invalidate_catalog() -> None:
-    """Clear cached catalog so it rebuilds on next access."""
-    global _catalog_cache, _catalog_version
+    """Clear cached catalog (and its search index) so it rebuilds on next access."""
+    global _catalog_cache, _catalog_index, _catalog_version
     _catalog_cache = None
+    _catalog_index = None
     _catalog_version += 1
 
 
@@ -26,6 +26,10 @@ def register_all() -> None:
         ),
     )
 
+    from npl_mcp.browser.to_markdown import to_markdown_batch
+
+    register_discoverable("ToMarkdown.Batch", category="Browser", fn=to_markdown_batch)
+
     from npl_mcp.browser.ping import ping
 
     register_discoverable("Ping", category="Browser", fn=ping)
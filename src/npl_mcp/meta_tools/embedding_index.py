@@ -0,0 +1,273 @@
+"""Embedding prefilter for intent-mode ToolSearch.
+
+Every catalog entry is embedded once via ``embed_texts`` and kept as a
+row-normalized NumPy matrix, so an intent query needs one query embedding
+plus a cosine top-k instead of sending the whole catalog to the LLM. The
+LLM then only sees the top ``NPL_INTENT_CANDIDATES`` entries, and when the
+LLM is unavailable the cosine ranking alone answers the query.
+
+Entry vectors are persisted in ``.tmp/cache/tool_embeddings.npz`` keyed by
+embedding model and a hash of the entry's text, so restarts and catalog
+rebuilds only embed new or changed entries; the file is read and written
+off the event loop. The in-memory index is keyed by ``_catalog_version``
+and rebuilt after ``invalidate_catalog``; concurrent first queries share a
+single build.
+
+Requires NumPy (``perf`` extra); without it, or when the embeddings
+endpoint fails, ``get_embedding_index`` returns None and callers keep the
+full-catalog behaviour. Failures are remembered for a short cooldown so a
+down endpoint does not add latency to every query.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
+
+from . import llm_client
+from .catalog import ToolEntry
+
+logger = logging.getLogger(__name__)
+
+# Default cache location (project convention: .tmp/ for persistent temp files)
+DEFAULT_CACHE_FILE = Path(".tmp/cache/tool_embeddings.npz")
+
+# Entries per embeddings request
+EMBED_BATCH_SIZE = 128
+
+# Seconds to skip the embedding path after a failure
+FAILURE_COOLDOWN = 60.0
+
+# Query embeddings kept in memory
+_QUERY_CACHE_SIZE = 256
+
+
+def entry_text(entry: ToolEntry) -> str:
+    """Return the text embedded for a catalog entry."""
+    tags = " ".join(sorted(entry.get("tags") or ()))
+    return f"{entry['name']} [{entry['category']}] {entry['description']} {tags}".strip()
+
+
+def entry_hash(entry: ToolEntry) -> str:
+    """Return a stable hash of an entry's embedded text."""
+    return hashlib.sha256(entry_text(entry).encode("utf-8")).hexdigest()[:32]
+
+
+class EmbeddingIndex:
+    """Row-normalized embedding matrix aligned with a catalog list."""
+
+    def __init__(self, version: int, model: str, matrix: "np.ndarray"):
+        self.version = version
+        self.model = model
+        self.matrix = matrix
+
+    def top_k(self, query_vector: "np.ndarray", k: int) -> list[tuple[int, float]]:
+        """Return ``(catalog position, cosine similarity)`` pairs, best first."""
+        norm = float(np.linalg.norm(query_vector))
+        if norm == 0.0 or k <= 0:
+            return []
+        scores = self.matrix @ (query_vector / norm)
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top]
+
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+
+
+def _load_vectors(cache_file: Path, model: str) -> dict[str, "np.ndarray"]:
+    """Load ``{entry_hash: vector}`` for *model* from the npz cache."""
+    try:
+        with np.load(cache_file, allow_pickle=False) as data:
+            if str(data["model"]) != model:
+                return {}
+            return dict(zip(data["hashes"].tolist(), data["vectors"]))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning("Ignoring unreadable embedding cache %s: %s", cache_file, e)
+        return {}
+
+
+def _save_vectors(cache_file: Path, model: str, vectors: dict[str, "np.ndarray"]) -> None:
+    """Atomically write the npz cache."""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    hashes = list(vectors)
+    tmp = cache_file.with_name(cache_file.name + ".tmp.npz")
+    np.savez(
+        tmp,
+        model=np.array(model),
+        hashes=np.array(hashes),
+        vectors=np.stack([vectors[h] for h in hashes]).astype(np.float32),
+    )
+    tmp.replace(cache_file)
+
+
+# ---------------------------------------------------------------------------
+# Index lifecycle
+# ---------------------------------------------------------------------------
+
+_index: Optional[EmbeddingIndex] = None
+_failed_at: float = 0.0
+# (catalog version, model, size) -> build in progress
+_inflight: dict[tuple[int, str, int], asyncio.Future] = {}
+_query_vectors: "OrderedDict[tuple[str, str], np.ndarray]" = OrderedDict()
+
+
+def _cache_file() -> Path:
+    return Path(os.environ.get("NPL_TOOL_EMBEDDINGS_CACHE", str(DEFAULT_CACHE_FILE)))
+
+
+def _cooling_down() -> bool:
+    return _failed_at > 0.0 and time.monotonic() - _failed_at < FAILURE_COOLDOWN
+
+
+def _mark_failed(what: str, exc: Exception) -> None:
+    global _failed_at
+    _failed_at = time.monotonic()
+    logger.info("Embedding prefilter disabled for %.0fs (%s failed: %s)", FAILURE_COOLDOWN, what, exc)
+
+
+async def get_embedding_index(catalog: list[ToolEntry]) -> Optional[EmbeddingIndex]:
+    """Return the embedding index for *catalog*, embedding missing entries.
+
+    Concurrent callers for the same catalog share one build. Returns None
+    when NumPy is missing or the embeddings endpoint fails.
+    """
+    from .catalog import _catalog_version
+
+    if not _HAS_NUMPY or not catalog:
+        return None
+    model = llm_client.LITELLM_EMBED_MODEL
+    if (_index is not None and _index.version == _catalog_version
+            and _index.model == model and _index.matrix.shape[0] == len(catalog)):
+        return _index
+    if _cooling_down():
+        return None
+
+    key = (_catalog_version, model, len(catalog))
+    pending = _inflight.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The leading caller was cancelled; build on our own below
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        index = await _build_index(catalog, model, _catalog_version)
+        future.set_result(index)
+        return index
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so a future nobody awaited does not log a warning
+        future.exception()
+        raise
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def _build_index(catalog: list[ToolEntry], model: str, version: int) -> Optional[EmbeddingIndex]:
+    """Embed the entries missing from the disk cache and build the index."""
+    global _index
+    cache_file = _cache_file()
+    stored = await asyncio.to_thread(_load_vectors, cache_file, model)
+    hashes = [entry_hash(e) for e in catalog]
+    missing = {h: e for h, e in zip(hashes, catalog) if h not in stored}
+
+    if missing:
+        pending = list(missing.items())
+        try:
+            for start in range(0, len(pending), EMBED_BATCH_SIZE):
+                batch = pending[start:start + EMBED_BATCH_SIZE]
+                vectors = await llm_client.embed_texts(
+                    [entry_text(e) for _, e in batch], model=model, retries=0,
+                )
+                for (h, _), vector in zip(batch, vectors):
+                    stored[h] = np.asarray(vector, dtype=np.float32)
+        except Exception as e:
+            _mark_failed("catalog embedding", e)
+            return None
+        live = set(hashes)
+        try:
+            await asyncio.to_thread(
+                _save_vectors, cache_file, model, {h: v for h, v in stored.items() if h in live},
+            )
+        except OSError as e:
+            logger.warning("Could not write embedding cache %s: %s", cache_file, e)
+
+    matrix = np.stack([stored[h] for h in hashes]).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    _index = EmbeddingIndex(version, model, matrix / norms)
+    return _index
+
+
+async def embed_query(query: str, model: str) -> Optional["np.ndarray"]:
+    """Return the (cached) embedding for *query*, or None on failure."""
+    key = (model, query)
+    vector = _query_vectors.get(key)
+    if vector is not None:
+        _query_vectors.move_to_end(key)
+        return vector
+    if _cooling_down():
+        return None
+    try:
+        [raw] = await llm_client.embed_texts([query], model=model, retries=0)
+    except Exception as e:
+        _mark_failed("query embedding", e)
+        return None
+    vector = np.asarray(raw, dtype=np.float32)
+    _query_vectors[key] = vector
+    while len(_query_vectors) > _QUERY_CACHE_SIZE:
+        _query_vectors.popitem(last=False)
+    return vector
+
+
+async def rank_catalog(
+    query: str,
+    catalog: list[ToolEntry],
+    k: int,
+) -> Optional[list[tuple[int, float]]]:
+    """Return the top *k* catalog positions for *query* by cosine similarity.
+
+    Returns None when the embedding path is unavailable.
+    """
+    index = await get_embedding_index(catalog)
+    if index is None:
+        return None
+    vector = await embed_query(query, index.model)
+    if vector is None or vector.shape[0] != index.matrix.shape[1]:
+        return None
+    return index.top_k(vector, k)
+
+
+def reset_embedding_index() -> None:
+    """Forget the in-memory index, query vectors and failure state (for testing)."""
+    global _index, _failed_at
+    _index = None
+    _failed_at = 0.0
+    _inflight.clear()
+    _query_vectors.clear()
@@ -3,7 +3,7 @@
 import json
 
 from .catalog import get_tool_by_name, ToolEntry
-from .inference_cache import cache_key, cache_get, cache_set
+from .inference_cache import cache_key, cached
 from .llm_client import chat_completion
 
 
@@ -79,10 +79,16 @@ async def tool_help(tool: str, task: str, verbose: int = 2) -> dict:
     verbose = max(1, min(3, verbose))
 
     key = cache_key("tool_help", tool, task, str(verbose))
-    cached = cache_get(key)
-    if cached is not None:
-        return cached
+    return await cached(key, lambda: _tool_help_uncached(entry, tool, task, verbose))
 
+
+async def _tool_help_uncached(
+    entry: ToolEntry,
+    tool: str,
+    task: str,
+    verbose: int,
+) -> tuple[dict, bool]:
+    """Ask the LLM for instructions; returns ``(result, cacheable)``."""
     try:
         messages = _build_help_prompt(entry, task, verbose)
         response = await chat_completion(messages, max_tokens=3000)
@@ -95,9 +101,7 @@ async def tool_help(tool: str, task: str, verbose: int = 2) -> dict:
             "verbose": verbose,
             "instructions": content.strip(),
         }
-
-        cache_set(key, result)
-        return result
+        return result, True
 
     except Exception as e:
         return {
@@ -107,4 +111,4 @@ async def tool_help(tool: str, task: str, verbose: int = 2) -> dict:
             "verbose": verbose,
             "status": "error",
             "message": f"LLM call failed: {type(e).__name__}: {e}",
-        }
+        }, False
@@ -1,12 +1,49 @@
-"""In-memory LLM inference cache keyed by catalog version + query params.
+"""LLM inference cache keyed by catalog version + query params.
 
 The catalog version counter is part of every cache key so that when the
 catalog is invalidated (e.g. after dynamic tool registration), all cached
 results auto-invalidate.
+
+Two tiers:
+
+* Memory -- an LRU with per-entry TTL, bounded both by entry count and by
+  an approximate byte ceiling (serialized JSON size).
+* Disk (optional) -- a SQLite table via aiosqlite that survives restarts.
+  Enabled by setting ``NPL_INFERENCE_CACHE_DB`` to a file path. Because the
+  version counter restarts with the process, disk rows are keyed by a hash
+  of the catalog contents instead.
+
+``cached()`` adds single-flight coalescing: concurrent callers with the
+same key await one computation instead of each calling the LLM.
+
+Configuration via environment variables:
+    NPL_INFERENCE_CACHE_SIZE       (default: 1024 entries)
+    NPL_INFERENCE_CACHE_MAX_BYTES  (default: 33554432 -- 32 MiB)
+    NPL_INFERENCE_CACHE_TTL        (default: 86400 seconds)
+    NPL_INFERENCE_CACHE_DB         (default: unset -- memory only)
 """
 
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
 from typing import Any, Optional
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = int(os.environ.get("NPL_INFERENCE_CACHE_SIZE", "1024"))
+DEFAULT_MAX_BYTES = int(os.environ.get("NPL_INFERENCE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+DEFAULT_TTL = float(os.environ.get("NPL_INFERENCE_CACHE_TTL", "86400"))
+
+# Rows kept in the disk tier before the oldest are pruned
+DISK_MAX_ROWS = 10_000
+
 
 def _get_catalog_version() -> str:
     """Return current catalog version as a string for cache key generation."""
@@ -14,8 +51,232 @@ def _get_catalog_version() -> str:
     return str(_catalog_version)
 
 
-# In-memory cache: full_key -> cached value
-_cache: dict[str, Any] = {}
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory cost of *value* by its JSON length."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+
+# ---------------------------------------------------------------------------
+# Memory tier
+# ---------------------------------------------------------------------------
+
+
+class InferenceCache:
+    """Thread-safe LRU with TTL and a byte ceiling."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+    ):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            max_bytes: Approximate ceiling on the summed entry sizes
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[str, tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the live value for *key* (marking it recent) or None."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store *value*, evicting least recently used entries over the limits."""
+        size = _estimate_size(value)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return size and hit/miss counters for health reporting."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# ---------------------------------------------------------------------------
+# Disk tier
+# ---------------------------------------------------------------------------
+
+
+class DiskTier:
+    """SQLite-backed cache rows keyed by catalog fingerprint + key parts."""
+
+    def __init__(self, path: Path, max_rows: int = DISK_MAX_ROWS):
+        self.path = Path(path)
+        self.max_rows = max_rows
+        self._ready = False
+
+    async def _connect(self):
+        import aiosqlite
+
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = await aiosqlite.connect(self.path)
+        if not self._ready:
+            await db.execute("PRAGMA journal_mode=WAL")
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS inference_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            await db.commit()
+            self._ready = True
+        return db
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the unexpired value for *key*, or None."""
+        db = await self._connect()
+        try:
+            async with db.execute(
+                "SELECT value FROM inference_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ) as cur:
+                row = await cur.fetchone()
+        finally:
+            await db.close()
+        return json.loads(row[0]) if row else None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Upsert *value* and prune expired / excess rows."""
+        now = time.time()
+        db = await self._connect()
+        try:
+            await db.execute(
+                "INSERT OR REPLACE INTO inference_cache (key, value, expires_at, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, default=str), now + ttl, now),
+            )
+            await db.execute("DELETE FROM inference_cache WHERE expires_at <= ?", (now,))
+            await db.execute(
+                "DELETE FROM inference_cache WHERE key IN ("
+                " SELECT key FROM inference_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+            await db.commit()
+        finally:
+            await db.close()
+
+    async def clear(self) -> None:
+        """Delete every row."""
+        if not self.path.exists():
+            return
+        db = await self._connect()
+        try:
+            await db.execute("DELETE FROM inference_cache")
+            await db.commit()
+        finally:
+            await db.close()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide cache
+# ---------------------------------------------------------------------------
+
+_cache = InferenceCache()
+_disk: Optional[DiskTier] = None
+_inflight: dict[str, asyncio.Future] = {}
+_fingerprint: tuple[str, str] = ("", "")
+
+
+def _disk_tier() -> Optional[DiskTier]:
+    """Return the disk tier configured by ``NPL_INFERENCE_CACHE_DB``, if any."""
+    global _disk
+    path = os.environ.get("NPL_INFERENCE_CACHE_DB")
+    if not path:
+        return None
+    if _disk is None or str(_disk.path) != path:
+        _disk = DiskTier(Path(path))
+    return _disk
+
+
+def _catalog_fingerprint() -> Optional[str]:
+    """Return a content hash of the built catalog, or None if not built."""
+    global _fingerprint
+    from .catalog import _catalog_cache
+
+    if _catalog_cache is None:
+        return None
+    version = _get_catalog_version()
+    if _fingerprint[0] != version:
+        digest = hashlib.sha256()
+        for entry in sorted(_catalog_cache, key=lambda e: e["name"]):
+            digest.update(json.dumps(
+                [entry["name"], entry["category"], entry["description"], entry["parameters"]],
+                sort_keys=True, default=str,
+            ).encode("utf-8"))
+        _fingerprint = (version, digest.hexdigest()[:16])
+    return _fingerprint[1]
+
+
+def _disk_key(key: str) -> Optional[str]:
+    """Swap the process-local version prefix for the catalog fingerprint."""
+    fingerprint = _catalog_fingerprint()
+    if fingerprint is None:
+        return None
+    _, _, parts = key.partition("|")
+    return f"{fingerprint}|{parts}"
 
 
 def cache_key(*parts: str) -> str:
@@ -24,15 +285,100 @@ def cache_key(*parts: str) -> str:
 
 
 def cache_get(key: str) -> Optional[Any]:
-    """Return cached value or None on miss."""
+    """Return the memory-tier value or None on miss."""
     return _cache.get(key)
 
 
 def cache_set(key: str, value: Any) -> None:
-    """Store a value in the cache."""
-    _cache[key] = value
+    """Store a value in the memory tier."""
+    _cache.set(key, value)
+
+
+async def cache_get_async(key: str) -> Optional[Any]:
+    """Return a cached value from memory, then disk (promoting disk hits)."""
+    value = _cache.get(key)
+    if value is not None:
+        return value
+    disk = _disk_tier()
+    disk_key = _disk_key(key) if disk is not None else None
+    if disk_key is None:
+        return None
+    try:
+        value = await disk.get(disk_key)
+    except Exception as e:
+        logger.warning("Inference cache disk read failed: %s", e)
+        return None
+    if value is not None:
+        _cache.set(key, value)
+    return value
+
+
+async def cache_set_async(key: str, value: Any) -> None:
+    """Store a value in memory and, when enabled, on disk."""
+    _cache.set(key, value)
+    disk = _disk_tier()
+    disk_key = _disk_key(key) if disk is not None else None
+    if disk_key is None:
+        return
+    try:
+        await disk.set(disk_key, value, _cache.ttl)
+    except Exception as e:
+        logger.warning("Inference cache disk write failed: %s", e)
+
+
+async def cached(
+    key: str,
+    compute: Callable[[], Awaitable[tuple[Any, bool]]],
+) -> Any:
+    """Return the cached value for *key* or compute it exactly once.
+
+    *compute* returns ``(value, cacheable)``; uncacheable results (e.g. LLM
+    fallbacks) are still shared with callers that were waiting on the same
+    key but are not stored. Exceptions propagate to every waiter.
+    """
+    value = await cache_get_async(key)
+    if value is not None:
+        return value
+
+    pending = _inflight.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The leading caller was cancelled; compute on our own below
+
+    future: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value, cacheable = await compute()
+        if cacheable:
+            await cache_set_async(key, value)
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark retrieved so a future nobody awaited does not log a warning
+        future.exception()
+        raise
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+def cache_stats() -> dict[str, Any]:
+    """Return memory-tier stats plus disk/in-flight state."""
+    stats = _cache.stats()
+    disk = _disk_tier()
+    stats["disk"] = str(disk.path) if disk is not None else None
+    stats["inflight"] = len(_inflight)
+    return stats
 
 
 def cache_clear() -> None:
-    """Clear all cached entries (for testing)."""
+    """Clear the memory tier (for testing)."""
     _cache.clear()
@@ -1,24 +1,169 @@
-"""Async LiteLLM proxy client for intent search and image descriptions."""
+"""Async LiteLLM proxy client for intent search and image descriptions.
 
+All requests share one long-lived, connection-pooled ``httpx.AsyncClient``
+per event loop (keepalive, HTTP/2 when ``h2`` is installed and the proxy
+speaks TLS). The launcher opens it at startup and closes it at shutdown;
+outside the server it is created lazily on first use.
+
+Pool and retry settings via environment variables:
+    NPL_LITELLM_MAX_CONNECTIONS  (default: 20)
+    NPL_LITELLM_MAX_KEEPALIVE    (default: 10)
+    NPL_LITELLM_KEEPALIVE_EXPIRY (default: 30 seconds)
+    NPL_LITELLM_RETRIES          (default: 3 retries on 429/5xx/connect errors)
+"""
+
+import asyncio
 import base64
+import logging
 import mimetypes
 import os
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 from urllib.parse import urlparse
 
 import httpx
 
+try:
+    import h2  # noqa: F401
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
+logger = logging.getLogger(__name__)
+
 LITELLM_BASE_URL = os.environ.get("NPL_LITELLM_URL", "http://localhost:4111/v1")
 LITELLM_API_KEY = os.environ.get("NPL_LITELLM_KEY", "sk-litellm-master-key-12345")
 LITELLM_MODEL = os.environ.get("NPL_LITELLM_MODEL", "groq/openai/gpt-oss-120b")
 LITELLM_EMBED_MODEL = os.environ.get("NPL_LITELLM_EMBED_MODEL", "openai/text-embedding-3-small")
 
+LITELLM_MAX_CONNECTIONS = int(os.environ.get("NPL_LITELLM_MAX_CONNECTIONS", "20"))
+LITELLM_MAX_KEEPALIVE = int(os.environ.get("NPL_LITELLM_MAX_KEEPALIVE", "10"))
+LITELLM_KEEPALIVE_EXPIRY = float(os.environ.get("NPL_LITELLM_KEEPALIVE_EXPIRY", "30"))
+LITELLM_RETRIES = int(os.environ.get("NPL_LITELLM_RETRIES", "3"))
+
+# Retry on rate limiting and transient upstream failures
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.RemoteProtocolError, httpx.PoolTimeout)
+_BACKOFF_BASE = 0.5
+_BACKOFF_MAX = 8.0
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+# ---------------------------------------------------------------------------
+# Shared client
+# ---------------------------------------------------------------------------
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers={
+            "Authorization": f"Bearer {LITELLM_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        limits=httpx.Limits(
+            max_connections=LITELLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LITELLM_MAX_KEEPALIVE,
+            keepalive_expiry=LITELLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=30.0,
+        http2=_HAS_H2,
+    )
+
+
+def get_llm_client() -> httpx.AsyncClient:
+    """Return the shared client for the running event loop.
+
+    An ``AsyncClient``'s connections belong to the loop that opened them,
+    so a new client is created if the loop changed (e.g. between tests).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.is_closed:
+        _client = _new_client()
+        _client_loop = loop
+    return _client
+
+
+async def start_llm_client() -> None:
+    """Open the shared client (launcher startup hook)."""
+    get_llm_client()
+
+
+async def close_llm_client() -> None:
+    """Close the shared client and its pooled connections (launcher shutdown hook)."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Full-jitter exponential backoff, honouring ``Retry-After`` when sent."""
+    if response is not None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                return min(float(retry_after), _BACKOFF_MAX)
+            except ValueError:
+                try:
+                    when = parsedate_to_datetime(retry_after)
+                    wait = (when - datetime.now(timezone.utc)).total_seconds()
+                    return min(max(wait, 0.0), _BACKOFF_MAX)
+                except (TypeError, ValueError):
+                    pass
+    return random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** attempt))
+
+
+async def _post(
+    path: str,
+    payload: dict[str, Any],
+    timeout: float,
+    retries: Optional[int] = None,
+) -> httpx.Response:
+    """POST *payload* to the LiteLLM proxy with retries on 429/5xx.
+
+    Raises:
+        httpx.HTTPStatusError: On a non-2xx response after the last retry.
+        httpx.TimeoutException: On timeout.
+    """
+    retries = LITELLM_RETRIES if retries is None else retries
+    client = get_llm_client()
+    attempt = 0
+    while True:
+        try:
+            response = await client.post(
+                f"{LITELLM_BASE_URL}{path}",
+                json=payload,
+                timeout=timeout,
+            )
+        except _RETRY_EXCEPTIONS as e:
+            if attempt >= retries:
+                raise
+            delay = _retry_delay(attempt)
+            logger.info("LiteLLM %s failed (%s); retrying in %.2fs", path, e, delay)
+        else:
+            if response.status_code not in _RETRY_STATUSES or attempt >= retries:
+                response.raise_for_status()
+                return response
+            delay = _retry_delay(attempt, response)
+            logger.info(
+                "LiteLLM %s returned %s; retrying in %.2fs",
+                path, response.status_code, delay,
+            )
+        attempt += 1
+        await asyncio.sleep(delay)
+
 
 async def embed_texts(
     texts: list[str],
     model: str | None = None,
     timeout: float = 30.0,
+    retries: int | None = None,
 ) -> list[list[float]]:
     """Call LiteLLM-compatible embeddings endpoint.
 
@@ -26,6 +171,7 @@ async def embed_texts(
         texts: List of strings to embed.
         model: Override embedding model (default from env).
         timeout: Request timeout in seconds.
+        retries: Override retry count (default ``NPL_LITELLM_RETRIES``).
 
     Returns:
         List of embedding vectors (list of floats), one per input text,
@@ -36,22 +182,18 @@ async def embed_texts(
         httpx.TimeoutException: On timeout.
     """
     use_model = model or LITELLM_EMBED_MODEL
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(
-            f"{LITELLM_BASE_URL}/embeddings",
-            headers={
-                "Authorization": f"Bearer {LITELLM_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": use_model,
-                "input": texts,
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        sorted_data = sorted(data["data"], key=lambda x: x["index"])
-        return [item["embedding"] for item in sorted_data]
+    response = await _post(
+        "/embeddings",
+        {
+            "model": use_model,
+            "input": texts,
+        },
+        timeout,
+        retries,
+    )
+    data = response.json()
+    sorted_data = sorted(data["data"], key=lambda x: x["index"])
+    return [item["embedding"] for item in sorted_data]
 
 
 async def chat_completion(
@@ -75,22 +217,17 @@ async def chat_completion(
         httpx.HTTPStatusError: On non-2xx response.
         httpx.TimeoutException: On timeout.
     """
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(
-            f"{LITELLM_BASE_URL}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {LITELLM_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": LITELLM_MODEL,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-            },
-        )
-        response.raise_for_status()
-        return response.json()
+    response = await _post(
+        "/chat/completions",
+        {
+            "model": LITELLM_MODEL,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        timeout,
+    )
+    return response.json()
 
 
 def _is_svg(uri: str) -> bool:
@@ -178,19 +315,14 @@ async def describe_image(
         }
     ]
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post(
-            f"{LITELLM_BASE_URL}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {LITELLM_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": model,
-                "messages": messages,
-                "max_tokens": 500,
-            },
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+    response = await _post(
+        "/chat/completions",
+        {
+            "model": model,
+            "messages": messages,
+            "max_tokens": 500,
+        },
+        timeout,
+    )
+    data = response.json()
+    return data["choices"][0]["message"]["content"]
@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 import json
+import os
 
-from .catalog import build_catalog, ToolEntry
-from .inference_cache import cache_key, cache_get, cache_set
+from .catalog import build_catalog, get_search_index, ToolEntry
+from .embedding_index import rank_catalog
+from .inference_cache import cache_key, cached
 from .llm_client import chat_completion
 
+# Catalog entries shown to the LLM after the embedding prefilter
+INTENT_CANDIDATES = int(os.environ.get("NPL_INTENT_CANDIDATES", "40"))
+
+# Cosine similarity cut-offs for embedding-only relevance labels
+_HIGH_SIMILARITY = 0.5
+_MEDIUM_SIMILARITY = 0.3
+
 
 async def tool_search(
     query: str,
@@ -19,7 +28,8 @@ async def tool_search(
 
     Args:
         query: Search query string.
-        mode: "text" for substring matching, "intent" for LLM-powered semantic search.
+        mode: "text" for indexed term/prefix/substring matching, "intent" for
+            LLM-powered semantic search.
         limit: Maximum results to return.
         verbose: If True, include full parameter definitions in each match.
 
@@ -32,7 +42,8 @@ async def tool_search(
         result = await _text_search(query, limit)
 
     if not verbose:
-        result["matches"] = [_strip_params(m) for m in result["matches"]]
+        # Copy: intent results are shared through the inference cache
+        result = {**result, "matches": [_strip_params(m) for m in result["matches"]]}
 
     return result
 
@@ -43,32 +54,21 @@ def _strip_params(match: dict) -> dict:
 
 
 async def _text_search(query: str, limit: int = 10) -> dict:
-    """Case-insensitive substring search on tool name and description."""
-    catalog = await build_catalog()
-    q = query.lower()
-
-    exact_name = []
-    name_match = []
-    desc_match = []
-
-    for tool in catalog:
-        name_lower = tool["name"].lower()
-        desc_lower = tool["description"].lower()
+    """Ranked, case-insensitive term search over the catalog index.
 
-        if name_lower == q:
-            exact_name.append(tool)
-        elif q in name_lower:
-            name_match.append(tool)
-        elif q in desc_lower:
-            desc_match.append(tool)
-
-    matches = (exact_name + name_match + desc_match)[:limit]
+    Each query term matches whole tokens, token prefixes or substrings of
+    the tool name, category, tags and description; name hits rank highest
+    and an exact tool-name match always comes first.
+    """
+    catalog = await build_catalog()
+    index = await get_search_index()
+    ranked = index.search(query)
 
     return {
         "mode": "text",
         "query": query,
-        "total_matches": len(exact_name) + len(name_match) + len(desc_match),
-        "matches": matches,
+        "total_matches": len(ranked),
+        "matches": [catalog[i] for i in ranked[:limit]],
     }
 
 
@@ -133,20 +133,65 @@ def _enrich_matches(
     return enriched
 
 
+def _embedding_matches(
+    ranked: list[tuple[int, float]],
+    catalog: list[ToolEntry],
+    limit: int,
+) -> list[dict]:
+    """Build intent matches from cosine ranking alone (no LLM)."""
+    matches = []
+    for pos, score in ranked[:limit]:
+        tool = catalog[pos]
+        if score >= _HIGH_SIMILARITY:
+            relevance = "high"
+        elif score >= _MEDIUM_SIMILARITY:
+            relevance = "medium"
+        else:
+            relevance = "low"
+        matches.append({
+            "name": tool["name"],
+            "category": tool["category"],
+            "description": tool["description"],
+            "parameters": tool["parameters"],
+            "relevance": relevance,
+            "explanation": f"Embedding similarity {score:.2f}",
+            "score": round(score, 4),
+        })
+    return matches
+
+
 async def _intent_search(query: str, limit: int = 10) -> dict:
-    """LLM-powered intent search with text-search fallback.
+    """LLM-powered intent search with embedding and text-search fallbacks.
 
-    Successful LLM results are cached keyed by catalog version + query + limit.
+    When catalog embeddings are available, the LLM only sees the
+    ``INTENT_CANDIDATES`` entries closest to the query; if the LLM then
+    fails, the embedding ranking is returned on its own. Without
+    embeddings the full catalog is sent and failures fall back to text
+    search.
+
+    Successful LLM results are cached keyed by catalog version + query + limit;
+    concurrent identical queries share one LLM call.
     """
+    catalog = await build_catalog()
     key = cache_key("intent_search", query, str(limit))
-    cached = cache_get(key)
-    if cached is not None:
-        return cached
+    return await cached(key, lambda: _intent_search_uncached(query, limit, catalog))
 
-    catalog = await build_catalog()
+
+async def _intent_search_uncached(
+    query: str,
+    limit: int,
+    catalog: list[ToolEntry],
+) -> tuple[dict, bool]:
+    """Run one intent search; returns ``(result, cacheable)``."""
+    ranked = None
+    candidates = catalog
+    if len(catalog) > INTENT_CANDIDATES:
+        ranked = await rank_catalog(query, catalog, max(INTENT_CANDIDATES, limit))
+        if ranked is not None:
+            candidates = [catalog[pos] for pos, _ in ranked]
 
     try:
-        messages = _build_intent_prompt(query, catalog, limit)
+        messages = _build_intent_prompt(query, candidates, limit)
         response = await chat_completion(messages)
         content = response["choices"][0]["message"]["content"]
 
@@ -166,13 +211,26 @@ async def _intent_search(query: str, limit: int = 10) -> dict:
             "total_matches": len(enriched),
             "matches": enriched[:limit],
         }
+        if ranked is not None:
+            response_dict["candidates"] = len(candidates)
 
-        cache_set(key, response_dict)
-        return response_dict
+        return response_dict, True
 
     except Exception as e:
+        reason = f"{type(e).__name__}: {e}"
+        if ranked:
+            matches = _embedding_matches(ranked, catalog, limit)
+            return {
+                "mode": "intent",
+                "query": query,
+                "total_matches": len(matches),
+                "matches": matches,
+                "fallback": True,
+                "fallback_source": "embeddings",
+                "fallback_reason": reason,
+            }, False
         fallback = await _text_search(query, limit)
         fallback["mode"] = "intent"
         fallback["fallback"] = True
-        fallback["fallback_reason"] = f"{type(e).__name__}: {e}"
-        return fallback
+        fallback["fallback_reason"] = reason
+        return fallback, False
@@ -0,0 +1,186 @@
+"""Inverted token/trigram index for ToolSearch text mode.
+
+Built once per catalog build (see ``catalog.build_catalog``) and dropped by
+``invalidate_catalog``. Each catalog entry is tokenized over four weighted
+fields -- name, category, tags and description -- into:
+
+* a token -> {entry: weight} posting map for exact term hits,
+* a sorted vocabulary for prefix hits (``bisect``),
+* a trigram -> tokens map for infix hits (``"down"`` finds ``"download"``
+  and ``"markdown"``), which keeps the old substring behaviour.
+
+Queries are split into terms; entries matching every term rank first, and
+if no entry matches them all the best partial matches are returned.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Tuple
+
+if TYPE_CHECKING:
+    from .catalog import ToolEntry
+
+
+# Field weights: a hit in the name outranks one in the description
+FIELD_WEIGHTS: Dict[str, float] = {
+    "name": 10.0,
+    "category": 3.0,
+    "tags": 3.0,
+    "description": 1.0,
+}
+
+# Match-kind multipliers
+_EXACT = 1.0
+_PREFIX = 0.6
+_INFIX = 0.3
+
+# Boost for a query equal to the whole tool name
+_EXACT_NAME_BOOST = 1000.0
+
+_CHUNK_RE = re.compile(r"[A-Za-z0-9]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def _chunks(text: str) -> List[str]:
+    return _CHUNK_RE.findall(text)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split *text* into lowercase tokens, adding camelCase parts.
+
+    ``"ToMarkdown"`` yields ``["tomarkdown", "to", "markdown"]``.
+    """
+    tokens: List[str] = []
+    for chunk in _chunks(text):
+        tokens.append(chunk.lower())
+        parts = _CAMEL_RE.findall(chunk)
+        if len(parts) > 1:
+            tokens.extend(p.lower() for p in parts)
+    return tokens
+
+
+def query_terms(query: str) -> List[str]:
+    """Split a query into unique lowercase terms (no camelCase splitting)."""
+    seen: Dict[str, None] = {}
+    for chunk in _chunks(query):
+        seen.setdefault(chunk.lower(), None)
+    return list(seen)
+
+
+def _trigrams(token: str) -> Set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """Ranked term search over a fixed list of catalog entries."""
+
+    def __init__(self, entries: Iterable["ToolEntry"]):
+        """Index *entries*; results are positions into this sequence.
+
+        Args:
+            entries: Catalog entries (name, category, description, tags)
+        """
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._names: Dict[str, List[int]] = {}
+        self.size = 0
+
+        for doc, entry in enumerate(entries):
+            self.size += 1
+            self._names.setdefault(entry["name"].lower(), []).append(doc)
+            fields = {
+                "name": entry["name"],
+                "category": entry.get("category", ""),
+                "tags": " ".join(sorted(entry.get("tags") or ())),
+                "description": entry.get("description", ""),
+            }
+            for field_name, text in fields.items():
+                weight = FIELD_WEIGHTS[field_name]
+                for token in set(tokenize(text)):
+                    posting = self._postings.setdefault(token, {})
+                    posting[doc] = posting.get(doc, 0.0) + weight
+
+        self._vocab: List[str] = sorted(self._postings)
+        for token in self._vocab:
+            for gram in _trigrams(token):
+                self._trigrams.setdefault(gram, set()).add(token)
+
+    # ------------------------------------------------------------------
+    # Term matching
+    # ------------------------------------------------------------------
+
+    def _prefix_tokens(self, term: str) -> List[str]:
+        start = bisect_left(self._vocab, term)
+        out = []
+        for token in self._vocab[start:]:
+            if not token.startswith(term):
+                break
+            out.append(token)
+        return out
+
+    def _infix_tokens(self, term: str) -> Set[str]:
+        if len(term) < 3:
+            return set()
+        grams = sorted(_trigrams(term), key=lambda g: len(self._trigrams.get(g, ())))
+        candidates = self._trigrams.get(grams[0])
+        if not candidates:
+            return set()
+        candidates = set(candidates)
+        for gram in grams[1:]:
+            candidates &= self._trigrams.get(gram, set())
+            if not candidates:
+                return set()
+        return {t for t in candidates if term in t}
+
+    def _term_scores(self, term: str) -> Dict[int, float]:
+        """Best score per entry for one term (exact > prefix > infix)."""
+        scores: Dict[int, float] = {}
+
+        def _add(tokens: Iterable[str], factor: float) -> None:
+            for token in tokens:
+                for doc, weight in self._postings[token].items():
+                    score = weight * factor
+                    if score > scores.get(doc, 0.0):
+                        scores[doc] = score
+
+        prefix = self._prefix_tokens(term)
+        _add(self._infix_tokens(term).difference(prefix), _INFIX)
+        _add((t for t in prefix if t != term), _PREFIX)
+        if term in self._postings:
+            _add((term,), _EXACT)
+        return scores
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def search(self, query: str) -> List[int]:
+        """Return entry positions matching *query*, best first.
+
+        Ranking: entries matching more terms first, then by summed
+        field-weighted score; ties keep catalog order.
+        """
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        totals: Dict[int, Tuple[int, float]] = {}
+        for term in terms:
+            for doc, score in self._term_scores(term).items():
+                hits, total = totals.get(doc, (0, 0.0))
+                totals[doc] = (hits + 1, total + score)
+
+        for doc in self._names.get(query.strip().lower(), ()):
+            hits, total = totals.get(doc, (len(terms), 0.0))
+            totals[doc] = (hits, total + _EXACT_NAME_BOOST)
+
+        if not totals:
+            return []
+
+        # Prefer entries matching every term; otherwise the best partial set
+        best = max(hits for hits, _ in totals.values())
+        ranked = [doc for doc, (hits, _) in totals.items() if hits == best]
+        ranked.sort(key=lambda doc: (-totals[doc][1], doc))
+        return ranked
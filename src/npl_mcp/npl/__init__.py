@@ -11,6 +11,8 @@ Main Entry Point:
 Components:
     - parser: Expression parser for NPL loading expressions
     - resolver: Resolves expressions to component data
+    - store: Process-wide parsed convention store
+    - render_cache: LRU of rendered NPLLoad/NPLSpec output
     - filters: Priority-based filtering
     - layout: Output formatting strategies
     - exceptions: Custom exception types
@@ -45,6 +47,12 @@ from .parser import (
 # Resolver
 from .resolver import NPLResolver, ResolvedComponent
 
+# Convention store
+from .store import ConventionStore, ConventionDocument, get_convention_store
+
+# Render cache
+from .render_cache import RenderCache, get_render_cache
+
 # Filters
 from .filters import filter_by_priority
 
@@ -65,6 +73,13 @@ __all__ = [
     # Resolver
     "NPLResolver",
     "ResolvedComponent",
+    # Store
+    "ConventionStore",
+    "ConventionDocument",
+    "get_convention_store",
+    # Render cache
+    "RenderCache",
+    "get_render_cache",
     # Filters
     "filter_by_priority",
     # Exceptions
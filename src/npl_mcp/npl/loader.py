@@ -12,6 +12,8 @@ from .parser import parse_expression
 from .resolver import NPLResolver
 from .layout import LayoutStrategy, NPLLayoutEngine
 from .exceptions import NPLParseError, NPLResolveError, NPLLoadError
+from .render_cache import expression_key, get_render_cache
+from .store import get_convention_store
 
 
 def load_npl(
@@ -24,7 +26,9 @@ def load_npl(
     """Load NPL components based on expression.
 
     This is the main entry point for NPL loading. It combines parsing,
-    resolving, and formatting into a single convenient function.
+    resolving, and formatting into a single convenient function. Rendered
+    output is memoized in the process-wide render cache, keyed by the
+    canonical expression, layout and convention file version.
 
     Args:
         expression: NPL loading expression (e.g., "syntax#placeholder:+2")
@@ -83,6 +87,13 @@ def load_npl(
                 # are ignored (nonsensical in this context).
                 parsed.subtractions.extend(skip_parsed.additions)
 
+        # Serve repeated expressions from the render cache
+        cache = get_render_cache()
+        key = expression_key(get_convention_store(npl_dir), parsed, layout.value)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
         # Resolve to components
         resolver = NPLResolver(npl_dir)
         components = resolver.resolve(parsed)
@@ -91,6 +102,7 @@ def load_npl(
         engine = NPLLayoutEngine(layout)
         result = engine.format(components)
 
+        cache.set(key, result)
         return result
 
     except (NPLParseError, NPLResolveError):
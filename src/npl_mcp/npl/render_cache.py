@@ -0,0 +1,125 @@
+"""
+Rendered-output cache for NPLLoad and NPLSpec.
+
+Agents request the same handful of NPL expressions at every session start.
+This module keeps an LRU of final rendered markdown strings keyed by a
+canonical form of the request plus the convention files' version, so a
+repeated request skips resolve + render entirely. Any change to a
+convention file changes the version and therefore misses the cache.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+
+from .parser import NPLExpression
+from .store import ConventionStore
+
+
+DEFAULT_MAXSIZE = 256
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered NPL strings with hit/miss counters."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of rendered strings to retain
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached string for *key* (marking it recent) or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: str) -> None:
+        """Store *value*, evicting the least recently used entry when full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters (for testing)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters for health reporting."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+_render_cache = RenderCache()
+
+
+def get_render_cache() -> RenderCache:
+    """Return the process-wide render cache."""
+    return _render_cache
+
+
+def expression_key(
+    store: ConventionStore,
+    expression: NPLExpression,
+    layout: str,
+) -> Tuple[Hashable, ...]:
+    """Build the cache key for a parsed (skip-folded) ``load_npl`` expression.
+
+    Additions keep their order because it determines output order and
+    later additions override earlier ones. Subtractions are a set, so they
+    are de-duplicated and sorted; their priority is ignored by the resolver
+    and is dropped here too.
+    """
+    additions = tuple(
+        (a.section.value, a.component, a.priority_max)
+        for a in expression.additions
+    )
+    subtractions = tuple(sorted({
+        (s.section.value, s.component or "")
+        for s in expression.subtractions
+    }))
+    return ("load", str(store.conventions_dir), store.version(), layout,
+            additions, subtractions)
+
+
+def spec_key(
+    store: ConventionStore,
+    components: Optional[Tuple[Hashable, ...]],
+    rendered: Optional[Tuple[Hashable, ...]],
+    component_priority: int,
+    example_priority: int,
+    extension: bool,
+    flags: Optional[Dict[str, Any]],
+) -> Tuple[Hashable, ...]:
+    """Build the cache key for an ``NPLDefinition.format`` call.
+
+    *components* and *rendered* are already normalized to tuples of
+    ``(spec, component_priority, example_priority)``.
+    """
+    flag_items = tuple(sorted((flags or {}).items()))
+    return ("spec", str(store.conventions_dir), store.version(), components,
+            rendered, component_priority, example_priority, extension,
+            flag_items)
@@ -2,7 +2,7 @@
 NPL Section Resolver.
 
 Resolves NPL expressions to component data by loading YAML files
-and applying filters.
+(through the shared ``ConventionStore``) and applying filters.
 """
 
 from dataclasses import dataclass
@@ -14,6 +14,7 @@ import logging
 from .parser import NPLSection, NPLExpression, NPLComponent
 from .filters import filter_by_priority
 from .exceptions import NPLResolveError
+from .store import ConventionDocument, get_convention_store
 
 logger = logging.getLogger(__name__)
 
@@ -56,44 +57,57 @@ class NPLResolver:
             npl_dir: Path to directory containing NPL YAML files
         """
         self.npl_dir = Path(npl_dir)
-        self._cache: Dict[NPLSection, Dict[str, Any]] = {}
+        self._store = get_convention_store(self.npl_dir)
+        # Per-resolver snapshot so a single resolve() sees one file version
+        self._cache: Dict[NPLSection, ConventionDocument] = {}
 
-    def _load_section(self, section: NPLSection) -> Dict[str, Any]:
-        """Load and cache a section's YAML data.
+    def _load_document(self, section: NPLSection) -> ConventionDocument:
+        """Load a section's parsed and indexed document from the shared store.
 
         Args:
             section: The section to load
 
         Returns:
-            Parsed YAML data
+            The section's ConventionDocument
 
         Raises:
             NPLResolveError: If file not found or invalid YAML
         """
-        # Return cached data if available
+        # Return cached document if available
         if section in self._cache:
             return self._cache[section]
 
         filename = _SECTION_FILES[section]
         filepath = self.npl_dir / filename
 
-        if not filepath.exists():
+        try:
+            doc = self._store.document(Path(filename).stem)
+        except FileNotFoundError:
             raise NPLResolveError(
                 f"Section file not found: {filename}. "
                 f"Expected at: {filepath}"
             )
-
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
         except yaml.YAMLError as e:
             raise NPLResolveError(
                 f"Invalid YAML in {filename}: {str(e)}"
             )
 
-        # Cache the loaded data
-        self._cache[section] = data
-        return data
+        self._cache[section] = doc
+        return doc
+
+    def _load_section(self, section: NPLSection) -> Dict[str, Any]:
+        """Load a section's YAML data.
+
+        Args:
+            section: The section to load
+
+        Returns:
+            Parsed YAML data (shared, read-only)
+
+        Raises:
+            NPLResolveError: If file not found or invalid YAML
+        """
+        return self._load_document(section).data
 
     def get_section_components(self, section: NPLSection) -> List[str]:
         """Get list of component slugs in a section.
@@ -170,8 +184,8 @@ class NPLResolver:
         Raises:
             NPLResolveError: If component not found
         """
-        data = self._load_section(component.section)
-        components_data = data.get('components', [])
+        doc = self._load_document(component.section)
+        components_data = doc.data.get('components', [])
 
         if component.component is None:
             # Load entire section
@@ -184,16 +198,16 @@ class NPLResolver:
                 for comp_data in components_data
             ]
         else:
-            # Load specific component
-            for comp_data in components_data:
-                if comp_data.get('slug') == component.component:
-                    return [
-                        self._resolve_component(
-                            component.section,
-                            comp_data,
-                            component.priority_max
-                        )
-                    ]
+            # Load specific component via the store's slug index
+            comp_data = doc.by_slug.get(component.component)
+            if comp_data is not None:
+                return [
+                    self._resolve_component(
+                        component.section,
+                        comp_data,
+                        component.priority_max
+                    )
+                ]
 
             # Component not found
             available = self.get_section_components(component.section)
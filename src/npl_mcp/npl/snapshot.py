@@ -0,0 +1,93 @@
+"""
+Precompiled convention snapshot.
+
+A snapshot is a pickle of every ``conventions/*.yaml`` file already parsed,
+each entry tagged with the SHA-256 of the YAML bytes it was built from.
+``ConventionStore`` loads it once at startup and serves a file from the
+snapshot only when the on-disk content hash still matches; any mismatch
+falls back to parsing the YAML.
+
+Snapshots are local build artifacts (see ``npl-conventions-snapshot``) and
+are only ever read from the conventions directory itself.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import logging
+import pickle
+
+logger = logging.getLogger(__name__)
+
+
+# Bump whenever the snapshot layout or the parsed data shape changes
+SNAPSHOT_FORMAT = 1
+
+# Snapshot filename inside the conventions directory
+SNAPSHOT_FILENAME = ".npl-snapshot.pickle"
+
+
+def content_hash(raw: bytes) -> str:
+    """Return the hex SHA-256 of a convention file's bytes."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def snapshot_path(conventions_dir: Path) -> Path:
+    """Return the snapshot path for a conventions directory."""
+    return Path(conventions_dir) / SNAPSHOT_FILENAME
+
+
+def build_snapshot(conventions_dir: Path) -> Dict[str, Any]:
+    """Parse every convention YAML file into a snapshot dict.
+
+    Returns:
+        ``{"format": SNAPSHOT_FORMAT, "files": {name: {"sha256", "data"}}}``
+    """
+    import yaml
+
+    files: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(Path(conventions_dir).glob("*.yaml")):
+        raw = path.read_bytes()
+        files[path.stem] = {
+            "sha256": content_hash(raw),
+            "data": yaml.safe_load(raw.decode("utf-8")),
+        }
+    return {"format": SNAPSHOT_FORMAT, "files": files}
+
+
+def write_snapshot(conventions_dir: Path, out: Optional[Path] = None) -> Path:
+    """Build and atomically write the snapshot for *conventions_dir*.
+
+    Returns:
+        The path written
+    """
+    out = Path(out) if out is not None else snapshot_path(conventions_dir)
+    payload = pickle.dumps(build_snapshot(conventions_dir), protocol=pickle.HIGHEST_PROTOCOL)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_bytes(payload)
+    tmp.replace(out)
+    return out
+
+
+def load_snapshot(conventions_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the snapshot entries for *conventions_dir*.
+
+    Returns an empty dict when the snapshot is missing, unreadable or built
+    with a different ``SNAPSHOT_FORMAT``.
+    """
+    path = snapshot_path(conventions_dir)
+    try:
+        with open(path, "rb") as f:
+            snap = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning("Ignoring unreadable convention snapshot %s: %s", path, e)
+        return {}
+
+    if not isinstance(snap, dict) or snap.get("format") != SNAPSHOT_FORMAT:
+        logger.info("Ignoring convention snapshot %s: format mismatch", path)
+        return {}
+    files = snap.get("files")
+    return files if isinstance(files, dict) else {}
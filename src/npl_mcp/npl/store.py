@@ -0,0 +1,203 @@
+"""
+Process-wide convention store.
+
+Parses each ``conventions/*.yaml`` file once per process and shares the
+result between every consumer (``NPLResolver``, ``ConventionFormatter``,
+``NPLDefinition`` and the ``/api/npl/*`` endpoints). Files are re-parsed
+only when their ``(mtime_ns, size)`` stamp changes on disk. On first use a
+precompiled snapshot (see ``snapshot.py``) is consulted so cold starts skip
+YAML parsing for files whose content hash still matches.
+
+Parsed documents are shared: callers must treat the returned data as
+read-only.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import threading
+
+import yaml
+
+from .snapshot import content_hash, load_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+# Stamp used to detect on-disk changes: (st_mtime_ns, st_size)
+_Stamp = Tuple[int, int]
+
+
+@dataclass
+class ConventionDocument:
+    """A parsed convention file plus its component index."""
+    name: str
+    path: Path
+    stamp: _Stamp
+    data: Any
+    by_slug: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def components(self) -> List[Dict[str, Any]]:
+        """Component list in YAML order (empty when the file has none)."""
+        if not isinstance(self.data, dict):
+            return []
+        return self.data.get("components") or []
+
+
+def _stat_stamp(path: Path) -> _Stamp:
+    st = path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _index_document(doc: ConventionDocument) -> None:
+    """Populate the slug/name lookup tables of *doc*."""
+    for comp in doc.components:
+        if not isinstance(comp, dict):
+            continue
+        slug = comp.get("slug")
+        name = comp.get("name")
+        if slug and slug not in doc.by_slug:
+            doc.by_slug[slug] = comp
+        if name and name not in doc.by_name:
+            doc.by_name[name] = comp
+
+
+class ConventionStore:
+    """Parse-once, mtime-validated cache of the convention YAML files."""
+
+    def __init__(self, conventions_dir: Path):
+        """Initialize the store for a conventions directory.
+
+        Args:
+            conventions_dir: Directory containing the convention YAML files
+        """
+        self.conventions_dir = Path(conventions_dir)
+        self._docs: Dict[str, ConventionDocument] = {}
+        self._lock = threading.RLock()
+        self._snapshot: Optional[Dict[str, Dict[str, Any]]] = None
+        self.parse_count = 0
+        self.snapshot_hits = 0
+
+    def path_for(self, name: str) -> Path:
+        """Return the YAML path for convention *name* (e.g. ``"syntax"``)."""
+        return self.conventions_dir / f"{name}.yaml"
+
+    def document(self, name: str) -> ConventionDocument:
+        """Return the parsed document for convention *name*.
+
+        Re-parses the file only when its stamp differs from the cached one.
+
+        Raises:
+            FileNotFoundError: If the YAML file does not exist
+            yaml.YAMLError: If the file cannot be parsed
+        """
+        path = self.path_for(name)
+        stamp = _stat_stamp(path)
+
+        with self._lock:
+            cached = self._docs.get(name)
+            if cached is not None and cached.stamp == stamp:
+                return cached
+
+            with open(path, "rb") as f:
+                raw = f.read()
+
+            data = self._from_snapshot(name, raw)
+            if data is None:
+                data = yaml.safe_load(raw.decode("utf-8"))
+                self.parse_count += 1
+                logger.debug("Parsed convention file %s", path)
+
+            doc = ConventionDocument(name=name, path=path, stamp=stamp, data=data)
+            _index_document(doc)
+            self._docs[name] = doc
+            return doc
+
+    def _from_snapshot(self, name: str, raw: bytes) -> Any:
+        """Return snapshot data for *name* if its hash matches *raw*, else None.
+
+        Entries are consumed on use; once a file has been served it lives in
+        ``_docs`` and later changes always go through YAML.
+        """
+        if self._snapshot is None:
+            self._snapshot = load_snapshot(self.conventions_dir)
+        entry = self._snapshot.pop(name, None)
+        if entry is None:
+            return None
+        if entry.get("sha256") != content_hash(raw):
+            logger.info("Convention snapshot stale for %s; parsing YAML", name)
+            return None
+        self.snapshot_hits += 1
+        return entry.get("data")
+
+    def load(self, name: str) -> Any:
+        """Return the raw parsed YAML data for convention *name*."""
+        return self.document(name).data
+
+    def component(self, name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a component in convention *name* by slug, then by name."""
+        doc = self.document(name)
+        return doc.by_slug.get(key) or doc.by_name.get(key)
+
+    def names(self, include_npl: bool = False) -> List[str]:
+        """Return the convention names present on disk, sorted."""
+        names = sorted(p.stem for p in self.conventions_dir.glob("*.yaml"))
+        if not include_npl:
+            names = [n for n in names if n != "npl"]
+        return names
+
+    def documents(self, include_npl: bool = False) -> List[ConventionDocument]:
+        """Return every convention document on disk, sorted by name."""
+        return [self.document(n) for n in self.names(include_npl=include_npl)]
+
+    def version(self) -> Tuple[Tuple[str, _Stamp], ...]:
+        """Return the on-disk version of every convention file.
+
+        A tuple of ``(name, (mtime_ns, size))`` pairs; it changes whenever a
+        file is added, removed or modified, so it can key derived caches.
+        """
+        stamps = []
+        for path in self.conventions_dir.glob("*.yaml"):
+            try:
+                stamps.append((path.stem, _stat_stamp(path)))
+            except FileNotFoundError:
+                continue
+        return tuple(sorted(stamps))
+
+    def clear(self) -> None:
+        """Drop every cached document (for testing)."""
+        with self._lock:
+            self._docs.clear()
+            self._snapshot = None
+
+
+# Process-wide registry: resolved conventions dir -> store
+_stores: Dict[Path, ConventionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def default_conventions_dir() -> Path:
+    """Return the repository ``conventions/`` directory."""
+    return Path(__file__).resolve().parents[3] / "conventions"
+
+
+def get_convention_store(conventions_dir: Optional[Path] = None) -> ConventionStore:
+    """Return the shared store for *conventions_dir* (default: ``conventions/``)."""
+    if conventions_dir is None:
+        conventions_dir = default_conventions_dir()
+    key = Path(conventions_dir).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ConventionStore(key)
+            _stores[key] = store
+        return store
+
+
+def reset_convention_stores() -> None:
+    """Forget every shared store (for testing)."""
+    with _stores_lock:
+        _stores.clear()
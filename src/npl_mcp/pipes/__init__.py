@@ -1,5 +1,5 @@
 """Agent pipes — inter-agent pub/sub messaging."""
 
-from .pipes import agent_input_pipe, agent_output_pipe
+from .pipes import agent_input_pipe, agent_input_stream, agent_output_pipe, resolve_member
 
-__all__ = ["agent_input_pipe", "agent_output_pipe"]
+__all__ = ["agent_input_pipe", "agent_input_stream", "agent_output_pipe", "resolve_member"]
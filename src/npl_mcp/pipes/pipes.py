@@ -1,23 +1,57 @@
 """Agent input/output pipe — inter-agent structured messaging.
 
 Output pipe: agent pushes YAML body with sections targeting other agents
-or groups.  Each (sender_agent_id, message_name, target*) row is upserted.
+or groups.  Each (sender_agent_id, message_name, target*) row is upserted,
+all sections in one ``unnest`` statement, with payloads stored as JSONB.
 
 Input pipe: agent pulls entries addressed to it (by UUID, agent handle,
-or group membership), optionally filtered by time and section name.
+or group membership), optionally filtered by time and section name. With
+``wait`` it long-polls: if nothing new is there yet it sleeps until the
+output pipe's NOTIFY (see ``pipes/stream.py``) names one of its targets.
+``agent_input_stream`` follows the same wake-ups as a stream of dashboards.
+
+``updated_at`` is stamped by the writer before its transaction commits, so
+an entry can become visible after a newer one was already read. Input
+pipes therefore resume from a ``PipeCursor`` (returned as ``latest``)
+rather than a bare timestamp: its floor trails the newest delivered entry
+by ``NPL_PIPE_HOLD_BACK`` seconds (default 10), each read re-queries from
+the floor, and entries already delivered above it are skipped. An entry is
+delivered exactly once provided it commits within ``HOLD_BACK`` seconds of
+its ``updated_at`` (writer clock skew included); later commits are missed.
+
+An agent's session and group memberships are cached per session for
+``NPL_PIPE_MEMBERSHIP_TTL`` seconds (default 30), so repeated polls cost a
+single entries query. Group membership changes (made directly in
+``npl_agent_group_members``) therefore reach polls only once the entry
+expires; a stream keeps the memberships it resolved when it opened.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
+import math
+import os
+import time
 import uuid as _uuid_mod
-from datetime import datetime, timezone
-from typing import Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Optional
 
 import shortuuid
 import yaml
 
+from npl_mcp.pipes.stream import CHANNEL, Waiter, build_payload, start_pipe_hub
 from npl_mcp.storage import get_pool
 
+MEMBERSHIP_TTL = float(os.environ.get("NPL_PIPE_MEMBERSHIP_TTL", "30"))
+MEMBERSHIP_CACHE_SIZE = 1024
+MAX_WAIT = 300.0
+HOLD_BACK = float(os.environ.get("NPL_PIPE_HOLD_BACK", "10"))
+# Delivered entries kept above the floor; bounds the cursor's length
+MAX_RECENT = 128
+
 
 def _decode(value: str) -> Optional[_uuid_mod.UUID]:
     try:
@@ -34,6 +68,38 @@ def _encode(uid: _uuid_mod.UUID) -> str:
     return shortuuid.encode(uid)
 
 
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _jsonable(value: Any) -> Any:
+    """Normalize parsed YAML into data the JSONB column accepts.
+
+    YAML-only types (dates, timestamps, sets) become their string form,
+    including when used as mapping keys, and ``.nan`` / ``.inf`` become
+    null since JSON has no spelling for them.
+    """
+    if isinstance(value, dict):
+        return {
+            k if isinstance(k, str) else _key(k): _jsonable(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def _key(key: Any) -> str:
+    # Match json.dumps' spelling for scalar keys; everything else uses str()
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return str(key)
+
+
 async def _resolve_session(pool, agent_id: str) -> Optional[dict]:
     uid = _decode(agent_id)
     if uid is None:
@@ -59,6 +125,61 @@ async def _agent_groups(pool, session_id: _uuid_mod.UUID, agent_handle: str) ->
     return [{"group_name": r["group_name"], "group_handle": r["group_handle"]} for r in rows]
 
 
+@dataclass(frozen=True)
+class PipeMember:
+    """An agent session with the groups it belongs to."""
+
+    session_id: _uuid_mod.UUID
+    agent_handle: str
+    group_names: tuple[str, ...]
+    group_handles: tuple[_uuid_mod.UUID, ...]
+
+    def waiter(self, sections: Optional[list[str]] = None) -> Waiter:
+        """Return a hub waiter matching this member's targets."""
+        return Waiter(
+            str(self.session_id),
+            self.agent_handle,
+            self.group_names,
+            [str(h) for h in self.group_handles],
+            sections,
+        )
+
+
+# session id -> (loaded at, member); least recently used first
+_members: "OrderedDict[_uuid_mod.UUID, tuple[float, PipeMember]]" = OrderedDict()
+
+
+async def resolve_member(agent: str) -> Optional[PipeMember]:
+    """Return the session and group memberships of *agent*, or None.
+
+    Results are cached per session for ``MEMBERSHIP_TTL`` seconds.
+    """
+    uid = _decode(agent)
+    if uid is None:
+        return None
+    cached = _members.get(uid)
+    if cached is not None and time.monotonic() - cached[0] < MEMBERSHIP_TTL:
+        _members.move_to_end(uid)
+        return cached[1]
+
+    pool = await get_pool()
+    session = await _resolve_session(pool, agent)
+    if session is None:
+        return None
+    groups = await _agent_groups(pool, session["id"], session["agent"])
+    member = PipeMember(
+        session_id=session["id"],
+        agent_handle=session["agent"],
+        group_names=tuple(g["group_name"] for g in groups),
+        group_handles=tuple(g["group_handle"] for g in groups),
+    )
+    _members[uid] = (time.monotonic(), member)
+    _members.move_to_end(uid)
+    while len(_members) > MEMBERSHIP_CACHE_SIZE:
+        _members.popitem(last=False)
+    return member
+
+
 # ── output pipe ──────────────────────────────────────────────────────────
 
 
@@ -82,7 +203,9 @@ async def agent_output_pipe(
            <arbitrary yaml payload>
 
     Each (sender, message_name, target) tuple is upserted — calling again
-    replaces the previous entry's body and bumps ``updated_at``.
+    replaces the previous entry's data and bumps ``updated_at``. All
+    sections are written by one statement, which also sends the NOTIFY
+    that wakes waiting input pipes. Payloads are stored as JSONB.
     """
     pool = await get_pool()
     session = await _resolve_session(pool, agent)
@@ -99,8 +222,12 @@ async def agent_output_pipe(
 
     sender_id: _uuid_mod.UUID = session["id"]
     sender_handle: str = session["agent"]
-    upserted = 0
 
+    # One array per column; all sections are upserted by a single statement
+    columns: dict[str, list[Any]] = {
+        "message_name": [], "target_agent": [], "target_agent_handle": [],
+        "target_group": [], "target_group_handle": [], "data": [],
+    }
     for message_name, section in parsed.items():
         if not isinstance(section, dict):
             continue
@@ -110,40 +237,63 @@ async def agent_output_pipe(
             data = {k: v for k, v in section.items() if k != "target"}
 
         target_agent_raw = target.get("agent")
-        target_agent = _decode(target_agent_raw) if target_agent_raw else None
-        target_agent_handle = target.get("agent-handle")
-        target_group = target.get("group")
         target_group_handle_raw = target.get("group-handle")
-        target_group_handle = _decode(target_group_handle_raw) if target_group_handle_raw else None
-
-        body_text = yaml.dump(data, default_flow_style=False, allow_unicode=True)
-        now = datetime.now(timezone.utc)
-
-        # Upsert by (sender, message_name, target combination)
-        await pool.execute(
-            """INSERT INTO npl_agent_pipe_entries
-                   (sender_agent_id, sender_agent_handle, message_name,
-                    target_agent, target_agent_handle, target_group, target_group_handle,
-                    body, created_at, updated_at)
-               VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$9)
-               ON CONFLICT (sender_agent_id, message_name,
-                            COALESCE(target_agent::text,''),
-                            COALESCE(target_agent_handle,''),
-                            COALESCE(target_group,''),
-                            COALESCE(target_group_handle::text,''))
-               DO UPDATE SET body = EXCLUDED.body,
-                             updated_at = EXCLUDED.updated_at""",
+        columns["message_name"].append(str(message_name))
+        columns["target_agent"].append(_decode(str(target_agent_raw)) if target_agent_raw else None)
+        columns["target_agent_handle"].append(_text(target.get("agent-handle")))
+        columns["target_group"].append(_text(target.get("group")))
+        columns["target_group_handle"].append(
+            _decode(str(target_group_handle_raw)) if target_group_handle_raw else None
+        )
+        columns["data"].append(json.dumps(_jsonable(data)))
+
+    upserted = len(columns["message_name"])
+    if upserted:
+        payload = build_payload(
+            columns["message_name"],
+            agents=[str(a) for a in columns["target_agent"] if a],
+            handles=[h for h in columns["target_agent_handle"] if h],
+            groups=[g for g in columns["target_group"] if g],
+            group_handles=[str(h) for h in columns["target_group_handle"] if h],
+        )
+        # Upsert by (sender, message_name, target combination); the NOTIFY
+        # rides in the same statement and is delivered on commit
+        await pool.fetchval(
+            """WITH upserted AS (
+                   INSERT INTO npl_agent_pipe_entries
+                       (sender_agent_id, sender_agent_handle, message_name,
+                        target_agent, target_agent_handle, target_group, target_group_handle,
+                        data, body, created_at, updated_at)
+                   SELECT $1, $2, t.message_name,
+                          t.target_agent, t.target_agent_handle, t.target_group,
+                          t.target_group_handle, t.data::jsonb, NULL, $3, $3
+                   FROM unnest($4::text[], $5::uuid[], $6::text[], $7::text[], $8::uuid[],
+                               $9::text[])
+                        AS t(message_name, target_agent, target_agent_handle, target_group,
+                             target_group_handle, data)
+                   ON CONFLICT (sender_agent_id, message_name,
+                                COALESCE(target_agent::text,''),
+                                COALESCE(target_agent_handle,''),
+                                COALESCE(target_group,''),
+                                COALESCE(target_group_handle::text,''))
+                   DO UPDATE SET data = EXCLUDED.data,
+                                 body = NULL,
+                                 updated_at = EXCLUDED.updated_at
+                   RETURNING 1
+               )
+               SELECT pg_notify($10, $11) FROM (SELECT count(*) FROM upserted) AS done""",
             sender_id,
             sender_handle,
-            str(message_name),
-            target_agent,
-            target_agent_handle,
-            target_group,
-            target_group_handle,
-            body_text,
-            now,
+            datetime.now(timezone.utc),
+            columns["message_name"],
+            columns["target_agent"],
+            columns["target_agent_handle"],
+            columns["target_group"],
+            columns["target_group_handle"],
+            columns["data"],
+            CHANNEL,
+            payload,
         )
-        upserted += 1
 
     return {"status": "ok", "upserted": upserted, "sender": _encode(sender_id)}
 
@@ -151,65 +301,110 @@ async def agent_output_pipe(
 # ── input pipe ───────────────────────────────────────────────────────────
 
 
-async def agent_input_pipe(
-    agent: str,
-    since: Optional[str] = None,
-    full: bool = False,
-    with_sections: Optional[list[str]] = None,
-) -> dict[str, Any]:
-    """Pull messages addressed to this agent.
-
-    Matches entries where any target field matches the agent's session UUID,
-    agent handle, or group memberships.
-
-    Args:
-        agent: Session UUID (short or full) of the requesting agent.
-        since: ISO-8601 UTC timestamp — only entries updated after this time.
-        full: If True, return all matching entries (no time filter even if since set).
-        with_sections: Optional list of message_name values to include.
+def parse_since(since: str) -> datetime:
+    """Parse an ISO-8601 ``since`` timestamp (``Z`` suffix allowed, naive means UTC).
 
-    Returns a YAML dashboard keyed by message_name with sender info + data.
+    Raises:
+        ValueError: If *since* is not a valid timestamp
     """
-    pool = await get_pool()
-    session = await _resolve_session(pool, agent)
-    if session is None:
-        return {"status": "error", "message": f"Session not found: {agent}"}
+    parsed = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
-    session_id: _uuid_mod.UUID = session["id"]
-    agent_handle: str = session["agent"]
 
-    groups = await _agent_groups(pool, session_id, agent_handle)
-    group_names = [g["group_name"] for g in groups]
-    group_handles = [g["group_handle"] for g in groups]
+@dataclass
+class PipeCursor:
+    """Entries delivered to one input pipe reader.
+
+    Every entry updated at or before ``floor`` counts as delivered, as do
+    the entries in ``recent`` (id -> ``updated_at``) above it. ``advance``
+    keeps the floor ``HOLD_BACK`` seconds behind the newest delivered entry.
+    """
 
+    floor: Optional[datetime] = None
+    recent: dict[int, datetime] = field(default_factory=dict)
+
+    @classmethod
+    def parse(cls, value: str) -> "PipeCursor":
+        """Parse ``"<floor>"`` or ``"<floor>~<id>.<us>,..."``.
+
+        A bare ISO-8601 timestamp is a cursor with nothing above its floor;
+        each ``<id>.<us>`` is an entry delivered ``<us>`` microseconds
+        after the floor.
+
+        Raises:
+            ValueError: If *value* is not such a cursor
+        """
+        stamp, _, keys = value.strip().partition("~")
+        floor = parse_since(stamp)
+        recent: dict[int, datetime] = {}
+        for key in filter(None, keys.split(",")):
+            entry_id, _, offset = key.partition(".")
+            if not (entry_id.isdigit() and offset.isdigit()):
+                raise ValueError(f"Invalid pipe cursor: {value!r}")
+            recent[int(entry_id)] = floor + timedelta(microseconds=int(offset))
+        return cls(floor, recent)
+
+    def __str__(self) -> str:
+        if self.floor is None:
+            return ""
+        keys = ",".join(
+            f"{entry_id}.{(at - self.floor) // timedelta(microseconds=1)}"
+            for entry_id, at in sorted(self.recent.items())
+        )
+        return f"{self.floor.isoformat()}~{keys}" if keys else self.floor.isoformat()
+
+    def is_new(self, row) -> bool:
+        """True if *row* has not been delivered through this cursor."""
+        at = row["updated_at"]
+        if at is None or (self.floor is not None and at <= self.floor):
+            return False
+        return self.recent.get(row["id"]) != at
+
+    def advance(self, rows: list) -> None:
+        """Record *rows* as delivered and raise the floor past settled entries."""
+        for row in rows:
+            if self.is_new(row):
+                self.recent[row["id"]] = row["updated_at"]
+        if not self.recent:
+            return
+        floor = min(max(self.recent.values()), datetime.now(timezone.utc) - timedelta(seconds=HOLD_BACK))
+        if len(self.recent) > MAX_RECENT:
+            floor = max(floor, sorted(self.recent.values())[-MAX_RECENT - 1])
+        if self.floor is None or floor > self.floor:
+            self.floor = floor
+        self.recent = {i: at for i, at in self.recent.items() if at > self.floor}
+
+
+async def _fetch_entries(
+    member: PipeMember,
+    since: Optional[datetime],
+    with_sections: Optional[list[str]],
+) -> list:
+    """Return entries addressed to *member*, newest first."""
     # Build query — match any target field
     conditions = [
         "e.target_agent = $1",
         "e.target_agent_handle = $2",
     ]
-    params: list[Any] = [session_id, agent_handle]
+    params: list[Any] = [member.session_id, member.agent_handle]
     idx = 3
 
-    if group_names:
+    if member.group_names:
         conditions.append(f"e.target_group = ANY(${idx}::text[])")
-        params.append(group_names)
+        params.append(list(member.group_names))
         idx += 1
 
-    if group_handles:
+    if member.group_handles:
         conditions.append(f"e.target_group_handle = ANY(${idx}::uuid[])")
-        params.append(group_handles)
+        params.append(list(member.group_handles))
         idx += 1
 
     where = f"({' OR '.join(conditions)})"
 
     # Optional time filter
-    if since and not full:
-        try:
-            since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
-        except ValueError:
-            return {"status": "error", "message": f"Invalid since timestamp: {since}"}
+    if since is not None:
         where += f" AND e.updated_at > ${idx}"
-        params.append(since_dt)
+        params.append(since)
         idx += 1
 
     # Optional section filter
@@ -218,23 +413,43 @@ async def agent_input_pipe(
         params.append(with_sections)
         idx += 1
 
-    rows = await pool.fetch(
-        f"""SELECT e.message_name, e.sender_agent_id, e.sender_agent_handle,
-                   e.body, e.updated_at
+    pool = await get_pool()
+    return await pool.fetch(
+        f"""SELECT e.id, e.message_name, e.sender_agent_id, e.sender_agent_handle,
+                   e.data, e.body, e.updated_at
             FROM npl_agent_pipe_entries e
             WHERE {where}
             ORDER BY e.updated_at DESC""",
         *params,
     )
 
-    # Build dashboard
+
+def _entry_data(row) -> Any:
+    """Return an entry's payload; rows written before changeset 022 hold YAML text."""
+    if row["data"] is not None:
+        return json.loads(row["data"])
+    try:
+        return _jsonable(yaml.safe_load(row["body"]))
+    except yaml.YAMLError:
+        return row["body"]
+
+
+async def _fetch_new(
+    member: PipeMember,
+    cursor: PipeCursor,
+    with_sections: Optional[list[str]],
+) -> list:
+    """Return entries from the cursor's floor on that it has not delivered yet."""
+    rows = await _fetch_entries(member, cursor.floor, with_sections)
+    return [row for row in rows if cursor.is_new(row)]
+
+
+def _dashboard(member: PipeMember, rows: list, cursor: PipeCursor) -> dict[str, Any]:
+    """Render *rows* as the input pipe's dashboard response, advancing *cursor*."""
     dashboard: dict[str, Any] = {}
     for row in rows:
         key = row["message_name"]
-        try:
-            data = yaml.safe_load(row["body"])
-        except yaml.YAMLError:
-            data = row["body"]
+        data = _entry_data(row)
         entry = {
             "sender": {
                 "agent_id": _encode(row["sender_agent_id"]),
@@ -250,11 +465,104 @@ async def agent_input_pipe(
         else:
             dashboard[key] = entry
 
+    cursor.advance(rows)
     return {
         "status": "ok",
-        "agent": _encode(session_id),
-        "agent_handle": agent_handle,
-        "groups": [g["group_name"] for g in groups],
+        "agent": _encode(member.session_id),
+        "agent_handle": member.agent_handle,
+        "groups": list(member.group_names),
         "entries": len(rows),
+        "latest": str(cursor) or None,
         "dashboard": dashboard,
     }
+
+
+async def agent_input_pipe(
+    agent: str,
+    since: Optional[str] = None,
+    full: bool = False,
+    with_sections: Optional[list[str]] = None,
+    wait: Optional[float] = None,
+) -> dict[str, Any]:
+    """Pull messages addressed to this agent.
+
+    Matches entries where any target field matches the agent's session UUID,
+    agent handle, or group memberships.
+
+    Args:
+        agent: Session UUID (short or full) of the requesting agent.
+        since: ``latest`` of a previous call (or an ISO-8601 UTC timestamp) —
+            only entries not delivered through it.
+        full: If True, return all matching entries (no time filter even if since set).
+        with_sections: Optional list of message_name values to include.
+        wait: If no entries match yet, wait up to this many seconds (max 300)
+            for a matching ``agent_output_pipe`` call before returning.
+
+    Returns a YAML dashboard keyed by message_name with sender info + data.
+    ``latest`` is a ``PipeCursor`` covering every entry returned so far (a
+    bare timestamp once they are ``HOLD_BACK`` seconds old); pass it as the
+    next ``since`` to long-poll in a loop.
+    """
+    member = await resolve_member(agent)
+    if member is None:
+        return {"status": "error", "message": f"Session not found: {agent}"}
+
+    cursor = PipeCursor()
+    if since and not full:
+        try:
+            cursor = PipeCursor.parse(since)
+        except ValueError:
+            return {"status": "error", "message": f"Invalid since timestamp: {since}"}
+
+    if not wait or wait <= 0:
+        rows = await _fetch_new(member, cursor, with_sections)
+        return _dashboard(member, rows, cursor)
+
+    # Register before the first query so a write landing in between wakes us
+    hub = await start_pipe_hub()
+    waiter = hub.subscribe(member.waiter(with_sections))
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + min(wait, MAX_WAIT)
+    try:
+        while True:
+            rows = await _fetch_new(member, cursor, with_sections)
+            remaining = deadline - loop.time()
+            if rows or remaining <= 0 or not await waiter.wait(remaining):
+                break
+    finally:
+        hub.unsubscribe(waiter)
+    return _dashboard(member, rows, cursor)
+
+
+async def agent_input_stream(
+    member: PipeMember,
+    since: Optional[PipeCursor] = None,
+    with_sections: Optional[list[str]] = None,
+    hub: Any = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield SSE events (``event``, ``id``, ``data``) of input pipe dashboards.
+
+    The first dashboard holds every entry not delivered through *since*
+    (all entries when None, possibly none); each later one holds only
+    entries not yet streamed, and is produced when ``agent_output_pipe``
+    notifies one of the member's targets. Each event ``id`` is the
+    dashboard's ``latest`` cursor, usable as ``since`` to resume.
+    """
+    cursor = since or PipeCursor()
+    hub = hub or await start_pipe_hub()
+    waiter = hub.subscribe(member.waiter(with_sections))
+    try:
+        first = True
+        while True:
+            rows = await _fetch_new(member, cursor, with_sections)
+            if rows or first:
+                result = _dashboard(member, rows, cursor)
+                yield {
+                    "event": "dashboard",
+                    "id": result["latest"] or "",
+                    "data": json.dumps(result, default=str),
+                }
+                first = False
+            await waiter.wait()
+    finally:
+        hub.unsubscribe(waiter)
@@ -0,0 +1,185 @@
+"""Wake-ups for agent input pipes fed by Postgres LISTEN/NOTIFY.
+
+``agent_output_pipe`` sends one notification per call on the
+``npl_agent_pipe`` channel listing the section names and every target it
+wrote (session ids, agent handles, group names, group handles). One
+``PipeHub`` per process holds a single dedicated LISTEN connection --
+opened when the first waiter arrives -- and wakes only the waiters whose
+session, handle or groups appear among those targets. Waiters then re-run
+their own ``since`` query, so notifications carry no entry data and a
+lost or oversized notification only costs an extra wake-up.
+
+Used by the ``wait`` long-poll mode of ``agent_input_pipe`` and by the
+``/pipes/input/stream`` SSE endpoint. After the LISTEN connection is
+re-established every waiter is woken, since notifications sent while
+disconnected are gone; the same happens once when the connection first
+opens, covering entries written while it was being established.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set
+
+from npl_mcp.storage.listen import HubSlot, ListenHub
+
+CHANNEL = "npl_agent_pipe"
+
+# pg_notify payloads must stay below 8000 bytes
+MAX_PAYLOAD = 7900
+
+
+def build_payload(
+    sections: Iterable[str],
+    agents: Iterable[str],
+    handles: Iterable[str],
+    groups: Iterable[str],
+    group_handles: Iterable[str],
+) -> str:
+    """Return the notification payload for one ``agent_output_pipe`` call.
+
+    Falls back to ``{"broadcast": true}`` (wake every waiter) when the
+    target lists would not fit in a notification.
+    """
+    payload = json.dumps({
+        "sections": sorted(set(sections)),
+        "agents": sorted(set(agents)),
+        "handles": sorted(set(handles)),
+        "groups": sorted(set(groups)),
+        "group_handles": sorted(set(group_handles)),
+    }, separators=(",", ":"))
+    if len(payload.encode()) > MAX_PAYLOAD:
+        return '{"broadcast":true}'
+    return payload
+
+
+class Waiter:
+    """One long-poll or stream waiting for entries addressed to an agent."""
+
+    def __init__(
+        self,
+        session_id: str,
+        agent_handle: str,
+        groups: Iterable[str] = (),
+        group_handles: Iterable[str] = (),
+        sections: Optional[Iterable[str]] = None,
+    ):
+        self.session_id = session_id
+        self.agent_handle = agent_handle
+        self.groups: FrozenSet[str] = frozenset(groups)
+        self.group_handles: FrozenSet[str] = frozenset(group_handles)
+        self.sections: Optional[FrozenSet[str]] = frozenset(sections) if sections else None
+        self._ready = asyncio.Event()
+
+    def matches(self, note: Dict[str, Any]) -> bool:
+        """True if *note* targets this agent (and one of its sections)."""
+        if note.get("broadcast"):
+            return True
+        if self.sections is not None and self.sections.isdisjoint(note.get("sections", ())):
+            return False
+        return (
+            self.session_id in note.get("agents", ())
+            or self.agent_handle in note.get("handles", ())
+            or not self.groups.isdisjoint(note.get("groups", ()))
+            or not self.group_handles.isdisjoint(note.get("group_handles", ()))
+        )
+
+    def wake(self) -> None:
+        self._ready.set()
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until woken or *timeout* seconds pass; True if woken."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._ready.clear()
+        return True
+
+
+class PipeHub(ListenHub):
+    """One LISTEN connection waking in-process pipe waiters."""
+
+    channel = CHANNEL
+    task_name = "npl-pipe-hub"
+
+    def __init__(self, reconnect_delay: float = 1.0):
+        super().__init__(reconnect_delay)
+        self._waiters: Set[Waiter] = set()
+        self.woken = 0
+
+    async def stop(self) -> None:
+        """Stop the connection task, close the LISTEN connection and wake all waiters."""
+        await super().stop()
+        self._wake_all()
+
+    # ------------------------------------------------------------------
+    # Waiters
+    # ------------------------------------------------------------------
+
+    def subscribe(self, waiter: Waiter) -> Waiter:
+        """Register *waiter*; it is woken by matching notifications."""
+        self._waiters.add(waiter)
+        if not self._listening:
+            self._wake()
+        return waiter
+
+    def unsubscribe(self, waiter: Waiter) -> None:
+        """Remove *waiter*; the LISTEN connection stays open for later waiters."""
+        self._waiters.discard(waiter)
+
+    def _wake_all(self) -> None:
+        for waiter in self._waiters:
+            waiter.wake()
+
+    # ------------------------------------------------------------------
+    # Listener
+    # ------------------------------------------------------------------
+
+    def _has_subscribers(self) -> bool:
+        return bool(self._waiters)
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        note = self._decode(payload)
+        if note is None:
+            return
+        for waiter in self._waiters:
+            if waiter.matches(note):
+                waiter.wake()
+                self.woken += 1
+
+    def _on_connect(self, reconnect: bool) -> None:
+        # Entries written before LISTEN took effect sent no usable
+        # notification; every waiter re-queries once
+        self._wake_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return waiter and wake-up counters for health reporting."""
+        return {
+            **super().stats(),
+            "waiters": len(self._waiters),
+            "woken": self.woken,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide hub
+# ---------------------------------------------------------------------------
+
+_slot: HubSlot[PipeHub] = HubSlot(PipeHub)
+
+
+def get_pipe_hub() -> Optional[PipeHub]:
+    """Return the running hub, or None when no waiter has started one."""
+    return _slot.get()
+
+
+async def start_pipe_hub(**kwargs: Any) -> PipeHub:
+    """Create and start the process-wide hub (idempotent)."""
+    return await _slot.start(**kwargs)
+
+
+async def stop_pipe_hub() -> None:
+    """Stop the process-wide hub and close its LISTEN connection."""
+    await _slot.stop()
@@ -0,0 +1,87 @@
+"""Compile ``conventions/*.yaml`` into a precompiled snapshot.
+
+The snapshot (``conventions/.npl-snapshot.pickle``) holds every convention
+file already parsed plus the SHA-256 of its source bytes.  The convention
+store loads it on first use and skips PyYAML for any file whose hash still
+matches, which keeps the first NPLLoad/NPLSpec call after a restart fast.
+Stale entries are ignored, so a forgotten rebuild only costs speed.
+
+Usage::
+
+    uv run npl-conventions-snapshot                  # writes conventions/.npl-snapshot.pickle
+    uv run npl-conventions-snapshot --out path.pkl   # custom destination
+    uv run npl-conventions-snapshot --check          # exit 1 if the snapshot is stale
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from npl_mcp.npl.snapshot import (
+    build_snapshot,
+    load_snapshot,
+    snapshot_path,
+    write_snapshot,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+DEFAULT_CONVENTIONS = REPO_ROOT / "conventions"
+
+
+def snapshot_is_current(conventions_dir: Path) -> bool:
+    """Return True if the on-disk snapshot matches every convention file hash."""
+    existing = load_snapshot(conventions_dir)
+    fresh = build_snapshot(conventions_dir)["files"]
+    if set(existing) != set(fresh):
+        return False
+    return all(existing[name].get("sha256") == fresh[name]["sha256"] for name in fresh)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="npl-conventions-snapshot",
+        description="Compile conventions/*.yaml into a precompiled snapshot for fast cold start.",
+    )
+    parser.add_argument(
+        "--conventions",
+        type=Path,
+        default=DEFAULT_CONVENTIONS,
+        help="Directory containing convention YAMLs (default: repo/conventions).",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        default=None,
+        help="Output snapshot path (default: <conventions>/.npl-snapshot.pickle).",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 if the snapshot is missing or stale.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.check:
+        path = snapshot_path(args.conventions)
+        if not path.exists():
+            print(f"{path} does not exist — build required.", file=sys.stderr)
+            return 1
+        if snapshot_is_current(args.conventions):
+            print(f"{path} is up to date.")
+            return 0
+        print(
+            f"{path} is stale — rebuild with `uv run npl-conventions-snapshot`.",
+            file=sys.stderr,
+        )
+        return 1
+
+    out = write_snapshot(args.conventions, args.out)
+    print(f"Wrote {out.stat().st_size} bytes to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
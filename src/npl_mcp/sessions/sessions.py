@@ -12,10 +12,12 @@ from typing import Any, Optional
 import shortuuid
 
 from npl_mcp.storage import get_pool
+from npl_mcp.storage.pagination import InvalidCursor, Keyset
 
 
 VALID_STATUSES = {"active", "paused", "completed", "archived"}
 _DEFAULT_STATUS = "active"
+_SESSION_KEYSET = Keyset("work_sessions", ("created_at", "id"))
 
 
 def _encode(uid: _uuid_mod.UUID) -> str:
@@ -104,8 +106,12 @@ async def session_get(session_id: str) -> dict[str, Any]:
 async def session_list(
     status: Optional[str] = None,
     limit: int = 50,
+    cursor: Optional[str] = None,
 ) -> dict[str, Any]:
-    """List generic sessions, optionally filtered by status."""
+    """List generic sessions, newest first, optionally filtered by status.
+
+    Pass the returned ``next_cursor`` back as *cursor* for the next page.
+    """
     if status is not None and status not in VALID_STATUSES:
         return {
             "status": "error",
@@ -123,18 +129,27 @@ async def session_list(
         clauses.append(f"status = ${idx}")
         params.append(status)
         idx += 1
+    try:
+        after, values = _SESSION_KEYSET.after(cursor, idx)
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e)}
+    if after:
+        clauses.append(after)
+        params.extend(values)
+        idx += len(values)
     where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    params.append(lim)
+    params.append(lim + 1)
 
     pool = await get_pool()
     rows = await pool.fetch(
         f"""SELECT id, title, status, description, created_by, created_at, updated_at
             FROM npl_generic_sessions
             {where}
-            ORDER BY created_at DESC
+            ORDER BY {_SESSION_KEYSET.order_by()}
             LIMIT ${idx}""",
         *params,
     )
+    rows, next_cursor = _SESSION_KEYSET.page(rows, lim)
 
     sessions_out = []
     for r in rows:
@@ -146,6 +161,7 @@ async def session_list(
         "status": "ok",
         "sessions": sessions_out,
         "count": len(sessions_out),
+        "next_cursor": next_cursor,
     }
 
 
@@ -229,12 +245,9 @@ async def session_get_contents(session_id: str) -> dict[str, Any]:
     session = _row_to_dict(row)
 
     rooms = await pool.fetch(
-        """SELECT r.id, r.name, r.description, COUNT(m.id) AS message_count,
-                  MAX(m.created_at) AS last_activity, r.created_at
-           FROM npl_chat_rooms r
-           LEFT JOIN npl_chat_messages m ON m.room_id = r.id
-           GROUP BY r.id
-           ORDER BY r.created_at DESC""",
+        """SELECT id, name, description, message_count, last_activity, created_at
+           FROM npl_chat_rooms
+           ORDER BY created_at DESC""",
     )
 
     artifacts = await pool.fetch(
@@ -1,5 +1,5 @@
 """Storage package – asyncpg connection pool singleton."""
 
-from .pool import get_pool, close_pool
+from .pool import get_pool, close_pool, connect
 
-__all__ = ["get_pool", "close_pool"]
+__all__ = ["get_pool", "close_pool", "connect"]
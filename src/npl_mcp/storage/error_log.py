@@ -1,6 +1,8 @@
 """Structured error logging for MCP tool invocations."""
 import traceback
+from datetime import datetime, timezone
 from typing import Optional
+from npl_mcp.storage.metrics_buffer import get_metrics_buffer
 from npl_mcp.storage.pool import get_pool
 
 
@@ -9,11 +11,25 @@ async def log_tool_error(
     exc: BaseException,
     session_id: Optional[str] = None,
 ) -> None:
-    """Record a tool-call error. Best-effort — swallows DB errors."""
+    """Record a tool-call error. Best-effort — swallows DB errors.
+
+    Queued on the metrics buffer when one is running, else inserted inline.
+    """
+    stack = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))[:2048]
+    buffer = get_metrics_buffer()
+    if buffer is not None:
+        await buffer.put("npl_tool_errors", (
+            tool_name,
+            type(exc).__name__,
+            str(exc)[:1024],
+            session_id,
+            stack,
+            datetime.now(timezone.utc),
+        ))
+        return
     try:
         pool = await get_pool()
         async with pool.acquire() as conn:
-            stack = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))[:2048]
             await conn.execute(
                 """
                 INSERT INTO npl_tool_errors
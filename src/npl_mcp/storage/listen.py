@@ -0,0 +1,205 @@
+"""Shared Postgres LISTEN connection for in-process notification hubs.
+
+``ListenHub`` owns one dedicated connection LISTENing on a single channel
+and a background task that opens it lazily -- when the first subscriber
+arrives -- and re-opens it with exponential backoff after it drops.
+Subclasses set ``channel`` and override two hooks:
+
+* ``_on_notify``  -- the asyncpg listener callback for one notification
+* ``_on_connect`` -- called each time LISTEN takes effect; notifications
+                     sent before that (or while disconnected) are gone,
+                     so subscribers must catch up from the tables
+
+``_has_subscribers`` tells the task whether a connection is wanted and
+``_drain`` runs after every wake-up for hubs that do work off the
+callback. ``HubSlot`` holds the process-wide instance of a hub class
+behind the usual ``get_x``/``start_x``/``stop_x`` helpers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+from npl_mcp.storage.pool import connect
+
+logger = logging.getLogger(__name__)
+
+MAX_RECONNECT_BACKOFF = 30.0
+
+
+class ListenHub:
+    """One LISTEN connection on ``channel`` shared by in-process subscribers."""
+
+    channel: str = ""
+    task_name: str = "npl-listen-hub"
+
+    def __init__(self, reconnect_delay: float = 1.0):
+        self.reconnect_delay = reconnect_delay
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._conn: Any = None
+        self._listening = False
+
+        self.notifications = 0
+        self.reconnects = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        """True while the connection task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the connection task on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        if self._has_subscribers():
+            self._wakeup.set()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=self.task_name)
+
+    async def stop(self) -> None:
+        """Stop the connection task and close the LISTEN connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self._close()
+
+    def _wake(self) -> None:
+        """Wake the connection task (e.g. a subscriber arrived)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+
+    def _has_subscribers(self) -> bool:
+        """True while anything in-process needs the LISTEN connection."""
+        raise NotImplementedError
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        """Handle one notification (asyncpg listener callback)."""
+        raise NotImplementedError
+
+    def _on_connect(self, reconnect: bool) -> None:
+        """Called once LISTEN is in effect; *reconnect* is False the first time."""
+
+    async def _drain(self) -> None:
+        """Process work queued by ``_on_notify``; runs after every wake-up."""
+
+    def _decode(self, payload: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON *payload* and count it; None (logged) if malformed."""
+        try:
+            note = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed %s notification: %r", self.channel, payload)
+            return None
+        self.notifications += 1
+        return note
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    def _on_terminate(self, conn: Any) -> None:
+        self._listening = False
+        self._wake()
+
+    async def _listen(self) -> None:
+        """Open the dedicated connection and LISTEN on ``channel``."""
+        conn = await connect()
+        try:
+            await conn.add_listener(self.channel, self._on_notify)
+        except BaseException:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_terminate)
+        self._conn = conn
+        self._listening = True
+
+    async def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        self._listening = False
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close()
+            except Exception:
+                logger.debug("Closing %s LISTEN connection failed", self.channel, exc_info=True)
+
+    async def _run(self) -> None:
+        backoff = 0.0
+        connected_before = False
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            if self._has_subscribers() and not self._listening:
+                await self._close()
+                try:
+                    await self._listen()
+                except Exception as e:
+                    backoff = min(max(backoff * 2, self.reconnect_delay), MAX_RECONNECT_BACKOFF)
+                    logger.warning(
+                        "%s LISTEN connection failed (retry in %.1fs): %s", self.channel, backoff, e,
+                    )
+                    await asyncio.sleep(backoff)
+                    self._wakeup.set()
+                    continue
+                backoff = 0.0
+                if connected_before:
+                    self.reconnects += 1
+                self._on_connect(connected_before)
+                connected_before = True
+
+            await self._drain()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection counters for health reporting."""
+        return {
+            "running": self.running,
+            "listening": self._listening,
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+        }
+
+
+H = TypeVar("H", bound=ListenHub)
+
+
+class HubSlot(Generic[H]):
+    """The process-wide instance of one hub class."""
+
+    def __init__(self, factory: Callable[..., H]):
+        self.factory = factory
+        self.hub: Optional[H] = None
+
+    def get(self) -> Optional[H]:
+        """Return the running hub, or None when none has been started."""
+        if self.hub is not None and self.hub.running:
+            return self.hub
+        return None
+
+    async def start(self, **kwargs: Any) -> H:
+        """Create and start the hub (idempotent)."""
+        if self.hub is None or not self.hub.running:
+            self.hub = self.factory(**kwargs)
+            self.hub.start()
+        return self.hub
+
+    async def stop(self) -> None:
+        """Stop the hub and close its LISTEN connection."""
+        if self.hub is not None:
+            await self.hub.stop()
+            self.hub = None
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Optional
 
+from npl_mcp.storage.metrics_buffer import get_metrics_buffer
 from npl_mcp.storage.pool import get_pool
 
 
@@ -21,7 +23,22 @@ async def record_tool_call(
     error: Optional[str] = None,
     session_id: Optional[str] = None,
 ) -> None:
-    """Record a tool invocation. Best-effort -- swallows DB errors."""
+    """Record a tool invocation. Best-effort -- swallows DB errors.
+
+    Queued on the metrics buffer when one is running, else inserted inline.
+    """
+    buffer = get_metrics_buffer()
+    if buffer is not None:
+        await buffer.put("npl_tool_calls", (
+            tool_name,
+            session_id,
+            (arguments or "")[:4096],
+            (result_summary or "")[:2048],
+            response_time_ms,
+            (error or "")[:2048] if error else None,
+            datetime.now(timezone.utc),
+        ))
+        return
     try:
         pool = await get_pool()
         async with pool.acquire() as conn:
@@ -54,7 +71,23 @@ async def record_llm_call(
     latency_ms: Optional[int] = None,
     session_id: Optional[str] = None,
 ) -> None:
-    """Record an LLM invocation. Best-effort -- swallows DB errors."""
+    """Record an LLM invocation. Best-effort -- swallows DB errors.
+
+    Queued on the metrics buffer when one is running, else inserted inline.
+    """
+    buffer = get_metrics_buffer()
+    if buffer is not None:
+        await buffer.put("npl_llm_calls", (
+            model,
+            purpose,
+            prompt_tokens,
+            completion_tokens,
+            total_tokens,
+            latency_ms,
+            session_id,
+            datetime.now(timezone.utc),
+        ))
+        return
     try:
         pool = await get_pool()
         async with pool.acquire() as conn:
@@ -0,0 +1,296 @@
+"""In-process buffered writer for tool-call, LLM-call and error metrics.
+
+``record_tool_call``, ``record_llm_call`` and ``log_tool_error`` enqueue a
+row here instead of running an INSERT on the request path whenever a
+buffer is running (the ASGI app starts one in its lifespan). A single
+background task flushes queued rows in batches with
+``copy_records_to_table`` -- falling back to ``executemany`` -- once
+``max_batch`` rows are waiting or ``flush_interval`` seconds have passed.
+
+While the database is unreachable rows stay queued and flushes back off
+exponentially. The queue is bounded by ``max_queue``; when it is full the
+``policy`` decides what happens:
+
+* ``drop_oldest`` (default) -- evict the oldest queued row
+* ``drop_newest``           -- discard the incoming row
+* ``block``                 -- wait for space (up to ``block_timeout``),
+                               then discard the incoming row
+
+``stop()`` drains the queue (best-effort, bounded by a timeout) before
+returning. Without a running buffer the record helpers write inline, so
+CLI scripts and tests keep their previous behaviour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+from npl_mcp.storage.pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+
+# table -> insert column order for buffered rows
+TABLE_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "npl_tool_calls": (
+        "tool_name", "session_id", "arguments", "result_summary",
+        "response_time_ms", "error", "called_at",
+    ),
+    "npl_llm_calls": (
+        "model", "purpose", "prompt_tokens", "completion_tokens",
+        "total_tokens", "latency_ms", "session_id", "called_at",
+    ),
+    "npl_tool_errors": (
+        "tool_name", "error_type", "error_message", "session_id",
+        "stack_excerpt", "created_at",
+    ),
+}
+
+POLICIES = ("drop_oldest", "drop_newest", "block")
+
+DEFAULT_MAX_BATCH = 200
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_QUEUE = 10_000
+MAX_RETRY_BACKOFF = 30.0
+
+
+class MetricsBuffer:
+    """Bounded queue of metric rows flushed in batches by one writer task."""
+
+    def __init__(
+        self,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        policy: str = "drop_oldest",
+        block_timeout: float = 0.5,
+    ):
+        """Initialize an idle buffer; call ``start()`` inside the event loop.
+
+        Args:
+            max_batch: Rows that trigger an immediate flush (and max per batch)
+            flush_interval: Seconds between time-based flushes
+            max_queue: Maximum rows held while the database is slow or down
+            policy: Overflow policy -- ``drop_oldest``, ``drop_newest`` or ``block``
+            block_timeout: Seconds a ``block`` enqueue waits for space
+
+        Raises:
+            ValueError: If *policy* is unknown
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown metrics buffer policy: {policy}")
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self._queue: Deque[Tuple[str, Tuple[Any, ...]]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._space: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._backoff = 0.0
+
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        """True while the writer task is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the writer task on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name="npl-metrics-buffer",
+        )
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop the writer task after draining queued rows.
+
+        Rows still queued when *timeout* expires (e.g. the database is
+        down) are counted as dropped.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Metrics buffer drain timed out; %d rows lost", len(self._queue))
+        except Exception:
+            logger.exception("Metrics buffer writer failed during shutdown")
+        self._task = None
+        self.dropped += len(self._queue)
+        self._queue.clear()
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+
+    async def put(self, table: str, row: Sequence[Any]) -> bool:
+        """Queue *row* for *table*; never performs I/O.
+
+        Returns:
+            True if the row was queued, False if the overflow policy dropped it
+        """
+        if len(self._queue) >= self.max_queue:
+            if self.policy == "drop_newest":
+                self.dropped += 1
+                return False
+            if self.policy == "drop_oldest":
+                self._queue.popleft()
+                self.dropped += 1
+            else:
+                self._space.clear()
+                try:
+                    await asyncio.wait_for(self._space.wait(), self.block_timeout)
+                except asyncio.TimeoutError:
+                    pass
+                if len(self._queue) >= self.max_queue:
+                    self.dropped += 1
+                    return False
+
+        self._queue.append((table, tuple(row)))
+        self.enqueued += 1
+        # While backing off from a failed flush, let the retry timer decide
+        if len(self._queue) >= self.max_batch and not self._backoff:
+            self._wakeup.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            delay = self._backoff or self.flush_interval
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._queue:
+                if not await self.flush_once():
+                    break
+                if len(self._queue) < self.max_batch and not self._stopping:
+                    break
+
+            if self._stopping and (not self._queue or self._backoff):
+                return
+
+    async def flush_once(self) -> bool:
+        """Write up to ``max_batch`` queued rows in one transaction.
+
+        Returns:
+            True on success; on failure the rows are put back at the front
+            of the queue and the retry delay grows
+        """
+        batch = [self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))]
+        if not batch:
+            return True
+
+        by_table: Dict[str, List[Tuple[Any, ...]]] = {}
+        for table, row in batch:
+            by_table.setdefault(table, []).append(row)
+
+        try:
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    for table, rows in by_table.items():
+                        await _write_rows(conn, table, rows)
+        except Exception as e:
+            self.failed_flushes += 1
+            self._backoff = min(max(self._backoff * 2, self.flush_interval), MAX_RETRY_BACKOFF)
+            # Keep the oldest rows first; trim from the front if over capacity
+            self._queue.extendleft(reversed(batch))
+            while len(self._queue) > self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+            logger.warning("Metrics flush failed (%d rows kept): %s", len(self._queue), e)
+            return False
+
+        self._backoff = 0.0
+        self.written += len(batch)
+        self._space.set()
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and counters for health reporting."""
+        return {
+            "running": self.running,
+            "queued": len(self._queue),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+            "policy": self.policy,
+        }
+
+
+async def _write_rows(conn: Any, table: str, rows: List[Tuple[Any, ...]]) -> None:
+    """Bulk-insert *rows* using COPY, falling back to a multi-row INSERT."""
+    columns = TABLE_COLUMNS[table]
+    try:
+        # Savepoint: a failed COPY aborts only itself, not the flush transaction
+        async with conn.transaction():
+            await conn.copy_records_to_table(table, records=rows, columns=list(columns))
+    except asyncpg.PostgresError:
+        # COPY can be unavailable (e.g. behind a transaction-mode pooler)
+        placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+        await conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+            rows,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Process-wide buffer
+# ---------------------------------------------------------------------------
+
+_buffer: Optional[MetricsBuffer] = None
+
+
+def get_metrics_buffer() -> Optional[MetricsBuffer]:
+    """Return the running buffer, or None when metrics are written inline."""
+    if _buffer is not None and _buffer.running:
+        return _buffer
+    return None
+
+
+async def start_metrics_buffer(**kwargs: Any) -> MetricsBuffer:
+    """Create and start the process-wide buffer (idempotent)."""
+    global _buffer
+    if _buffer is None or not _buffer.running:
+        _buffer = MetricsBuffer(**kwargs)
+        _buffer.start()
+    return _buffer
+
+
+async def stop_metrics_buffer(timeout: float = 5.0) -> None:
+    """Drain and stop the process-wide buffer, if one is running."""
+    global _buffer
+    if _buffer is not None:
+        await _buffer.stop(timeout)
+        _buffer = None
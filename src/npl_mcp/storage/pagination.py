@@ -0,0 +1,122 @@
+"""Opaque keyset cursors for newest-first list queries.
+
+Every paginated list orders by a sort key that ends in a unique column --
+``(created_at, id)``, ``(updated_at, id)`` or just ``id`` within a scope
+such as a room or task -- and continues with a row comparison::
+
+    WHERE (created_at, id) < ($n, $n+1)
+    ORDER BY created_at DESC, id DESC
+    LIMIT page + 1
+
+so each page is an index range scan on the matching composite index
+(changeset 021) no matter how deep the client pages. The extra row tells
+whether a next page exists.
+
+Cursors are URL-safe base64 of the keyset's scope name plus the last
+row's key values. Clients treat them as opaque strings; a cursor from a
+different list is rejected rather than silently misapplied.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+
+class InvalidCursor(ValueError):
+    """Raised for malformed, tampered or foreign cursors."""
+
+
+def _pack(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"d": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "d" in value:
+            return datetime.fromisoformat(value["d"])
+        if "u" in value:
+            return uuid.UUID(value["u"])
+        raise ValueError(f"unknown cursor value {value!r}")
+    return value
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Sort key of one list query, newest first.
+
+    Attributes:
+        scope: Name embedded in cursors (e.g. ``"tasks"``)
+        columns: Sort columns; the last one must be unique (usually ``id``)
+    """
+
+    scope: str
+    columns: tuple[str, ...]
+
+    def _qualified(self, alias: str) -> list[str]:
+        prefix = f"{alias}." if alias else ""
+        return [f"{prefix}{column}" for column in self.columns]
+
+    def order_by(self, alias: str = "") -> str:
+        """Return the ``ORDER BY`` list, e.g. ``"created_at DESC, id DESC"``."""
+        return ", ".join(f"{column} DESC" for column in self._qualified(alias))
+
+    def after(self, cursor: Optional[str], idx: int, alias: str = "") -> tuple[Optional[str], list[Any]]:
+        """Return a condition selecting rows after *cursor* and its parameters.
+
+        Args:
+            cursor: Cursor from a previous page, or None for the first page
+            idx: Number of the first ``$`` placeholder to use
+            alias: Table alias to qualify the columns with
+
+        Returns:
+            ``(None, [])`` without a cursor, otherwise e.g.
+            ``("(created_at, id) < ($3, $4)", [ts, 42])``
+
+        Raises:
+            InvalidCursor: If *cursor* is malformed or belongs to another list
+        """
+        if not cursor:
+            return None, []
+        values = self.decode(cursor)
+        placeholders = ", ".join(f"${idx + i}" for i in range(len(values)))
+        return f"({', '.join(self._qualified(alias))}) < ({placeholders})", values
+
+    def encode(self, row: Any) -> str:
+        """Return the cursor continuing after *row*."""
+        payload = [self.scope, [_pack(row[column]) for column in self.columns]]
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode(self, cursor: str) -> list[Any]:
+        """Return the key values stored in *cursor*.
+
+        Raises:
+            InvalidCursor: If *cursor* is malformed or belongs to another list
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            scope, values = json.loads(raw)
+            values = [_unpack(value) for value in values]
+        except (binascii.Error, ValueError, TypeError) as e:
+            raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+        if scope != self.scope or len(values) != len(self.columns):
+            raise InvalidCursor(f"Cursor does not belong to this list: {cursor!r}")
+        return values
+
+    def page(self, rows: Sequence[Any], limit: int) -> tuple[list[Any], Optional[str]]:
+        """Trim a ``LIMIT limit + 1`` result to *limit* rows and the next cursor."""
+        rows = list(rows)
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, self.encode(rows[-1])
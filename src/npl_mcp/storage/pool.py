@@ -16,22 +16,29 @@ import asyncpg
 _pool: Optional[asyncpg.Pool] = None
 
 
+def _connect_kwargs() -> dict:
+    return {
+        "host": os.environ.get("NPL_DB_HOST", "localhost"),
+        "port": int(os.environ.get("NPL_DB_PORT", "5432")),
+        "database": os.environ.get("NPL_DB_NAME", "npl"),
+        "user": os.environ.get("NPL_DB_USER", "npl"),
+        "password": os.environ.get("NPL_DB_PASSWORD", "npl"),
+    }
+
+
 async def get_pool() -> asyncpg.Pool:
     """Return the shared connection pool, creating it on first call."""
     global _pool
     if _pool is None:
-        _pool = await asyncpg.create_pool(
-            host=os.environ.get("NPL_DB_HOST", "localhost"),
-            port=int(os.environ.get("NPL_DB_PORT", "5432")),
-            database=os.environ.get("NPL_DB_NAME", "npl"),
-            user=os.environ.get("NPL_DB_USER", "npl"),
-            password=os.environ.get("NPL_DB_PASSWORD", "npl"),
-            min_size=1,
-            max_size=5,
-        )
+        _pool = await asyncpg.create_pool(**_connect_kwargs(), min_size=1, max_size=5)
     return _pool
 
 
+async def connect() -> asyncpg.Connection:
+    """Open a standalone connection outside the pool (e.g. for LISTEN)."""
+    return await asyncpg.connect(**_connect_kwargs())
+
+
 async def close_pool() -> None:
     """Close the pool if it was created."""
     global _pool
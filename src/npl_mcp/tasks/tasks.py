@@ -17,12 +17,19 @@ from __future__ import annotations
 from typing import Any, Optional
 
 from npl_mcp.storage import get_pool
+from npl_mcp.storage.pagination import InvalidCursor, Keyset
 
 
 VALID_STATUSES = {"pending", "in_progress", "blocked", "review", "done"}
 _DEFAULT_STATUS = "pending"
 _DEFAULT_PRIORITY = 1
 
+# Newest-first keysets; see npl_mcp.storage.pagination
+_TASK_KEYSET = Keyset("tasks", ("created_at", "id"))
+_QUEUE_KEYSET = Keyset("task_queues", ("created_at", "id"))
+_TASK_FEED_KEYSET = Keyset("task_feed", ("id",))
+_QUEUE_FEED_KEYSET = Keyset("queue_feed", ("id",))
+
 
 def _row_to_dict(row) -> dict[str, Any]:
     """Convert a DB row to a response dict (without the ``status`` envelope key)."""
@@ -112,13 +119,15 @@ async def task_list(
     status: Optional[str] = None,
     assigned_to: Optional[str] = None,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> dict[str, Any]:
-    """List tasks, optionally filtered by status / assignee.
+    """List tasks, newest first, optionally filtered by status / assignee.
 
     Args:
         status: Optional status filter — must be in ``VALID_STATUSES`` if set.
         assigned_to: Optional assignee filter (exact match).
         limit: Max rows to return (1..500, default 100).
+        cursor: ``next_cursor`` of the previous page.
     """
     if status is not None and status not in VALID_STATUSES:
         return {
@@ -141,9 +150,17 @@ async def task_list(
         clauses.append(f"assigned_to = ${idx}")
         params.append(assigned_to)
         idx += 1
+    try:
+        after, values = _TASK_KEYSET.after(cursor, idx)
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e)}
+    if after:
+        clauses.append(after)
+        params.extend(values)
+        idx += len(values)
 
     where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
-    params.append(lim)
+    params.append(lim + 1)
 
     pool = await get_pool()
     rows = await pool.fetch(
@@ -151,15 +168,17 @@ async def task_list(
                    created_at, updated_at
             FROM npl_tasks
             {where}
-            ORDER BY created_at DESC
+            ORDER BY {_TASK_KEYSET.order_by()}
             LIMIT ${idx}""",
         *params,
     )
+    rows, next_cursor = _TASK_KEYSET.page(rows, lim)
 
     return {
         "status": "ok",
         "tasks": [_row_to_dict(r) for r in rows],
         "count": len(rows),
+        "next_cursor": next_cursor,
     }
 
 
@@ -291,31 +310,39 @@ async def task_queue_get(queue_id: int) -> dict[str, Any]:
 async def task_queue_list(
     status: Optional[str] = None,
     limit: int = 50,
+    cursor: Optional[str] = None,
 ) -> dict[str, Any]:
-    """List task queues."""
-    pool = await get_pool()
+    """List task queues, newest first."""
+    clauses: list[str] = []
+    params: list[Any] = []
     if status:
-        rows = await pool.fetch(
-            """SELECT id, name, description, session_id, chat_room_id, status,
-                      created_at, updated_at
-               FROM npl_task_queues WHERE status = $1
-               ORDER BY created_at DESC LIMIT $2""",
-            status,
-            limit,
-        )
-    else:
-        rows = await pool.fetch(
-            """SELECT id, name, description, session_id, chat_room_id, status,
-                      created_at, updated_at
-               FROM npl_task_queues
-               ORDER BY created_at DESC LIMIT $1""",
-            limit,
-        )
+        params.append(status)
+        clauses.append(f"status = ${len(params)}")
+    try:
+        after, values = _QUEUE_KEYSET.after(cursor, len(params) + 1)
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e)}
+    if after:
+        clauses.append(after)
+        params.extend(values)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    params.append(limit + 1)
+
+    pool = await get_pool()
+    rows = await pool.fetch(
+        f"""SELECT id, name, description, session_id, chat_room_id, status,
+                  created_at, updated_at
+           FROM npl_task_queues {where}
+           ORDER BY {_QUEUE_KEYSET.order_by()} LIMIT ${len(params)}""",
+        *params,
+    )
+    rows, next_cursor = _QUEUE_KEYSET.page(rows, limit)
 
     return {
         "status": "ok",
         "queues": [_queue_dto(r) for r in rows],
         "count": len(rows),
+        "next_cursor": next_cursor,
     }
 
 
@@ -462,34 +489,61 @@ async def task_list_artifacts(task_id: int) -> dict[str, Any]:
     }
 
 
-async def task_feed(
-    task_id: int,
-    since: Optional[str] = None,
-    limit: int = 50,
-) -> dict[str, Any]:
-    """Get activity feed for a task."""
+async def _feed_rows(
+    column: str,
+    keyset: Keyset,
+    scope_id: int,
+    since: Optional[str],
+    limit: int,
+    cursor: Optional[str],
+) -> tuple[list[Any], Optional[str]]:
+    """Fetch feed events for ``column = scope_id``.
+
+    With *since*, events after that time come oldest first; otherwise pages
+    run newest first along ``(column, id)``.
+
+    Raises:
+        InvalidCursor: If *cursor* was not issued for this feed
+    """
     pool = await get_pool()
     if since:
         rows = await pool.fetch(
-            """SELECT id, task_id, queue_id, event_type, persona, data, created_at
+            f"""SELECT id, task_id, queue_id, event_type, persona, data, created_at
                FROM npl_task_events
-               WHERE task_id = $1 AND created_at > $2::timestamptz
+               WHERE {column} = $1 AND created_at > $2::timestamptz
                ORDER BY created_at
                LIMIT $3""",
-            task_id,
+            scope_id,
             since,
             limit,
         )
-    else:
-        rows = await pool.fetch(
-            """SELECT id, task_id, queue_id, event_type, persona, data, created_at
-               FROM npl_task_events
-               WHERE task_id = $1
-               ORDER BY created_at DESC
-               LIMIT $2""",
-            task_id,
-            limit,
-        )
+        return rows, None
+
+    after, values = keyset.after(cursor, 2)
+    rows = await pool.fetch(
+        f"""SELECT id, task_id, queue_id, event_type, persona, data, created_at
+           FROM npl_task_events
+           WHERE {column} = $1{f" AND {after}" if after else ""}
+           ORDER BY {keyset.order_by()}
+           LIMIT ${2 + len(values)}""",
+        scope_id,
+        *values,
+        limit + 1,
+    )
+    return keyset.page(rows, limit)
+
+
+async def task_feed(
+    task_id: int,
+    since: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> dict[str, Any]:
+    """Get activity feed for a task."""
+    try:
+        rows, next_cursor = await _feed_rows("task_id", _TASK_FEED_KEYSET, task_id, since, limit, cursor)
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e)}
     return {
         "status": "ok",
         "task_id": task_id,
@@ -504,6 +558,7 @@ async def task_feed(
             for r in rows
         ],
         "count": len(rows),
+        "next_cursor": next_cursor,
     }
 
 
@@ -511,30 +566,13 @@ async def queue_feed(
     queue_id: int,
     since: Optional[str] = None,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> dict[str, Any]:
     """Get activity feed for a task queue."""
-    pool = await get_pool()
-    if since:
-        rows = await pool.fetch(
-            """SELECT id, task_id, queue_id, event_type, persona, data, created_at
-               FROM npl_task_events
-               WHERE queue_id = $1 AND created_at > $2::timestamptz
-               ORDER BY created_at
-               LIMIT $3""",
-            queue_id,
-            since,
-            limit,
-        )
-    else:
-        rows = await pool.fetch(
-            """SELECT id, task_id, queue_id, event_type, persona, data, created_at
-               FROM npl_task_events
-               WHERE queue_id = $1
-               ORDER BY created_at DESC
-               LIMIT $2""",
-            queue_id,
-            limit,
-        )
+    try:
+        rows, next_cursor = await _feed_rows("queue_id", _QUEUE_FEED_KEYSET, queue_id, since, limit, cursor)
+    except InvalidCursor as e:
+        return {"status": "error", "message": str(e)}
     return {
         "status": "ok",
         "queue_id": queue_id,
@@ -550,4 +588,5 @@ async def queue_feed(
             for r in rows
         ],
         "count": len(rows),
+        "next_cursor": next_cursor,
     }
@@ -236,7 +236,8 @@ class TestArtifactList:
         assert result["count"] == 1
         sql, *args = pool.fetch.call_args[0]
         assert "kind = $1" in sql
-        assert args == ["json", 100]
+        # LIMIT fetches one extra row to detect a next page
+        assert args == ["json", 101]
 
     @patch("npl_mcp.artifacts.artifacts.get_pool")
     async def test_limit_clamped(self, mock_pool):
@@ -246,11 +247,11 @@ class TestArtifactList:
 
         await artifact_list(limit=99999)
         _, *args = pool.fetch.call_args[0]
-        assert args[-1] == 500
+        assert args[-1] == 501  # + 1 probe row for the next cursor
 
         await artifact_list(limit=0)
         _, *args = pool.fetch.call_args[0]
-        assert args[-1] == 1
+        assert args[-1] == 2
 
 
 # ---------------------------------------------------------------------------
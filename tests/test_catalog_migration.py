@@ -125,7 +125,7 @@ EXPECTED_MCP_TOOL_NAMES = {
 
 EXPECTED_DISCOVERABLE_NAMES = {
     # Browser
-    "ToMarkdown", "Ping", "Download", "Screenshot", "Rest",
+    "ToMarkdown", "ToMarkdown.Batch", "Ping", "Download", "Screenshot", "Rest",
     # Utility
     "Secret",
     # Instructions (hidden)
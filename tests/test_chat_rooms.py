@@ -0,0 +1,84 @@
+"""Tests for chat room queries over denormalized statistics (npl_mcp.chat.chat).
+
+Tests cover:
+- room_list / room_get read counters from npl_chat_rooms without aggregating messages
+- Member listings expose unread counters
+- room_mark_read reports missing members
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+from npl_mcp.chat import chat
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+ROOM = {
+    "id": 1, "name": "general", "description": None, "message_count": 12_000,
+    "last_activity": NOW, "last_message_id": 12_345, "created_at": NOW,
+}
+
+
+def _pool(fetch=None, fetchrow=None):
+    pool = AsyncMock()
+    pool.fetch.return_value = fetch or []
+    pool.fetchrow.return_value = fetchrow
+    return pool
+
+
+class TestRoomQueries:
+    async def test_room_list_reads_counters(self):
+        pool = _pool(fetch=[ROOM])
+        with patch.object(chat, "get_pool", AsyncMock(return_value=pool)):
+            rooms = await chat.room_list(limit=10)
+
+        sql = pool.fetch.call_args.args[0]
+        assert "npl_chat_messages" not in sql
+        assert "GROUP BY" not in sql
+        assert rooms == [{
+            "id": 1, "name": "general", "description": "", "message_count": 12_000,
+            "last_activity": NOW.isoformat(), "last_message_id": 12_345,
+            "created_at": NOW.isoformat(),
+        }]
+
+    async def test_room_get(self):
+        pool = _pool(fetchrow=ROOM)
+        with patch.object(chat, "get_pool", AsyncMock(return_value=pool)):
+            room = await chat.room_get(1)
+        assert "npl_chat_messages" not in pool.fetchrow.call_args.args[0]
+        assert room["message_count"] == 12_000
+
+    async def test_room_create_returns_counters(self):
+        pool = _pool(fetchrow={**ROOM, "message_count": 0, "last_activity": None,
+                               "last_message_id": None})
+        with patch.object(chat, "get_pool", AsyncMock(return_value=pool)):
+            room = await chat.room_create("general")
+        assert room["message_count"] == 0
+        assert room["last_activity"] is None
+
+
+class TestMembers:
+    async def test_unread_counts_listed(self):
+        pool = _pool(fetch=[{
+            "id": 1, "room_id": 1, "persona_slug": "alice", "joined_at": NOW,
+            "unread_count": 3, "last_read_message_id": 40,
+        }])
+        with patch.object(chat, "get_pool", AsyncMock(return_value=pool)):
+            result = await chat.room_list_members(1)
+        assert result["members"][0]["unread_count"] == 3
+        assert result["members"][0]["last_read_message_id"] == 40
+
+    async def test_mark_read(self):
+        pool = _pool(fetchrow={"persona_slug": "alice", "unread_count": 0,
+                               "last_read_message_id": 12_345})
+        with patch.object(chat, "get_pool", AsyncMock(return_value=pool)):
+            result = await chat.room_mark_read(1, "alice")
+        assert result == {"status": "ok", "room_id": 1, "persona_slug": "alice",
+                          "unread_count": 0, "last_read_message_id": 12_345}
+
+    async def test_mark_read_unknown_member(self):
+        with patch.object(chat, "get_pool", AsyncMock(return_value=_pool())):
+            result = await chat.room_mark_read(1, "nobody", message_id=5)
+        assert result["status"] == "not_found"
@@ -0,0 +1,460 @@
+"""Tests for push-based chat streams (npl_mcp.chat.stream).
+
+Tests cover:
+- Stream cursors parse, render and skip already delivered ids
+- Rows committed out of id order are streamed once, live and in backfill
+- One fetch per kind fans rows out to every subscriber of a room
+- Notifications only reach the matching persona
+- Resume from a cursor replays rows before going live, without duplicates
+- Overflowing subscribers and every LISTEN (re)connect resync from the tables
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from npl_mcp.chat import stream as stream_module
+from npl_mcp.chat.stream import ChatHub, StreamCursor, Subscription, room_stream
+from npl_mcp.storage import listen as listen_module
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _FakePool:
+    """In-memory chat tables answering the stream module's queries."""
+
+    def __init__(self):
+        self.messages = []
+        self.events = []
+        self.notifications = []
+        self.queries = []
+
+    def add_message(self, room_id, content):
+        row = {"id": len(self.messages) + 1, "room_id": room_id, "content": content,
+               "author": "user", "created_at": NOW}
+        self.messages.append(row)
+        return row
+
+    def add_event(self, room_id, event_type, data=None):
+        row = {"id": len(self.events) + 1, "room_id": room_id, "event_type": event_type,
+               "persona": "alice", "data": json.dumps(data or {}), "reply_to_id": None,
+               "created_at": NOW}
+        self.events.append(row)
+        return row
+
+    def add_notification(self, event_id, persona):
+        event = self.events[event_id - 1]
+        row = {"id": len(self.notifications) + 1, "persona": persona,
+               "notification_type": "mention", "event_id": event_id, "created_at": NOW,
+               "read_at": None, "room_id": event["room_id"],
+               "event_type": event["event_type"], "data": event["data"]}
+        self.notifications.append(row)
+        return row
+
+    async def fetch(self, sql, *args):
+        self.queries.append(sql)
+        if "npl_chat_notifications" in sql:
+            table = self.notifications
+        elif "npl_chat_events" in sql:
+            table = self.events
+        else:
+            table = self.messages
+        if "ANY" in sql:
+            return [r for r in table if r["id"] in args[0]]
+        room_id, after, limit, *persona = args
+        rows = [r for r in table if r["room_id"] == room_id and r["id"] > after
+                and (not persona or r["persona"] == persona[0])]
+        return rows[:limit]
+
+    async def fetchrow(self, sql, room_id, persona, hold_back):
+        # Every existing row is older than the hold-back window
+        def newest(rows):
+            return max((r["id"] for r in rows if r["room_id"] == room_id), default=0)
+        return {
+            "message": newest(self.messages),
+            "event": newest(self.events),
+            "notification": newest([n for n in self.notifications if n["persona"] == persona]),
+            "message_recent": None, "event_recent": None, "notification_recent": None,
+        }
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = _FakePool()
+
+    async def _get_pool():
+        return fake
+
+    monkeypatch.setattr(stream_module, "get_pool", _get_pool)
+    return fake
+
+
+def _note(kind, room_id, item_id, **extra):
+    return {"kind": kind, "room_id": room_id, "id": item_id, **extra}
+
+
+async def _take(agen, count):
+    return [await asyncio.wait_for(agen.__anext__(), 1.0) for _ in range(count)]
+
+
+# ---------------------------------------------------------------------------
+# Cursor
+# ---------------------------------------------------------------------------
+
+
+class TestStreamCursor:
+    def test_round_trip(self):
+        cursor = StreamCursor.parse("12.5.0")
+        assert (cursor.message, cursor.event, cursor.notification) == (12, 5, 0)
+        assert str(cursor) == "12.5.0"
+
+    def test_round_trip_with_recent_ids(self):
+        cursor = StreamCursor.parse("9+11+13.4.0")
+        assert (cursor.floor("message"), cursor.message) == (9, 13)
+        assert str(cursor) == "9+11+13.4.0"
+        assert not cursor.advance("message", 11)
+        assert cursor.advance("message", 10)
+
+    @pytest.mark.parametrize("value", ["", "1.2", "1.2.x", "-1.0.0", "1.2.3.4", "1+.0.0", "1+-2.0.0"])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            StreamCursor.parse(value)
+
+    def test_advance_skips_seen_ids(self):
+        cursor = StreamCursor()
+        assert cursor.advance("message", 3)
+        assert not cursor.advance("message", 3)
+        assert cursor.advance("reaction", 7)
+        assert cursor.event == 7
+        assert not cursor.advance("event", 7)
+
+    def test_out_of_order_ids_within_hold_back(self):
+        cursor = StreamCursor(5)
+        assert cursor.advance("message", 7)
+        # id 6 committed after 7 was delivered
+        assert cursor.advance("message", 6)
+        assert not cursor.advance("message", 6)
+        assert not cursor.advance("message", 5)
+        assert str(cursor) == "5+6+7.0.0"
+
+    def test_floor_passes_settled_ids(self, monkeypatch):
+        monkeypatch.setattr(stream_module, "HOLD_BACK", 0)
+        cursor = StreamCursor()
+        assert cursor.advance("message", 4)
+        assert str(cursor) == "4.0.0"
+        assert not cursor.advance("message", 3)
+
+    def test_recent_ids_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(stream_module, "MAX_RECENT", 3)
+        cursor = StreamCursor()
+        for item_id in range(1, 6):
+            cursor.advance("message", item_id)
+        assert str(cursor) == "2+3+4+5.0.0"
+
+
+# ---------------------------------------------------------------------------
+# Fan-out
+# ---------------------------------------------------------------------------
+
+
+class TestDispatch:
+    async def test_one_query_per_kind_for_all_subscribers(self, pool):
+        hub = ChatHub()
+        subs = [hub.subscribe(1) for _ in range(3)]
+        for i in range(5):
+            pool.add_message(1, f"m{i}")
+        pool.add_event(1, "todo")
+        pool.add_event(1, "reaction", {"emoji": "+1"})
+
+        notes = [_note("message", 1, i) for i in range(1, 6)]
+        notes += [_note("event", 1, 1), _note("reaction", 1, 2)]
+        await hub.dispatch(notes)
+
+        assert len(pool.queries) == 2
+        for sub in subs:
+            items = await sub.get()
+            assert [kind for kind, _, _ in items] == ["message"] * 5 + ["event", "reaction"]
+            assert items[-1][2]["data"] == {"emoji": "+1"}
+        assert hub.delivered == 21
+
+    async def test_unwatched_rooms_are_not_fetched(self, pool):
+        hub = ChatHub()
+        hub.subscribe(1)
+        pool.add_message(2, "elsewhere")
+        await hub.dispatch([_note("message", 2, 1)])
+        assert pool.queries == []
+
+    async def test_notifications_filtered_by_persona(self, pool):
+        hub = ChatHub()
+        alice = hub.subscribe(1, persona="alice")
+        anonymous = hub.subscribe(1)
+        pool.add_event(1, "todo")
+        pool.add_notification(1, "alice")
+        pool.add_notification(1, "bob")
+
+        await hub.dispatch([
+            _note("notification", 1, 1, persona="alice"),
+            _note("notification", 1, 2, persona="bob"),
+        ])
+        assert [(kind, item_id) for kind, item_id, _ in await alice.get()] == [("notification", 1)]
+        assert not anonymous._items
+
+    async def test_on_notify_queues_only_watched_rooms(self):
+        hub = ChatHub()
+        hub.start()
+        hub.subscribe(1)
+        hub._on_notify(None, 0, "npl_chat", json.dumps(_note("message", 2, 1)))
+        hub._on_notify(None, 0, "npl_chat", "not json")
+        assert list(hub._inbox) == []
+        await hub.stop()
+
+
+class TestSubscription:
+    async def test_overflow_marks_stale(self):
+        sub = Subscription(1, None, max_queue=2)
+        for i in range(3):
+            sub.deliver(("message", i + 1, {}))
+        assert sub.stale
+        assert await sub.get() == []
+
+
+# ---------------------------------------------------------------------------
+# Streams
+# ---------------------------------------------------------------------------
+
+
+class TestRoomStream:
+    async def test_resume_replays_then_goes_live(self, pool):
+        hub = ChatHub()
+        for i in range(3):
+            pool.add_message(1, f"m{i}")
+        pool.add_event(1, "todo")
+
+        agen = room_stream(1, cursor=StreamCursor.parse("1.0.0"), hub=hub)
+        replayed = await _take(agen, 3)
+        assert [e["event"] for e in replayed] == ["message", "message", "event"]
+        assert [e["id"] for e in replayed] == ["1+2.0.0", "1+2+3.0.0", "1+2+3.0+1.0"]
+        assert json.loads(replayed[0]["data"])["content"] == "m1"
+
+        pending = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0)
+        pool.add_message(1, "live")
+        # A duplicate of a replayed row is dropped by the cursor
+        await hub.dispatch([_note("message", 1, 3), _note("message", 1, 4)])
+        live = await asyncio.wait_for(pending, 1.0)
+        assert live["id"] == "1+2+3+4.0+1.0"
+        assert json.loads(live["data"])["content"] == "live"
+
+        await agen.aclose()
+        assert hub.stats()["subscribers"] == 0
+
+    async def test_without_cursor_starts_at_newest(self, pool):
+        hub = ChatHub()
+        pool.add_message(1, "old")
+        agen = room_stream(1, hub=hub)
+        pending = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0)
+        pool.add_message(1, "new")
+        await hub.dispatch([_note("message", 1, 2)])
+        event = await asyncio.wait_for(pending, 1.0)
+        assert json.loads(event["data"])["content"] == "new"
+        await agen.aclose()
+
+    async def test_rows_committed_out_of_id_order(self, pool):
+        hub = ChatHub()
+        agen = room_stream(1, cursor=StreamCursor(), hub=hub)
+        pending = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0)
+
+        pool.add_message(1, "slow")
+        pool.add_message(1, "fast")
+        # id 2 commits (and notifies) first; id 1 commits afterwards
+        await hub.dispatch([_note("message", 1, 2)])
+        first = await asyncio.wait_for(pending, 1.0)
+        await hub.dispatch([_note("message", 1, 1), _note("message", 1, 2)])
+        second = await asyncio.wait_for(agen.__anext__(), 1.0)
+        assert [json.loads(e["data"])["content"] for e in (first, second)] == ["fast", "slow"]
+
+        # A backfill from the resulting cursor repeats neither row
+        pool.add_message(1, "after")
+        (sub,) = hub._rooms[1]
+        sub.mark_stale()
+        third = await asyncio.wait_for(agen.__anext__(), 1.0)
+        assert json.loads(third["data"])["content"] == "after"
+        assert third["id"] == "0+1+2+3.0.0"
+        await agen.aclose()
+
+    async def test_backfill_delivers_late_lower_id(self, pool):
+        hub = ChatHub()
+        for content in ("a", "b", "c"):
+            pool.add_message(1, content)
+        # Resumed client had seen 1 and 3; 2 committed late
+        agen = room_stream(1, cursor=StreamCursor.parse("1+3.0.0"), hub=hub)
+        event = await asyncio.wait_for(agen.__anext__(), 1.0)
+        assert json.loads(event["data"])["content"] == "b"
+        assert event["id"] == "1+2+3.0.0"
+        await agen.aclose()
+
+    async def test_stale_subscriber_backfills(self, pool):
+        hub = ChatHub()
+        agen = room_stream(1, cursor=StreamCursor(), hub=hub)
+        pending = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0)
+
+        pool.add_message(1, "missed")
+        (sub,) = hub._rooms[1]
+        sub.mark_stale()
+        event = await asyncio.wait_for(pending, 1.0)
+        assert json.loads(event["data"])["content"] == "missed"
+        await agen.aclose()
+
+    async def test_backfill_pages(self, pool, monkeypatch):
+        monkeypatch.setattr(stream_module, "BACKFILL_PAGE", 2)
+        for i in range(5):
+            pool.add_message(1, f"m{i}")
+        items = [item async for item in stream_module.backfill(1, StreamCursor(), page=2)]
+        assert [item_id for _, item_id, _ in items] == [1, 2, 3, 4, 5]
+
+
+# ---------------------------------------------------------------------------
+# LISTEN connection
+# ---------------------------------------------------------------------------
+
+
+class _FakeListenConn:
+    def __init__(self):
+        self.listeners = []
+        self.terminators = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append((channel, callback))
+
+    def add_termination_listener(self, callback):
+        self.terminators.append(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class TestListener:
+    async def test_single_connection_opened_on_first_subscriber(self, monkeypatch):
+        conns = []
+
+        async def _connect():
+            conns.append(_FakeListenConn())
+            return conns[-1]
+
+        monkeypatch.setattr(listen_module, "connect", _connect)
+        hub = ChatHub()
+        hub.start()
+        await asyncio.sleep(0.01)
+        assert conns == []
+
+        sub = hub.subscribe(1)
+        hub.subscribe(2)
+        await asyncio.sleep(0.01)
+        assert len(conns) == 1
+        assert conns[0].listeners[0][0] == "npl_chat"
+        assert hub.stats()["listening"] is True
+        # Rows committed while connecting are recovered by a backfill
+        assert sub.stale
+        assert hub.stats()["reconnects"] == 0
+
+        await hub.stop()
+        assert conns[0].closed
+
+    async def test_reconnect_resyncs_subscribers(self, monkeypatch):
+        conns = []
+
+        async def _connect():
+            conns.append(_FakeListenConn())
+            return conns[-1]
+
+        monkeypatch.setattr(listen_module, "connect", _connect)
+        hub = ChatHub()
+        hub.start()
+        sub = hub.subscribe(1)
+        await asyncio.sleep(0.01)
+
+        conns[0].closed = True
+        conns[0].terminators[0](conns[0])
+        await asyncio.sleep(0.01)
+
+        assert len(conns) == 2
+        assert sub.stale
+        assert hub.stats()["reconnects"] == 1
+        await hub.stop()
+
+    async def test_first_connect_recovers_rows_committed_while_positioning(self, pool, monkeypatch):
+        async def _connect():
+            return _FakeListenConn()
+
+        monkeypatch.setattr(listen_module, "connect", _connect)
+        hub = ChatHub()
+        hub.start()
+        agen = room_stream(1, hub=hub)
+        pending = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0)
+        # Committed after the stream positioned, before LISTEN was active
+        pool.add_message(1, "unnotified")
+        event = await asyncio.wait_for(pending, 1.0)
+        assert json.loads(event["data"])["content"] == "unnotified"
+        await agen.aclose()
+        await hub.stop()
+
+    async def test_connect_failure_backs_off(self, monkeypatch):
+        attempts = []
+
+        async def _connect():
+            attempts.append(1)
+            raise OSError("connection refused")
+
+        monkeypatch.setattr(listen_module, "connect", _connect)
+        hub = ChatHub(reconnect_delay=0.01)
+        hub.start()
+        hub.subscribe(1)
+        await asyncio.sleep(0.1)
+        assert 2 <= len(attempts) < 10
+        assert hub.stats()["listening"] is False
+        await hub.stop()
+
+
+# ---------------------------------------------------------------------------
+# Route
+# ---------------------------------------------------------------------------
+
+
+class TestStreamRoute:
+    def _client(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from npl_mcp.api.router import router
+
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_invalid_cursor(self):
+        response = self._client().get(
+            "/api/chat/rooms/1/stream", headers={"Last-Event-ID": "bogus"},
+        )
+        assert response.status_code == 400
+
+    def test_unknown_room(self, monkeypatch):
+        monkeypatch.setattr("npl_mcp.chat.chat.room_get", AsyncMock(return_value=None))
+        response = self._client().get("/api/chat/rooms/99/stream?last_event_id=1.0.0")
+        assert response.status_code == 404
@@ -0,0 +1,280 @@
+"""Tests for concurrent checkpoint capture and the browser context pool.
+
+Tests cover:
+- capture_checkpoint never exceeds the configured concurrency
+- Every shot is written and records capture/write timings
+- Timings and concurrency round-trip through the manifest
+- BrowserManager reuses pooled contexts per (viewport, theme)
+- Pooled contexts never carry storage to the next capture
+- Concurrent shots in one session context each get their own viewport and theme
+"""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+import npl_mcp.browser.checkpoint as checkpoint
+import npl_mcp.browser.capture as capture
+from npl_mcp.browser.capture import BrowserManager, CaptureResult, capture_screenshot
+from npl_mcp.browser.checkpoint import capture_checkpoint, load_manifest
+
+
+# ============================================================================
+# Fakes
+# ============================================================================
+
+
+class _FakeCapture:
+    """Stand-in for capture_screenshot that tracks parallelism."""
+
+    def __init__(self, fail_on=None):
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+        self.fail_on = fail_on
+
+    async def __call__(self, url, viewport, theme, use_pool=False, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.calls.append((url, viewport, theme, use_pool))
+        try:
+            await asyncio.sleep(0.01)
+            if self.fail_on and self.fail_on in url:
+                raise ValueError("boom")
+            return CaptureResult(
+                image_bytes=f"{url}|{viewport}|{theme}".encode(),
+                width=10,
+                height=20,
+                url=url,
+                viewport_preset=viewport,
+                theme=theme,
+                full_page=True,
+                captured_at="2026-01-01T00:00:00+00:00",
+            )
+        finally:
+            self.active -= 1
+
+
+class _FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.viewport = None
+        self.color_scheme = None
+        self.scripts = []
+
+    async def set_viewport_size(self, size):
+        self.viewport = size
+
+    async def emulate_media(self, color_scheme=None):
+        self.color_scheme = color_scheme
+
+    async def goto(self, url, **kwargs):
+        await asyncio.sleep(0.01)
+
+    async def screenshot(self, **kwargs):
+        return b"png"
+
+    async def evaluate(self, script):
+        self.scripts.append(script)
+        if "localStorage.clear" in script:
+            self.context.origins = []
+        return {"width": 1, "height": 1}
+
+    async def close(self):
+        pass
+
+
+class _FakeContext:
+    def __init__(self):
+        self.closed = False
+        self.cookies_cleared = 0
+        self.origins = []
+        self.pages = []
+
+    async def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    async def storage_state(self):
+        return {"cookies": [], "origins": list(self.origins)}
+
+    async def new_page(self):
+        self.pages.append(_FakePage(self))
+        return self.pages[-1]
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.created = 0
+
+    async def new_context(self, **kwargs):
+        self.created += 1
+        ctx = _FakeContext()
+
+        async def add_init_script(script):
+            return None
+
+        ctx.add_init_script = add_init_script
+        return ctx
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+PAGES = [{"name": f"p{i}", "url": f"/p{i}"} for i in range(3)]
+
+
+# ============================================================================
+# capture_checkpoint
+# ============================================================================
+
+
+class TestConcurrentCapture:
+    def test_respects_concurrency_limit(self, tmp_path: Path, monkeypatch):
+        fake = _FakeCapture()
+        monkeypatch.setattr(checkpoint, "capture_screenshot", fake)
+        manifest = _run(capture_checkpoint(
+            "run", PAGES, "http://x", base_dir=tmp_path, concurrency=3,
+        ))
+        assert manifest.total_screenshots == 12
+        assert len(fake.calls) == 12
+        assert 1 < fake.peak <= 3
+        assert all(call[3] for call in fake.calls)
+
+    def test_sequential_by_default(self, tmp_path: Path, monkeypatch):
+        fake = _FakeCapture()
+        monkeypatch.setattr(checkpoint, "capture_screenshot", fake)
+        _run(capture_checkpoint("run", PAGES, "http://x", base_dir=tmp_path))
+        assert fake.peak == 1
+
+    def test_files_and_timings(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(checkpoint, "capture_screenshot", _FakeCapture())
+        manifest = _run(capture_checkpoint(
+            "run", PAGES, "http://x", base_dir=tmp_path, concurrency=4,
+        ))
+        info = manifest.screenshots["p1"]["mobile"]["dark"]
+        assert (tmp_path / info.path).read_bytes() == b"http://x/p1|mobile|dark"
+        assert info.capture_ms is not None and info.capture_ms >= 0
+        assert info.write_ms is not None and info.write_ms >= 0
+        assert manifest.elapsed_ms is not None
+
+    def test_manifest_roundtrip(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(checkpoint, "capture_screenshot", _FakeCapture())
+        manifest = _run(capture_checkpoint(
+            "run", PAGES, "http://x", base_dir=tmp_path, concurrency=2,
+        ))
+        loaded = _run(load_manifest(tmp_path))[manifest.slug]
+        assert loaded.concurrency == 2
+        assert loaded.elapsed_ms == manifest.elapsed_ms
+        info = loaded.screenshots["p0"]["desktop"]["light"]
+        assert info.capture_ms == manifest.screenshots["p0"]["desktop"]["light"].capture_ms
+
+    def test_failure_is_recorded(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(checkpoint, "capture_screenshot", _FakeCapture(fail_on="/p2"))
+        manifest = _run(capture_checkpoint(
+            "run", PAGES, "http://x", base_dir=tmp_path, concurrency=4,
+        ))
+        assert manifest.total_screenshots == 8
+        assert manifest.screenshots["p2"]["desktop"]["light"].path == ""
+
+
+# ============================================================================
+# BrowserManager pool
+# ============================================================================
+
+
+class TestContextPool:
+    def _manager(self, max_idle=4):
+        manager = BrowserManager(max_idle_contexts=max_idle)
+        manager._browser = _FakeBrowser()
+        return manager
+
+    def test_reuses_released_context(self):
+        async def scenario():
+            manager = self._manager()
+            ctx = await manager.acquire_context(1280, 720, "light")
+            await manager.release_context(ctx, 1280, 720, "light")
+            again = await manager.acquire_context(1280, 720, "light")
+            return manager, ctx, again
+
+        manager, ctx, again = _run(scenario())
+        assert again is ctx
+        assert ctx.cookies_cleared == 1
+        assert manager._browser.created == 1
+
+    def test_pool_is_keyed_by_viewport_and_theme(self):
+        async def scenario():
+            manager = self._manager()
+            ctx = await manager.acquire_context(1280, 720, "light")
+            await manager.release_context(ctx, 1280, 720, "light")
+            dark = await manager.acquire_context(1280, 720, "dark")
+            return ctx, dark
+
+        ctx, dark = _run(scenario())
+        assert dark is not ctx
+
+    def test_excess_contexts_are_closed(self):
+        async def scenario():
+            manager = self._manager(max_idle=1)
+            a = await manager.acquire_context(375, 667, "light")
+            b = await manager.acquire_context(375, 667, "light")
+            await manager.release_context(a, 375, 667, "light")
+            await manager.release_context(b, 375, 667, "light")
+            return manager, a, b
+
+        manager, a, b = _run(scenario())
+        assert not a.closed and b.closed
+        assert manager.pool_stats() == {"375x667/light": 1}
+
+    def test_context_with_leftover_storage_is_not_pooled(self):
+        async def scenario():
+            manager = self._manager()
+            ctx = await manager.acquire_context(1280, 720, "light")
+            ctx.origins = [{"origin": "http://x", "localStorage": [{"name": "k", "value": "v"}]}]
+            await manager.release_context(ctx, 1280, 720, "light")
+            return manager, ctx
+
+        manager, ctx = _run(scenario())
+        assert ctx.closed
+        assert manager.pool_stats() == {"1280x720/light": 0}
+
+    def test_pooled_capture_clears_page_storage(self, monkeypatch):
+        manager = self._manager()
+        monkeypatch.setattr(capture, "get_browser_manager", lambda: _async(manager))
+
+        async def scenario():
+            await capture_screenshot("http://x/a", use_pool=True, network_idle=False)
+            return await manager.acquire_context(1280, 720, "light")
+
+        ctx = _run(scenario())
+        assert manager._browser.created == 1
+        assert any("localStorage.clear" in script for script in ctx.pages[0].scripts)
+
+
+class TestSessionCapture:
+    def test_concurrent_shots_get_own_viewport_and_theme(self, monkeypatch):
+        manager = BrowserManager()
+        manager._browser = _FakeBrowser()
+        monkeypatch.setattr(capture, "get_browser_manager", lambda: _async(manager))
+
+        async def scenario():
+            await asyncio.gather(
+                capture_screenshot("http://x/a", viewport="desktop", theme="light",
+                                   session_key="auth", network_idle=False),
+                capture_screenshot("http://x/a", viewport="mobile", theme="dark",
+                                   session_key="auth", network_idle=False),
+            )
+            return manager._contexts["auth"]
+
+        ctx = _run(scenario())
+        assert manager._browser.created == 1
+        shots = sorted((p.viewport["width"], p.viewport["height"], p.color_scheme) for p in ctx.pages)
+        assert shots == [(375, 667, "dark"), (1280, 720, "light")]
+
+
+async def _async(value):
+    return value
@@ -0,0 +1,105 @@
+"""Tests for tiled, early-exit checkpoint comparison.
+
+Tests cover:
+- compare_screenshots_tiled matches compare_screenshots across tile edges
+- Identical inputs short-circuit and encode no diff image
+- compare_checkpoints skips identical pairs and writes diffs only on change
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from npl_mcp.browser.checkpoint import (
+    CheckpointManifest,
+    ScreenshotInfo,
+    compare_checkpoints,
+    save_manifest,
+)
+from npl_mcp.browser.diff import DiffStatus, compare_screenshots, compare_screenshots_tiled
+
+
+def _png(width: int, height: int, changes=()) -> bytes:
+    """Solid image with a horizontal gradient; *changes* are (x, y, rgb) edits."""
+    img = Image.new("RGBA", (width, height), (220, 220, 220, 255))
+    for x in range(width):
+        for y in range(0, height, 3):
+            img.putpixel((x, y), (x * 9 % 256, 120, 60, 255))
+    for x, y, rgb in changes:
+        img.putpixel((x, y), (*rgb, 255))
+    buf = BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class TestCompareScreenshotsTiled:
+    @pytest.mark.parametrize("tile_rows", [1, 4, 7, 64])
+    def test_matches_untiled(self, tile_rows):
+        # Edits on and around tile boundaries
+        changes = [(x, y, (0, 0, 255)) for x in range(3, 9) for y in (3, 4, 7, 8)]
+        a = _png(16, 20)
+        b = _png(16, 20, changes)
+        full = compare_screenshots(a, b)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            tiled = compare_screenshots_tiled(a, b, executor=pool, tile_rows=tile_rows)
+        assert tiled.diff_pixels == full.diff_pixels > 0
+        assert tiled.status == full.status
+        decoded_full = Image.open(BytesIO(full.diff_image)).tobytes()
+        decoded_tiled = Image.open(BytesIO(tiled.diff_image)).tobytes()
+        assert decoded_tiled == decoded_full
+
+    def test_identical_bytes_skip_diff_image(self):
+        a = _png(8, 8)
+        result = compare_screenshots_tiled(a, a)
+        assert result.status == DiffStatus.IDENTICAL
+        assert result.diff_image == b""
+        assert result.total_pixels == 64
+
+    def test_dimension_mismatch(self):
+        result = compare_screenshots_tiled(_png(8, 8), _png(8, 9))
+        assert result.status == DiffStatus.MAJOR
+        assert not result.dimensions_match
+
+
+def _write_checkpoint(base: Path, slug: str, images: dict) -> CheckpointManifest:
+    screenshots = {}
+    for page, data in images.items():
+        path = base / "checkpoints" / slug / "desktop" / "light" / f"{page}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        screenshots[page] = {"desktop": {"light": ScreenshotInfo(path=str(path.relative_to(base)))}}
+    return CheckpointManifest(
+        slug=slug,
+        name=slug,
+        description="",
+        timestamp="2026-01-01T00:00:00+00:00",
+        base_url="http://localhost",
+        viewports=["desktop"],
+        themes=["light"],
+        pages=[{"name": p} for p in images],
+        screenshots=screenshots,
+    )
+
+
+def test_compare_checkpoints_identical_and_changed(tmp_path: Path):
+    same = _png(12, 12)
+    base = _write_checkpoint(tmp_path, "base", {"home": same, "about": _png(12, 12)})
+    comp = _write_checkpoint(
+        tmp_path, "comp",
+        {"home": same, "about": _png(12, 12, [(x, y, (0, 0, 255)) for x in range(4, 8) for y in range(4, 8)])},
+    )
+    asyncio.run(save_manifest({"base": base, "comp": comp}, tmp_path))
+
+    result = asyncio.run(compare_checkpoints("base", "comp", base_dir=tmp_path, max_workers=2))
+
+    by_page = {d.page: d for d in result.details}
+    assert by_page["home"].status == "identical"
+    assert by_page["home"].diff_path is None
+    assert by_page["about"].status != "identical"
+    assert (tmp_path / by_page["about"].diff_path).exists()
+    assert result.summary["identical"] == 1
+    assert not (tmp_path / "diffs" / "base_vs_comp" / "desktop" / "light" / "home.png").exists()
@@ -0,0 +1,143 @@
+"""Tests for the process-wide convention store.
+
+Tests cover:
+- Files are parsed once and shared between consumers
+- mtime/size changes trigger a re-parse
+- Component index by slug and name
+- get_convention_store returns one store per directory
+- NPLResolver, ConventionFormatter and NPLDefinition read through the store
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from npl_mcp.npl.store import (
+    ConventionStore,
+    get_convention_store,
+    reset_convention_stores,
+)
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stores():
+    reset_convention_stores()
+    yield
+    reset_convention_stores()
+
+
+@pytest.fixture
+def conventions_dir(tmp_path: Path) -> Path:
+    """Create a minimal conventions directory."""
+    (tmp_path / "npl.yaml").write_text(yaml.dump({
+        "/npl": {
+            "version": 1.0,
+            "description": "Test NPL",
+            "concepts": [],
+            "section_order": {"components": ["syntax"]},
+        }
+    }))
+    (tmp_path / "syntax.yaml").write_text(yaml.dump({
+        "name": "syntax",
+        "categories": [{"name": "core", "title": "Core"}],
+        "components": [
+            {
+                "name": "placeholder",
+                "slug": "placeholder-slug",
+                "category": "core",
+                "brief": "Placeholder brief",
+                "examples": [],
+            },
+            {
+                "name": "qualifier",
+                "slug": "qualifier",
+                "category": "core",
+                "brief": "Qualifier brief",
+                "examples": [],
+            },
+        ],
+    }))
+    return tmp_path
+
+
+def _touch_newer(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+# ============================================================================
+# Store behaviour
+# ============================================================================
+
+
+class TestConventionStore:
+    def test_parses_once(self, conventions_dir):
+        store = ConventionStore(conventions_dir)
+        first = store.load("syntax")
+        second = store.load("syntax")
+        assert first is second
+        assert store.parse_count == 1
+
+    def test_reparses_on_change(self, conventions_dir):
+        store = ConventionStore(conventions_dir)
+        store.load("syntax")
+        path = conventions_dir / "syntax.yaml"
+        path.write_text(yaml.dump({"name": "syntax", "components": [{"name": "only", "slug": "only"}]}))
+        _touch_newer(path)
+        data = store.load("syntax")
+        assert [c["name"] for c in data["components"]] == ["only"]
+        assert store.parse_count == 2
+
+    def test_component_index(self, conventions_dir):
+        store = ConventionStore(conventions_dir)
+        assert store.component("syntax", "placeholder-slug")["name"] == "placeholder"
+        assert store.component("syntax", "placeholder")["slug"] == "placeholder-slug"
+        assert store.component("syntax", "missing") is None
+
+    def test_missing_file_raises(self, conventions_dir):
+        store = ConventionStore(conventions_dir)
+        with pytest.raises(FileNotFoundError):
+            store.load("pumps")
+
+    def test_names_skip_npl(self, conventions_dir):
+        store = ConventionStore(conventions_dir)
+        assert store.names() == ["syntax"]
+        assert store.names(include_npl=True) == ["npl", "syntax"]
+
+    def test_shared_per_directory(self, conventions_dir, tmp_path_factory):
+        assert get_convention_store(conventions_dir) is get_convention_store(conventions_dir)
+        other = tmp_path_factory.mktemp("other")
+        assert get_convention_store(other) is not get_convention_store(conventions_dir)
+
+
+# ============================================================================
+# Consumers share the store
+# ============================================================================
+
+
+class TestConsumersShareStore:
+    def test_resolver_uses_shared_store(self, conventions_dir):
+        from npl_mcp.npl.resolver import NPLResolver
+        from npl_mcp.npl.parser import parse_expression
+
+        for _ in range(3):
+            resolved = NPLResolver(conventions_dir).resolve(parse_expression("syntax#qualifier"))
+            assert [c.slug for c in resolved] == ["qualifier"]
+        assert get_convention_store(conventions_dir).parse_count == 1
+
+    def test_formatter_and_definition_share_store(self, conventions_dir):
+        from npl_mcp.convention_formatter import ConventionFormatter, NPLDefinition
+
+        for _ in range(3):
+            ConventionFormatter(conventions_dir).format_convention("syntax")
+            out = NPLDefinition(conventions_dir).format()
+            assert "Placeholder brief" in out
+        # npl.yaml + syntax.yaml, each parsed exactly once
+        assert get_convention_store(conventions_dir).parse_count == 2
@@ -0,0 +1,100 @@
+"""Tests for the precompiled convention snapshot and npl-conventions-snapshot."""
+
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+
+import pytest
+import yaml
+
+from npl_mcp.npl.snapshot import SNAPSHOT_FORMAT, load_snapshot, snapshot_path, write_snapshot
+from npl_mcp.npl.store import ConventionStore
+from npl_mcp.scripts.conventions_snapshot import main
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def conventions_dir(tmp_path: Path) -> Path:
+    conv = tmp_path / "conventions"
+    conv.mkdir()
+    (conv / "syntax.yaml").write_text(yaml.dump({
+        "name": "syntax",
+        "components": [{"name": "placeholder", "slug": "placeholder", "brief": "Original"}],
+    }))
+    (conv / "pumps.yaml").write_text(yaml.dump({"name": "pumps", "components": []}))
+    return conv
+
+
+def _rewrite(path: Path, text: str) -> None:
+    path.write_text(text)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+# ---------------------------------------------------------------------------
+# Store integration
+# ---------------------------------------------------------------------------
+
+class TestStoreUsesSnapshot:
+    def test_serves_from_snapshot_without_parsing(self, conventions_dir: Path):
+        write_snapshot(conventions_dir)
+        store = ConventionStore(conventions_dir)
+        assert store.component("syntax", "placeholder")["brief"] == "Original"
+        assert store.snapshot_hits == 1
+        assert store.parse_count == 0
+
+    def test_hash_mismatch_falls_back_to_yaml(self, conventions_dir: Path):
+        write_snapshot(conventions_dir)
+        path = conventions_dir / "syntax.yaml"
+        _rewrite(path, path.read_text().replace("Original", "Edited"))
+        store = ConventionStore(conventions_dir)
+        assert store.component("syntax", "placeholder")["brief"] == "Edited"
+        assert store.snapshot_hits == 0
+        assert store.parse_count == 1
+
+    def test_format_mismatch_is_ignored(self, conventions_dir: Path):
+        snapshot_path(conventions_dir).write_bytes(
+            pickle.dumps({"format": SNAPSHOT_FORMAT + 1, "files": {}})
+        )
+        assert load_snapshot(conventions_dir) == {}
+
+    def test_corrupt_snapshot_is_ignored(self, conventions_dir: Path):
+        snapshot_path(conventions_dir).write_bytes(b"not a pickle")
+        store = ConventionStore(conventions_dir)
+        assert store.load("pumps")["name"] == "pumps"
+        assert store.parse_count == 1
+
+    def test_snapshot_not_listed_as_convention(self, conventions_dir: Path):
+        write_snapshot(conventions_dir)
+        assert ConventionStore(conventions_dir).names() == ["pumps", "syntax"]
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+class TestMain:
+    def test_writes_snapshot(self, conventions_dir: Path, capsys):
+        assert main(["--conventions", str(conventions_dir)]) == 0
+        assert snapshot_path(conventions_dir).exists()
+        assert set(load_snapshot(conventions_dir)) == {"syntax", "pumps"}
+
+    def test_check_reports_missing_file(self, conventions_dir: Path, capsys):
+        assert main(["--conventions", str(conventions_dir), "--check"]) == 1
+        assert "does not exist" in capsys.readouterr().err
+
+    def test_check_reports_up_to_date(self, conventions_dir: Path, capsys):
+        main(["--conventions", str(conventions_dir)])
+        assert main(["--conventions", str(conventions_dir), "--check"]) == 0
+        assert "up to date" in capsys.readouterr().out
+
+    def test_check_reports_stale(self, conventions_dir: Path, capsys):
+        main(["--conventions", str(conventions_dir)])
+        (conventions_dir / "fences.yaml").write_text(yaml.dump({"name": "fences"}))
+        assert main(["--conventions", str(conventions_dir), "--check"]) == 1
+        assert "stale" in capsys.readouterr().err
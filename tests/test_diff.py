@@ -0,0 +1,93 @@
+"""Tests for browser visual diff engines.
+
+Tests cover:
+- NumPy engine matches the pure Python reference (counts and diff image)
+- Anti-aliasing classification at image borders and with include_aa
+- compare_screenshots selects the NumPy engine and falls back without it
+"""
+
+import random
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from npl_mcp.browser import diff
+from npl_mcp.browser.diff import compare_screenshots, pixelmatch
+
+np = pytest.importorskip("numpy")
+
+
+def _random_pair(width: int, height: int, seed: int) -> tuple[bytes, bytes]:
+    """Two RGBA buffers with flat regions, gradients and scattered noise."""
+    rng = random.Random(seed)
+    base = bytearray()
+    for y in range(height):
+        for x in range(width):
+            if x < width // 3:
+                px = (200, 200, 200)
+            elif x < 2 * width // 3:
+                px = (x * 7 % 256, y * 11 % 256, (x + y) * 5 % 256)
+            else:
+                px = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            base += bytes((*px, 255))
+    other = bytearray(base)
+    # Solid block inside the flat region: a real (non anti-aliased) change
+    for y in range(2, min(7, height)):
+        for x in range(1, min(5, width // 3)):
+            idx = (y * width + x) * 4
+            other[idx:idx + 3] = bytes((10, 40, 220))
+    for _ in range(width * height // 4):
+        idx = rng.randrange(width * height) * 4
+        for c in range(3):
+            other[idx + c] = max(0, min(255, other[idx + c] + rng.randrange(-90, 91)))
+    return bytes(base), bytes(other)
+
+
+def _png(rgba: bytes, width: int, height: int) -> bytes:
+    buf = BytesIO()
+    Image.frombytes("RGBA", (width, height), rgba).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("include_aa", [False, True])
+@pytest.mark.parametrize("threshold", [0.0, 0.1, 0.3])
+def test_numpy_matches_reference(seed, include_aa, threshold):
+    width, height = 23, 17
+    img1, img2 = _random_pair(width, height, seed)
+    expected = pixelmatch(img1, img2, width, height, threshold=threshold, include_aa=include_aa)
+    actual = diff.pixelmatch_numpy(img1, img2, width, height, threshold=threshold, include_aa=include_aa)
+    assert actual[0] == expected[0]
+    assert actual[1] == expected[1]
+
+
+def test_numpy_identical_images():
+    width, height = 8, 600  # spans several row bands
+    img1, _ = _random_pair(width, height, 7)
+    count, out = diff.pixelmatch_numpy(img1, img1, width, height)
+    assert count == 0
+    assert out == pixelmatch(img1, img1, width, height)[1]
+
+
+def test_compare_screenshots_uses_numpy(monkeypatch):
+    calls = []
+    real = diff.pixelmatch_numpy
+
+    def spy(*args, **kwargs):
+        calls.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(diff, "pixelmatch_numpy", spy)
+    img1, img2 = _random_pair(10, 10, 4)
+    result = compare_screenshots(_png(img1, 10, 10), _png(img2, 10, 10))
+    assert calls
+    assert result.diff_pixels == pixelmatch(img1, img2, 10, 10)[0]
+
+
+def test_compare_screenshots_falls_back_without_numpy(monkeypatch):
+    monkeypatch.setattr(diff, "_HAS_NUMPY", False)
+    monkeypatch.setattr(diff, "pixelmatch_numpy", None)
+    img1, img2 = _random_pair(10, 10, 5)
+    result = compare_screenshots(_png(img1, 10, 10), _png(img2, 10, 10))
+    assert result.diff_pixels == pixelmatch(img1, img2, 10, 10)[0]
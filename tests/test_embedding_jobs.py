@@ -0,0 +1,190 @@
+"""Tests for the background instruction embedding queue (npl_mcp.instructions.embedding_jobs).
+
+Tests cover:
+- Enqueue supersedes older pending versions and applies the debounce
+- A batch embeds every instruction's phrases with one embed_texts call
+- Vectors are replaced with one bulk insert and jobs marked done
+- Stale duplicate jobs in a batch are superseded; the latest enqueued wins
+- Extraction and embedding failures reschedule only the affected jobs
+- Worker lifecycle and health counters
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from npl_mcp.instructions import embedding_jobs
+from npl_mcp.instructions.embedding_jobs import EmbeddingWorker, enqueue_embedding
+
+A = uuid.uuid4()
+B = uuid.uuid4()
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+_EXTRACT = "npl_mcp.instructions.embedding_jobs.extract_descriptive_phrases"
+_EMBED = "npl_mcp.instructions.embedding_jobs.embed_texts"
+
+
+def _job(job_id, instruction_id, version, attempts=1, enqueued_at=None):
+    return {"id": job_id, "instruction_id": instruction_id, "version": version,
+            "attempts": attempts, "enqueued_at": enqueued_at or NOW + timedelta(seconds=job_id)}
+
+
+def _pool(jobs):
+    """Pool answering the claim and content queries; conn records the write transaction."""
+    conn = AsyncMock()
+    tx_cm = MagicMock()
+    tx_cm.__aenter__ = AsyncMock(return_value=None)
+    tx_cm.__aexit__ = AsyncMock(return_value=False)
+    conn.transaction = MagicMock(return_value=tx_cm)
+    acquire_cm = MagicMock()
+    acquire_cm.__aenter__ = AsyncMock(return_value=conn)
+    acquire_cm.__aexit__ = AsyncMock(return_value=False)
+
+    async def fetch(sql, *args):
+        if "SET status = 'running'" in sql:
+            return jobs
+        job_ids = args[0]
+        return [
+            {"job_id": job_id, "title": f"T{job_id}", "description": None, "tags": None,
+             "body": f"body {job_id}"}
+            for job_id in job_ids
+        ]
+
+    pool = AsyncMock()
+    pool.fetch.side_effect = fetch
+    pool.acquire = MagicMock(return_value=acquire_cm)
+    return pool, conn
+
+
+@pytest.fixture
+def use_pool(monkeypatch):
+    def _use(pool):
+        monkeypatch.setattr(embedding_jobs, "get_pool", AsyncMock(return_value=pool))
+        return pool
+    return _use
+
+
+class TestEnqueue:
+    async def test_supersedes_and_debounces(self):
+        conn = AsyncMock()
+        await enqueue_embedding(conn, A, 3, debounce=2.5)
+        sql, *args = conn.execute.call_args.args
+        assert "status = 'superseded'" in sql
+        assert "ON CONFLICT (instruction_id, version)" in sql
+        assert args == [A, 3, 2.5]
+
+    def test_wake_without_worker_is_noop(self):
+        embedding_jobs.wake_embedding_worker()
+
+
+class TestRunOnce:
+    async def test_batches_embeddings_and_bulk_inserts(self, use_pool):
+        pool, conn = _pool([_job(1, A, 2), _job(2, B, 1)])
+        use_pool(pool)
+        extract = AsyncMock(side_effect=[["a1", "a2"], ["b1"]])
+        embed = AsyncMock(return_value=[[0.1], [0.2], [0.3]])
+        with patch(_EXTRACT, extract), patch(_EMBED, embed):
+            worker = EmbeddingWorker()
+            assert await worker.run_once() == 2
+
+        embed.assert_awaited_once_with(["a1", "a2", "b1"])
+        delete, insert, done = (c.args for c in conn.execute.call_args_list)
+        assert "DELETE" in delete[0] and delete[1] == [A, B]
+        assert "unnest" in insert[0]
+        assert insert[1:] == ([A, A, B], [2, 2, 1], ["a1", "a2", "b1"], ["[0.1]", "[0.2]", "[0.3]"])
+        assert "status = 'done'" in done[0] and done[1] == [1, 2]
+        assert worker.stats()["done"] == 2
+        assert worker.stats()["vectors"] == 3
+
+    async def test_stale_version_superseded(self, use_pool):
+        pool, conn = _pool([_job(1, A, 1), _job(2, A, 3)])
+        use_pool(pool)
+        with patch(_EXTRACT, AsyncMock(return_value=["p"])), \
+                patch(_EMBED, AsyncMock(return_value=[[0.5]])):
+            worker = EmbeddingWorker()
+            assert await worker.run_once() == 2
+
+        superseded = pool.execute.call_args_list[0].args
+        assert "superseded" in superseded[0] and superseded[1] == [1]
+        assert conn.execute.call_args_list[1].args[2] == [3]
+        assert worker.superseded == 1
+
+    async def test_rollback_keeps_latest_enqueued_not_highest_version(self, use_pool):
+        # Version 3 was reclaimed after a stale lease; version 2 was re-queued
+        # later by a rollback
+        pool, conn = _pool([
+            _job(5, A, 3, enqueued_at=NOW),
+            _job(2, A, 2, enqueued_at=NOW + timedelta(minutes=1)),
+        ])
+        use_pool(pool)
+        with patch(_EXTRACT, AsyncMock(return_value=["p"])), \
+                patch(_EMBED, AsyncMock(return_value=[[0.5]])):
+            worker = EmbeddingWorker()
+            assert await worker.run_once() == 2
+
+        superseded = pool.execute.call_args_list[0].args
+        assert superseded[1] == [5]
+        assert conn.execute.call_args_list[1].args[2] == [2]
+
+    async def test_extraction_failure_retries_only_that_job(self, use_pool):
+        pool, conn = _pool([_job(1, A, 1), _job(2, B, 1, attempts=5)])
+        use_pool(pool)
+        extract = AsyncMock(side_effect=[["a"], RuntimeError("LLM down")])
+        embed = AsyncMock(return_value=[[0.1]])
+        with patch(_EXTRACT, extract), patch(_EMBED, embed):
+            worker = EmbeddingWorker(max_attempts=5)
+            await worker.run_once()
+
+        embed.assert_awaited_once_with(["a"])
+        retry = pool.execute.call_args.args
+        assert retry[1] == [2]
+        assert "LLM down" in retry[2][0]
+        assert worker.stats()["failed"] == 1
+        assert worker.stats()["done"] == 1
+
+    async def test_embedding_failure_retries_batch(self, use_pool):
+        pool, conn = _pool([_job(1, A, 1), _job(2, B, 1)])
+        use_pool(pool)
+        with patch(_EXTRACT, AsyncMock(return_value=["p"])), \
+                patch(_EMBED, AsyncMock(side_effect=RuntimeError("429"))):
+            worker = EmbeddingWorker()
+            await worker.run_once()
+
+        conn.execute.assert_not_called()
+        retry = pool.execute.call_args.args
+        assert retry[1] == [1, 2]
+        assert worker.stats()["retried"] == 2
+
+    async def test_no_due_jobs(self, use_pool):
+        pool, _ = _pool([])
+        use_pool(pool)
+        assert await EmbeddingWorker().run_once() == 0
+
+
+class TestLifecycle:
+    async def test_start_processes_and_stop(self, monkeypatch):
+        calls = []
+
+        async def run_once(self):
+            calls.append(1)
+            return 0
+
+        monkeypatch.setattr(EmbeddingWorker, "run_once", run_once)
+        monkeypatch.setattr(EmbeddingWorker, "_next_due", AsyncMock(return_value=60.0))
+        worker = await embedding_jobs.start_embedding_worker()
+        try:
+            await asyncio.sleep(0.01)
+            assert calls == [1]
+            assert embedding_jobs.get_embedding_worker() is worker
+
+            embedding_jobs.wake_embedding_worker()
+            await asyncio.sleep(0.01)
+            assert calls == [1, 1]
+        finally:
+            await embedding_jobs.stop_embedding_worker()
+        assert embedding_jobs.get_embedding_worker() is None
@@ -124,7 +124,8 @@ class TestSessionList:
         assert result["sessions"][0]["session_status"] == "completed"
         sql, *args = pool.fetch.call_args[0]
         assert "status = $1" in sql
-        assert args == ["completed", 50]
+        # LIMIT fetches one extra row to detect a next page
+        assert args == ["completed", 51]
 
     @patch("npl_mcp.sessions.sessions.get_pool")
     async def test_limit_clamped(self, mock_pool):
@@ -132,13 +133,14 @@ class TestSessionList:
         pool.fetch.return_value = []
         mock_pool.return_value = pool
 
+        # Clamped page size + 1 probe row for the next cursor
         await session_list(limit=99999)
         _, *args = pool.fetch.call_args[0]
-        assert args[-1] == 200
+        assert args[-1] == 201
 
         await session_list(limit=0)
         _, *args = pool.fetch.call_args[0]
-        assert args[-1] == 1
+        assert args[-1] == 2
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,92 @@
+"""Tests for the SQLite image description store.
+
+Tests cover:
+- Import from the legacy YAML cache (once per file version, rows win)
+- Batched reads/writes and one write per injected page
+- Concurrent writers in separate instances do not lose entries
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+import yaml
+
+from npl_mcp.markdown.image_descriptions import ImageDescriptionCache, inject_image_descriptions
+
+
+def _write_yaml(path, entries):
+    path.write_text(yaml.dump({
+        f"{uri}::{model}": {"description": desc, "created_at": "2025-01-01T00:00:00+00:00"}
+        for (uri, model), desc in entries.items()
+    }))
+
+
+class TestYamlImport:
+    def test_legacy_path_imports_sibling_yaml(self, tmp_path):
+        yaml_file = tmp_path / "image_descriptions.yaml"
+        _write_yaml(yaml_file, {("https://x/a.png", "m1"): "A", ("https://x/b.png", "m2"): "B"})
+
+        cache = ImageDescriptionCache(yaml_file)
+        assert cache.cache_file == tmp_path / "image_descriptions.sqlite"
+        assert cache.get("https://x/a.png", "m1") == "A"
+        assert cache.get("https://x/b.png", "m2") == "B"
+
+    def test_import_runs_once_per_version_and_keeps_rows(self, tmp_path):
+        yaml_file = tmp_path / "image_descriptions.yaml"
+        _write_yaml(yaml_file, {("https://x/a.png", "m1"): "old"})
+        cache = ImageDescriptionCache(tmp_path / "image_descriptions.sqlite")
+        cache.set("https://x/a.png", "m1", "new")
+
+        assert cache.import_yaml(yaml_file) == 0
+        _write_yaml(yaml_file, {("https://x/a.png", "m1"): "old", ("https://x/c.png", "m1"): "C"})
+        stat = yaml_file.stat()
+        os.utime(yaml_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        cache = ImageDescriptionCache(tmp_path / "image_descriptions.sqlite")
+        assert cache.get("https://x/a.png", "m1") == "new"
+        assert cache.get("https://x/c.png", "m1") == "C"
+
+
+class TestBatching:
+    def test_get_many_set_many(self, tmp_path):
+        cache = ImageDescriptionCache(tmp_path / "img.sqlite")
+        cache.set_many({f"https://x/{i}.png": f"d{i}" for i in range(600)}, "m")
+        found = cache.get_many([f"https://x/{i}.png" for i in range(650)], "m")
+        assert len(found) == 600
+        assert found["https://x/599.png"] == "d599"
+        assert cache.get_many(["https://x/1.png"], "other") == {}
+
+    async def test_inject_writes_once_per_page(self, tmp_path):
+        md = "\n".join(f"![i{i}](https://x/{i}.png)" for i in range(40))
+        cache_file = tmp_path / "img.sqlite"
+
+        with patch(
+            "npl_mcp.markdown.image_descriptions.describe_image",
+            new_callable=AsyncMock,
+            side_effect=lambda uri, model: f"about {uri}",
+        ), patch.object(
+            ImageDescriptionCache, "set_many", autospec=True, side_effect=ImageDescriptionCache.set_many,
+        ) as set_many:
+            result = await inject_image_descriptions(md, model="m", cache_file=cache_file)
+
+        assert set_many.call_count == 1
+        assert result.count("> **Image**:") == 40
+        assert ImageDescriptionCache(cache_file).get("https://x/39.png", "m") == "about https://x/39.png"
+
+
+class TestConcurrency:
+    def test_concurrent_writers_keep_all_rows(self, tmp_path):
+        cache_file = tmp_path / "img.sqlite"
+        ImageDescriptionCache(cache_file)
+
+        def writer(worker):
+            cache = ImageDescriptionCache(cache_file)
+            for i in range(25):
+                cache.set(f"https://x/{worker}-{i}.png", "m", f"d{worker}-{i}")
+
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(writer, range(4)))
+
+        uris = [f"https://x/{w}-{i}.png" for w in range(4) for i in range(25)]
+        assert len(ImageDescriptionCache(cache_file).get_many(uris, "m")) == 100
@@ -0,0 +1,155 @@
+"""Tests for the bounded, two-tier LLM inference cache.
+
+Tests cover:
+- LRU eviction by entry count and by byte ceiling
+- TTL expiry
+- SQLite disk tier survives a memory reset and keys by catalog contents
+- Single-flight coalescing of concurrent identical keys
+- Uncacheable results and exceptions are shared but not stored
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from npl_mcp.meta_tools import inference_cache
+from npl_mcp.meta_tools.catalog import build_catalog
+from npl_mcp.meta_tools.inference_cache import InferenceCache, cache_key, cached
+
+
+@pytest.fixture(autouse=True)
+def _clean(monkeypatch):
+    monkeypatch.delenv("NPL_INFERENCE_CACHE_DB", raising=False)
+    inference_cache.cache_clear()
+    yield
+    inference_cache.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Memory tier
+# ---------------------------------------------------------------------------
+
+
+class TestMemoryTier:
+    def test_lru_eviction(self):
+        cache = InferenceCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_byte_ceiling(self):
+        cache = InferenceCache(maxsize=100, max_bytes=40)
+        cache.set("a", "x" * 20)
+        cache.set("b", "y" * 20)
+        assert cache.stats()["bytes"] <= 40
+        assert cache.get("a") is None
+        assert cache.get("b") == "y" * 20
+
+    def test_oversized_value_not_stored(self):
+        cache = InferenceCache(max_bytes=10)
+        cache.set("a", "x" * 100)
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+    def test_ttl_expiry(self, monkeypatch):
+        cache = InferenceCache(ttl=10)
+        now = time.monotonic()
+        monkeypatch.setattr(inference_cache.time, "monotonic", lambda: now)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        monkeypatch.setattr(inference_cache.time, "monotonic", lambda: now + 11)
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Disk tier
+# ---------------------------------------------------------------------------
+
+
+class TestDiskTier:
+    async def test_survives_memory_reset(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("NPL_INFERENCE_CACHE_DB", str(tmp_path / "cache.sqlite"))
+        await build_catalog()
+        key = cache_key("tool_help", "Ping", "check", "2")
+        await inference_cache.cache_set_async(key, {"instructions": "ok"})
+
+        inference_cache.cache_clear()
+        assert inference_cache.cache_get(key) is None
+        assert await inference_cache.cache_get_async(key) == {"instructions": "ok"}
+        # Promoted back into memory
+        assert inference_cache.cache_get(key) == {"instructions": "ok"}
+
+    async def test_disk_key_ignores_process_version(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("NPL_INFERENCE_CACHE_DB", str(tmp_path / "cache.sqlite"))
+        await build_catalog()
+        await inference_cache.cache_set_async("0|q", "v")
+        inference_cache.cache_clear()
+        # Same catalog contents, different (restarted) version counter
+        assert await inference_cache.cache_get_async("7|q") == "v"
+
+    async def test_expired_rows_ignored(self, tmp_path):
+        disk = inference_cache.DiskTier(tmp_path / "cache.sqlite")
+        await disk.set("k", "v", ttl=-1)
+        assert await disk.get("k") is None
+
+    async def test_prunes_excess_rows(self, tmp_path):
+        disk = inference_cache.DiskTier(tmp_path / "cache.sqlite", max_rows=2)
+        for i in range(4):
+            await disk.set(f"k{i}", i, ttl=60)
+        assert await disk.get("k0") is None
+        assert await disk.get("k3") == 3
+
+
+# ---------------------------------------------------------------------------
+# Single-flight
+# ---------------------------------------------------------------------------
+
+
+class TestCached:
+    async def test_concurrent_calls_coalesce(self):
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return {"n": calls}, True
+
+        results = await asyncio.gather(*(cached("k", compute) for _ in range(5)))
+        assert calls == 1
+        assert all(r == {"n": 1} for r in results)
+        assert await cached("k", compute) == {"n": 1}
+        assert calls == 1
+
+    async def test_uncacheable_shared_not_stored(self):
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "fallback", False
+
+        results = await asyncio.gather(cached("k", compute), cached("k", compute))
+        assert results == ["fallback", "fallback"]
+        assert calls == 1
+        await cached("k", compute)
+        assert calls == 2
+
+    async def test_exception_propagates_to_waiters(self):
+        async def compute():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("llm down")
+
+        results = await asyncio.gather(
+            cached("k", compute), cached("k", compute), return_exceptions=True,
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert inference_cache._inflight == {}
@@ -132,16 +132,17 @@ class TestGenerateAndStoreEmbeddings:
             instruction_id, "Title", "Desc", ["tag"], "Body"
         )
 
-        # Verify DELETE was called, then 2 INSERTs
-        assert conn.execute.call_count == 3  # 1 DELETE + 2 INSERT
+        # Verify DELETE was called, then one bulk INSERT for both phrases
+        assert conn.execute.call_count == 2  # 1 DELETE + 1 INSERT ... unnest
         # First call is DELETE
         delete_call = conn.execute.call_args_list[0]
         assert "DELETE" in delete_call[0][0]
-        assert delete_call[0][1] == instruction_id
-        # Subsequent calls are INSERTs
-        insert_call_1 = conn.execute.call_args_list[1]
-        assert "INSERT" in insert_call_1[0][0]
-        assert insert_call_1[0][2] == "phrase 1"
+        assert delete_call[0][1] == [instruction_id]
+        # Second call inserts every phrase
+        insert_call = conn.execute.call_args_list[1]
+        assert "unnest" in insert_call[0][0]
+        assert insert_call[0][1] == [instruction_id, instruction_id]
+        assert insert_call[0][3] == ["phrase 1", "phrase 2"]
 
     @patch("npl_mcp.instructions.embeddings.chat_completion", new_callable=AsyncMock)
     async def test_swallows_llm_failure(self, mock_chat):
@@ -15,8 +15,8 @@ from npl_mcp.instructions.instructions import (
     instructions_versions,
 )
 
-# All create/update tests need to mock the embedding pipeline
-_EMBED_PATCH = "npl_mcp.instructions.embeddings.generate_and_store_embeddings"
+# Create/update queue embedding jobs and wake the background worker
+_WAKE_PATCH = "npl_mcp.instructions.embedding_jobs.wake_embedding_worker"
 
 
 # ---------------------------------------------------------------------------
@@ -56,9 +56,9 @@ def _mock_pool_with_transaction():
 
 
 class TestInstructionsCreate:
-    @patch(_EMBED_PATCH, new_callable=AsyncMock)
+    @patch(_WAKE_PATCH)
     @patch("npl_mcp.instructions.instructions.get_pool")
-    async def test_create_returns_short_uuid(self, mock_get_pool, mock_embed):
+    async def test_create_returns_short_uuid(self, mock_get_pool, mock_wake):
         new_id = uuid.uuid4()
         pool, conn = _mock_pool_with_transaction()
         conn.fetchval.return_value = new_id
@@ -69,12 +69,16 @@ class TestInstructionsCreate:
         assert result["uuid"] == shortuuid.encode(new_id)
         assert result["version"] == 1
         conn.fetchval.assert_called_once()
-        conn.execute.assert_called_once()
-        mock_embed.assert_awaited_once()
+        # Version insert, then the embedding job in the same transaction
+        assert conn.execute.call_count == 2
+        enqueue = conn.execute.call_args_list[1][0]
+        assert "npl_instruction_embedding_jobs" in enqueue[0]
+        assert enqueue[1:3] == (new_id, 1)
+        mock_wake.assert_called_once()
 
-    @patch(_EMBED_PATCH, new_callable=AsyncMock)
+    @patch(_WAKE_PATCH)
     @patch("npl_mcp.instructions.instructions.get_pool")
-    async def test_create_passes_tags(self, mock_get_pool, mock_embed):
+    async def test_create_passes_tags(self, mock_get_pool, mock_wake):
         pool, conn = _mock_pool_with_transaction()
         conn.fetchval.return_value = uuid.uuid4()
         mock_get_pool.return_value = pool
@@ -92,9 +96,9 @@ class TestInstructionsCreate:
         result = await instructions_create("title", "desc", [], "")
         assert result["status"] == "error"
 
-    @patch(_EMBED_PATCH, new_callable=AsyncMock)
+    @patch(_WAKE_PATCH)
     @patch("npl_mcp.instructions.instructions.get_pool")
-    async def test_create_with_valid_session(self, mock_get_pool, mock_embed):
+    async def test_create_with_valid_session(self, mock_get_pool, mock_wake):
         """Session ID is stored when a valid session is provided."""
         new_id = uuid.uuid4()
         session_id = uuid.uuid4()
@@ -430,9 +434,9 @@ class TestInstructionsGet:
 
 
 class TestInstructionsUpdate:
-    @patch(_EMBED_PATCH, new_callable=AsyncMock)
+    @patch(_WAKE_PATCH)
     @patch("npl_mcp.instructions.instructions.get_pool")
-    async def test_creates_new_version(self, mock_get_pool, mock_embed):
+    async def test_creates_new_version(self, mock_get_pool, mock_wake):
         uid = uuid.uuid4()
         pool, conn = _mock_pool_with_transaction()
         conn.fetchrow.side_effect = [
@@ -444,11 +448,14 @@ class TestInstructionsUpdate:
         result = await instructions_update(str(uid), "Changed body", body="new body")
         assert result["status"] == "ok"
         assert result["version"] == 2
-        mock_embed.assert_awaited_once()
+        enqueue = conn.execute.call_args_list[-1][0]
+        assert "npl_instruction_embedding_jobs" in enqueue[0]
+        assert enqueue[1:3] == (uid, 2)
+        mock_wake.assert_called_once()
 
-    @patch(_EMBED_PATCH, new_callable=AsyncMock)
+    @patch(_WAKE_PATCH)
     @patch("npl_mcp.instructions.instructions.get_pool")
-    async def test_carries_forward_body(self, mock_get_pool, mock_embed):
+    async def test_carries_forward_body(self, mock_get_pool, mock_wake):
         uid = uuid.uuid4()
         pool, conn = _mock_pool_with_transaction()
         conn.fetchrow.side_effect = [
@@ -464,9 +471,9 @@ class TestInstructionsUpdate:
         insert_call = conn.execute.call_args_list[0]
         assert insert_call[0][3] == "carried body"
 
-    @patch(_EMBED_PATCH, new_callable=AsyncMock)
+    @patch(_WAKE_PATCH)
     @patch("npl_mcp.instructions.instructions.get_pool")
-    async def test_not_found(self, mock_get_pool, mock_embed):
+    async def test_not_found(self, mock_get_pool, mock_wake):
         pool, conn = _mock_pool_with_transaction()
         conn.fetchrow.return_value = None
         mock_get_pool.return_value = pool
@@ -487,10 +494,11 @@ class TestInstructionsUpdate:
 
 
 class TestInstructionsActiveVersion:
+    @patch(_WAKE_PATCH)
     @patch("npl_mcp.instructions.instructions.get_pool")
-    async def test_rollback(self, mock_get_pool):
+    async def test_rollback(self, mock_get_pool, mock_wake):
         uid = uuid.uuid4()
-        pool = AsyncMock()
+        pool, conn = _mock_pool_with_transaction()
         pool.fetchrow.return_value = {"version": 1}
         mock_get_pool.return_value = pool
 
@@ -498,7 +506,10 @@ class TestInstructionsActiveVersion:
         assert result["status"] == "ok"
         assert result["active_version"] == 1
         assert result["uuid"] == shortuuid.encode(uid)
-        pool.execute.assert_called_once()
+        # Active-version update, then re-queue embeddings for that version
+        assert conn.execute.call_count == 2
+        assert conn.execute.call_args_list[1][0][1:3] == (uid, 1)
+        mock_wake.assert_called_once()
 
     @patch("npl_mcp.instructions.instructions.get_pool")
     async def test_version_not_found(self, mock_get_pool):
@@ -529,8 +540,10 @@ class TestInstructionsVersions:
         pool = AsyncMock()
         pool.fetchrow.return_value = {"id": uid, "active_version": 2}
         pool.fetch.return_value = [
-            {"version": 1, "change_note": "Initial", "created_at": None},
-            {"version": 2, "change_note": "Updated", "created_at": None},
+            {"version": 1, "change_note": "Initial", "created_at": None,
+             "embedding_status": "superseded"},
+            {"version": 2, "change_note": "Updated", "created_at": None,
+             "embedding_status": "pending"},
         ]
         mock_get_pool.return_value = pool
 
@@ -539,6 +552,7 @@ class TestInstructionsVersions:
         assert len(result["versions"]) == 2
         assert result["versions"][0]["is_active"] is False
         assert result["versions"][1]["is_active"] is True
+        assert result["versions"][1]["embedding_status"] == "pending"
         assert result["active_version"] == 2
         assert result["uuid"] == shortuuid.encode(uid)
 
@@ -667,9 +681,9 @@ class TestInstructionsList:
         mock_get_pool.return_value = pool
 
         await instructions_list(mode="all", limit=500)
-        # Verify limit was clamped to 100
+        # Verify limit was clamped to 100 (+1 probe row for the next cursor)
         call_args = pool.fetch.call_args[0]
-        assert call_args[1] == 100
+        assert call_args[1] == 101
 
     @patch("npl_mcp.instructions.instructions.get_pool")
     async def test_limit_clamped_to_min(self, mock_get_pool):
@@ -679,7 +693,7 @@ class TestInstructionsList:
 
         await instructions_list(mode="all", limit=-5)
         call_args = pool.fetch.call_args[0]
-        assert call_args[1] == 1
+        assert call_args[1] == 2
 
     @patch("npl_mcp.meta_tools.llm_client.embed_texts", new_callable=AsyncMock)
     @patch("npl_mcp.instructions.instructions.get_pool")
@@ -0,0 +1,168 @@
+"""Tests for the embedding prefilter behind intent-mode ToolSearch.
+
+Tests cover:
+- The LLM prompt only lists the top-N embedding candidates
+- Embedding-only fallback when the LLM fails
+- Entry vectors are cached on disk and reused after a restart
+- Concurrent first queries share one catalog embedding pass
+- Embedding failures fall back to the full catalog and cool down
+"""
+
+import asyncio
+import hashlib
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from npl_mcp.meta_tools import embedding_index, inference_cache, search
+from npl_mcp.meta_tools.catalog import build_catalog
+from npl_mcp.meta_tools.search import tool_search
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _fake_vector(text: str, dim: int = 64) -> list[float]:
+    """Deterministic bag-of-words embedding."""
+    vec = [0.0] * dim
+    for word in text.lower().replace("[", " ").replace("]", " ").split():
+        bucket = int(hashlib.md5(word.encode()).hexdigest(), 16) % dim
+        vec[bucket] += 1.0
+    return vec
+
+
+class _FakeEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, texts, model=None, timeout=30.0, retries=None):
+        self.calls.append(list(texts))
+        # Yield like a real request so concurrent callers interleave
+        await asyncio.sleep(0)
+        return [_fake_vector(t) for t in texts]
+
+
+def _llm_response(names: list[str]) -> dict:
+    content = json.dumps({"matches": [
+        {"name": n, "category": "x", "relevance": "high", "explanation": "e"} for n in names
+    ]})
+    return {"choices": [{"message": {"content": content}}]}
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    monkeypatch.setenv("NPL_TOOL_EMBEDDINGS_CACHE", str(tmp_path / "emb.npz"))
+    monkeypatch.setattr(search, "INTENT_CANDIDATES", 5)
+    embedding_index.reset_embedding_index()
+    inference_cache.cache_clear()
+    yield
+    embedding_index.reset_embedding_index()
+    inference_cache.cache_clear()
+
+
+# ---------------------------------------------------------------------------
+# Prefilter
+# ---------------------------------------------------------------------------
+
+
+class TestPrefilter:
+    async def test_llm_sees_only_candidates(self):
+        embedder = _FakeEmbedder()
+        with patch("npl_mcp.meta_tools.llm_client.embed_texts", embedder), patch(
+            "npl_mcp.meta_tools.search.chat_completion",
+            new_callable=AsyncMock,
+            return_value=_llm_response(["ToMarkdown"]),
+        ) as llm:
+            result = await tool_search("convert page to markdown", mode="intent", limit=3)
+
+        prompt = llm.call_args[0][0][1]["content"]
+        listed = [line for line in prompt.splitlines() if line.startswith("- **")]
+        assert len(listed) == 5
+        assert result["candidates"] == 5
+        assert result["matches"][0]["name"] == "ToMarkdown"
+
+    async def test_embedding_only_fallback(self):
+        with patch("npl_mcp.meta_tools.llm_client.embed_texts", _FakeEmbedder()), patch(
+            "npl_mcp.meta_tools.search.chat_completion",
+            new_callable=AsyncMock,
+            side_effect=httpx.ConnectError("down"),
+        ):
+            result = await tool_search("ToMarkdown Browser", mode="intent", limit=3)
+
+        assert result["fallback"] is True
+        assert result["fallback_source"] == "embeddings"
+        assert len(result["matches"]) == 3
+        scores = [m["score"] for m in result["matches"]]
+        assert scores == sorted(scores, reverse=True)
+        assert all(m["relevance"] in {"high", "medium", "low"} for m in result["matches"])
+
+    async def test_vectors_cached_on_disk(self):
+        first = _FakeEmbedder()
+        with patch("npl_mcp.meta_tools.llm_client.embed_texts", first):
+            catalog = await build_catalog()
+            index = await embedding_index.get_embedding_index(catalog)
+        assert index.matrix.shape[0] == len(catalog)
+        assert sum(len(batch) for batch in first.calls) == len(catalog)
+
+        # Simulated restart: only the disk cache survives
+        embedding_index.reset_embedding_index()
+        second = _FakeEmbedder()
+        with patch("npl_mcp.meta_tools.llm_client.embed_texts", second):
+            again = await embedding_index.get_embedding_index(catalog)
+        assert second.calls == []
+        assert np.allclose(again.matrix, index.matrix)
+
+    async def test_concurrent_first_queries_build_once(self, tmp_path):
+        embedder = _FakeEmbedder()
+        saves = []
+        real_save = embedding_index._save_vectors
+
+        def _save(*args):
+            saves.append(args[0])
+            real_save(*args)
+
+        with patch("npl_mcp.meta_tools.llm_client.embed_texts", embedder), patch.object(
+            embedding_index, "_save_vectors", _save,
+        ):
+            catalog = await build_catalog()
+            indexes = await asyncio.gather(
+                *(embedding_index.get_embedding_index(catalog) for _ in range(5))
+            )
+        assert all(index is indexes[0] for index in indexes)
+        assert sum(len(batch) for batch in embedder.calls) == len(catalog)
+        assert saves == [tmp_path / "emb.npz"]
+
+    async def test_failure_uses_full_catalog_and_cools_down(self):
+        failing = AsyncMock(side_effect=httpx.ConnectError("refused"))
+        with patch("npl_mcp.meta_tools.llm_client.embed_texts", failing), patch(
+            "npl_mcp.meta_tools.search.chat_completion",
+            new_callable=AsyncMock,
+            return_value=_llm_response([]),
+        ) as llm:
+            catalog = await build_catalog()
+            result = await tool_search("first query", mode="intent")
+            await tool_search("second query", mode="intent")
+
+        prompt = llm.call_args[0][0][1]["content"]
+        listed = [line for line in prompt.splitlines() if line.startswith("- **")]
+        assert len(listed) == len(catalog)
+        assert "candidates" not in result
+        assert failing.call_count == 1
+
+
+class TestTopK:
+    def test_orders_by_cosine(self):
+        matrix = np.array([[1.0, 0.0], [0.0, 1.0], [0.7071, 0.7071]], dtype=np.float32)
+        index = embedding_index.EmbeddingIndex(0, "m", matrix)
+        ranked = index.top_k(np.array([1.0, 0.1], dtype=np.float32), 2)
+        assert [pos for pos, _ in ranked] == [0, 2]
+
+    def test_zero_query(self):
+        index = embedding_index.EmbeddingIndex(0, "m", np.eye(2, dtype=np.float32))
+        assert index.top_k(np.zeros(2, dtype=np.float32), 2) == []
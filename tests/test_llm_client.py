@@ -0,0 +1,124 @@
+"""Tests for the shared LiteLLM client in npl_mcp.meta_tools.llm_client.
+
+Tests cover:
+- One pooled client is reused across calls on the same event loop
+- 429/5xx responses and connect errors are retried, then raised
+- Retry-After is honoured and backoff is jittered and capped
+- close_llm_client closes the pooled client
+"""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from npl_mcp.meta_tools import llm_client
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Route the shared client through a scripted MockTransport."""
+    state = {"responses": [], "requests": [], "clients": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        item = state["responses"].pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def new_client() -> httpx.AsyncClient:
+        state["clients"] += 1
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(llm_client, "_new_client", new_client)
+    monkeypatch.setattr(llm_client, "_retry_delay", lambda attempt, response=None: 0.0)
+    yield state
+
+
+@pytest.fixture(autouse=True)
+async def _close_client():
+    yield
+    await llm_client.close_llm_client()
+
+
+def _chat_ok() -> httpx.Response:
+    return httpx.Response(200, json={"choices": [{"message": {"content": "hi"}}]})
+
+
+# ---------------------------------------------------------------------------
+# Shared client
+# ---------------------------------------------------------------------------
+
+
+class TestSharedClient:
+    async def test_reused_across_calls(self, transport):
+        transport["responses"] = [_chat_ok(), _chat_ok()]
+        await llm_client.chat_completion([{"role": "user", "content": "a"}])
+        await llm_client.chat_completion([{"role": "user", "content": "b"}])
+        assert transport["clients"] == 1
+        assert len(transport["requests"]) == 2
+
+    async def test_close_releases_client(self, transport):
+        client = llm_client.get_llm_client()
+        await llm_client.close_llm_client()
+        assert client.is_closed
+        assert llm_client.get_llm_client() is not client
+
+
+# ---------------------------------------------------------------------------
+# Retries
+# ---------------------------------------------------------------------------
+
+
+class TestRetries:
+    async def test_retries_rate_limit_then_succeeds(self, transport):
+        transport["responses"] = [
+            httpx.Response(429),
+            httpx.Response(503),
+            _chat_ok(),
+        ]
+        result = await llm_client.chat_completion([{"role": "user", "content": "a"}])
+        assert result["choices"][0]["message"]["content"] == "hi"
+        assert len(transport["requests"]) == 3
+
+    async def test_retries_connect_errors(self, transport):
+        transport["responses"] = [
+            httpx.ConnectError("refused"),
+            httpx.Response(200, json={"data": [{"index": 0, "embedding": [0.5]}]}),
+        ]
+        assert await llm_client.embed_texts(["x"]) == [[0.5]]
+
+    async def test_gives_up_after_retries(self, transport, monkeypatch):
+        monkeypatch.setattr(llm_client, "LITELLM_RETRIES", 2)
+        transport["responses"] = [httpx.Response(500)] * 3
+        with pytest.raises(httpx.HTTPStatusError):
+            await llm_client.chat_completion([{"role": "user", "content": "a"}])
+        assert len(transport["requests"]) == 3
+
+    async def test_client_errors_are_not_retried(self, transport):
+        transport["responses"] = [httpx.Response(400)]
+        with pytest.raises(httpx.HTTPStatusError):
+            await llm_client.chat_completion([{"role": "user", "content": "a"}])
+        assert len(transport["requests"]) == 1
+
+
+class TestRetryDelay:
+    def test_honours_retry_after(self):
+        response = httpx.Response(429, headers={"Retry-After": "2"})
+        assert llm_client._retry_delay(0, response) == 2.0
+
+    def test_retry_after_is_capped(self):
+        response = httpx.Response(429, headers={"Retry-After": "600"})
+        assert llm_client._retry_delay(0, response) == llm_client._BACKOFF_MAX
+
+    def test_jittered_backoff_bounds(self):
+        for attempt in range(8):
+            delay = llm_client._retry_delay(attempt)
+            cap = min(llm_client._BACKOFF_MAX, llm_client._BACKOFF_BASE * 2 ** attempt)
+            assert 0 <= delay <= cap
@@ -6,6 +6,9 @@ Tests cover:
 - cache_get with valid/expired/missing entries
 - cache_save and persistence
 - Deterministic cache paths (same URL = same path)
+- Index-backed source validation, conditional revalidation, stale-while-revalidate
+- LRU eviction by byte budget and hit ratio stats
+- Index schema created once per cache; a hit opens one connection
 """
 
 import os
@@ -369,3 +372,217 @@ class TestCacheDirectoryCreation:
         """Test default cache directory path."""
         cache = MarkdownCache()
         assert cache.cache_dir == Path(".tmp/cache/markdown")
+
+
+# ============================================================================
+# Test Index Validation
+# ============================================================================
+
+
+def _mock_origin(monkeypatch, handler):
+    """Route the cache's revalidation requests through *handler*."""
+    import httpx
+
+    real_client = httpx.AsyncClient
+
+    def factory(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(handler)
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setattr("npl_mcp.markdown.cache.httpx.AsyncClient", factory)
+
+
+def _age(cache, source, seconds):
+    old = time.time() - seconds
+    os.utime(cache.get_cache_path(source), (old, old))
+
+
+class TestIndexValidation:
+    """Test source validation backed by the SQLite index."""
+
+    @pytest.mark.asyncio
+    async def test_modified_local_source_invalidates(self, cache, temp_file):
+        """A local cache is dropped once the source's size/mtime change."""
+        await cache.save_cache(temp_file, "# Old")
+        assert cache.index_path.exists()
+
+        Path(temp_file).write_text("changed and longer content")
+        assert await cache.get_cached(temp_file) is None
+
+    @pytest.mark.asyncio
+    async def test_legacy_sidecar_without_index_row(self, cache, temp_file):
+        """Sidecars written before the index are served while newer than the source."""
+        sidecar = cache.get_cache_path(temp_file)
+        sidecar.write_text("# Legacy")
+        try:
+            assert await cache.get_cached(temp_file) == "# Legacy"
+            old = time.time() - 3600
+            os.utime(sidecar, (old, old))
+            assert await cache.get_cached(temp_file) is None
+        finally:
+            sidecar.unlink(missing_ok=True)
+
+    @pytest.mark.asyncio
+    async def test_expired_url_revalidated_by_304(self, cache, monkeypatch):
+        """An expired URL cache with validators survives a 304."""
+        import httpx
+
+        seen = {}
+
+        def handler(request):
+            seen.update(request.headers)
+            return httpx.Response(304)
+
+        _mock_origin(monkeypatch, handler)
+        url = "https://example.com/doc"
+        await cache.save_cache(url, "# Doc", validators={"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        _age(cache, url, 7200)
+
+        assert await cache.get_cached(url, max_age=3600) == "# Doc"
+        assert seen["if-none-match"] == '"v1"'
+        assert seen["if-modified-since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert cache.revalidated == 1
+        # Revalidation restarted the freshness window
+        assert (await cache.lookup(url, max_age=3600)).state == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_revalidate_with_closed_batch_client(self, cache, monkeypatch):
+        """A refresh that outlives its batch's client falls back to its own."""
+        import httpx
+
+        _mock_origin(monkeypatch, lambda request: httpx.Response(304))
+        url = "https://example.com/doc"
+        await cache.save_cache(url, "# Doc", validators={"etag": '"v1"'})
+        _age(cache, url, 7200)
+
+        batch_client = httpx.AsyncClient()
+        await batch_client.aclose()
+        assert await cache.revalidate(url, {"etag": '"v1"'}, client=batch_client)
+        assert cache.revalidated == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_url_changed_origin(self, cache, monkeypatch):
+        """A 200 on revalidation means the cache must be refetched."""
+        import httpx
+
+        _mock_origin(monkeypatch, lambda request: httpx.Response(200, text="new"))
+        url = "https://example.com/doc"
+        await cache.save_cache(url, "# Doc", validators={"etag": '"v1"'})
+        _age(cache, url, 7200)
+
+        assert await cache.get_cached(url, max_age=3600) is None
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate_window(self, cache):
+        """Past max_age but within the SWR window the entry is stale, then expired."""
+        url = "https://example.com/doc"
+        await cache.save_cache(url, "# Doc")
+
+        _age(cache, url, 4000)
+        result = await cache.lookup(url, max_age=3600, stale_while_revalidate=600)
+        assert result.state == "stale"
+        assert result.content == "# Doc"
+
+        _age(cache, url, 5000)
+        result = await cache.lookup(url, max_age=3600, stale_while_revalidate=600)
+        assert result.state == "expired"
+
+
+# ============================================================================
+# Test Eviction and Stats
+# ============================================================================
+
+
+class TestEvictionAndStats:
+    """Test the byte budget and hit ratio reporting."""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_bytes(self, tmp_path):
+        """URL caches are evicted least-recently-used over max_bytes."""
+        cache = MarkdownCache(cache_dir=tmp_path, max_bytes=25)
+        await cache.save_cache("https://example.com/a", "a" * 10)
+        await cache.save_cache("https://example.com/b", "b" * 10)
+        # Touch a so b becomes least recently used
+        assert await cache.get_cached("https://example.com/a") == "a" * 10
+        await cache.save_cache("https://example.com/c", "c" * 10)
+
+        assert not cache.get_cache_path("https://example.com/b").exists()
+        assert await cache.get_cached("https://example.com/a") == "a" * 10
+        assert await cache.get_cached("https://example.com/c") == "c" * 10
+        assert cache.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_hit_ratio(self, cache):
+        """Stats report hits, misses and the hit ratio."""
+        url = "https://example.com/doc"
+        assert await cache.get_cached(url) is None
+        await cache.save_cache(url, "# Doc")
+        await cache.get_cached(url)
+        await cache.get_cached(url)
+        await cache.get_cached(url)
+
+        stats = cache.stats()
+        assert stats["hits"] == 3
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.75
+
+
+# ============================================================================
+# Test Index Connections
+# ============================================================================
+
+
+class TestIndexConnections:
+    """Test that the index connection and schema are set up once per cache."""
+
+    @pytest.fixture
+    def connects(self, monkeypatch):
+        import sqlite3
+
+        opened = []
+        real_connect = sqlite3.connect
+
+        def _connect(*args, **kwargs):
+            opened.append(args[0])
+            return real_connect(*args, **kwargs)
+
+        monkeypatch.setattr("npl_mcp.markdown.cache.sqlite3.connect", _connect)
+        return opened
+
+    @pytest.mark.asyncio
+    async def test_connection_reused(self, cache, connects):
+        """Saves, hits and misses share one index connection."""
+        url = "https://example.com/doc"
+        await cache.save_cache(url, "# Doc")
+        assert await cache.get_cached(url) == "# Doc"
+        assert await cache.get_cached(url) == "# Doc"
+        assert await cache.get_cached("https://example.com/other") is None
+        assert len(connects) == 1
+
+    @pytest.mark.asyncio
+    async def test_hit_records_access(self, cache):
+        """A hit refreshes the entry's last_access for LRU eviction."""
+        import sqlite3
+
+        url = "https://example.com/doc"
+        await cache.save_cache(url, "# Doc")
+
+        def last_access():
+            with sqlite3.connect(cache.index_path) as db:
+                return db.execute("SELECT last_access FROM entries").fetchone()[0]
+
+        before = last_access()
+        time.sleep(0.01)
+        assert await cache.get_cached(url) == "# Doc"
+        assert last_access() > before
+
+    @pytest.mark.asyncio
+    async def test_deleted_index_recreated(self, cache, connects):
+        """The connection and schema are recreated if the index file disappears."""
+        url = "https://example.com/doc"
+        await cache.save_cache(url, "# Doc")
+        cache.index_path.unlink()
+
+        await cache.save_cache(url, "# Doc 2")
+        assert await cache.get_cached(url) == "# Doc 2"
+        assert len(connects) == 2
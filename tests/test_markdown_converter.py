@@ -5,6 +5,7 @@ Tests cover:
 - Convert local file (text/markdown)
 - Caching behavior (cache then use cached)
 - force_refresh parameter
+- Concurrent conversions of one source share a single task
 - Error handling (file not found, URL timeout)
 - Metadata header format
 - BUG #1: Double extension cache issue (markdown file .md.md)
@@ -411,6 +412,102 @@ class TestConverterCaching:
         assert "cached: true" in result2
         assert "Cached URL Content" in result2
 
+    @pytest.mark.asyncio
+    async def test_stale_url_served_while_refreshing(self, converter, cache):
+        """Test that a stale URL cache is returned and refreshed in the background."""
+        import asyncio
+        import time
+
+        url = "https://example.com/page"
+        await cache.save_cache(url, "# Old Content")
+        old = time.time() - 7200
+        os.utime(cache.get_cache_path(url), (old, old))
+
+        async def slow_jina(url, timeout):
+            await asyncio.sleep(0.05)
+            return "# New Content"
+
+        jina_mock = AsyncMock(side_effect=slow_jina)
+        with patch.object(converter, "_convert_url_jina", jina_mock), \
+             patch.object(converter, "_fetch_validators", new_callable=AsyncMock, return_value={"etag": '"v2"'}):
+            result = await converter.convert(url, max_age=3600)
+            # A second request while the refresh is in flight does not start another
+            await converter.convert(url, max_age=3600)
+            assert "cached: true" in result
+            assert "Old Content" in result
+            await asyncio.gather(*cache._refreshing.values())
+
+        assert jina_mock.await_count == 1
+        assert await cache.get_cached(url) == "# New Content"
+        assert (await cache.lookup(url)).validators == {"etag": '"v2"'}
+
+
+# ============================================================================
+# Test Concurrent Conversion Coalescing
+# ============================================================================
+
+
+class TestConverterCoalescing:
+    """Test that concurrent conversions of one source share a single task."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_url_conversions_share_one_fetch(self, converter, cache):
+        """Test that simultaneous requests for one URL fetch and write once."""
+        import asyncio
+
+        async def slow_jina(url, timeout):
+            await asyncio.sleep(0.05)
+            return "# Shared Content"
+
+        jina_mock = AsyncMock(side_effect=slow_jina)
+        with patch.object(converter, "_convert_url_jina", jina_mock), \
+             patch.object(cache, "save_cache", wraps=cache.save_cache) as save_spy:
+            results = await asyncio.gather(
+                *(converter.convert("https://example.com/page") for _ in range(5))
+            )
+
+        assert jina_mock.await_count == 1
+        assert save_spy.await_count == 1
+        assert all("Shared Content" in r and "cached: false" in r for r in results)
+        assert list(cache.cache_dir.glob("*.tmp")) == []
+
+    @pytest.mark.asyncio
+    async def test_other_sources_not_coalesced(self, converter):
+        """Test that different URLs or options convert independently."""
+        import asyncio
+
+        jina_mock = AsyncMock(return_value="# Content")
+        with patch.object(converter, "_convert_url_jina", jina_mock):
+            await asyncio.gather(
+                converter.convert("https://example.com/a"),
+                converter.convert("https://example.com/b"),
+                converter.convert("https://example.com/c", fallback_parser=True),
+            )
+
+        assert jina_mock.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_to_all_waiters(self, converter):
+        """Test that a failed shared conversion raises for every caller."""
+        import asyncio
+
+        from npl_mcp.markdown import converter as converter_module
+
+        async def failing(file_path, timeout=60, **kwargs):
+            await asyncio.sleep(0.02)
+            raise RuntimeError("broken pdf")
+
+        with patch.object(converter, "_convert_pdf", AsyncMock(side_effect=failing)) as pdf_mock:
+            results = await asyncio.gather(
+                converter.convert("/tmp/spec.pdf"),
+                converter.convert("/tmp/spec.pdf"),
+                return_exceptions=True,
+            )
+
+        assert pdf_mock.await_count == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert converter_module._inflight == {}
+
 
 # ============================================================================
 # Test Force Refresh
@@ -0,0 +1,93 @@
+"""Tests for the markdown heading outline index.
+
+Tests cover:
+- Levels, normalized names, line numbers, parent links and offsets
+- Section slices match the original line-based rendering
+- Outlines are memoized by content, not object identity
+- Byte buffers index with byte offsets
+"""
+
+from npl_mcp.markdown import outline as outline_module
+from npl_mcp.markdown.filters.heading import HeadingFilter
+from npl_mcp.markdown.outline import build_outline, get_outline, normalize_heading_name
+
+DOC = """intro line
+# Getting Started #
+Welcome.
+
+## API_Reference
+### Auth
+token
+## Über Café
+# Appendix
+end
+"""
+
+
+class TestBuildOutline:
+    def test_structure(self):
+        outline = build_outline(DOC)
+        texts = [h.text for h in outline.headings]
+        assert texts == ["Getting Started", "API_Reference", "Auth", "Über Café", "Appendix"]
+        assert [h.level for h in outline.headings] == [1, 2, 3, 2, 1]
+        assert [h.line for h in outline.headings] == [1, 4, 5, 7, 8]
+        assert [h.parent for h in outline.headings] == [-1, 0, 1, 0, -1]
+        assert outline.roots == (0, 4)
+        assert outline.headings[0].children == (1, 3)
+        assert outline.ancestors(2) == [1, 0]
+        assert [h.name for h in outline.headings][:2] == ["getting-started", "api-reference"]
+
+    def test_offsets_slice_sections(self):
+        outline = build_outline(DOC)
+        first, appendix = outline.headings[0], outline.headings[4]
+        assert DOC[first.start:first.end].startswith("# Getting Started #")
+        assert DOC[first.start:first.end].endswith("## Über Café")
+        assert DOC[appendix.start:appendix.end] == "# Appendix\nend\n"
+        assert outline.body(DOC, 0) == "Welcome.\n"
+        assert not outline.headings[1].has_body
+        assert DOC[:outline.preamble_end] == "intro line"
+
+    def test_sections_markdown_normalizes_headings(self):
+        outline = build_outline(DOC)
+        assert outline.sections_markdown(DOC, [1]) == "## API_Reference\n### Auth\ntoken"
+        assert outline.sections_markdown(DOC, [0]).startswith("# Getting Started\nWelcome.")
+
+    def test_bytes_buffer_uses_byte_offsets(self):
+        data = DOC.encode()
+        outline = build_outline(data)
+        heading = outline.headings[3]
+        assert heading.text == "Über Café"
+        assert data[heading.start:heading.head_end].decode() == "## Über Café"
+        assert outline.sections_markdown(data, [3]) == "## Über Café"
+
+    def test_no_headings(self):
+        outline = build_outline("plain\ntext")
+        assert outline.headings == ()
+        assert outline.preamble_end == len("plain\ntext")
+
+    def test_normalize(self):
+        assert normalize_heading_name("HTTP/2 _ Basics") == "http2-basics"
+
+
+class TestMemoization:
+    def test_reused_for_equal_content(self, monkeypatch):
+        outline_module.outline_cache_clear()
+        calls = []
+        real = outline_module.build_outline
+        monkeypatch.setattr(outline_module, "build_outline", lambda c: calls.append(1) or real(c))
+
+        first = get_outline(DOC)
+        # A distinct but equal string object hits the same entry
+        assert get_outline("".join(DOC)) is first
+        HeadingFilter().filter(DOC, "Auth")
+        assert len(calls) == 1
+
+        get_outline(DOC + "\n# More")
+        assert len(calls) == 2
+
+    def test_bounded(self, monkeypatch):
+        outline_module.outline_cache_clear()
+        monkeypatch.setattr(outline_module, "OUTLINE_CACHE_SIZE", 2)
+        for i in range(4):
+            get_outline(f"# Doc {i}")
+        assert len(outline_module._outlines) == 2
@@ -0,0 +1,115 @@
+"""Tests for CSS and XPath markdown filters (npl_mcp.markdown.filters.tree).
+
+Tests cover:
+- Block matches come back as their original markdown lines
+- Inline, attribute and scalar results
+- Heading ids from normalized names
+- Invalid selectors raise ValueError
+- Trees are memoized by content
+- Context-mode rendering through MarkdownViewer
+"""
+
+import pytest
+
+from npl_mcp.markdown.filters import apply_filter, select_lines
+from npl_mcp.markdown.filters import tree as tree_module
+from npl_mcp.markdown.viewer import MarkdownViewer
+
+DOC = """# Overview
+Intro with *emphasis* and a [link](https://example.com/a).
+
+```python
+print("hi")
+```
+
+## API Reference #
+
+| Method | Path |
+|--------|------|
+| GET    | /users |
+
+- one
+- two
+
+# Appendix
+Last words.
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    tree_module.tree_cache_clear()
+    yield
+    tree_module.tree_cache_clear()
+
+
+class TestCSSFilter:
+    def test_blocks_return_source_lines(self):
+        assert apply_filter(DOC, "css:pre") == '```python\nprint("hi")\n```'
+        assert apply_filter(DOC, "css:ul") == "- one\n- two"
+        assert apply_filter(DOC, "css:tbody tr") == "| GET    | /users |"
+
+    def test_heading_ids(self):
+        assert apply_filter(DOC, "css:#api-reference") == "## API Reference #"
+        assert apply_filter(DOC, "css:h1") == "# Overview\n\n# Appendix"
+
+    def test_nested_matches_not_repeated(self):
+        assert apply_filter(DOC, "css:ul, li") == "- one\n- two"
+
+    def test_inline_element(self):
+        assert apply_filter(DOC, "css:em") == "_emphasis_"
+
+    def test_no_match(self):
+        assert apply_filter(DOC, "css:blockquote").startswith("# Error: No elements match")
+
+    def test_invalid_selector(self):
+        with pytest.raises(ValueError, match="Invalid CSS selector"):
+            apply_filter(DOC, "css:p >")
+
+
+class TestXPathFilter:
+    def test_elements(self):
+        assert apply_filter(DOC, "xpath://h2/following-sibling::ul") == "- one\n- two"
+
+    def test_attribute_and_scalars(self):
+        assert apply_filter(DOC, "xpath://a/@href") == "https://example.com/a"
+        assert apply_filter(DOC, "xpath:count(//li)") == "2"
+        assert apply_filter(DOC, "xpath:boolean(//table)") == "true"
+
+    def test_invalid_expression(self):
+        with pytest.raises(ValueError, match="Invalid XPath"):
+            apply_filter(DOC, "xpath://[")
+        with pytest.raises(ValueError):
+            apply_filter(DOC, "xpath:nope(1)")
+
+
+class TestMemoization:
+    def test_tree_built_once_per_content(self, monkeypatch):
+        calls = []
+        real = tree_module.build_tree
+        monkeypatch.setattr(tree_module, "build_tree", lambda c: calls.append(1) or real(c))
+
+        apply_filter(DOC, "css:h1")
+        apply_filter("".join(DOC), "xpath://li")
+        assert len(calls) == 1
+        apply_filter(DOC + "\nmore", "css:h1")
+        assert len(calls) == 2
+
+    def test_crlf_lines(self):
+        assert apply_filter("# A\r\ntext\r\n\r\n- x\r\n", "css:ul") == "- x"
+
+
+class TestContextMode:
+    def test_select_lines(self):
+        assert select_lines(DOC, "css:li") == [13, 14]
+
+    def test_sections_with_matches_expanded(self):
+        result = MarkdownViewer().view(DOC, filter="css:li")
+        assert "## API Reference" in result
+        assert "- one" in result
+        assert "# Appendix 📦" in result
+        assert "Intro with" in result  # Ancestor body stays visible
+
+    def test_no_match(self):
+        result = MarkdownViewer().view(DOC, filter="css:blockquote")
+        assert result == "# Error: Section not found: css:blockquote"
@@ -0,0 +1,125 @@
+"""Tests for memory-mapped markdown viewing (MarkdownViewer.view_file).
+
+Tests cover:
+- view_file renders exactly what view renders for the same text
+- Start offsets skip a metadata header
+- Outlines are keyed by the mapped file, not its path, across os.replace
+- Memory stays flat relative to document size
+- ToMarkdown maps large local files and servable URL caches
+"""
+
+import os
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from npl_mcp.browser import to_markdown as to_markdown_module
+from npl_mcp.browser.to_markdown import _to_markdown
+from npl_mcp.markdown.cache import MarkdownCache
+from npl_mcp.markdown.converter import MarkdownConverter
+from npl_mcp.markdown.viewer import MarkdownViewer
+
+ASSET = Path(__file__).parent / "assets" / "test.md"
+
+
+@pytest.fixture
+def viewer():
+    return MarkdownViewer()
+
+
+class TestViewFile:
+    @pytest.mark.parametrize("kwargs", [
+        {},
+        {"depth": 2},
+        {"filter": "h2", "bare": True},
+        {"filter": "h2"},
+        {"filter": "h2", "depth": 1, "filter_inner_depth": 2},
+        {"filter": "no-such-heading", "bare": True},
+    ])
+    def test_matches_in_memory_view(self, viewer, kwargs):
+        content = ASSET.read_text()
+        assert viewer.view_file(ASSET, **kwargs) == viewer.view(content, **kwargs)
+
+    def test_non_ascii_headings(self, viewer, tmp_path):
+        content = "# Über Café #\nbody\n## Naïve\ntext\n"
+        path = tmp_path / "doc.md"
+        path.write_bytes(content.encode())
+        assert viewer.view_file(path, filter="naïve", bare=True) == "## Naïve\ntext\n"
+        assert viewer.view_file(path, depth=1) == viewer.view(content, depth=1)
+
+    def test_start_offset_skips_header(self, viewer, tmp_path):
+        header = "Title: Doc\nMarkdown Content:\n"
+        path = tmp_path / "doc.md"
+        path.write_text(header + "intro\n# A\nbody\n")
+        assert viewer.view_file(path, depth=1, start=len(header)) == "intro\n# A\nbody\n"
+
+    def test_empty_file(self, viewer, tmp_path):
+        path = tmp_path / "empty.md"
+        path.write_text("")
+        assert viewer.view_file(path, depth=2) == ""
+
+    def test_replaced_file_gets_its_own_outline(self, viewer, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("# A\nalpha\n# B\nbravo\n")
+        assert viewer.view_file(path, filter="B", bare=True) == "# B\nbravo\n"
+        st = path.stat()
+
+        # Same size and mtime, swapped in the way MarkdownCache writes files
+        tmp = tmp_path / "doc.md.tmp"
+        tmp.write_text("# C\ncharl\n# D\ndelta\n")
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, path)
+        assert viewer.view_file(path, filter="D", bare=True) == "# D\ndelta\n"
+
+    def test_memory_stays_flat(self, viewer, tmp_path):
+        section = "".join(f"paragraph {i} " * 8 + "\n" for i in range(200))
+        path = tmp_path / "big.md"
+        with path.open("w") as f:
+            for i in range(300):
+                f.write(f"# Chapter {i}\n{section}## Notes {i}\n{section}")
+        size = path.stat().st_size
+
+        tracemalloc.start()
+        try:
+            result = viewer.view_file(path, filter="chapter-150 > notes-150", bare=True)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result.startswith("## Notes 150\n")
+        assert size > 10 * 1024 * 1024
+        # Outline entries and the extracted section only, not the document
+        assert peak < size / 20
+
+
+class TestToMarkdownMapping:
+    async def test_large_local_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(to_markdown_module, "MMAP_THRESHOLD", 0)
+        path = tmp_path / "doc.md"
+        path.write_text(ASSET.read_text())
+
+        result = await _to_markdown(str(path), filter="h2", filtered_only=True)
+        assert result["memory_mapped"] is True
+        assert result["source_type"] == "file"
+        assert result["content"] == MarkdownViewer().view(ASSET.read_text(), filter="h2", bare=True)
+
+    async def test_small_file_loaded(self, tmp_path):
+        path = tmp_path / "doc.md"
+        path.write_text("# A\nbody\n")
+        result = await _to_markdown(str(path), collapsed_depth=1)
+        assert "memory_mapped" not in result
+
+    async def test_cached_url_with_jina_header(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(to_markdown_module, "MMAP_THRESHOLD", 0)
+        cache = MarkdownCache(cache_dir=tmp_path / "cache")
+        url = "https://example.com/doc"
+        await cache.save_cache(
+            url, "Title: Doc\nURL Source: https://example.com/doc\nMarkdown Content:\n# A\nalpha\n# B\nbeta\n",
+        )
+
+        result = await _to_markdown(
+            url, filter="B", filtered_only=True, converter=MarkdownConverter(cache),
+        )
+        assert result["memory_mapped"] is True
+        assert result["content"] == "# B\nbeta\n"
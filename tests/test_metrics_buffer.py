@@ -0,0 +1,237 @@
+"""Unit tests for npl_mcp.storage.metrics_buffer.
+
+Tests cover:
+- record_* helpers enqueue instead of inserting while a buffer runs
+- Size- and time-triggered batch flushes via copy_records_to_table
+- executemany fallback when COPY is rejected and aborts its savepoint
+- Retention, backoff and overflow policies during a DB outage
+- stop() drains queued rows
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import asyncpg
+import pytest
+
+from npl_mcp.storage import metrics_buffer
+from npl_mcp.storage.error_log import log_tool_error
+from npl_mcp.storage.metrics import record_llm_call, record_tool_call
+from npl_mcp.storage.metrics_buffer import (
+    MetricsBuffer,
+    get_metrics_buffer,
+    start_metrics_buffer,
+    stop_metrics_buffer,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _Transaction:
+    """Transaction or savepoint; rolling back a savepoint clears the abort."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    async def __aenter__(self):
+        self._conn.depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, *exc):
+        self._conn.depth -= 1
+        if exc_type is not None and self._conn.depth > 0:
+            self._conn.aborted = False
+
+
+class _FakeConn:
+    """Records COPY / executemany batches; a failed COPY aborts the transaction."""
+
+    def __init__(self, copy_error: Exception | None = None):
+        self.copied = []
+        self.many = []
+        self.executed = []
+        self.depth = 0
+        self.aborted = False
+        self._copy_error = copy_error
+
+    def transaction(self):
+        return _Transaction(self)
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        if self._copy_error is not None:
+            self.aborted = True
+            raise self._copy_error
+        self.copied.append((table, list(records), columns))
+
+    async def executemany(self, sql, rows):
+        if self.aborted:
+            raise asyncpg.InFailedSQLTransactionError("current transaction is aborted")
+        self.many.append((sql, list(rows)))
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+class _FakePool:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def acquire(self):
+        return self._conn
+
+
+def _rows(conn: _FakeConn, table: str) -> list:
+    return [row for t, rows, _ in conn.copied if t == table for row in rows]
+
+
+@pytest.fixture(autouse=True)
+async def _no_global_buffer():
+    yield
+    await stop_metrics_buffer(timeout=1)
+
+
+# ---------------------------------------------------------------------------
+# Producers
+# ---------------------------------------------------------------------------
+
+
+class TestBufferedRecorders:
+    @patch("npl_mcp.storage.metrics_buffer.get_pool")
+    @patch("npl_mcp.storage.metrics.get_pool")
+    async def test_record_helpers_enqueue(self, inline_pool, buffer_pool):
+        conn = _FakeConn()
+        buffer_pool.return_value = _FakePool(conn)
+        await start_metrics_buffer(flush_interval=60)
+
+        await record_tool_call("Ping", session_id="s1", response_time_ms=3)
+        await record_llm_call("gpt-4o", purpose="intent", latency_ms=9)
+        await log_tool_error("Ping", ValueError("bad"))
+
+        inline_pool.assert_not_called()
+        assert get_metrics_buffer().stats()["queued"] == 3
+
+        await stop_metrics_buffer()
+        tool_rows = _rows(conn, "npl_tool_calls")
+        assert tool_rows[0][:2] == ("Ping", "s1")
+        assert _rows(conn, "npl_llm_calls")[0][:2] == ("gpt-4o", "intent")
+        assert _rows(conn, "npl_tool_errors")[0][:3] == ("Ping", "ValueError", "bad")
+
+    @patch("npl_mcp.storage.metrics.get_pool")
+    async def test_inline_without_buffer(self, inline_pool):
+        conn = _FakeConn()
+        inline_pool.return_value = _FakePool(conn)
+        assert get_metrics_buffer() is None
+        await record_tool_call("Ping")
+        assert len(conn.executed) == 1
+
+
+# ---------------------------------------------------------------------------
+# Flushing
+# ---------------------------------------------------------------------------
+
+
+class TestFlush:
+    @patch("npl_mcp.storage.metrics_buffer.get_pool")
+    async def test_size_trigger_flushes_one_batch(self, mock_pool):
+        conn = _FakeConn()
+        mock_pool.return_value = _FakePool(conn)
+        buffer = MetricsBuffer(max_batch=5, flush_interval=60)
+        buffer.start()
+        for i in range(5):
+            await buffer.put("npl_tool_calls", (f"t{i}", None, "", "", 1, None, None))
+        await asyncio.sleep(0.05)
+        assert len(conn.copied) == 1
+        assert len(conn.copied[0][1]) == 5
+        assert buffer.written == 5
+        await buffer.stop()
+
+    @patch("npl_mcp.storage.metrics_buffer.get_pool")
+    async def test_time_trigger(self, mock_pool):
+        conn = _FakeConn()
+        mock_pool.return_value = _FakePool(conn)
+        buffer = MetricsBuffer(max_batch=100, flush_interval=0.02)
+        buffer.start()
+        await buffer.put("npl_llm_calls", ("m", None, 1, 2, 3, 4, None, None))
+        await asyncio.sleep(0.1)
+        assert buffer.written == 1
+        await buffer.stop()
+
+    @patch("npl_mcp.storage.metrics_buffer.get_pool")
+    async def test_executemany_fallback(self, mock_pool):
+        conn = _FakeConn(copy_error=asyncpg.PostgresError("COPY not allowed"))
+        mock_pool.return_value = _FakePool(conn)
+        buffer = MetricsBuffer(flush_interval=60)
+        buffer.start()
+        await buffer.put("npl_tool_calls", ("Ping", None, "", "", 1, None, None))
+        await buffer.stop()
+        sql, rows = conn.many[0]
+        assert sql.startswith("INSERT INTO npl_tool_calls (tool_name, session_id")
+        assert rows == [("Ping", None, "", "", 1, None, None)]
+        assert buffer.stats()["written"] == 1
+        assert buffer.stats()["failed_flushes"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Outage handling
+# ---------------------------------------------------------------------------
+
+
+class TestOutage:
+    @patch("npl_mcp.storage.metrics_buffer.get_pool")
+    async def test_failed_flush_keeps_rows_in_order(self, mock_pool):
+        mock_pool.side_effect = OSError("DB down")
+        buffer = MetricsBuffer(flush_interval=60)
+        buffer._wakeup = asyncio.Event()
+        buffer._space = asyncio.Event()
+        for i in range(3):
+            await buffer.put("npl_tool_calls", (f"t{i}",))
+        assert await buffer.flush_once() is False
+        assert [row[0] for _, row in buffer._queue] == ["t0", "t1", "t2"]
+        assert buffer.failed_flushes == 1
+        assert buffer._backoff > 0
+
+        conn = _FakeConn()
+        mock_pool.side_effect = None
+        mock_pool.return_value = _FakePool(conn)
+        assert await buffer.flush_once() is True
+        assert buffer._backoff == 0
+        assert [r[0] for r in _rows(conn, "npl_tool_calls")] == ["t0", "t1", "t2"]
+
+    @pytest.mark.parametrize("policy,kept", [
+        ("drop_oldest", ["t1", "t2"]),
+        ("drop_newest", ["t0", "t1"]),
+        ("block", ["t0", "t1"]),
+    ])
+    async def test_overflow_policy(self, policy, kept):
+        buffer = MetricsBuffer(max_queue=2, policy=policy, block_timeout=0.01)
+        buffer._wakeup = asyncio.Event()
+        buffer._space = asyncio.Event()
+        results = [await buffer.put("npl_tool_calls", (f"t{i}",)) for i in range(3)]
+        assert [row[0] for _, row in buffer._queue] == kept
+        assert buffer.dropped == 1
+        assert results[2] is (policy == "drop_oldest")
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            MetricsBuffer(policy="spill")
+
+    @patch("npl_mcp.storage.metrics_buffer.get_pool")
+    async def test_stop_during_outage_counts_dropped(self, mock_pool):
+        mock_pool.side_effect = OSError("DB down")
+        buffer = MetricsBuffer(flush_interval=60)
+        buffer.start()
+        await buffer.put("npl_tool_calls", ("t0",))
+        await buffer.stop(timeout=1)
+        assert buffer.dropped == 1
+        assert not buffer.running
@@ -0,0 +1,152 @@
+"""Tests for the NPLLoad / NPLSpec rendered-output cache.
+
+Tests cover:
+- LRU eviction and hit/miss counters
+- load_npl serves repeated and equivalent expressions from the cache
+- Convention file changes invalidate cached output
+- NPLDefinition.format caching keyed by specs and flags
+- Counters surfaced through /api/health
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+import yaml
+
+from npl_mcp.npl.render_cache import RenderCache, get_render_cache
+from npl_mcp.npl.store import reset_convention_stores
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    reset_convention_stores()
+    get_render_cache().clear()
+    yield
+    get_render_cache().clear()
+    reset_convention_stores()
+
+
+@pytest.fixture
+def conventions_dir(tmp_path: Path) -> Path:
+    (tmp_path / "npl.yaml").write_text(yaml.dump({
+        "/npl": {
+            "version": 1.0,
+            "description": "Test NPL",
+            "concepts": [],
+            "section_order": {"components": ["syntax"]},
+        }
+    }))
+    (tmp_path / "syntax.yaml").write_text(yaml.dump({
+        "name": "syntax",
+        "categories": [{"name": "core", "title": "Core"}],
+        "components": [
+            {"name": "placeholder", "slug": "placeholder", "category": "core",
+             "brief": "Placeholder brief", "examples": []},
+            {"name": "qualifier", "slug": "qualifier", "category": "core",
+             "brief": "Qualifier brief", "examples": []},
+            {"name": "in-fill", "slug": "in-fill", "category": "core",
+             "brief": "In-fill brief", "examples": []},
+        ],
+    }))
+    return tmp_path
+
+
+class TestRenderCache:
+    def test_lru_eviction(self):
+        cache = RenderCache(maxsize=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        assert cache.get("a") == "A"  # a is now most recent
+        cache.set("c", "C")
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+
+    def test_stats(self):
+        cache = RenderCache(maxsize=4)
+        cache.get("missing")
+        cache.set("k", "v")
+        cache.get("k")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+
+class TestLoadNplCaching:
+    def test_repeat_hits(self, conventions_dir):
+        from npl_mcp.npl.loader import load_npl
+
+        first = load_npl("syntax", npl_dir=conventions_dir)
+        second = load_npl("syntax", npl_dir=conventions_dir)
+        assert first == second
+        assert get_render_cache().stats()["hits"] == 1
+
+    def test_skip_and_subtraction_are_equivalent(self, conventions_dir):
+        from npl_mcp.npl.loader import load_npl
+
+        a = load_npl("syntax -syntax#qualifier -syntax#in-fill", npl_dir=conventions_dir)
+        b = load_npl("syntax", npl_dir=conventions_dir, skip=["syntax#in-fill", "syntax#qualifier"])
+        assert a == b
+        assert get_render_cache().stats()["hits"] == 1
+
+    def test_addition_order_is_significant(self, conventions_dir):
+        from npl_mcp.npl.loader import load_npl
+
+        a = load_npl("syntax#placeholder syntax#qualifier", npl_dir=conventions_dir)
+        b = load_npl("syntax#qualifier syntax#placeholder", npl_dir=conventions_dir)
+        assert a != b
+        assert get_render_cache().stats()["hits"] == 0
+
+    def test_file_change_invalidates(self, conventions_dir):
+        from npl_mcp.npl.loader import load_npl
+
+        assert "Placeholder brief" in load_npl("syntax#placeholder", npl_dir=conventions_dir)
+        path = conventions_dir / "syntax.yaml"
+        path.write_text(path.read_text().replace("Placeholder brief", "Changed brief text"))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert "Changed brief text" in load_npl("syntax#placeholder", npl_dir=conventions_dir)
+
+
+class TestNplDefinitionCaching:
+    def test_repeat_hits(self, conventions_dir):
+        from npl_mcp.convention_formatter import NPLDefinition, ComponentSpec
+
+        specs = [ComponentSpec("syntax:placeholder", example_priority=1)]
+        first = NPLDefinition(conventions_dir).format(components=specs)
+        second = NPLDefinition(conventions_dir).format(components=specs)
+        assert first == second
+        assert get_render_cache().stats()["hits"] == 1
+
+    def test_flags_change_key(self, conventions_dir):
+        from npl_mcp.convention_formatter import NPLDefinition
+
+        npl = NPLDefinition(conventions_dir)
+        npl.format(flags={"concise": True})
+        npl.format(flags={"concise": False})
+        assert get_render_cache().stats()["hits"] == 0
+
+    def test_rendered_order_is_irrelevant(self, conventions_dir):
+        from npl_mcp.convention_formatter import NPLDefinition
+
+        npl = NPLDefinition(conventions_dir)
+        a = npl.format(components=["syntax"], rendered=["syntax:placeholder", "syntax:qualifier"])
+        b = npl.format(components=["syntax"], rendered=["syntax:qualifier", "syntax:placeholder"])
+        assert a == b
+        assert get_render_cache().stats()["hits"] == 1
+
+
+def test_health_reports_render_cache():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from npl_mcp.api.router import router
+
+    app = FastAPI()
+    app.include_router(router)
+    get_render_cache().get("missing")
+    report = TestClient(app).get("/api/health").json()
+    assert report["npl_render_cache"]["status"] == "ok"
+    assert report["npl_render_cache"]["misses"] == 1
@@ -0,0 +1,141 @@
+"""Tests for keyset cursor pagination (npl_mcp.storage.pagination).
+
+Tests cover:
+- Cursors round-trip timestamps, UUIDs and ints and stay opaque
+- Foreign, truncated and garbage cursors are rejected
+- Row-comparison conditions and limit + 1 page trimming
+- Module list functions continue from a cursor and report next_cursor
+- REST endpoints return 400 for bad cursors and expose X-Next-Cursor
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from npl_mcp.chat.chat import message_page
+from npl_mcp.storage.pagination import InvalidCursor, Keyset
+from npl_mcp.tasks.tasks import task_feed, task_list
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+TASKS = Keyset("tasks", ("created_at", "id"))
+
+
+def _task_row(i):
+    return {
+        "id": i, "title": f"t{i}", "description": "", "status": "pending", "priority": 1,
+        "assigned_to": None, "notes": None,
+        "created_at": NOW - timedelta(minutes=i), "updated_at": NOW,
+    }
+
+
+class TestKeyset:
+    def test_round_trip(self):
+        key = Keyset("x", ("created_at", "id", "session"))
+        sid = uuid.uuid4()
+        cursor = key.encode({"created_at": NOW, "id": 7, "session": sid})
+        assert key.decode(cursor) == [NOW, 7, sid]
+        assert "tasks" not in cursor and "=" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["", "!!!", "bm90IGpzb24", "WyJ0YXNrcyJd"])
+    def test_garbage_rejected(self, cursor):
+        with pytest.raises(InvalidCursor):
+            TASKS.decode(cursor)
+
+    def test_foreign_cursor_rejected(self):
+        other = Keyset("artifacts", ("updated_at", "id")).encode({"updated_at": NOW, "id": 1})
+        with pytest.raises(InvalidCursor, match="does not belong"):
+            TASKS.after(other, 1)
+
+    def test_after_builds_row_comparison(self):
+        assert TASKS.after(None, 3) == (None, [])
+        cursor = TASKS.encode({"created_at": NOW, "id": 9})
+        assert TASKS.after(cursor, 3, alias="t") == ("(t.created_at, t.id) < ($3, $4)", [NOW, 9])
+        assert TASKS.order_by("t") == "t.created_at DESC, t.id DESC"
+
+    def test_page_trims_probe_row(self):
+        rows = [_task_row(i) for i in range(1, 5)]
+        page, cursor = TASKS.page(rows, 3)
+        assert [r["id"] for r in page] == [1, 2, 3]
+        assert TASKS.decode(cursor) == [rows[2]["created_at"], 3]
+        assert TASKS.page(rows[:3], 3) == (rows[:3], None)
+
+
+class TestModulePages:
+    async def test_task_list_walks_pages(self):
+        table = [_task_row(i) for i in range(1, 6)]
+
+        async def fetch(sql, *args):
+            rows = table
+            if "(created_at, id) <" in sql:
+                created_at, last_id = args[-3], args[-2]
+                rows = [r for r in rows if (r["created_at"], r["id"]) < (created_at, last_id)]
+            return sorted(rows, key=lambda r: (r["created_at"], r["id"]), reverse=True)[:args[-1]]
+
+        pool = AsyncMock()
+        pool.fetch.side_effect = fetch
+        seen, cursor = [], None
+        with patch("npl_mcp.tasks.tasks.get_pool", AsyncMock(return_value=pool)):
+            while True:
+                result = await task_list(limit=2, cursor=cursor)
+                seen += [t["id"] for t in result["tasks"]]
+                cursor = result["next_cursor"]
+                if cursor is None:
+                    break
+        assert seen == [1, 2, 3, 4, 5]
+        assert pool.fetch.await_count == 3
+
+    async def test_bad_cursor_is_an_error_envelope(self):
+        with patch("npl_mcp.tasks.tasks.get_pool", AsyncMock()):
+            result = await task_feed(1, cursor="nonsense")
+        assert result["status"] == "error"
+
+    async def test_message_page_orders_by_id(self):
+        pool = AsyncMock()
+        pool.fetch.return_value = [
+            {"id": i, "room_id": 1, "content": f"m{i}", "author": "a", "created_at": NOW}
+            for i in (9, 8, 7)
+        ]
+        with patch("npl_mcp.chat.chat.get_pool", AsyncMock(return_value=pool)):
+            page = await message_page(1, limit=2)
+        sql, *args = pool.fetch.call_args.args
+        assert "ORDER BY id DESC" in sql
+        assert args == [1, 3]
+        assert [m["id"] for m in page["items"]] == [8, 9]
+        assert Keyset("chat_messages", ("id",)).decode(page["next_cursor"]) == [8]
+
+
+class TestRoutes:
+    @pytest.fixture
+    def client(self):
+        from npl_mcp.api.router import router
+
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_bad_cursor_400(self, client):
+        with patch("npl_mcp.tasks.tasks.get_pool", AsyncMock()):
+            assert client.get("/api/tasks?cursor=nonsense").status_code == 400
+        with patch("npl_mcp.chat.chat.get_pool", AsyncMock()):
+            assert client.get("/api/chat/rooms/1/messages?cursor=nonsense").status_code == 400
+
+    def test_next_cursor_header_on_list_endpoints(self, client):
+        pool = AsyncMock()
+        pool.fetch.return_value = [
+            {"id": uuid.uuid4(), "agent": "a", "brief": "", "task": "t", "project_id": None,
+             "parent_id": None, "notes": "", "created_at": NOW, "updated_at": NOW,
+             "project_name": "p"}
+            for _ in range(3)
+        ]
+        with patch("npl_mcp.storage.pool.get_pool", AsyncMock(return_value=pool)):
+            response = client.get("/api/sessions?limit=2")
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+        cursor = response.headers["X-Next-Cursor"]
+        assert Keyset("tool_sessions", ("updated_at", "id")).decode(cursor)[0] == NOW
@@ -0,0 +1,178 @@
+"""Tests for page-wise PDF extraction (npl_mcp.markdown.pdf).
+
+Tests cover:
+- Page range parsing
+- Pages stream back in order even when later chunks finish first
+- Per-page cache: unchanged pages are not re-extracted
+- Fingerprints cover page resources, so pages drawing different forms never collide
+- MarkdownConverter ``pages=`` selection on a real PDF
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from npl_mcp.markdown import pdf
+from npl_mcp.markdown.cache import MarkdownCache
+from npl_mcp.markdown.converter import MarkdownConverter
+
+NIHILISM_PDF = Path(__file__).parent / "assets" / "nihilism.pdf"
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+    """Six fake pages; later pages extract faster so chunks finish out of order."""
+    calls: list[list[int]] = []
+
+    def extract(file_path, page_numbers):
+        calls.append(list(page_numbers))
+        time.sleep(0.01 * (7 - page_numbers[0]))
+        return [(n, f"text {n}") for n in page_numbers]
+
+    monkeypatch.setattr(pdf, "page_fingerprints", lambda file_path: [f"fp{n}" for n in range(1, 7)])
+    monkeypatch.setattr(pdf, "extract_pages", extract)
+    return calls
+
+
+class TestParsePageRange:
+    def test_all_pages_by_default(self):
+        assert pdf.parse_page_range(None, 3) == [1, 2, 3]
+
+    def test_ranges_and_singles(self):
+        assert pdf.parse_page_range("5, 1-2,2", 10) == [1, 2, 5]
+
+    def test_open_ended(self):
+        assert pdf.parse_page_range("8-", 10) == [8, 9, 10]
+        assert pdf.parse_page_range("-2", 10) == [1, 2]
+
+    def test_clipped_to_document(self):
+        assert pdf.parse_page_range("9-20", 10) == [9, 10]
+
+    @pytest.mark.parametrize("spec", ["abc", "0", "5-2", "20-30"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            pdf.parse_page_range(spec, 10)
+
+
+class TestStreamPages:
+    async def test_in_order_across_chunks(self, fake_pdf):
+        with ThreadPoolExecutor(3) as executor:
+            pages = [p async for p in pdf.stream_pages("x.pdf", chunk_pages=2, executor=executor)]
+        assert [n for n, _ in pages] == [1, 2, 3, 4, 5, 6]
+        assert sorted(fake_pdf) == [[1, 2], [3, 4], [5, 6]]
+
+    async def test_selection(self, fake_pdf):
+        pages = [p async for p in pdf.stream_pages("x.pdf", "2,5-6", chunk_pages=2)]
+        assert pages == [(2, "text 2"), (5, "text 5"), (6, "text 6")]
+
+    async def test_only_unseen_pages_extracted(self, fake_pdf):
+        store: dict[str, str] = {"fp1": "cached 1", "fp4": "cached 4"}
+
+        async def load(fingerprints):
+            return {fp: store[fp] for fp in fingerprints if fp in store}
+
+        async def save(pages):
+            store.update(pages)
+
+        pages = [p async for p in pdf.stream_pages("x.pdf", load=load, save=save, chunk_pages=2)]
+        assert pages[0] == (1, "cached 1")
+        assert pages[3] == (4, "cached 4")
+        assert sorted(fake_pdf) == [[2, 3], [5, 6]]
+        assert set(store) == {f"fp{n}" for n in range(1, 7)}
+
+        fake_pdf.clear()
+        [p async for p in pdf.stream_pages("x.pdf", load=load, save=save)]
+        assert fake_pdf == []
+
+
+def _form_xobject_pdf(path: Path, texts: list[str]) -> None:
+    """Write a PDF whose pages all have the content ``/Fm0 Do``.
+
+    Each page's ``/Fm0`` is a different Form XObject drawing one of *texts*,
+    so only the resources tell the pages apart.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length 8 >>\nstream\n/Fm0 Do\nendstream",
+    ]
+    kids = []
+    for text in texts:
+        draw = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Type /XObject /Subtype /Form /BBox [0 0 612 792]"
+            b" /Resources << /Font << /F1 3 0 R >> >> /Length %d >>\nstream\n%s\nendstream"
+            % (len(draw), draw)
+        )
+        form = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+            b" /Resources << /XObject << /Fm0 %d 0 R >> >> >>" % form
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+class TestFingerprints:
+    def test_same_content_stream_different_forms(self, tmp_path):
+        source = tmp_path / "forms.pdf"
+        _form_xobject_pdf(source, ["Alpha page one", "Bravo page two"])
+        first, second = pdf.page_fingerprints(str(source))
+        assert first != second
+
+    def test_identical_pages_share_a_fingerprint(self, tmp_path):
+        source = tmp_path / "same.pdf"
+        _form_xobject_pdf(source, ["Same text", "Same text"])
+        first, second = pdf.page_fingerprints(str(source))
+        assert first == second
+
+    async def test_cached_pages_keep_their_own_text(self, tmp_path):
+        source = tmp_path / "forms.pdf"
+        _form_xobject_pdf(source, ["Alpha page one", "Bravo page two"])
+        cache = MarkdownCache(cache_dir=tmp_path / "cache")
+
+        async def run():
+            return [text async for _, text in pdf.stream_pages(
+                str(source), load=cache.get_pdf_pages, save=cache.save_pdf_pages,
+            )]
+
+        extracted = await run()
+        assert "Alpha page one" in extracted[0] and "Bravo page two" in extracted[1]
+        assert await run() == extracted
+
+
+class TestConverterPages:
+    @pytest.fixture
+    def converter(self, tmp_path):
+        return MarkdownConverter(MarkdownCache(cache_dir=tmp_path / "cache"))
+
+    async def test_page_selection(self, converter, tmp_path, monkeypatch):
+        monkeypatch.delenv("JINA_API_KEY", raising=False)
+        source = tmp_path / "nihilism.pdf"
+        source.write_bytes(NIHILISM_PDF.read_bytes())
+
+        result = await converter.convert(str(source), pages="2-3")
+        assert "## Page 2" in result
+        assert "## Page 3" in result
+        assert "## Page 1\n" not in result
+        # Partial conversions never write the whole-document sidecar
+        assert not source.with_suffix(".pdf.md").exists()
+        assert len(await converter.cache.get_pdf_pages(pdf.page_fingerprints(str(source)))) == 2
+
+    async def test_pages_rejected_for_non_pdf(self, converter):
+        with pytest.raises(ValueError, match="local PDF"):
+            await converter.convert("notes.txt", pages="1")
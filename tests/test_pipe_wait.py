@@ -0,0 +1,385 @@
+"""Tests for long-poll and streamed agent input pipes (npl_mcp.pipes).
+
+Tests cover:
+- Waiters match notifications by session, handle, group and section
+- Oversized notifications degrade to a broadcast
+- Session and group memberships are cached per session
+- agent_output_pipe upserts every section and notifies in one statement
+- YAML date keys and .nan/.inf payloads are normalized to valid JSON
+- JSONB payloads are read directly; legacy YAML rows still parse
+- agent_input_pipe(wait=...) returns on a matching notification or times out
+- The hub LISTENs once waiters arrive and wakes them all on (re)connect
+- agent_input_stream yields a dashboard per wake-up without repeats
+- Cursors re-read the hold-back window, so late commits arrive exactly once
+- The stream route rejects unknown agents and bad timestamps
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+import shortuuid
+
+from npl_mcp.pipes import pipes as pipes_module
+from npl_mcp.pipes.stream import PipeHub, Waiter, build_payload
+from npl_mcp.storage import listen as listen_module
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+SESSION = uuid.uuid4()
+SENDER = uuid.uuid4()
+GROUP_HANDLE = uuid.uuid4()
+
+
+class _FakePool:
+    """Sessions, one group membership and pipe entries in memory."""
+
+    def __init__(self):
+        self.entries = []
+        self.session_lookups = 0
+        self.group_lookups = 0
+        self.notified = []
+        self.upserts = []
+
+    def add_entry(self, name, minutes=0):
+        self.entries.append({
+            "id": len(self.entries) + 1, "message_name": name, "sender_agent_id": SENDER, "sender_agent_handle": "lead",
+            "data": json.dumps({"value": name}), "body": None,
+            "updated_at": NOW + timedelta(minutes=minutes),
+        })
+
+    async def fetchrow(self, sql, uid):
+        self.session_lookups += 1
+        if uid == SESSION:
+            return {"id": SESSION, "agent": "coder", "project_id": None}
+        if uid == SENDER:
+            return {"id": SENDER, "agent": "lead", "project_id": None}
+        return None
+
+    async def fetch(self, sql, *args):
+        if "npl_agent_groups" in sql:
+            self.group_lookups += 1
+            return [{"group_name": "reviewers", "group_handle": GROUP_HANDLE}]
+        rows = self.entries
+        since = next((a for a in args if isinstance(a, datetime)), None)
+        if since is not None:
+            rows = [r for r in rows if r["updated_at"] > since]
+        return sorted(rows, key=lambda r: r["updated_at"], reverse=True)
+
+    async def fetchval(self, sql, *args):
+        self.upserts.append((sql, args))
+        self.notified.append(json.loads(args[-1]))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = _FakePool()
+
+    async def _get_pool():
+        return fake
+
+    monkeypatch.setattr(pipes_module, "get_pool", _get_pool)
+    pipes_module._members.clear()
+    yield fake
+    pipes_module._members.clear()
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = PipeHub()
+    monkeypatch.setattr(pipes_module, "start_pipe_hub", AsyncMock(return_value=hub))
+    return hub
+
+
+def _note(**targets):
+    return {"sections": ["status"], "agents": [], "handles": [], "groups": [],
+            "group_handles": [], **targets}
+
+
+class TestWaiter:
+    def test_matches_targets(self):
+        waiter = Waiter(str(SESSION), "coder", ["reviewers"], [str(GROUP_HANDLE)])
+        assert waiter.matches(_note(agents=[str(SESSION)]))
+        assert waiter.matches(_note(handles=["coder"]))
+        assert waiter.matches(_note(groups=["reviewers"]))
+        assert waiter.matches(_note(group_handles=[str(GROUP_HANDLE)]))
+        assert not waiter.matches(_note(handles=["someone-else"]))
+        assert waiter.matches({"broadcast": True})
+
+    def test_section_filter(self):
+        waiter = Waiter(str(SESSION), "coder", sections=["plan"])
+        assert not waiter.matches(_note(handles=["coder"]))
+        assert waiter.matches(_note(handles=["coder"], sections=["plan", "status"]))
+
+    def test_oversized_payload_broadcasts(self):
+        handles = [f"agent-{i:05d}" for i in range(1000)]
+        assert json.loads(build_payload(["s"], [], handles, [], [])) == {"broadcast": True}
+        assert json.loads(build_payload(["s"], [], ["a"], [], []))["handles"] == ["a"]
+
+
+class TestMembershipCache:
+    async def test_cached_per_session(self, pool):
+        agent = shortuuid.encode(SESSION)
+        first = await pipes_module.resolve_member(agent)
+        second = await pipes_module.resolve_member(str(SESSION))
+        assert first is second
+        assert first.group_names == ("reviewers",)
+        assert (pool.session_lookups, pool.group_lookups) == (1, 1)
+
+    async def test_expires(self, pool, monkeypatch):
+        await pipes_module.resolve_member(str(SESSION))
+        monkeypatch.setattr(pipes_module, "MEMBERSHIP_TTL", 0)
+        await pipes_module.resolve_member(str(SESSION))
+        assert pool.group_lookups == 2
+
+    async def test_unknown_session_not_cached(self, pool):
+        assert await pipes_module.resolve_member(str(uuid.uuid4())) is None
+        assert await pipes_module.resolve_member("not a uuid") is None
+
+
+class TestOutputPipe:
+    async def test_one_notification_with_targets(self, pool):
+        body = (
+            "status:\n  target:\n    agent-handle: coder\n  data: {ok: true}\n"
+            "plan:\n  target:\n    group: reviewers\n  data: {step: 1}\n"
+        )
+        result = await pipes_module.agent_output_pipe(str(SENDER), body)
+        assert result["upserted"] == 2
+        assert pool.notified == [{
+            "sections": ["plan", "status"], "agents": [], "handles": ["coder"],
+            "groups": ["reviewers"], "group_handles": [],
+        }]
+
+    async def test_sections_upserted_in_one_statement(self, pool):
+        target = shortuuid.encode(SESSION)
+        body = "".join(
+            f"s{i}:\n  target:\n    agent: {target}\n  data: {{n: {i}, day: 2026-01-01}}\n"
+            for i in range(30)
+        )
+        result = await pipes_module.agent_output_pipe(str(SENDER), body)
+        assert result["upserted"] == 30
+        assert len(pool.upserts) == 1
+        sql, args = pool.upserts[0]
+        assert "unnest(" in sql and "pg_notify" in sql
+        names, agents, data = args[3], args[4], args[8]
+        assert names == [f"s{i}" for i in range(30)]
+        assert agents == [SESSION] * 30
+        assert json.loads(data[3]) == {"n": 3, "day": "2026-01-01"}
+
+    async def test_yaml_only_keys_stored_as_strings(self, pool):
+        body = "status:\n  target:\n    agent-handle: coder\n  data: {2024-01-01: released, 7: seven}\n"
+        result = await pipes_module.agent_output_pipe(str(SENDER), body)
+        assert result["upserted"] == 1
+        data = pool.upserts[0][1][8]
+        assert json.loads(data[0]) == {"2024-01-01": "released", "7": "seven"}
+
+    async def test_nan_and_inf_stored_as_null(self, pool):
+        body = "status:\n  target:\n    agent-handle: coder\n  data: {ratio: .nan, limit: -.inf, n: 1.5}\n"
+        result = await pipes_module.agent_output_pipe(str(SENDER), body)
+        assert result["upserted"] == 1
+        data = pool.upserts[0][1][8][0]
+        assert "NaN" not in data and "Infinity" not in data
+        assert json.loads(data) == {"ratio": None, "limit": None, "n": 1.5}
+
+    async def test_no_sections_no_statement(self, pool):
+        result = await pipes_module.agent_output_pipe(str(SENDER), "note: plain\n")
+        assert result["upserted"] == 0
+        assert pool.upserts == []
+
+    async def test_legacy_yaml_rows_still_read(self, pool):
+        pool.add_entry("status")
+        pool.entries[0].update(data=None, body="value: legacy\n")
+        result = await pipes_module.agent_input_pipe(str(SESSION))
+        assert result["dashboard"]["status"]["data"] == {"value": "legacy"}
+
+    async def test_legacy_yaml_date_keys_normalized(self, pool):
+        pool.add_entry("status")
+        pool.entries[0].update(data=None, body="2024-01-01: released\n")
+        result = await pipes_module.agent_input_pipe(str(SESSION))
+        assert result["dashboard"]["status"]["data"] == {"2024-01-01": "released"}
+
+
+class _FakeListenConn:
+    def __init__(self):
+        self.channels = []
+        self.terminators = []
+        self.closed = False
+
+    async def add_listener(self, channel, callback):
+        self.channels.append(channel)
+
+    def add_termination_listener(self, callback):
+        self.terminators.append(callback)
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class TestHub:
+    async def test_connect_and_reconnect_wake_waiters(self, monkeypatch):
+        conns = []
+
+        async def _connect():
+            conns.append(_FakeListenConn())
+            return conns[-1]
+
+        monkeypatch.setattr(listen_module, "connect", _connect)
+        hub = PipeHub()
+        hub.start()
+        await asyncio.sleep(0.01)
+        assert conns == []
+
+        waiter = hub.subscribe(Waiter(str(SESSION), "tester"))
+        assert await waiter.wait(1.0)
+        assert conns[0].channels == ["npl_agent_pipe"]
+        assert hub.stats()["listening"] is True
+
+        conns[0].closed = True
+        conns[0].terminators[0](conns[0])
+        assert await waiter.wait(1.0)
+        assert len(conns) == 2
+        assert hub.stats()["reconnects"] == 1
+
+        await hub.stop()
+        assert conns[1].closed
+
+
+class TestLongPoll:
+    async def test_returns_immediately_with_entries(self, pool, hub):
+        pool.add_entry("status")
+        result = await pipes_module.agent_input_pipe(str(SESSION), wait=30)
+        assert result["entries"] == 1
+        assert result["latest"] == NOW.isoformat()
+        assert hub.stats()["waiters"] == 0
+
+    async def test_wakes_on_matching_notification(self, pool, hub):
+        since = NOW.isoformat()
+        task = asyncio.ensure_future(
+            pipes_module.agent_input_pipe(str(SESSION), since=since, wait=30)
+        )
+        await asyncio.sleep(0.01)
+        assert hub.stats()["waiters"] == 1
+
+        hub._on_notify(None, 0, "npl_agent_pipe", json.dumps(_note(handles=["someone-else"])))
+        await asyncio.sleep(0.01)
+        assert not task.done()
+
+        pool.add_entry("status", minutes=1)
+        hub._on_notify(None, 0, "npl_agent_pipe", json.dumps(_note(groups=["reviewers"])))
+        result = await asyncio.wait_for(task, 1.0)
+        assert result["entries"] == 1
+        assert result["dashboard"]["status"]["data"] == {"value": "status"}
+        assert hub.stats()["waiters"] == 0
+
+    async def test_times_out_empty(self, pool, hub):
+        result = await pipes_module.agent_input_pipe(str(SESSION), since=NOW.isoformat(), wait=0.05)
+        assert result["entries"] == 0
+        assert result["latest"] == NOW.isoformat()
+
+    async def test_invalid_since(self, pool, hub):
+        result = await pipes_module.agent_input_pipe(str(SESSION), since="yesterday", wait=1)
+        assert result["status"] == "error"
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = pipes_module.PipeCursor(NOW, {7: NOW + timedelta(microseconds=1500), 3: NOW + timedelta(seconds=2)})
+        text = str(cursor)
+        assert text == f"{NOW.isoformat()}~3.2000000,7.1500"
+        assert pipes_module.PipeCursor.parse(text) == cursor
+
+    def test_bare_timestamp(self):
+        cursor = pipes_module.PipeCursor.parse("2026-01-01T00:00:00Z")
+        assert cursor == pipes_module.PipeCursor(NOW)
+        assert str(cursor) == NOW.isoformat()
+
+    @pytest.mark.parametrize("value", ["yesterday", f"{NOW.isoformat()}~x.1", f"{NOW.isoformat()}~1"])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            pipes_module.PipeCursor.parse(value)
+
+    def test_floor_trails_recent_entries(self):
+        now = datetime.now(timezone.utc)
+        cursor = pipes_module.PipeCursor()
+        cursor.advance([{"id": 1, "updated_at": NOW}, {"id": 2, "updated_at": now}])
+        assert cursor.floor < now
+        assert cursor.recent == {2: now}
+        assert not cursor.is_new({"id": 1, "updated_at": NOW})
+        assert not cursor.is_new({"id": 2, "updated_at": now})
+        assert cursor.is_new({"id": 2, "updated_at": now + timedelta(seconds=1)})
+
+    def test_recent_entries_are_bounded(self, monkeypatch):
+        monkeypatch.setattr(pipes_module, "MAX_RECENT", 2)
+        now = datetime.now(timezone.utc)
+        cursor = pipes_module.PipeCursor()
+        cursor.advance([{"id": i, "updated_at": now + timedelta(seconds=i)} for i in range(1, 5)])
+        assert sorted(cursor.recent) == [3, 4]
+        assert cursor.floor == now + timedelta(seconds=2)
+
+    async def test_late_commit_delivered_once(self, pool):
+        now = datetime.now(timezone.utc)
+        pool.add_entry("plan")
+        pool.entries[-1]["updated_at"] = now
+        first = await pipes_module.agent_input_pipe(str(SESSION))
+        assert first["entries"] == 1
+
+        # Stamped before "plan" but committed after it was read
+        pool.add_entry("status")
+        pool.entries[-1]["updated_at"] = now - timedelta(seconds=1)
+        second = await pipes_module.agent_input_pipe(str(SESSION), since=first["latest"])
+        assert list(second["dashboard"]) == ["status"]
+
+        third = await pipes_module.agent_input_pipe(str(SESSION), since=second["latest"], wait=0.05)
+        assert third["entries"] == 0
+
+
+class TestStream:
+    async def test_dashboard_per_wakeup(self, pool, hub):
+        pool.add_entry("status")
+        member = await pipes_module.resolve_member(str(SESSION))
+        agen = pipes_module.agent_input_stream(member, hub=hub)
+
+        first = await asyncio.wait_for(agen.__anext__(), 1.0)
+        assert first["event"] == "dashboard"
+        assert first["id"] == NOW.isoformat()
+        assert json.loads(first["data"])["entries"] == 1
+
+        pending = asyncio.ensure_future(agen.__anext__())
+        await asyncio.sleep(0.01)
+        pool.add_entry("plan", minutes=2)
+        hub._on_notify(None, 0, "npl_agent_pipe", json.dumps(_note(agents=[str(SESSION)])))
+        second = await asyncio.wait_for(pending, 1.0)
+        data = json.loads(second["data"])
+        assert list(data["dashboard"]) == ["plan"]
+        assert second["id"] == (NOW + timedelta(minutes=2)).isoformat()
+
+        await agen.aclose()
+        assert hub.stats()["waiters"] == 0
+
+
+class TestStreamRoute:
+    def _client(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from npl_mcp.api.router import router
+
+        app = FastAPI()
+        app.include_router(router)
+        return TestClient(app)
+
+    def test_unknown_agent(self, pool):
+        response = self._client().get(f"/api/pipes/input/stream?agent={uuid.uuid4()}")
+        assert response.status_code == 404
+
+    def test_invalid_since(self, pool):
+        response = self._client().get(
+            f"/api/pipes/input/stream?agent={SESSION}", headers={"Last-Event-ID": "bogus"},
+        )
+        assert response.status_code == 400
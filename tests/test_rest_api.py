@@ -1853,3 +1853,34 @@ class TestBrowserToMarkdown:
         )
         assert r.status_code == 500
         assert "fetch failed" in r.json()["detail"]
+
+    def test_batch_streams_ndjson(self):
+        """POST /api/browser/to-markdown/batch streams one line per source plus a summary."""
+        import json
+
+        async def fake_batch(sources, **kwargs):
+            yield {"index": 1, "source": sources[1], "ok": False, "error": "boom", "elapsed_ms": 1.0}
+            yield {"index": 0, "source": sources[0], "ok": True, "content": "# A",
+                   "content_length": 3, "elapsed_ms": 2.0}
+
+        with patch("npl_mcp.browser.to_markdown.iter_to_markdown_batch", fake_batch):
+            client = _make_client()
+            r = client.post(
+                "/api/browser/to-markdown/batch",
+                json={"sources": ["https://a.example.com", "https://b.example.com"]},
+            )
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in r.text.splitlines()]
+        assert lines[0] == {"index": 1, "source": "https://b.example.com", "ok": False,
+                            "error": "boom", "elapsed_ms": 1.0}
+        assert lines[1]["markdown"] == "# A"
+        assert lines[1]["char_count"] == 3
+        assert lines[2]["done"] is True
+        assert (lines[2]["succeeded"], lines[2]["failed"]) == (1, 1)
+
+    def test_batch_empty_sources_returns_400(self):
+        """POST /api/browser/to-markdown/batch with no sources returns HTTP 400."""
+        client = _make_client()
+        r = client.post("/api/browser/to-markdown/batch", json={"sources": []})
+        assert r.status_code == 400
@@ -0,0 +1,91 @@
+"""Tests for the ToolSearch inverted index (npl_mcp.meta_tools.search_index).
+
+Tests cover:
+- Tokenization with camelCase splitting
+- Exact, prefix and infix (substring) term matches
+- Field weighting and exact-name boost
+- Multi-term ranking prefers entries matching every term
+- build_catalog builds the index; invalidate_catalog drops it
+"""
+
+import pytest
+
+from npl_mcp.meta_tools import catalog as catalog_mod
+from npl_mcp.meta_tools.search_index import SearchIndex, query_terms, tokenize
+
+
+ENTRIES = [
+    {"name": "ToMarkdown", "category": "Browser", "description": "Convert a page to markdown",
+     "tags": {"browser"}},
+    {"name": "Download", "category": "Browser", "description": "Download a file",
+     "tags": {"browser"}},
+    {"name": "Tasks.Create", "category": "Tasks", "description": "Create a task in a queue",
+     "tags": {"tasks"}},
+    {"name": "MarkdownViewer", "category": "Markdown", "description": "View documents",
+     "tags": {"markdown"}},
+]
+
+
+def _names(index: SearchIndex, query: str) -> list[str]:
+    return [ENTRIES[i]["name"] for i in index.search(query)]
+
+
+class TestTokenize:
+    def test_camel_case_parts(self):
+        assert tokenize("ToMarkdown") == ["tomarkdown", "to", "markdown"]
+
+    def test_punctuation_splits(self):
+        assert tokenize("Tasks.Create task_queue") == ["tasks", "create", "task", "queue"]
+
+    def test_query_terms_unique(self):
+        assert query_terms("Task task QUEUE") == ["task", "queue"]
+
+
+class TestSearchIndex:
+    @pytest.fixture
+    def index(self):
+        return SearchIndex(ENTRIES)
+
+    def test_exact_name_first(self, index):
+        assert _names(index, "ToMarkdown")[0] == "ToMarkdown"
+
+    def test_prefix_match(self, index):
+        assert "Download" in _names(index, "downl")
+
+    def test_infix_match(self, index):
+        # "down" is inside "markdown" as well as a prefix of "download"
+        names = _names(index, "down")
+        assert set(names) >= {"Download", "ToMarkdown", "MarkdownViewer"}
+        assert names[0] == "Download"
+
+    def test_name_outranks_description(self, index):
+        # "page" is in PageView's name but only in ToMarkdown's description
+        index = SearchIndex(ENTRIES + [
+            {"name": "PageView", "category": "Misc", "description": "", "tags": set()},
+        ])
+        names = [(ENTRIES + [{"name": "PageView"}])[i]["name"] for i in index.search("page")]
+        assert names == ["PageView", "ToMarkdown"]
+
+    def test_multi_term_requires_all_when_possible(self, index):
+        assert _names(index, "create queue") == ["Tasks.Create"]
+
+    def test_partial_fallback(self, index):
+        assert _names(index, "create zzzz") == ["Tasks.Create"]
+
+    def test_no_match(self, index):
+        assert _names(index, "zzz_nonexistent_zzz") == []
+        assert _names(index, "  ") == []
+
+
+class TestCatalogIntegration:
+    async def test_index_follows_catalog(self, monkeypatch):
+        monkeypatch.setattr(catalog_mod, "_catalog_cache", None)
+        monkeypatch.setattr(catalog_mod, "_catalog_index", None)
+        catalog = await catalog_mod.build_catalog()
+        index = await catalog_mod.get_search_index()
+        assert index is catalog_mod._catalog_index
+        assert index.size == len(catalog)
+
+        catalog_mod.invalidate_catalog()
+        assert catalog_mod._catalog_index is None
+        assert await catalog_mod.get_search_index() is not index
@@ -161,7 +161,8 @@ class TestTaskList:
         sql, *args = pool.fetch.call_args[0]
         assert "status = $1" in sql
         assert "assigned_to = $2" in sql
-        assert args == ["in_progress", "alice", 100]
+        # LIMIT fetches one extra row to detect a next page
+        assert args == ["in_progress", "alice", 101]
 
     @patch("npl_mcp.tasks.tasks.get_pool")
     async def test_limit_clamped_to_range(self, mock_pool):
@@ -172,17 +173,17 @@ class TestTaskList:
         # Above max
         await task_list(limit=99999)
         sql, *args = pool.fetch.call_args[0]
-        assert args[-1] == 500
+        assert args[-1] == 501  # + 1 probe row for the next cursor
 
         # Below min
         await task_list(limit=0)
         sql, *args = pool.fetch.call_args[0]
-        assert args[-1] == 1
+        assert args[-1] == 2
 
         # Garbage → default
         await task_list(limit="garbage")  # type: ignore[arg-type]
         sql, *args = pool.fetch.call_args[0]
-        assert args[-1] == 100
+        assert args[-1] == 101
 
 
 # ---------------------------------------------------------------------------
@@ -368,3 +368,97 @@ class TestToMarkdownRegistration:
     def test_tool_in_registry(self):
         from npl_mcp.meta_tools.catalog import _DISCOVERABLE_TOOLS
         assert "ToMarkdown" in _DISCOVERABLE_TOOLS
+
+
+# ---------------------------------------------------------------------------
+# Batch conversion
+# ---------------------------------------------------------------------------
+
+
+class TestToMarkdownBatch:
+    @pytest.fixture
+    def fake_fetch(self, tmp_path, monkeypatch):
+        """Isolated cache plus a fake Jina fetch that records concurrency."""
+        import asyncio
+
+        from npl_mcp.browser import to_markdown as tm
+        from npl_mcp.markdown.cache import MarkdownCache
+        from npl_mcp.markdown.converter import MarkdownConverter
+
+        cache = MarkdownCache(cache_dir=tmp_path / "cache")
+        monkeypatch.setattr(tm, "get_markdown_cache", lambda: cache)
+        stats = {"active": {}, "peak_host": 0, "peak_total": 0, "clients": set()}
+
+        async def fake_jina(self, url, timeout):
+            host = url.split("/")[2]
+            stats["clients"].add(id(self.client))
+            stats["active"][host] = stats["active"].get(host, 0) + 1
+            stats["peak_host"] = max(stats["peak_host"], stats["active"][host])
+            stats["peak_total"] = max(stats["peak_total"], sum(stats["active"].values()))
+            await asyncio.sleep(0.05 if "slow" in url else 0.01)
+            stats["active"][host] -= 1
+            return f"# {url}"
+
+        monkeypatch.setattr(MarkdownConverter, "_convert_url_jina", fake_jina)
+        return stats
+
+    async def test_limits_and_input_order(self, fake_fetch):
+        from npl_mcp.browser.to_markdown import to_markdown_batch
+
+        sources = [f"https://{host}.example.com/p{i}" for i in range(4) for host in ("a", "b", "c")]
+        result = await to_markdown_batch(sources, concurrency=2, per_host=1)
+
+        assert result["total"] == 12
+        assert result["succeeded"] == 12
+        assert [r["source"] for r in result["results"]] == sources
+        assert result["results"][0]["content"] == f"# {sources[0]}"
+        assert fake_fetch["peak_host"] == 1
+        assert fake_fetch["peak_total"] <= 2
+        # Every fetch went through the batch's single pooled client
+        assert len(fake_fetch["clients"]) == 1
+
+    async def test_streams_in_completion_order(self, fake_fetch):
+        from npl_mcp.browser.to_markdown import iter_to_markdown_batch
+
+        sources = ["https://a.example.com/slow", "https://b.example.com/fast"]
+        order = [entry["index"] async for entry in iter_to_markdown_batch(sources)]
+        assert order == [1, 0]
+
+    async def test_failures_are_isolated(self, fake_fetch, tmp_path):
+        from npl_mcp.browser.to_markdown import to_markdown_batch
+
+        broken = tmp_path / "broken.pdf"
+        broken.write_bytes(b"not a pdf")
+        result = await to_markdown_batch([str(broken), "https://a.example.com/ok"])
+
+        assert result["failed"] == 1
+        assert result["results"][0]["ok"] is False
+        assert "broken.pdf" in result["results"][0]["error"]
+        assert result["results"][1]["ok"] is True
+
+    async def test_output_dir(self, fake_fetch, tmp_path):
+        from npl_mcp.browser.to_markdown import to_markdown_batch
+
+        out = tmp_path / "out"
+        result = await to_markdown_batch(["https://a.example.com/doc", "# Raw\n\nText"], output_dir=str(out))
+
+        files = sorted(p.name for p in out.iterdir())
+        assert len(files) == 2
+        assert files[0].startswith("0000-a.example.com.doc")
+        assert files[1] == "0001-raw.md"
+        assert all("content" not in r for r in result["results"])
+
+    @pytest.mark.parametrize("sources,kwargs", [
+        ([], {}),
+        (["x"] * 501, {}),
+        (["x"], {"concurrency": 0}),
+    ])
+    async def test_invalid_arguments(self, sources, kwargs):
+        from npl_mcp.browser.to_markdown import to_markdown_batch
+
+        with pytest.raises(ValueError):
+            await to_markdown_batch(sources, **kwargs)
+
+    def test_batch_tool_in_registry(self):
+        from npl_mcp.meta_tools.catalog import _DISCOVERABLE_TOOLS
+        assert "ToMarkdown.Batch" in _DISCOVERABLE_TOOLS